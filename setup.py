@@ -38,7 +38,7 @@ req_path = path.join(here, "requirements")
 INSTALL_REQUIRES = parse_requirements_file(path.join(req_path, "default.txt"))
 EXTRA_REQUIRES = {
     dep: parse_requirements_file(path.join(req_path, dep + ".txt"))
-    for dep in ["docs", "report", "test"]
+    for dep in ["docs", "highs", "report", "test"]
 }
 
 # Arguments marked as "Required" below must be included for upload to PyPI.
@@ -187,7 +187,11 @@ setup(
         "console_scripts": [
             "mvs_tool=multi_vector_simulator.cli:main",
             "mvs_report=multi_vector_simulator.cli:report",
+            "mvs_reevaluate=multi_vector_simulator.cli:reevaluate",
             "mvs_create_input_template=multi_vector_simulator.cli:create_input_template_folder",
+            "mvs_daemon=multi_vector_simulator.daemon:start",
+            "mvs_client=multi_vector_simulator.daemon:client",
+            "mvs_queue=multi_vector_simulator.job_queue:main",
         ],
     },
     # List additional URLs that are relevant to your project as a dict.
@@ -91,6 +91,10 @@ from multi_vector_simulator.utils.constants import (
     ARG_REPORT_PATH,
     ARG_PATH_SIM_OUTPUT,
     ARG_DEBUG_REPORT,
+    ARG_ECONOMIC_DATA_OVERRIDES,
+    DAEMON_PORT,
+    QUEUE_DATABASE,
+    QUEUE_MAX_ATTEMPTS,
 )
 from multi_vector_simulator.utils.constants_json_strings import LABEL
 from multi_vector_simulator.version import version_num
@@ -286,6 +290,306 @@ def report_arg_parser():
     return parser
 
 
+def reevaluate_arg_parser():
+    """Create a command line argument parser for the economic re-evaluation of MVS results
+
+    Usage when multi-vector-simulator is installed as a package:
+
+    .. code-block:: bash
+
+        mvs_reevaluate [-h] [-i [PATH_SIM_OUTPUT]] [-o [OUTPUT_FOLDER]] [-e PARAMETER=VALUE]
+
+    Process mvs reevaluate command line arguments
+
+    optional arguments:
+      -h, --help
+        show this help message and exit
+
+      -i [OUTPUT_FOLDER]
+        path to the simulation result json file 'json_with_results.json'
+
+      -o [OUTPUT_FOLDER]
+        folder in which the re-evaluated results are saved (default: folder of the simulation
+        result json file)
+
+      -e PARAMETER=VALUE
+        new value of a parameter of the economic data, can be repeated
+
+    :return: parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="mvs_reevaluate",
+        description="Re-evaluate the economic KPI of a MVS simulation with other economic "
+        "data, without re-optimizing the energy system",
+    )
+    parser.add_argument(
+        "-i",
+        dest=ARG_PATH_SIM_OUTPUT,
+        nargs="?",
+        type=str,
+        help=f"path to the simulation result json file {JSON_WITH_RESULTS}.json'",
+        default=os.path.join(
+            REPO_PATH, OUTPUT_FOLDER, JSON_WITH_RESULTS + JSON_FILE_EXTENSION
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        dest=PATH_OUTPUT_FOLDER,
+        nargs="?",
+        type=str,
+        help="folder in which the re-evaluated results are saved (default: folder of the "
+        "simulation result json file)",
+        default=None,
+    )
+    parser.add_argument(
+        "-e",
+        dest=ARG_ECONOMIC_DATA_OVERRIDES,
+        action="append",
+        type=str,
+        help="new value of a parameter of the economic data, as PARAMETER=VALUE (for example "
+        "-e discount_factor=0.1), can be repeated",
+        default=[],
+    )
+    return parser
+
+
+def daemon_arg_parser():
+    """Create a command line argument parser for the MVS daemon
+
+    Usage when multi-vector-simulator is installed as a package:
+
+    .. code-block:: bash
+
+        mvs_daemon [-h] [-n [N_WORKERS]] [-port [PORT]] [-tasks [MAX_TASKS]]
+
+    Process mvs daemon command line arguments
+
+    optional arguments:
+      -h, --help
+        show this help message and exit
+
+      -n [N_WORKERS]
+        number of worker processes (default: number of processors)
+
+      -port [PORT]
+        port of the daemon on localhost
+
+      -tasks [MAX_TASKS]
+        number of simulations after which a worker process is renewed (default: never)
+
+    :return: parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="mvs_daemon",
+        description="Keep a pool of warm MVS worker processes listening on a local socket",
+    )
+    parser.add_argument(
+        "-n",
+        dest="n_workers",
+        nargs="?",
+        type=int,
+        help="number of worker processes (default: number of processors)",
+        default=None,
+    )
+    parser.add_argument(
+        "-port",
+        dest="port",
+        nargs="?",
+        type=int,
+        help=f"port of the daemon on localhost (default: {DAEMON_PORT})",
+        default=DAEMON_PORT,
+    )
+    parser.add_argument(
+        "-tasks",
+        dest="max_tasks",
+        nargs="?",
+        type=int,
+        help="number of simulations after which a worker process is renewed (default: never)",
+        default=None,
+    )
+    return parser
+
+
+def client_arg_parser():
+    """Create a command line argument parser for the client of the MVS daemon
+
+    Usage when multi-vector-simulator is installed as a package:
+
+    .. code-block:: bash
+
+        mvs_client [-port [PORT]] [-stop] [mvs_tool arguments]
+
+    Process mvs client command line arguments, all other arguments are forwarded to `mvs_tool`
+
+    optional arguments:
+      -port [PORT]
+        port of the daemon on localhost
+
+      -stop
+        stop the daemon once the running simulations are finished
+
+    :return: parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="mvs_client",
+        description="Run a MVS simulation within the MVS daemon, the arguments not listed "
+        "here are forwarded to mvs_tool (see mvs_tool -h)",
+        allow_abbrev=False,
+    )
+    parser.add_argument(
+        "-port",
+        dest="port",
+        nargs="?",
+        type=int,
+        help=f"port of the daemon on localhost (default: {DAEMON_PORT})",
+        default=DAEMON_PORT,
+    )
+    parser.add_argument(
+        "-stop",
+        dest="stop",
+        help="stop the daemon once the running simulations are finished",
+        nargs="?",
+        const=True,
+        default=False,
+        type=bool,
+    )
+    return parser
+
+
+def queue_arg_parser():
+    """Create a command line argument parser for the MVS job queue
+
+    Usage when multi-vector-simulator is installed as a package:
+
+    .. code-block:: bash
+
+        mvs_queue [-db [DATABASE]] submit [-attempts [MAX_ATTEMPTS]] [-timeout [TIMEOUT]]
+        [mvs_tool arguments]
+
+        mvs_queue [-db [DATABASE]] worker [-n [N_WORKERS]] [-jobs [MAX_JOBS]] [-idle]
+
+        mvs_queue [-db [DATABASE]] status [-id [JOB_ID]]
+
+        mvs_queue [-db [DATABASE]] requeue JOB_ID [JOB_ID ...]
+
+    Process mvs queue command line arguments, the arguments of submit which are not listed here
+    are forwarded to `mvs_tool`
+
+    optional arguments:
+      -db [DATABASE]
+        path to the sqlite database of the queue, on a filesystem shared by all worker nodes
+
+      -attempts [MAX_ATTEMPTS]
+        number of attempts of a job before it is moved to the dead letter state
+
+      -timeout [TIMEOUT]
+        seconds after which an attempt of a job is stopped (default: no timeout)
+
+      -n [N_WORKERS]
+        number of worker processes started on this node
+
+      -jobs [MAX_JOBS]
+        number of jobs after which a worker process exits (default: never)
+
+      -idle
+        exit the workers once the queue holds no pending or running job
+
+      -id [JOB_ID]
+        show the details of a single job
+
+    :return: parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="mvs_queue",
+        description="Queue MVS simulations in a sqlite database and run them with worker "
+        "processes on any node sharing its filesystem",
+        allow_abbrev=False,
+    )
+    parser.add_argument(
+        "-db",
+        dest="database",
+        nargs="?",
+        type=str,
+        help=f"path to the sqlite database of the queue (default: {QUEUE_DATABASE})",
+        default=QUEUE_DATABASE,
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    submit = commands.add_parser(
+        "submit",
+        help="queue a simulation, the arguments not listed here are forwarded to mvs_tool "
+        "(see mvs_tool -h)",
+        allow_abbrev=False,
+    )
+    submit.add_argument(
+        "-attempts",
+        dest="max_attempts",
+        nargs="?",
+        type=int,
+        help=f"number of attempts of the job before it is moved to the dead letter state "
+        f"(default: {QUEUE_MAX_ATTEMPTS})",
+        default=QUEUE_MAX_ATTEMPTS,
+    )
+    submit.add_argument(
+        "-timeout",
+        dest="timeout",
+        nargs="?",
+        type=float,
+        help="seconds after which an attempt of the job is stopped (default: no timeout)",
+        default=None,
+    )
+
+    worker = commands.add_parser(
+        "worker", help="run the queued jobs on this node", allow_abbrev=False
+    )
+    worker.add_argument(
+        "-n",
+        dest="n_workers",
+        nargs="?",
+        type=int,
+        help="number of worker processes (default: 1)",
+        default=1,
+    )
+    worker.add_argument(
+        "-jobs",
+        dest="max_jobs",
+        nargs="?",
+        type=int,
+        help="number of jobs after which a worker process exits (default: never)",
+        default=None,
+    )
+    worker.add_argument(
+        "-idle",
+        dest="exit_when_idle",
+        help="exit once the queue holds no pending or running job",
+        nargs="?",
+        const=True,
+        default=False,
+        type=bool,
+    )
+
+    status = commands.add_parser(
+        "status", help="show the state of the queued jobs", allow_abbrev=False
+    )
+    status.add_argument(
+        "-id",
+        dest="job_id",
+        nargs="?",
+        type=int,
+        help="show the details of a single job",
+        default=None,
+    )
+
+    requeue = commands.add_parser(
+        "requeue",
+        help="queue jobs in the dead letter state again, with new attempts",
+        allow_abbrev=False,
+    )
+    requeue.add_argument("job_ids", nargs="+", type=int, metavar="JOB_ID")
+    return parser
+
+
 def check_input_folder(path_input_folder, input_type):
     """Enforces the rules for the input folder and files
 
@@ -10,10 +10,12 @@ import os
 import numpy as np
 import pandas as pd
 
+import multi_vector_simulator.E1_process_results as E1
 from multi_vector_simulator.utils import (
     data_parser,
     compare_input_parameters_with_reference,
 )
+from multi_vector_simulator.utils.scenario_delta import load_scenario
 
 from multi_vector_simulator.utils.constants_json_strings import (
     START_DATE,
@@ -26,6 +28,8 @@ from multi_vector_simulator.utils.constants_json_strings import (
     VALUE,
     DATA,
     TIMESERIES,
+    TIMESERIES_STORE,
+    GRANULARITY_FULL,
 )
 
 from multi_vector_simulator.utils.constants import (
@@ -39,12 +43,18 @@ from multi_vector_simulator.utils.constants import (
     TYPE_NDARRAY,
     TYPE_DATAFRAME,
     TYPE_TIMESTAMP,
+    TYPE_TIMESERIES_STORE,
     SIMULATION_SETTINGS,
     PATH_INPUT_FOLDER,
     PATH_OUTPUT_FOLDER,
     PATH_OUTPUT_FOLDER_INPUTS,
     MISSING_PARAMETERS_KEY,
 )
+from multi_vector_simulator.utils.timeseries_store import TimeseriesStore
+from multi_vector_simulator.utils.asset_records import (
+    AssetRecord,
+    dict_values_to_asset_records,
+)
 
 """
 This module is used to open a json file and parse it as a dict all input parameters for the energy 
@@ -56,7 +66,9 @@ It will be an interface to the EPA.
 """
 
 
-def convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
+def convert_from_json_to_special_types(
+    a_dict, prev_key=None, time_index=None, timeseries_store=None, period_index=None
+):
     """Convert the field values of the mvs result json file which are not simple types.
 
     The function is recursive to explore all nested levels
@@ -67,6 +79,14 @@ def convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
         In the recursion, this is either a dict (moving down one nesting level) or a field value
     prev_key: str
         The previous key of the dict in the recursive loop
+    time_index: :pandas:`pandas.DatetimeIndex`
+        Index set to the timeseries, if their length match
+    timeseries_store: :class:`multi_vector_simulator.utils.timeseries_store.TimeseriesStore`
+        Store of the arrays referenced by the timeseries. If a_dict contains a serialized
+        store under the TIMESERIES_STORE key, it is converted first and used for the nested levels
+    period_index: :pandas:`pandas.DatetimeIndex`
+        Index set to the timeseries which do not match the time_index but the periods of
+        the RESULT_GRANULARITY, see E1.aggregate_result_timeseries
 
     Returns
     -------
@@ -81,10 +101,23 @@ def convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
         # therefore we dive deeper in the nesting level
         if DATA_TYPE_JSON_KEY not in a_dict:
             answer = {}
+            if (
+                isinstance(a_dict.get(TIMESERIES_STORE), dict)
+                and a_dict[TIMESERIES_STORE].get(DATA_TYPE_JSON_KEY)
+                == TYPE_TIMESERIES_STORE
+            ):
+                # the store has to be available before the timeseries referencing it
+                timeseries_store = TimeseriesStore.from_json(a_dict[TIMESERIES_STORE])
+                answer[TIMESERIES_STORE] = timeseries_store
             for k in a_dict:
-                answer[k] = convert_from_json_to_special_types(
-                    a_dict[k], prev_key=k, time_index=time_index
-                )
+                if k not in answer:
+                    answer[k] = convert_from_json_to_special_types(
+                        a_dict[k],
+                        prev_key=k,
+                        time_index=time_index,
+                        timeseries_store=timeseries_store,
+                        period_index=period_index,
+                    )
         # TODO this cas might be obsolete with the newer version of the parser from PR #675
         elif prev_key == data_parser.MAP_MVS_EPA[TIMESERIES]:
             # the a_dict is from the EPA
@@ -128,11 +161,25 @@ def convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
                 # extract the name of the series in case it was a tuple
                 name = a_dict.get("name", None)
 
-                # reconvert the dict to a json for conversion to pandas Series
-                answer = pd.Series(a_dict[VALUE])
+                if TIMESERIES_STORE in a_dict:
+                    # the values are stored once in the timeseries store
+                    if timeseries_store is None:
+                        raise ValueError(
+                            f"The timeserie under the field {prev_key} references the array "
+                            f"{a_dict[TIMESERIES_STORE]} but no {TIMESERIES_STORE} is provided"
+                        )
+                    answer = timeseries_store.view(a_dict[TIMESERIES_STORE])
+                else:
+                    # reconvert the dict to a json for conversion to pandas Series
+                    answer = pd.Series(a_dict[VALUE])
 
                 # Set time_index to Series
-                if time_index is not None:
+                if period_index is not None and len(answer.index) == len(
+                    period_index
+                ) != len(time_index):
+                    # the result timeseries were aggregated to periods
+                    answer.index = period_index
+                elif time_index is not None:
                     if len(answer.index) > len(time_index):
                         logging.warning(
                             f"The time index inferred from {SIMULATION_SETTINGS} is shorter as "
@@ -159,11 +206,13 @@ def convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
             elif TYPE_NDARRAY in data_type:
                 # numpy.array
                 answer = np.array(a_dict[VALUE])
+            elif TYPE_TIMESERIES_STORE in data_type:
+                answer = TimeseriesStore.from_json(a_dict)
 
     return answer
 
 
-def convert_from_special_types_to_json(o):
+def convert_from_special_types_to_json(o, timeseries_store=None):
     """This converts all data stored in dict_values that is not compatible with the
     json format to a format that is compatible.
 
@@ -171,6 +220,10 @@ def convert_from_special_types_to_json(o):
     ----------
     o :
         Any type. Object to be converted to json-storable value.
+    timeseries_store: :class:`multi_vector_simulator.utils.timeseries_store.TimeseriesStore`
+        Store serialized alongside o. The pandas.Series which are views on its arrays are
+        converted to a reference to the array instead of a list of values.
+        Default: None
 
     Returns
     -------
@@ -187,7 +240,16 @@ def convert_from_special_types_to_json(o):
     elif isinstance(o, pd.Timestamp):
         answer = {DATA_TYPE_JSON_KEY: TYPE_TIMESTAMP, VALUE: str(o)}
     elif isinstance(o, pd.Series):
-        answer = {DATA_TYPE_JSON_KEY: TYPE_SERIES, VALUE: o.to_list()}
+        key = None if timeseries_store is None else timeseries_store.key_of(o)
+        if key is not None:
+            answer = {DATA_TYPE_JSON_KEY: TYPE_SERIES, TIMESERIES_STORE: key}
+        else:
+            answer = {DATA_TYPE_JSON_KEY: TYPE_SERIES, VALUE: o.to_list()}
+    elif isinstance(o, TimeseriesStore):
+        answer = o.to_json()
+    elif isinstance(o, AssetRecord):
+        # the asset is serialized as its dict of {VALUE, UNIT} parameters
+        answer = o.to_dict()
     elif isinstance(o, np.ndarray):
         answer = {DATA_TYPE_JSON_KEY: TYPE_NDARRAY, VALUE: o.tolist()}
     elif isinstance(o, pd.DataFrame):
@@ -256,6 +318,7 @@ def load_json(
     move_copy=False,
     flag_missing_values=True,
     set_default_values=False,
+    asset_records=False,
 ):
     """Opens and reads json input file and parses it to dict of input parameters.
 
@@ -263,7 +326,8 @@ def load_json(
     ----------
 
     path_input_file: str
-        The path to the json file created from csv files
+        The path to the json file created from csv files, or to a scenario delta (see
+        :mod:`multi_vector_simulator.utils.scenario_delta`)
     path_input_folder : str, optional
         The path to the directory where the input CSVs/JSON files are located.
         Default: 'inputs/'.
@@ -279,6 +343,13 @@ def load_json(
     set_default_values: bool
         if True, set the default value of a missing required parameter which is listed in
         KNOWN_EXTRA_PARAMETERS
+    asset_records: bool
+        if True, the assets are converted to the compact records of
+        :mod:`multi_vector_simulator.utils.asset_records` (one record type per asset group),
+        which can be stored with F0.store_as_json. Only the economic evaluation of the
+        assets (E0.reevaluate_economics) runs on records, the other functions of the modules
+        C0 to E4 require the assets as dicts.
+        Default: False
 
 
     Returns
@@ -287,8 +358,8 @@ def load_json(
     dict of all input parameters of the MVS E-Lands simulation
     """
 
-    with open(path_input_file) as json_file:
-        dict_values = json.load(json_file)
+    # a scenario delta is resolved to its base input with the changes of the scenario applied
+    dict_values = load_scenario(path_input_file)
 
     # Retrieve the simulation setting in the right format
     if SIMULATION_SETTINGS in dict_values:
@@ -299,11 +370,21 @@ def load_json(
         retrieve_date_time_info(dict_values[SIMULATION_SETTINGS])
 
         time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+
+        # Index of the result timeseries aggregated to the RESULT_GRANULARITY
+        granularity, _ = E1.get_result_granularity(dict_values[SIMULATION_SETTINGS])
+        if granularity == GRANULARITY_FULL:
+            period_index = None
+        else:
+            period_index = E1.get_period_index(time_index, granularity)
     else:
         time_index = None
+        period_index = None
 
     # Convert the values inside the dict to python types
-    dict_values = convert_from_json_to_special_types(dict_values, time_index=time_index)
+    dict_values = convert_from_json_to_special_types(
+        dict_values, time_index=time_index, period_index=period_index
+    )
 
     # The user specified a value
     if path_input_folder is not None:
@@ -336,4 +417,7 @@ def load_json(
         dict_values, flag_missing=flag_missing_values, set_default=set_default_values
     )
 
+    if asset_records is True:
+        dict_values = dict_values_to_asset_records(dict_values)
+
     return dict_values
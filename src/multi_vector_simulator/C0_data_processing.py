@@ -22,6 +22,7 @@ Module C0 prepares the data read from csv or json for simulation, ie. pre-proces
 """
 
 import logging
+import numbers
 import os
 import sys
 import pprint as pp
@@ -46,6 +47,10 @@ from multi_vector_simulator.utils.exceptions import InvalidPeakDemandPricingPeri
 import multi_vector_simulator.B0_data_input_json as B0
 import multi_vector_simulator.C1_verification as C1
 import multi_vector_simulator.C2_economic_functions as C2
+import multi_vector_simulator.C3_model_reduction as C3
+from multi_vector_simulator.utils import get_nested_value
+from multi_vector_simulator.utils.timeseries_store import share_timeseries
+from multi_vector_simulator.utils.asset_records import get_value, get_unit, set_value
 
 
 def all(dict_values):
@@ -56,6 +61,24 @@ def all(dict_values):
 
     :return Pre-processed dictionary with all input parameters
 
+    """
+    process_input_data(dict_values)
+    verify_and_reduce_energy_system(dict_values)
+
+
+def process_input_data(dict_values):
+    """
+    Processes the input data: time and economic parameters, energy vectors, busses, costs and
+    timeseries of all assets and the auxiliary assets of the energy providers
+
+    The processed input data can be shared by variants of a scenario which only differ in a few
+    parameters, see `apply_parameter_changes`. The energy system is verified and reduced
+    afterwards with `verify_and_reduce_energy_system`.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All input data in dict format, updated in place
     """
     # Check if any asset label has duplicates
     C1.check_for_label_duplicates(dict_values)
@@ -73,6 +96,16 @@ def all(dict_values):
     # Adds costs to each asset and sub-asset, adds time series to assets
     process_all_assets(dict_values)
 
+
+def verify_and_reduce_energy_system(dict_values):
+    """
+    Verifies the processed input data and reduces the model of the energy system
+
+    Parameters
+    ----------
+    dict_values: dict
+        Input data processed with `process_input_data`, updated in place
+    """
     # check electricity price >= feed-in tariff todo: can be integrated into check_input_values() later
     C1.check_feedin_tariff_vs_energy_price(dict_values=dict_values)
     # check that energy supply costs are not lower than generation costs of any asset (of the same energy vector)
@@ -101,6 +134,177 @@ def all(dict_values):
     # connected to one bus is smaller than the maximum demand
     C1.check_energy_system_can_fulfill_max_demand(dict_values)
 
+    # reject energy systems that can be proven infeasible without solving the linear program,
+    # if the simulation setting FEASIBILITY_SCREENING is True
+    C1.check_feasibility_of_energy_system(dict_values)
+
+    # remove assets and busses from the model that do not change the optimal solution,
+    # if the simulation setting MODEL_REDUCTION is True
+    C3.reduce_energy_system_model(dict_values)
+
+    # let identical timeseries of the assets share one read-only array of values
+    share_timeseries(dict_values)
+
+
+# Simulation settings which are not read by process_input_data
+UNPROCESSED_SIMULATION_SETTINGS = (
+    OUTPUT_LP_FILE,
+    MODEL_REDUCTION,
+    LP_SCALING,
+    FEASIBILITY_SCREENING,
+    IN_MEMORY_SOLVER,
+    TWO_STAGE_PLANNING,
+    INVESTMENT_TIMESTEP,
+    TIMESTEP_SEGMENTATION,
+    SEGMENTATION_RATIO,
+    COST_RANGING,
+    MEMORY_BUDGET,
+    SOLVER_PROGRESS,
+    RESULT_GRANULARITY,
+    FULL_RESOLUTION_ASSETS,
+)
+# Scalar asset parameters which are used as provided by process_input_data
+UNPROCESSED_ASSET_PARAMETERS = (
+    OPTIMIZE_CAP,
+    EFFICIENCY,
+    SOC_INITIAL,
+    SOC_MIN,
+    SOC_MAX,
+    C_RATE,
+    THERM_LOSSES_REL,
+    THERM_LOSSES_ABS,
+    EMISSION_FACTOR,
+    RENEWABLE_ASSET_BOOL,
+)
+# Scalar asset parameters from which evaluate_lifetime_costs derives the costs of the asset
+COST_PARAMETERS = (
+    SPECIFIC_COSTS,
+    SPECIFIC_COSTS_OM,
+    DISPATCH_PRICE,
+    LIFETIME,
+    AGE_INSTALLED,
+    DEVELOPMENT_COSTS,
+)
+# Asset parameters from which process_maximum_cap_constraint derives the capacity limits
+CAPACITY_PARAMETERS = (INSTALLED_CAP, MAXIMUM_CAP)
+
+
+def apply_parameter_changes(dict_values, changes):
+    """
+    Applies changes of input parameters to processed input data and re-runs only the affected
+    processing steps
+
+    The input data of variants of a scenario only differing in a few parameters can thus be
+    derived from the processed input data of the scenario, without loading and processing the
+    whole input data again. Supported are changes of
+
+    * the simulation settings UNPROCESSED_SIMULATION_SETTINGS and of the constraints, which are
+      not processed
+    * the scalar UNPROCESSED_ASSET_PARAMETERS of the energy conversion, production, storage and
+      consumption assets, which are not processed
+    * the scalar COST_PARAMETERS of these assets and of the fix costs, the costs of the asset
+      are evaluated again with `evaluate_lifetime_costs`
+    * the CAPACITY_PARAMETERS of the energy conversion, production and storage assets, the
+      capacity limits of the asset are processed again with `process_maximum_cap_constraint`
+
+    Any other change, for example of the economic data, of the energy providers or of a
+    timeseries, requires the whole input data to be processed again. The energy system is
+    verified and reduced afterwards with `verify_and_reduce_energy_system`.
+
+    Parameters
+    ----------
+    dict_values: dict
+        Input data processed with `process_input_data`, updated in place if all changes are
+        supported
+
+    changes: dict
+        Maps the path (tuple of keys, see `utils.split_nested_path`) of each changed parameter,
+        e.g. (ENERGY_PRODUCTION, "pv_plant", SPECIFIC_COSTS, VALUE), to its new value
+
+    Returns
+    -------
+    True if the changes were applied, False if one of them is not supported, dict_values is
+    then left unchanged
+
+    Notes
+    -----
+    Tested with:
+    - test_apply_parameter_changes_cost_parameter()
+    - test_apply_parameter_changes_capacity_parameter()
+    - test_apply_parameter_changes_unsupported_change()
+    """
+    asset_groups = (ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_STORAGE)
+    cost_updates = {}
+    capacity_updates = {}
+    for path, value in changes.items():
+        group = path[0]
+        if group == CONSTRAINTS or (
+            group == SIMULATION_SETTINGS
+            and len(path) > 1
+            and path[1] in UNPROCESSED_SIMULATION_SETTINGS
+        ):
+            continue
+        if (
+            group not in asset_groups + (ENERGY_CONSUMPTION, FIX_COST)
+            or len(path) < 3
+            or path[1] not in dict_values[group]
+        ):
+            return False
+        subasset = None
+        parameter_path = path[2:]
+        if group == ENERGY_STORAGE and path[2] in (
+            STORAGE_CAPACITY,
+            INPUT_POWER,
+            OUTPUT_POWER,
+        ):
+            subasset = path[2]
+            parameter_path = path[3:]
+        parameter = parameter_path[0] if len(parameter_path) > 0 else None
+        if len(parameter_path) == 1 and isinstance(value, dict):
+            value = value.get(VALUE)
+        elif parameter_path[1:] != (VALUE,):
+            return False
+        # parameters provided as timeseries or lists are processed with the timeseries
+        asset_dict = dict_values[group][path[1]]
+        if subasset is not None:
+            asset_dict = asset_dict[subasset]
+        current = asset_dict.get(parameter)
+        if isinstance(current, dict):
+            current = current.get(VALUE)
+        for v in (value, current):
+            if v is not None and not isinstance(v, numbers.Number):
+                return False
+        key = (group, path[1], subasset)
+        if parameter in COST_PARAMETERS:
+            cost_updates[key] = asset_dict
+        elif parameter in CAPACITY_PARAMETERS and group in asset_groups:
+            capacity_updates[key] = asset_dict
+        elif parameter not in UNPROCESSED_ASSET_PARAMETERS or group == FIX_COST:
+            return False
+
+    for path, value in changes.items():
+        get_nested_value(dict_values, path[:-1])[path[-1]] = value
+    for asset_dict in cost_updates.values():
+        evaluate_lifetime_costs(
+            dict_values[SIMULATION_SETTINGS], dict_values[ECONOMIC_DATA], asset_dict,
+        )
+    for (group, asset, subasset), asset_dict in capacity_updates.items():
+        # the normalized capacity limits are only defined for a maximumCap
+        asset_dict.pop(MAXIMUM_CAP_NORMALIZED, None)
+        asset_dict.pop(MAXIMUM_ADD_CAP_NORMALIZED, None)
+        if group == ENERGY_PRODUCTION and asset_dict.get(FILENAME) not in (
+            "None",
+            None,
+        ):
+            process_normalized_installed_cap(dict_values, group, asset)
+        process_maximum_cap_constraint(dict_values, group, asset, subasset)
+    logging.debug(
+        f"Applied {len(changes)} parameter changes to the processed input data, "
+        f"evaluated the costs of {len(cost_updates)} and the capacity limits of "
+        f"{len(capacity_updates)} assets again"
+    )
+    return True
+
 
 def add_version_number_used(simulation_settings):
     r"""
@@ -671,6 +875,12 @@ def define_auxiliary_assets_of_energy_providers(dict_values, dso):
     r"""
     Defines all sinks and sources that need to be added to model the transformer using assets of energyConsumption, energyProduction and energyConversion.
 
+    If the simulation setting PEAK_DEMAND_PRICING_CONSTRAINT is True, the consumption source
+    supplies the outflow bus of the DSO directly. The peak demand pricing assets are still defined,
+    so that their costs are processed and their results evaluated like any other energyConversion
+    asset, but they are not added to the oemof model: the peak demand of each period is modelled
+    by D2.constraint_peak_demand_pricing instead.
+
     Parameters
     ----------
     dict_values
@@ -702,6 +912,17 @@ def define_auxiliary_assets_of_energy_providers(dict_values, dso):
     - C0.test_change_sign_of_feedin_tariff_zero()
     """
 
+    peak_demand_pricing_constraint = dict_values[SIMULATION_SETTINGS].get(
+        PEAK_DEMAND_PRICING_CONSTRAINT, {VALUE: False}
+    )[VALUE]
+    if peak_demand_pricing_constraint is True:
+        consumption_bus = dict_values[ENERGY_PROVIDERS][dso][OUTFLOW_DIRECTION]
+    else:
+        consumption_bus = (
+            dict_values[ENERGY_PROVIDERS][dso][OUTFLOW_DIRECTION]
+            + DSO_PEAK_DEMAND_SUFFIX
+        )
+
     number_of_pricing_periods = dict_values[ENERGY_PROVIDERS][dso][
         PEAK_DEMAND_PRICING_PERIOD
     ][VALUE]
@@ -716,14 +937,16 @@ def define_auxiliary_assets_of_energy_providers(dict_values, dso):
     )
 
     list_of_dso_energyConversion_assets = add_a_transformer_for_each_peak_demand_pricing_period(
-        dict_values, dict_values[ENERGY_PROVIDERS][dso], dict_availability_timeseries,
+        dict_values,
+        dict_values[ENERGY_PROVIDERS][dso],
+        dict_availability_timeseries,
+        peak_demand_pricing_constraint=peak_demand_pricing_constraint,
     )
 
     define_source(
         dict_values=dict_values,
         asset_key=dso + DSO_CONSUMPTION,
-        outflow_direction=dict_values[ENERGY_PROVIDERS][dso][OUTFLOW_DIRECTION]
-        + DSO_PEAK_DEMAND_SUFFIX,
+        outflow_direction=consumption_bus,
         price=dict_values[ENERGY_PROVIDERS][dso][ENERGY_PRICE],
         energy_vector=dict_values[ENERGY_PROVIDERS][dso][ENERGY_VECTOR],
         emission_factor=dict_values[ENERGY_PROVIDERS][dso][EMISSION_FACTOR],
@@ -822,31 +1045,31 @@ def define_availability_of_peak_demand_pricing_assets(
         Dict with all availability timeseries for each period
 
     """
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
     dict_availability_timeseries = {}
     for period in range(1, number_of_pricing_periods + 1):
-        availability_in_period = pd.Series(
-            0, index=dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+        # Period start
+        period_start = dict_values[SIMULATION_SETTINGS][START_DATE] + pd.DateOffset(
+            months=(period - 1) * months_in_a_period
         )
-        time_period = pd.date_range(
-            # Period start
-            start=dict_values[SIMULATION_SETTINGS][START_DATE]
-            + pd.DateOffset(months=(period - 1) * months_in_a_period),
-            # Period end, with months_in_a_period durartion
-            end=dict_values[SIMULATION_SETTINGS][START_DATE]
-            + pd.DateOffset(months=(period) * months_in_a_period, hours=-1),
-            freq=str(dict_values[SIMULATION_SETTINGS][TIMESTEP][VALUE]) + UNIT_MINUTE,
+        # Period end, with months_in_a_period durartion
+        period_end = dict_values[SIMULATION_SETTINGS][START_DATE] + pd.DateOffset(
+            months=(period) * months_in_a_period, hours=-1
+        )
+        availability_in_period = pd.Series(
+            ((time_index >= period_start) & (time_index <= period_end)).astype(float),
+            index=time_index,
         )
-
-        availability_in_period = availability_in_period.add(
-            pd.Series(1, index=time_period), fill_value=0
-        ).loc[dict_values[SIMULATION_SETTINGS][TIME_INDEX]]
         dict_availability_timeseries.update({period: availability_in_period})
 
     return dict_availability_timeseries
 
 
 def add_a_transformer_for_each_peak_demand_pricing_period(
-    dict_values, dict_dso, dict_availability_timeseries
+    dict_values,
+    dict_dso,
+    dict_availability_timeseries,
+    peak_demand_pricing_constraint=False,
 ):
     r"""
     Adds transformers that are supposed to model the peak_demand_pricing periods for each period.
@@ -863,6 +1086,11 @@ def add_a_transformer_for_each_peak_demand_pricing_period(
     dict_availability_timeseries: dict
         dict with all availability timeseries for each period
 
+    peak_demand_pricing_constraint: bool
+        If True, the transformers are not added to the oemof model but modelled by
+        D2.constraint_peak_demand_pricing
+        Default: False
+
     Returns
     -------
     list_of_dso_energyConversion_assets: list
@@ -898,6 +1126,7 @@ def add_a_transformer_for_each_peak_demand_pricing_period(
             dict_dso=dict_dso,
             transformer_name=transformer_name,
             timeseries_availability=dict_availability_timeseries[key],
+            peak_demand_pricing_constraint=peak_demand_pricing_constraint,
         )
 
         list_of_dso_energyConversion_assets.append(transformer_name)
@@ -963,7 +1192,11 @@ def determine_months_in_a_peak_demand_pricing_period(
 
 
 def define_transformer_for_peak_demand_pricing(
-    dict_values, dict_dso, transformer_name, timeseries_availability
+    dict_values,
+    dict_dso,
+    transformer_name,
+    timeseries_availability,
+    peak_demand_pricing_constraint=False,
 ):
     r"""
     Defines a transformer for peak demand pricing in energyConverion
@@ -982,6 +1215,11 @@ def define_transformer_for_peak_demand_pricing(
     timeseries_availability: pd.Series
         Timeseries of transformer availability. Introduced to cover peak demand pricing.
 
+    peak_demand_pricing_constraint: bool
+        If True, the transformer is connected to the outflow bus of the DSO only and marked to be
+        modelled by D2.constraint_peak_demand_pricing instead of being added to the oemof model
+        Default: False
+
     Returns
     -------
     Updated dict_values with newly added transformer asset in the energyConversion asset group.
@@ -1007,6 +1245,15 @@ def define_transformer_for_peak_demand_pricing(
         AGE_INSTALLED: {VALUE: 0, UNIT: UNIT_YEAR},
     }
 
+    if peak_demand_pricing_constraint is True:
+        default_dso_transformer.update(
+            {
+                INFLOW_DIRECTION: dict_dso[OUTFLOW_DIRECTION],
+                CONNECTED_CONSUMPTION_SOURCE: dict_dso[LABEL] + DSO_CONSUMPTION,
+                PEAK_DEMAND_PRICING_CONSTRAINT: True,
+            }
+        )
+
     dict_values[ENERGY_CONVERSION].update({transformer_name: default_dso_transformer})
 
     logging.debug(
@@ -1393,7 +1640,7 @@ def evaluate_lifetime_costs(settings, economic_data, dict_asset):
         - CRF
         - ANNUITY_FACTOR
 
-    dict_asset: dict
+    dict_asset: dict or :class:`multi_vector_simulator.utils.asset_records.AssetRecord`
         dict of all asset parameters, including
         - SPECIFIC_COSTS
         - SPECIFIC_COSTS_OM
@@ -1425,76 +1672,62 @@ def evaluate_lifetime_costs(settings, economic_data, dict_asset):
         specific_replacement_costs_optimized,
         specific_replacement_costs_already_installed,
     ) = C2.capex_from_investment(
-        investment_t0=dict_asset[SPECIFIC_COSTS][VALUE],
-        lifetime=dict_asset[LIFETIME][VALUE],
+        investment_t0=get_value(dict_asset, SPECIFIC_COSTS),
+        lifetime=get_value(dict_asset, LIFETIME),
         project_life=economic_data[PROJECT_DURATION][VALUE],
         discount_factor=economic_data[DISCOUNTFACTOR][VALUE],
         tax=economic_data[TAX][VALUE],
-        age_of_asset=dict_asset[AGE_INSTALLED][VALUE],
-        asset_label=dict_asset[LABEL],
+        age_of_asset=get_value(dict_asset, AGE_INSTALLED),
+        asset_label=get_value(dict_asset, LABEL),
     )
 
-    dict_asset.update(
-        {
-            LIFETIME_SPECIFIC_COST: {
-                VALUE: specific_capex,
-                UNIT: dict_asset[SPECIFIC_COSTS][UNIT],
-            }
-        }
+    set_value(
+        dict_asset,
+        LIFETIME_SPECIFIC_COST,
+        specific_capex,
+        get_unit(dict_asset, SPECIFIC_COSTS),
     )
 
-    dict_asset.update(
-        {
-            SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED: {
-                VALUE: specific_replacement_costs_optimized,
-                UNIT: dict_asset[SPECIFIC_COSTS][UNIT],
-            }
-        }
+    set_value(
+        dict_asset,
+        SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED,
+        specific_replacement_costs_optimized,
+        get_unit(dict_asset, SPECIFIC_COSTS),
     )
 
-    dict_asset.update(
-        {
-            SPECIFIC_REPLACEMENT_COSTS_INSTALLED: {
-                VALUE: specific_replacement_costs_already_installed,
-                UNIT: dict_asset[SPECIFIC_COSTS][UNIT],
-            }
-        }
+    set_value(
+        dict_asset,
+        SPECIFIC_REPLACEMENT_COSTS_INSTALLED,
+        specific_replacement_costs_already_installed,
+        get_unit(dict_asset, SPECIFIC_COSTS),
     )
 
     # Annuities of components including opex AND capex #
-    dict_asset.update(
-        {
-            ANNUITY_SPECIFIC_INVESTMENT_AND_OM: {
-                VALUE: C2.annuity(
-                    dict_asset[LIFETIME_SPECIFIC_COST][VALUE],
-                    economic_data[CRF][VALUE],
-                )
-                + dict_asset[SPECIFIC_COSTS_OM][VALUE],  # changes from dispatch_price
-                UNIT: dict_asset[LIFETIME_SPECIFIC_COST][UNIT] + "/" + UNIT_YEAR,
-            }
-        }
+    set_value(
+        dict_asset,
+        ANNUITY_SPECIFIC_INVESTMENT_AND_OM,
+        C2.annuity(
+            get_value(dict_asset, LIFETIME_SPECIFIC_COST), economic_data[CRF][VALUE],
+        )
+        + get_value(dict_asset, SPECIFIC_COSTS_OM),  # changes from dispatch_price
+        get_unit(dict_asset, LIFETIME_SPECIFIC_COST) + "/" + UNIT_YEAR,
     )
 
-    dict_asset.update(
-        {
-            LIFETIME_SPECIFIC_COST_OM: {
-                VALUE: dict_asset[SPECIFIC_COSTS_OM][VALUE]
-                * economic_data[ANNUITY_FACTOR][VALUE],
-                UNIT: dict_asset[SPECIFIC_COSTS_OM][UNIT][:-2],
-            }
-        }
+    set_value(
+        dict_asset,
+        LIFETIME_SPECIFIC_COST_OM,
+        get_value(dict_asset, SPECIFIC_COSTS_OM) * economic_data[ANNUITY_FACTOR][VALUE],
+        get_unit(dict_asset, SPECIFIC_COSTS_OM)[:-2],
     )
 
-    dict_asset.update(
-        {
-            SIMULATION_ANNUITY: {
-                VALUE: C2.simulation_annuity(
-                    dict_asset[ANNUITY_SPECIFIC_INVESTMENT_AND_OM][VALUE],
-                    settings[EVALUATED_PERIOD][VALUE],
-                ),
-                UNIT: CURR + "/" + UNIT + "/" + EVALUATED_PERIOD,
-            }
-        }
+    set_value(
+        dict_asset,
+        SIMULATION_ANNUITY,
+        C2.simulation_annuity(
+            get_value(dict_asset, ANNUITY_SPECIFIC_INVESTMENT_AND_OM),
+            settings[EVALUATED_PERIOD][VALUE],
+        ),
+        CURR + "/" + UNIT + "/" + EVALUATED_PERIOD,
     )
 
 
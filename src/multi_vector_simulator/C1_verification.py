@@ -14,7 +14,9 @@ tests whether the parameters are in correct value ranges:
 
 import logging
 import os
+import timeit
 
+import numpy as np
 import pandas as pd
 
 from multi_vector_simulator.utils.helpers import find_value_by_key
@@ -22,6 +24,7 @@ from multi_vector_simulator.utils.helpers import find_value_by_key
 from multi_vector_simulator.utils.exceptions import (
     UnknownEnergyVectorError,
     DuplicateLabels,
+    InfeasibleEnergySystemError,
 )
 from multi_vector_simulator.utils.constants import (
     PATH_INPUT_FILE,
@@ -86,6 +89,23 @@ from multi_vector_simulator.utils.constants_json_strings import (
     MAXIMUM_EMISSIONS,
     CONSTRAINTS,
     RENEWABLE_SHARE_DSO,
+    SIMULATION_SETTINGS,
+    FEASIBILITY_SCREENING,
+    TIME_INDEX,
+    TIMESTEP,
+    TIMESERIES_NORMALIZED,
+    INSTALLED_CAP_NORMALIZED,
+    MAXIMUM_ADD_CAP,
+    MAXIMUM_ADD_CAP_NORMALIZED,
+    INFLOW_DIRECTION,
+    INPUT_POWER,
+    THERM_LOSSES_REL,
+    THERM_LOSSES_ABS,
+    AVAILABILITY_DISPATCH,
+    PEAK_DEMAND_PRICING_CONSTRAINT,
+    DSO_CONSUMPTION,
+    MINIMAL_RENEWABLE_FACTOR,
+    NET_ZERO_ENERGY,
 )
 
 # Necessary for check_for_label_duplicates()
@@ -910,3 +930,534 @@ def check_energy_system_can_fulfill_max_demand(dict_values):
             )
 
         return peak_generation, peak_demand
+
+
+def timeseries_of_parameter(value, number_of_timesteps):
+    r"""
+    Returns a parameter that is either a scalar or a timeseries as numpy array with one value per timestep
+
+    Parameters
+    ----------
+    value: float, list, :pandas:`pandas.Series<series>` or :numpy:`numpy.ndarray`
+        Value of the parameter, None is interpreted as an unlimited value
+
+    number_of_timesteps: int
+        Number of timesteps of the simulation
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray`
+        Value of the parameter in each timestep
+    """
+    if value is None:
+        value = np.inf
+    return np.broadcast_to(np.asarray(value, dtype=float), (number_of_timesteps,))
+
+
+def maximal_capacity(dict_asset, optimize_cap):
+    r"""
+    Returns the maximal capacity of an asset or of a sub-asset of a storage
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Asset or sub-asset of a storage
+
+    optimize_cap: bool
+        True if the capacity of the asset is optimized
+
+    Returns
+    -------
+    float
+        Installed capacity, plus the maximum additional capacity if the capacity is optimized.
+        numpy.inf if the additional capacity is not limited.
+    """
+    capacity = dict_asset[INSTALLED_CAP][VALUE]
+    if optimize_cap is True:
+        maximum_add_cap = dict_asset.get(MAXIMUM_ADD_CAP, {VALUE: None})[VALUE]
+        if maximum_add_cap is None:
+            return np.inf
+        capacity += maximum_add_cap
+    return capacity
+
+
+def multiply_bound(factor, bound):
+    r"""
+    Multiplies a bound with a factor, a factor of 0 results in 0 even if the bound is not limited
+    """
+    with np.errstate(invalid="ignore"):
+        return np.where(factor == 0, 0, factor * bound)
+
+
+def get_bounds_of_source_flow(dict_asset, number_of_timesteps):
+    r"""
+    Determines the minimal and maximal flow of a source in each timestep, as it is defined in D1
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Source of dict_values[ENERGY_PRODUCTION]
+
+    number_of_timesteps: int
+        Number of timesteps of the simulation
+
+    Returns
+    -------
+    lower_bound: :numpy:`numpy.ndarray`
+        Minimal flow of the source in each timestep
+
+    upper_bound: :numpy:`numpy.ndarray`
+        Maximal flow of the source in each timestep, numpy.inf if it is not limited
+
+    Notes
+    -----
+    Tested with:
+    - test_get_bounds_of_source_flow_non_dispatchable()
+    - test_get_bounds_of_source_flow_dispatchable()
+    """
+    optimize_cap = dict_asset[OPTIMIZE_CAP][VALUE]
+    zeros = np.zeros(number_of_timesteps)
+    if dict_asset.get(DISPATCHABILITY) is True:
+        if optimize_cap is True:
+            capacity = maximal_capacity(dict_asset, optimize_cap)
+            if TIMESERIES_NORMALIZED in dict_asset:
+                availability = timeseries_of_parameter(
+                    dict_asset[TIMESERIES_NORMALIZED], number_of_timesteps
+                )
+                return zeros, multiply_bound(availability, capacity)
+            return zeros, timeseries_of_parameter(capacity, number_of_timesteps)
+        # The flow of dispatchable sources with a fixed capacity is not limited in D1
+        return zeros, timeseries_of_parameter(None, number_of_timesteps)
+
+    if optimize_cap is True:
+        timeseries = timeseries_of_parameter(
+            dict_asset[TIMESERIES_NORMALIZED], number_of_timesteps
+        )
+        existing = dict_asset.get(INSTALLED_CAP_NORMALIZED, dict_asset[INSTALLED_CAP])[
+            VALUE
+        ]
+        maximum = dict_asset.get(
+            MAXIMUM_ADD_CAP_NORMALIZED, dict_asset[MAXIMUM_ADD_CAP]
+        )[VALUE]
+        if maximum is None:
+            maximum = np.inf
+        return (
+            timeseries * existing,
+            multiply_bound(timeseries, existing + maximum),
+        )
+    timeseries = timeseries_of_parameter(dict_asset[TIMESERIES], number_of_timesteps)
+    flow = timeseries * dict_asset[INSTALLED_CAP][VALUE]
+    return flow, flow
+
+
+def get_bounds_of_energy_system(dict_values, include_energy_providers=True):
+    r"""
+    Propagates upper bounds of the supply of each bus over the bus graph, timestep by timestep
+
+    The supply of a bus is bounded by the maximal flows of the sources and storages connected to it,
+    and by the maximal output of the conversion assets feeding it, which is limited by their capacity
+    and by their efficiency multiplied with the supply of their input busses that is not needed for
+    the demand of these busses. Starting from unlimited supplies, the bounds are tightened once per bus,
+    so that each intermediate result is a valid upper bound, also if the bus graph contains cycles.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    include_energy_providers: bool
+        If False, the consumption sources of the energy providers are not considered.
+        Default: True.
+
+    Returns
+    -------
+    bounds: dict
+        - `busses`: list of the bus labels, ordering the rows of the arrays
+        - `demand`: fixed demand of each bus in each timestep
+        - `supply`: maximal supply of each bus in each timestep
+        - `supply_without_storage`: maximal supply of each bus without the storage discharge
+        - `storage_round_trip_efficiency`: for each bus whose storages are charged from and discharged
+          to the bus without possible energy gains, the maximal round trip efficiency of these storages
+        - `lossy_storages`: True if no storage can gain energy
+        - `dissipative`: True if neither conversion assets nor storages can increase the weighted energy of
+          the energy system, see DEFAULT_WEIGHTS_ENERGY_CARRIERS
+        - `sources`: minimal and maximal flow of each source, see `get_bounds_of_source_flow`
+        - `weights`: weighting factor of the energy carrier of each bus
+
+    Notes
+    -----
+    Tested with:
+    - test_get_bounds_of_energy_system_conversion()
+    - test_get_bounds_of_energy_system_storage()
+    """
+    number_of_timesteps = len(dict_values[SIMULATION_SETTINGS][TIME_INDEX])
+    busses = [dict_bus[LABEL] for dict_bus in dict_values[ENERGY_BUSSES].values()]
+    bus_index = {bus: number for number, bus in enumerate(busses)}
+    weights = np.array(
+        [
+            DEFAULT_WEIGHTS_ENERGY_CARRIERS.get(
+                dict_bus[ENERGY_VECTOR], {VALUE: np.nan}
+            )[VALUE]
+            for dict_bus in dict_values[ENERGY_BUSSES].values()
+        ]
+    )
+    dissipative = bool(np.all(np.isfinite(weights)))
+
+    def bus_numbers(direction):
+        if isinstance(direction, list):
+            return [bus_index[bus] for bus in direction]
+        return [bus_index[direction]]
+
+    demand = np.zeros((len(busses), number_of_timesteps))
+    for dict_asset in dict_values[ENERGY_CONSUMPTION].values():
+        if TIMESERIES in dict_asset:
+            # Each input bus of a non-dispatchable sink has to supply its timeseries, see D1
+            for bus in bus_numbers(dict_asset[INFLOW_DIRECTION]):
+                demand[bus] += timeseries_of_parameter(
+                    dict_asset[TIMESERIES], number_of_timesteps
+                )
+
+    energy_provider_sources = [
+        dso + DSO_CONSUMPTION for dso in dict_values[ENERGY_PROVIDERS]
+    ]
+    sources = {}
+    supply_of_sources = np.zeros((len(busses), number_of_timesteps))
+    for asset, dict_asset in dict_values[ENERGY_PRODUCTION].items():
+        sources[asset] = get_bounds_of_source_flow(dict_asset, number_of_timesteps)
+        if include_energy_providers is False and asset in energy_provider_sources:
+            continue
+        for bus in bus_numbers(dict_asset[OUTFLOW_DIRECTION]):
+            supply_of_sources[bus] += sources[asset][1]
+
+    storage_discharge = np.zeros((len(busses), number_of_timesteps))
+    storage_round_trip_efficiency = {}
+    lossy_storages = True
+    for dict_asset in dict_values[ENERGY_STORAGE].values():
+        optimize_cap = dict_asset[OPTIMIZE_CAP][VALUE]
+        outflow = bus_numbers(dict_asset[OUTFLOW_DIRECTION])
+        inflow = bus_numbers(dict_asset[INFLOW_DIRECTION])
+        for bus in outflow:
+            storage_discharge[bus] += maximal_capacity(
+                dict_asset[OUTPUT_POWER], optimize_cap
+            )
+        storage_capacity = dict_asset[STORAGE_CAPACITY]
+        round_trip_efficiency = np.max(
+            timeseries_of_parameter(
+                dict_asset[INPUT_POWER][EFFICIENCY][VALUE], number_of_timesteps
+            )
+        ) * np.max(
+            timeseries_of_parameter(
+                dict_asset[OUTPUT_POWER][EFFICIENCY][VALUE], number_of_timesteps
+            )
+        )
+        # The storage can not gain energy if its losses are not negative, see D1.storage_fix
+        lossy = (
+            np.all(
+                timeseries_of_parameter(
+                    storage_capacity[EFFICIENCY][VALUE], number_of_timesteps
+                )
+                <= 1
+            )
+            and np.all(
+                timeseries_of_parameter(
+                    storage_capacity[THERM_LOSSES_REL][VALUE], number_of_timesteps
+                )
+                >= 0
+            )
+            and np.all(
+                timeseries_of_parameter(
+                    storage_capacity[THERM_LOSSES_ABS][VALUE], number_of_timesteps
+                )
+                >= 0
+            )
+        )
+        if not lossy:
+            lossy_storages = False
+        if lossy and inflow == outflow and round_trip_efficiency <= 1:
+            bus = outflow[0]
+            if storage_round_trip_efficiency.get(bus, 0) is not None:
+                storage_round_trip_efficiency[bus] = max(
+                    storage_round_trip_efficiency.get(bus, 0), round_trip_efficiency
+                )
+        else:
+            for bus in set(inflow + outflow):
+                storage_round_trip_efficiency[bus] = None
+            if not lossy or np.max(weights[outflow]) * round_trip_efficiency > np.min(
+                weights[inflow]
+            ):
+                dissipative = False
+
+    conversion_assets = []
+    for dict_asset in dict_values[ENERGY_CONVERSION].values():
+        if dict_asset.get(PEAK_DEMAND_PRICING_CONSTRAINT, False) is True:
+            # Not part of the oemof model, see D2.constraint_peak_demand_pricing
+            continue
+        optimize_cap = dict_asset[OPTIMIZE_CAP][VALUE]
+        inflow = bus_numbers(dict_asset[INFLOW_DIRECTION])
+        outflow = bus_numbers(dict_asset[OUTFLOW_DIRECTION])
+        efficiencies = dict_asset[EFFICIENCY][VALUE]
+        if not isinstance(dict_asset[OUTFLOW_DIRECTION], list):
+            efficiencies = [efficiencies]
+        efficiencies = [
+            np.maximum(timeseries_of_parameter(efficiency, number_of_timesteps), 0)
+            for efficiency in efficiencies
+        ]
+        capacity = timeseries_of_parameter(
+            maximal_capacity(dict_asset, optimize_cap), number_of_timesteps
+        )
+        if optimize_cap is True and AVAILABILITY_DISPATCH in dict_asset:
+            capacity = multiply_bound(
+                timeseries_of_parameter(
+                    dict_asset[AVAILABILITY_DISPATCH], number_of_timesteps
+                ),
+                capacity,
+            )
+        conversion_assets.append((inflow, outflow, efficiencies, capacity))
+        weighted_output = sum(
+            np.max(efficiency) * weights[bus]
+            for bus, efficiency in zip(outflow, efficiencies)
+        )
+        if weighted_output > np.sum(weights[inflow]):
+            dissipative = False
+
+    supply = np.full((len(busses), number_of_timesteps), np.inf)
+    supply_of_conversion = np.zeros((len(busses), number_of_timesteps))
+    for iteration in range(len(busses) + 1):
+        available = np.maximum(supply - demand, 0)
+        supply_of_conversion = np.zeros((len(busses), number_of_timesteps))
+        for inflow, outflow, efficiencies, capacity in conversion_assets:
+            # Each input flow of a conversion asset is linked to its output flows, see D1
+            input_flow = np.min(available[inflow], axis=0)
+            for bus, efficiency in zip(outflow, efficiencies):
+                supply_of_conversion[bus] += np.minimum(
+                    capacity, multiply_bound(efficiency, input_flow)
+                )
+        updated_supply = supply_of_sources + storage_discharge + supply_of_conversion
+        if np.array_equal(updated_supply, supply):
+            break
+        supply = updated_supply
+
+    return {
+        "busses": busses,
+        "demand": demand,
+        "supply": supply,
+        "supply_without_storage": supply_of_sources + supply_of_conversion,
+        "storage_round_trip_efficiency": storage_round_trip_efficiency,
+        "dissipative": dissipative,
+        "lossy_storages": lossy_storages,
+        "sources": sources,
+        "weights": weights,
+    }
+
+
+def check_feasibility_of_energy_system(dict_values):
+    r"""
+    Raises an InfeasibleEnergySystemError if the energy system can be proven infeasible without solving the linear program.
+
+    The bounds of the supply of each bus in each timestep are determined with `get_bounds_of_energy_system`,
+    which considers the availability timeseries, capacities and efficiencies of the assets. The energy
+    system is infeasible if:
+    - the fixed demand of a bus exceeds its maximal supply in any timestep
+    - the storages of a bus can not cover the demand that exceeds the supply of the other assets of the bus,
+      as they can not discharge more than they are charged over the simulation period
+    - the renewable generation can not reach the minimal renewable factor
+    - the emissions of the non-dispatchable sources with a fixed generation exceed the maximum emissions
+    - the local generation can not cover the demand, while a net zero energy system is required
+
+    The check is only applied if the simulation setting FEASIBILITY_SCREENING is True (default).
+
+    Parameters
+    ----------
+    dict_values : dict
+        Contains all input data of the simulation.
+
+    Returns
+    -------
+    Raises an InfeasibleEnergySystemError pointing to the binding bus and timestep or constraint,
+    if the energy system is infeasible.
+
+    Notes
+    -----
+    Only necessary conditions for the feasibility of the energy system are checked, some infeasible
+    energy systems therefore still pass the check and fail in the optimization.
+
+    Tested with:
+    - test_check_feasibility_of_energy_system_feasible()
+    - test_check_feasibility_of_energy_system_not_applied()
+    - test_check_feasibility_of_energy_system_insufficient_supply()
+    - test_check_feasibility_of_energy_system_insufficient_storage()
+    - test_check_feasibility_of_energy_system_minimal_renewable_factor()
+    - test_check_feasibility_of_energy_system_maximum_emissions()
+    - test_check_feasibility_of_energy_system_net_zero_energy()
+    - test_check_feasibility_of_energy_system_fails_mvs_runthrough()
+    """
+    if (
+        dict_values[SIMULATION_SETTINGS]
+        .get(FEASIBILITY_SCREENING, {VALUE: True})
+        .get(VALUE)
+        is not True
+    ):
+        return None
+
+    start = timeit.default_timer()
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    bounds = get_bounds_of_energy_system(dict_values)
+    demand = bounds["demand"]
+    supply = bounds["supply"]
+    weights = bounds["weights"]
+    tolerance = 1e-6
+    reasons = []
+
+    # Demand of each bus in each timestep
+    infeasible_timesteps = demand - supply > tolerance * np.maximum(1, demand)
+    for number, bus in enumerate(bounds["busses"]):
+        timesteps = np.flatnonzero(infeasible_timesteps[number])
+        if len(timesteps) > 0:
+            timestep = timesteps[0]
+            reasons.append(
+                f"The demand of bus {bus} can not be supplied in {len(timesteps)} timestep(s), "
+                f"first in timestep {timestep} ({time_index[timestep]}): the demand is "
+                f"{round(demand[number, timestep], 3)}, but at most "
+                f"{round(supply[number, timestep], 3)} can be supplied."
+            )
+
+    # Energy that the storages of each bus can shift over the simulation period
+    for bus, round_trip_efficiency in bounds["storage_round_trip_efficiency"].items():
+        if round_trip_efficiency is None:
+            continue
+        net_demand = demand[bus] - bounds["supply_without_storage"][bus]
+        discharge = np.sum(np.maximum(net_demand, 0))
+        charge = np.sum(np.maximum(-net_demand, 0))
+        if discharge > round_trip_efficiency * charge + tolerance * max(1, discharge):
+            timestep = int(np.argmax(net_demand))
+            reasons.append(
+                f"The storages of bus {bounds['busses'][bus]} would have to discharge at least "
+                f"{round(discharge, 3)} over the simulation period, but can be charged with at most "
+                f"{round(charge, 3)} (round trip efficiency {round(round_trip_efficiency, 3)}). "
+                f"The largest demand that has to be covered by the storages is in timestep "
+                f"{timestep} ({time_index[timestep]})."
+            )
+
+    # Weighted demand of the energy system, which has to be covered by the sources if neither
+    # conversion assets nor storages can increase the weighted energy
+    total_demand = float(np.sum(weights * np.sum(demand, axis=1)))
+    bus_index = {bus: number for number, bus in enumerate(bounds["busses"])}
+
+    def weighted_generation(asset, bound):
+        dict_asset = dict_values[ENERGY_PRODUCTION][asset]
+        outflow = dict_asset[OUTFLOW_DIRECTION]
+        if not isinstance(outflow, list):
+            outflow = [outflow]
+        generation = np.sum(bounds["sources"][asset][bound])
+        return sum(weights[bus_index[bus]] for bus in outflow) * generation
+
+    energy_provider_sources = {
+        dso + DSO_CONSUMPTION: dso for dso in dict_values[ENERGY_PROVIDERS]
+    }
+
+    minimal_renewable_factor = dict_values[CONSTRAINTS][MINIMAL_RENEWABLE_FACTOR][VALUE]
+    if minimal_renewable_factor > 0:
+        maximal_renewable_generation = 0
+        minimal_non_renewable_generation = 0
+        for asset, dict_asset in dict_values[ENERGY_PRODUCTION].items():
+            if asset in energy_provider_sources:
+                renewable_share = dict_values[ENERGY_PROVIDERS][
+                    energy_provider_sources[asset]
+                ][RENEWABLE_SHARE_DSO][VALUE]
+            elif dict_asset.get(RENEWABLE_ASSET_BOOL, {VALUE: False})[VALUE] is True:
+                renewable_share = 1
+            else:
+                renewable_share = 0
+            if renewable_share > 0:
+                maximal_renewable_generation += renewable_share * weighted_generation(
+                    asset, 1
+                )
+            if renewable_share < 1:
+                minimal_non_renewable_generation += (
+                    1 - renewable_share
+                ) * weighted_generation(asset, 0)
+        if bounds["dissipative"] is True:
+            minimal_generation = total_demand
+        else:
+            minimal_generation = 0
+        # The renewable generation is at most maximal_renewable_generation, the total generation at least
+        # minimal_generation and minimal_non_renewable_generation more than the renewable generation
+        required_non_renewable_generation = max(
+            minimal_non_renewable_generation,
+            minimal_generation - maximal_renewable_generation,
+        )
+        if (
+            maximal_renewable_generation == 0
+            and total_demand > 0
+            and bounds["lossy_storages"] is True
+        ):
+            # The demand can only be supplied by the generation of sources
+            feasible = False
+        elif minimal_renewable_factor >= 1:
+            feasible = required_non_renewable_generation <= tolerance * max(
+                1, total_demand
+            )
+        elif np.isinf(maximal_renewable_generation):
+            feasible = True
+        else:
+            feasible = (
+                1 - minimal_renewable_factor
+            ) * maximal_renewable_generation >= minimal_renewable_factor * required_non_renewable_generation - tolerance * max(
+                1, maximal_renewable_generation
+            )
+        if not feasible:
+            reasons.append(
+                f"The minimal renewable factor of {minimal_renewable_factor} can not be reached: the weighted "
+                f"renewable generation is at most {round(maximal_renewable_generation, 3)}, while at least "
+                f"{round(required_non_renewable_generation, 3)} have to be generated by non-renewable assets."
+            )
+
+    maximum_emissions = dict_values[CONSTRAINTS][MAXIMUM_EMISSIONS][VALUE]
+    emission_factors = {
+        asset: dict_asset.get(EMISSION_FACTOR, {VALUE: 0})[VALUE]
+        for asset, dict_asset in dict_values[ENERGY_PRODUCTION].items()
+    }
+    if maximum_emissions is not None and all(
+        np.all(np.asarray(emission_factor, dtype=float) >= 0)
+        for emission_factor in emission_factors.values()
+    ):
+        # The emissions are weighted with the duration of the timesteps in oemof.solph
+        duration = dict_values[SIMULATION_SETTINGS][TIMESTEP][VALUE] / 60
+        minimal_emissions = duration * sum(
+            np.sum(emission_factor * bounds["sources"][asset][0])
+            for asset, emission_factor in emission_factors.items()
+        )
+        if minimal_emissions > maximum_emissions + tolerance * max(
+            1, maximum_emissions
+        ):
+            reasons.append(
+                f"The maximum emissions of {maximum_emissions} can not be met: the non-dispatchable "
+                f"sources with a fixed generation emit at least {round(minimal_emissions, 3)}."
+            )
+
+    if (
+        dict_values[CONSTRAINTS][NET_ZERO_ENERGY][VALUE] is True
+        and bounds["dissipative"]
+    ):
+        maximal_local_generation = sum(
+            weighted_generation(asset, 1)
+            for asset in dict_values[ENERGY_PRODUCTION]
+            if asset not in energy_provider_sources
+        )
+        if maximal_local_generation < total_demand - tolerance * max(1, total_demand):
+            reasons.append(
+                f"The energy system can not be a net zero energy system: the weighted local generation "
+                f"is at most {round(maximal_local_generation, 3)}, but the weighted demand is {round(total_demand, 3)}."
+            )
+
+    duration_of_check = round((timeit.default_timer() - start) * 1000, 1)
+    if len(reasons) > 0:
+        msg = (
+            f"The energy system is infeasible, the optimization is therefore not started "
+            f"(you can deactivate this check with the simulation setting {FEASIBILITY_SCREENING}):\n- "
+            + "\n- ".join(reasons)
+        )
+        raise InfeasibleEnergySystemError(msg)
+    logging.debug(
+        f"The feasibility screening of the energy system did not find any infeasibility ({duration_of_check} ms)."
+    )
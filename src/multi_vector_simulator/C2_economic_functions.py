@@ -17,6 +17,7 @@ import logging
 import pandas as pd
 
 from multi_vector_simulator.utils.constants import UNIT_HOUR
+from multi_vector_simulator.utils.asset_records import get_value, set_value
 
 from multi_vector_simulator.utils.constants_json_strings import (
     ANNUITY_FACTOR,
@@ -365,7 +366,7 @@ def determine_lifetime_price_dispatch(dict_asset, economic_data):
 
     Parameters
     ----------
-    dict_asset: dict
+    dict_asset: dict or :class:`multi_vector_simulator.utils.asset_records.AssetRecord`
         Data of an asset
 
     economic_data: dict
@@ -383,39 +384,36 @@ def determine_lifetime_price_dispatch(dict_asset, economic_data):
     - test_determine_lifetime_price_dispatch_as_list()
     - test_determine_lifetime_price_dispatch_as_timeseries ()
     """
+    dispatch_price = get_value(dict_asset, DISPATCH_PRICE)
     # Dispatch price is provided as a scalar value
-    if isinstance(dict_asset[DISPATCH_PRICE][VALUE], float) or isinstance(
-        dict_asset[DISPATCH_PRICE][VALUE], int
-    ):
+    if isinstance(dispatch_price, float) or isinstance(dispatch_price, int):
         lifetime_price_dispatch = get_lifetime_price_dispatch_one_value(
-            dict_asset[DISPATCH_PRICE][VALUE], economic_data
+            dispatch_price, economic_data
         )
 
     # Multiple dispatch prices are provided as asset is connected to multiple busses
-    elif isinstance(dict_asset[DISPATCH_PRICE][VALUE], list):
+    elif isinstance(dispatch_price, list):
         lifetime_price_dispatch = get_lifetime_price_dispatch_list(
-            dict_asset[DISPATCH_PRICE][VALUE], economic_data
+            dispatch_price, economic_data
         )
 
     # Dispatch price is provided as a timeseries
-    elif isinstance(dict_asset[DISPATCH_PRICE][VALUE], pd.Series):
+    elif isinstance(dispatch_price, pd.Series):
         lifetime_price_dispatch = get_lifetime_price_dispatch_timeseries(
-            dict_asset[DISPATCH_PRICE][VALUE], economic_data
+            dispatch_price, economic_data
         )
 
     else:
         raise ValueError(
-            f"Type of dispatch_price neither int, float, list or pd.Series, but of type {dict_asset[DISPATCH_PRICE][VALUE]}. Is type correct?"
+            f"Type of dispatch_price neither int, float, list or pd.Series, but of type {dispatch_price}. Is type correct?"
         )
 
     # Update asset dict
-    dict_asset.update(
-        {
-            LIFETIME_PRICE_DISPATCH: {
-                VALUE: lifetime_price_dispatch,
-                UNIT: dict_asset[UNIT] + "/" + UNIT_HOUR,
-            }
-        }
+    set_value(
+        dict_asset,
+        LIFETIME_PRICE_DISPATCH,
+        lifetime_price_dispatch,
+        get_value(dict_asset, UNIT) + "/" + UNIT_HOUR,
     )
 
 
@@ -0,0 +1,628 @@
+"""
+Module C3 - Model reduction
+===========================
+
+Module C3 simplifies the energy system model described by the pre-processed `dict_values`
+before the oemof-solph model is built in D0. It does not change the optimal solution, but the
+linear program that has to be built and solved is smaller:
+
+- Assets that can not have any flow are removed: transformers and non-dispatchable sources with an installed capacity of 0 that are not optimized, as well as non-dispatchable sources and sinks with a timeseries that is always 0
+- Excess sinks of busses that can not have any surplus are removed, ie. of busses that are only supplied by dispatchable sources
+- Busses connected by a lossless pass-through transformer (efficiency of 1, without costs and capacity limit) are merged, when the transformer is the only outflow of its input bus or the only inflow of its output bus
+- Identical assets on the same bus are aggregated into one asset: non-dispatchable sinks, and non-dispatchable sources with the same timeseries and costs, which may differ in their capacities
+
+The assets stay in `dict_values`, but every removal, merge and aggregation is recorded in `dict_values[REDUCED_MODEL]`.
+D0 does not add them to the oemof-solph model (or adds one asset per aggregation) and `E1.restore_results_of_reduced_model`
+restores their flows and the original bus names, so that the results are evaluated as if the model had not been reduced.
+
+The model reduction is only applied if the simulation setting MODEL_REDUCTION is True.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    VALUE,
+    LABEL,
+    SIMULATION_SETTINGS,
+    CONSTRAINTS,
+    ENERGY_BUSSES,
+    ENERGY_VECTOR,
+    ENERGY_CONVERSION,
+    ENERGY_PRODUCTION,
+    ENERGY_CONSUMPTION,
+    ENERGY_STORAGE,
+    INFLOW_DIRECTION,
+    OUTFLOW_DIRECTION,
+    EXCESS_SINK,
+    DISPATCHABILITY,
+    DISPATCH_PRICE,
+    INSTALLED_CAP,
+    OPTIMIZE_CAP,
+    MAXIMUM_ADD_CAP,
+    SIMULATION_ANNUITY,
+    EFFICIENCY,
+    EMISSION_FACTOR,
+    RENEWABLE_ASSET_BOOL,
+    INSTALLED_CAP_NORMALIZED,
+    MAXIMUM_ADD_CAP_NORMALIZED,
+    TIMESERIES,
+    AVAILABILITY_DISPATCH,
+    OEMOF_ASSET_TYPE,
+    OEMOF_TRANSFORMER,
+    MINIMAL_RENEWABLE_FACTOR,
+    MINIMAL_DEGREE_OF_AUTONOMY,
+    NET_ZERO_ENERGY,
+    PEAK_DEMAND_PRICING_CONSTRAINT,
+    MODEL_REDUCTION,
+    REDUCED_MODEL,
+    REMOVED_ASSETS,
+    MERGED_BUSSES,
+    KEPT_BUS,
+    PASS_THROUGH_TRANSFORMER,
+    AGGREGATED_ASSETS,
+)
+
+# Asset groups of which the assets are added to the oemof-solph model
+MODEL_ASSET_GROUPS = [
+    ENERGY_CONVERSION,
+    ENERGY_PRODUCTION,
+    ENERGY_CONSUMPTION,
+    ENERGY_STORAGE,
+]
+
+# Reasons for which an asset is removed from the model
+ZERO_CAPACITY = "installed capacity of 0 without capacity optimization"
+ZERO_TIMESERIES = "timeseries that is always 0"
+NO_SURPLUS = "excess sink of a bus without possible surplus"
+LOSSLESS_PASS_THROUGH = "lossless pass-through transformer of merged busses"
+
+
+def reduce_energy_system_model(dict_values):
+    r"""
+    Removes assets and merges busses of the energy system that do not change the optimal solution.
+
+    The reductions are applied repeatedly until the model can not be reduced any further,
+    as a merge of busses can make an excess sink removable and vice versa.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All pre-processed simulation parameters
+
+    Returns
+    -------
+    reduced_model: dict or None
+        Removed assets (REMOVED_ASSETS, asset keys with the reason of their removal), merged busses
+        (MERGED_BUSSES, merged bus with the KEPT_BUS and the PASS_THROUGH_TRANSFORMER) and aggregated assets
+        (AGGREGATED_ASSETS, representative asset with the keys of all aggregated assets), also stored in
+        dict_values[REDUCED_MODEL]. None if the simulation setting MODEL_REDUCTION is not True.
+
+    Notes
+    -----
+    Tested with:
+    - C3.test_reduce_energy_system_model_not_applied()
+    - C3.test_reduce_energy_system_model_dso_busses_merged()
+    - C3.test_benchmark_model_reduction() (benchmark test)
+    """
+    if (
+        dict_values[SIMULATION_SETTINGS].get(MODEL_REDUCTION, {VALUE: False})[VALUE]
+        is not True
+    ):
+        return None
+
+    reduced_model = {REMOVED_ASSETS: {}, MERGED_BUSSES: {}, AGGREGATED_ASSETS: {}}
+    dict_values.update({REDUCED_MODEL: reduced_model})
+
+    remove_assets_without_flow(dict_values)
+    reduction = True
+    while reduction is True:
+        merged = merge_lossless_pass_through_busses(dict_values)
+        removed = remove_excess_sinks_without_surplus(dict_values)
+        reduction = merged or removed
+    aggregate_identical_assets(dict_values)
+
+    logging.info(
+        f"Model reduction: {len(reduced_model[REMOVED_ASSETS])} asset(s) removed, "
+        f"{len(reduced_model[MERGED_BUSSES])} bus(ses) merged and "
+        f"{sum(len(assets) for assets in reduced_model[AGGREGATED_ASSETS].values())} asset(s) "
+        f"aggregated into {len(reduced_model[AGGREGATED_ASSETS])} asset(s)."
+    )
+    return reduced_model
+
+
+def as_list(busses):
+    r"""
+    Returns the bus(ses) of an INFLOW_DIRECTION or OUTFLOW_DIRECTION as a list
+    """
+    if busses is None:
+        busses = []
+    elif not isinstance(busses, list):
+        busses = [busses]
+    return busses
+
+
+def parameter_value(dict_asset, parameter, default=None):
+    r"""
+    Returns the value of a parameter that is either provided with or without a VALUE key
+    """
+    parameter = dict_asset.get(parameter, default)
+    if isinstance(parameter, dict):
+        parameter = parameter.get(VALUE, default)
+    return parameter
+
+
+def is_part_of_model(dict_values, asset_key, dict_asset):
+    r"""
+    Returns True if the asset is added to the oemof-solph model by D0
+    """
+    reduced_model = dict_values[REDUCED_MODEL]
+    for representative, assets in reduced_model[AGGREGATED_ASSETS].items():
+        if asset_key in assets and asset_key != representative:
+            return False
+    return (
+        asset_key not in reduced_model[REMOVED_ASSETS]
+        and dict_asset.get(PEAK_DEMAND_PRICING_CONSTRAINT, False) is not True
+    )
+
+
+def model_bus(dict_values, bus):
+    r"""
+    Returns the bus of the reduced model to which `bus` is connected
+    """
+    merged_busses = dict_values[REDUCED_MODEL][MERGED_BUSSES]
+    while bus in merged_busses:
+        bus = merged_busses[bus][KEPT_BUS]
+    return bus
+
+
+def get_connected_assets(dict_values):
+    r"""
+    Determines the assets supplying and supplied by each bus of the reduced model.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All pre-processed simulation parameters, including dict_values[REDUCED_MODEL]
+
+    Returns
+    -------
+    supplying_assets: dict
+        Keys of the assets with a flow into each bus
+    supplied_assets: dict
+        Keys of the assets with a flow out of each bus
+
+    Notes
+    -----
+    The asset dicts of dict_values[ENERGY_BUSSES] are not used, as they do not include all
+    auxiliary assets of the energy providers.
+    """
+    supplying_assets = {bus: [] for bus in dict_values[ENERGY_BUSSES]}
+    supplied_assets = {bus: [] for bus in dict_values[ENERGY_BUSSES]}
+    for asset_group in MODEL_ASSET_GROUPS:
+        for asset_key, dict_asset in dict_values[asset_group].items():
+            if is_part_of_model(dict_values, asset_key, dict_asset) is False:
+                continue
+            for bus in as_list(dict_asset.get(INFLOW_DIRECTION)):
+                supplied_assets[model_bus(dict_values, bus)].append(asset_key)
+            for bus in as_list(dict_asset.get(OUTFLOW_DIRECTION)):
+                supplying_assets[model_bus(dict_values, bus)].append(asset_key)
+    return supplying_assets, supplied_assets
+
+
+def remove_asset(dict_values, asset_key, reason):
+    r"""
+    Records the removal of an asset from the model in dict_values[REDUCED_MODEL]
+    """
+    dict_values[REDUCED_MODEL][REMOVED_ASSETS].update({asset_key: reason})
+    logging.debug(f"Model reduction: Asset {asset_key} is removed ({reason}).")
+
+
+def leaves_busses_connected(dict_values, dict_asset, asset_keys):
+    r"""
+    Returns True if the busses of an asset keep at least one asset if `asset_keys` are removed
+    """
+    supplying_assets, supplied_assets = get_connected_assets(dict_values)
+    for bus in as_list(dict_asset.get(INFLOW_DIRECTION)) + as_list(
+        dict_asset.get(OUTFLOW_DIRECTION)
+    ):
+        bus = model_bus(dict_values, bus)
+        remaining = [
+            asset
+            for asset in supplying_assets[bus] + supplied_assets[bus]
+            if asset not in asset_keys
+        ]
+        if len(remaining) == 0:
+            return False
+    return True
+
+
+def get_reason_for_removal(dict_asset, asset_group):
+    r"""
+    Determines if an asset can not have any flow and therefore can be removed from the model.
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Pre-processed asset
+
+    asset_group: str
+        Asset group of the asset
+
+    Returns
+    -------
+    reason: str or None
+        ZERO_CAPACITY or ZERO_TIMESERIES, None if the asset has to be part of the model
+
+    Notes
+    -----
+    Dispatchable sources are never removed, as their installed capacity does not bound their flow.
+
+    Tested with:
+    - C3.test_get_reason_for_removal_zero_capacity()
+    - C3.test_get_reason_for_removal_zero_timeseries()
+    - C3.test_get_reason_for_removal_dispatchable_source()
+    """
+    reason = None
+    dispatchable = parameter_value(dict_asset, DISPATCHABILITY, False)
+    if asset_group in [ENERGY_CONVERSION, ENERGY_PRODUCTION]:
+        if asset_group == ENERGY_PRODUCTION and dispatchable is True:
+            return reason
+        if (
+            parameter_value(dict_asset, OPTIMIZE_CAP) is False
+            and parameter_value(dict_asset, INSTALLED_CAP) == 0
+        ):
+            reason = ZERO_CAPACITY
+    if asset_group in [ENERGY_PRODUCTION, ENERGY_CONSUMPTION] and reason is None:
+        if dispatchable is False and isinstance(dict_asset.get(TIMESERIES), pd.Series):
+            if (dict_asset[TIMESERIES].values == 0).all():
+                reason = ZERO_TIMESERIES
+    return reason
+
+
+def remove_assets_without_flow(dict_values):
+    r"""
+    Removes all assets which can not have any flow from the model, see `get_reason_for_removal`.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All pre-processed simulation parameters, including dict_values[REDUCED_MODEL]
+
+    Returns
+    -------
+    Updated dict_values[REDUCED_MODEL][REMOVED_ASSETS]
+    """
+    for asset_group in [ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_CONSUMPTION]:
+        for asset_key, dict_asset in dict_values[asset_group].items():
+            if is_part_of_model(dict_values, asset_key, dict_asset) is False:
+                continue
+            reason = get_reason_for_removal(dict_asset, asset_group)
+            if reason is not None and leaves_busses_connected(
+                dict_values, dict_asset, [asset_key]
+            ):
+                remove_asset(dict_values, asset_key, reason)
+
+
+def constraints_allow_surplus(dict_values):
+    r"""
+    Returns True if a constraint could make a surplus of energy beneficial.
+
+    The minimal renewable factor, the minimal degree of autonomy and the net zero energy
+    constraint depend on the generation of the assets, which could be increased by
+    curtailing energy in an excess sink.
+    """
+    constraints = dict_values.get(CONSTRAINTS, {})
+    for constraint in [
+        MINIMAL_RENEWABLE_FACTOR,
+        MINIMAL_DEGREE_OF_AUTONOMY,
+        NET_ZERO_ENERGY,
+    ]:
+        value = parameter_value(constraints, constraint)
+        if value is not None and value is not False and value != 0:
+            return True
+    return False
+
+
+def remove_excess_sinks_without_surplus(dict_values):
+    r"""
+    Removes the excess sinks of busses that can not have any surplus.
+
+    A bus can not have any surplus if it is supplied only by dispatchable sources with a
+    non-negative dispatch price, because the supply can always be reduced instead of curtailing
+    energy in the excess sink, without increasing the costs.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All pre-processed simulation parameters, including dict_values[REDUCED_MODEL]
+
+    Returns
+    -------
+    removed: bool
+        True if at least one excess sink was removed
+
+    Notes
+    -----
+    Tested with:
+    - C3.test_remove_excess_sinks_without_surplus()
+    - C3.test_remove_excess_sinks_without_surplus_non_dispatchable_source()
+    """
+    removed = False
+    if constraints_allow_surplus(dict_values) is True:
+        return removed
+
+    excess_sinks = dict_values[SIMULATION_SETTINGS].get(EXCESS_SINK, [])
+    supplying_assets, supplied_assets = get_connected_assets(dict_values)
+    for bus in dict_values[ENERGY_BUSSES]:
+        if bus in dict_values[REDUCED_MODEL][MERGED_BUSSES]:
+            continue
+        bus_excess_sinks = [
+            asset for asset in supplied_assets[bus] if asset in excess_sinks
+        ]
+        # Busses without any supply are kept as they are, so that E1 finds the investment
+        # of their excess sink in the results
+        if len(bus_excess_sinks) == 0 or len(supplying_assets[bus]) == 0:
+            continue
+        surplus = False
+        for asset in supplying_assets[bus]:
+            dict_asset = dict_values[ENERGY_PRODUCTION].get(asset)
+            if (
+                dict_asset is None
+                or parameter_value(dict_asset, DISPATCHABILITY, False) is not True
+                or isinstance(dict_asset[OUTFLOW_DIRECTION], list)
+                or not np.all(
+                    np.asarray(parameter_value(dict_asset, DISPATCH_PRICE, 0)) >= 0
+                )
+            ):
+                surplus = True
+                break
+        if surplus is False and leaves_busses_connected(
+            dict_values,
+            dict_values[ENERGY_CONSUMPTION][bus_excess_sinks[0]],
+            bus_excess_sinks,
+        ):
+            for excess_sink in bus_excess_sinks:
+                remove_asset(dict_values, excess_sink, NO_SURPLUS)
+            removed = True
+    return removed
+
+
+def is_lossless_pass_through(dict_asset):
+    r"""
+    Returns True if the asset is a transformer between two busses without losses, costs and capacity limit.
+
+    Notes
+    -----
+    Tested with:
+    - C3.test_is_lossless_pass_through()
+    - C3.test_is_lossless_pass_through_with_losses()
+    """
+    if dict_asset[OEMOF_ASSET_TYPE] != OEMOF_TRANSFORMER:
+        return False
+    if isinstance(dict_asset[INFLOW_DIRECTION], list) or isinstance(
+        dict_asset[OUTFLOW_DIRECTION], list
+    ):
+        return False
+    if dict_asset[INFLOW_DIRECTION] == dict_asset[OUTFLOW_DIRECTION]:
+        return False
+    availability = dict_asset.get(AVAILABILITY_DISPATCH)
+    if availability is not None and not (np.asarray(availability) > 0).all():
+        return False
+    for parameter in [EFFICIENCY, DISPATCH_PRICE, SIMULATION_ANNUITY, MAXIMUM_ADD_CAP]:
+        value = parameter_value(dict_asset, parameter)
+        if isinstance(value, (list, pd.Series, np.ndarray)):
+            return False
+    return (
+        parameter_value(dict_asset, OPTIMIZE_CAP) is True
+        and parameter_value(dict_asset, MAXIMUM_ADD_CAP) is None
+        and parameter_value(dict_asset, EFFICIENCY) == 1
+        and parameter_value(dict_asset, DISPATCH_PRICE) == 0
+        and parameter_value(dict_asset, SIMULATION_ANNUITY) == 0
+    )
+
+
+def merge_lossless_pass_through_busses(dict_values):
+    r"""
+    Merges the two busses of lossless pass-through transformers.
+
+    The busses of a transformer without losses, costs and capacity limit can be merged if the
+    transformer is the only outflow of its input bus (the input bus is merged into the output bus)
+    or the only inflow of its output bus (the output bus is merged into the input bus), as the
+    flow through the transformer can not be reversed in the merged bus then.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All pre-processed simulation parameters, including dict_values[REDUCED_MODEL]
+
+    Returns
+    -------
+    merged: bool
+        True if at least one pair of busses was merged
+
+    Notes
+    -----
+    A bus can only be part of one merge, chains of pass-through transformers are only reduced
+    by their first transformer. The busses need to have the same energy vector and no other asset
+    can be connected to both busses.
+
+    Tested with:
+    - C3.test_merge_lossless_pass_through_busses()
+    - C3.test_merge_lossless_pass_through_busses_different_energy_vectors()
+    """
+    merged = False
+    merged_busses = dict_values[REDUCED_MODEL][MERGED_BUSSES]
+    for asset_key, dict_asset in dict_values[ENERGY_CONVERSION].items():
+        if is_part_of_model(dict_values, asset_key, dict_asset) is False:
+            continue
+        if is_lossless_pass_through(dict_asset) is False:
+            continue
+        input_bus = dict_asset[INFLOW_DIRECTION]
+        output_bus = dict_asset[OUTFLOW_DIRECTION]
+        busses_of_merges = list(merged_busses.keys()) + [
+            merge[KEPT_BUS] for merge in merged_busses.values()
+        ]
+        if input_bus in busses_of_merges or output_bus in busses_of_merges:
+            continue
+        if (
+            dict_values[ENERGY_BUSSES][input_bus][ENERGY_VECTOR]
+            != dict_values[ENERGY_BUSSES][output_bus][ENERGY_VECTOR]
+        ):
+            continue
+
+        supplying_assets, supplied_assets = get_connected_assets(dict_values)
+        connected_to_input_bus = set(
+            supplying_assets[input_bus] + supplied_assets[input_bus]
+        )
+        connected_to_output_bus = set(
+            supplying_assets[output_bus] + supplied_assets[output_bus]
+        )
+        if connected_to_input_bus & connected_to_output_bus != {asset_key}:
+            continue
+
+        if supplied_assets[input_bus] == [asset_key]:
+            merged_bus, kept_bus = input_bus, output_bus
+        elif supplying_assets[output_bus] == [asset_key]:
+            merged_bus, kept_bus = output_bus, input_bus
+        else:
+            continue
+
+        merged_busses.update(
+            {merged_bus: {KEPT_BUS: kept_bus, PASS_THROUGH_TRANSFORMER: asset_key}}
+        )
+        remove_asset(dict_values, asset_key, LOSSLESS_PASS_THROUGH)
+        logging.debug(f"Model reduction: Bus {merged_bus} is merged into {kept_bus}.")
+        merged = True
+    return merged
+
+
+def get_aggregation_key(dict_values, asset_key, dict_asset, asset_group):
+    r"""
+    Determines the parameters an asset needs to share with other assets to be aggregated with them.
+
+    Non-dispatchable sinks have a fixed flow, so that all of them that are connected to the same bus
+    can be aggregated. Non-dispatchable sources can be aggregated if they are connected to the same bus
+    and have the same costs, emissions and renewable share, their capacities may differ. Their timeseries
+    are compared in `aggregate_identical_assets`.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All pre-processed simulation parameters, including dict_values[REDUCED_MODEL]
+
+    asset_key: str
+        Key of the asset in its asset group
+
+    dict_asset: dict
+        Pre-processed asset
+
+    asset_group: str
+        Asset group of the asset
+
+    Returns
+    -------
+    key: tuple or None
+        None if the asset can not be aggregated
+
+    Notes
+    -----
+    Tested with:
+    - C3.test_get_aggregation_key_sources()
+    - C3.test_get_aggregation_key_dispatchable_source()
+    """
+    if asset_group == ENERGY_PRODUCTION:
+        direction = OUTFLOW_DIRECTION
+        parameters = [
+            ENERGY_VECTOR,
+            OPTIMIZE_CAP,
+            SIMULATION_ANNUITY,
+            DISPATCH_PRICE,
+            EMISSION_FACTOR,
+            RENEWABLE_ASSET_BOOL,
+        ]
+    elif asset_group == ENERGY_CONSUMPTION:
+        direction = INFLOW_DIRECTION
+        parameters = []
+    else:
+        return None
+
+    if (
+        is_part_of_model(dict_values, asset_key, dict_asset) is False
+        or parameter_value(dict_asset, DISPATCHABILITY, False) is not False
+        or not isinstance(dict_asset.get(TIMESERIES), pd.Series)
+        or not isinstance(dict_asset.get(direction), str)
+    ):
+        return None
+
+    key = [asset_group, model_bus(dict_values, dict_asset[direction])]
+    for parameter in parameters:
+        value = parameter_value(dict_asset, parameter)
+        if isinstance(value, (list, pd.Series, np.ndarray)):
+            return None
+        key.append(value)
+    if asset_group == ENERGY_PRODUCTION:
+        # The capacities are summed up, see D0.model_building.aggregate_assets
+        key += [
+            parameter_value(dict_asset, MAXIMUM_ADD_CAP) is None,
+            INSTALLED_CAP_NORMALIZED in dict_asset,
+            MAXIMUM_ADD_CAP_NORMALIZED in dict_asset,
+        ]
+    return tuple(key)
+
+
+def aggregate_identical_assets(dict_values):
+    r"""
+    Aggregates identical assets connected to the same bus.
+
+    Each group of assets is modelled by one asset in D0, with the capacities (sources) or timeseries (sinks)
+    of all aggregated assets summed up. The flows and capacities are split between the aggregated assets
+    again in `E1.restore_results_of_reduced_model`.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All pre-processed simulation parameters, including dict_values[REDUCED_MODEL]
+
+    Returns
+    -------
+    aggregated: bool
+        True if at least one group of assets was aggregated
+
+    Notes
+    -----
+    The first asset of each group represents the group in the model. Sources are only aggregated if their
+    timeseries are identical, ie. they are identical or scaled duplicates of each other.
+
+    Tested with:
+    - C3.test_aggregate_identical_assets()
+    - C3.test_aggregate_identical_assets_different_timeseries()
+    """
+    groups = {}
+    for asset_group in [ENERGY_PRODUCTION, ENERGY_CONSUMPTION]:
+        for asset_key, dict_asset in dict_values[asset_group].items():
+            key = get_aggregation_key(dict_values, asset_key, dict_asset, asset_group)
+            if key is None:
+                continue
+            groups_with_key = groups.setdefault(key, [])
+            for assets in groups_with_key:
+                if asset_group == ENERGY_CONSUMPTION or np.array_equal(
+                    dict_asset[TIMESERIES].values,
+                    dict_values[asset_group][assets[0]][TIMESERIES].values,
+                ):
+                    assets.append(asset_key)
+                    break
+            else:
+                groups_with_key.append([asset_key])
+
+    aggregated_assets = dict_values[REDUCED_MODEL][AGGREGATED_ASSETS]
+    for groups_with_key in groups.values():
+        for assets in groups_with_key:
+            if len(assets) > 1:
+                aggregated_assets.update({assets[0]: assets})
+                logging.debug(
+                    f"Model reduction: Assets {', '.join(assets)} are aggregated into one asset."
+                )
+    return len(aggregated_assets) > 0
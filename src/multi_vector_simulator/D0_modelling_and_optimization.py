@@ -12,19 +12,64 @@ Functional requirements of module D0:
 - plot network graph
 - at constraints to remote model
 - store lp file (optional)
-- start oemof simulation
+- optimize the capacities with aggregated timesteps before the dispatch (optional)
+- optimize with timesteps of variable length, merging similar consecutive timesteps (optional)
+- estimate the size of the linear program and segment the timesteps if it exceeds the memory budget (optional)
+- start oemof simulation, either with the cbc solver or in memory with the HiGHS solver (optional)
+- follow the progress of the solver while the model is solved (optional)
+- derive the cost ranges of the optimized assets from the reduced costs (optional)
+- generate the pareto front of the costs and emissions with the epsilon-constraint method (optional)
 - process results by giving them to the next function
 - dump oemof results
 - add simulation parameters to dict values
 """
 
+import contextlib
+import copy
+import heapq
 import logging
 import os
+import re
+import subprocess
+import tempfile
+import threading
 import timeit
 import warnings
 
+import numpy as np
+import pandas as pd
+
 from oemof.solph import processing
 import oemof.solph as solph
+from pyomo.core import (
+    Constraint,
+    Expression,
+    Objective,
+    Param,
+    Suffix,
+    Var,
+    maximize,
+    value,
+)
+from pyomo.opt import SolverFactory, SolverResults, SolverStatus, TerminationCondition
+from pyomo.repn import generate_standard_repn
+
+HIGHSPY_INSTALLED = False
+try:
+    import highspy
+
+    HIGHSPY_INSTALLED = True
+except ModuleNotFoundError:
+    pass
+
+SCIPY_INSTALLED = False
+try:
+    from scipy.optimize import linprog
+    from scipy.sparse import csr_matrix, vstack
+
+    SCIPY_INSTALLED = True
+except ModuleNotFoundError:
+    pass
 
 import multi_vector_simulator.D1_model_components as D1
 import multi_vector_simulator.D2_model_constraints as D2
@@ -35,6 +80,7 @@ from multi_vector_simulator.utils.constants import (
     PATHS_TO_PLOTS,
     PLOTS_ES,
     LP_FILE,
+    SOLVER_LOG_FILE,
 )
 from multi_vector_simulator.utils.constants_json_strings import (
     ENERGY_BUSSES,
@@ -50,20 +96,108 @@ from multi_vector_simulator.utils.constants_json_strings import (
     LABEL,
     TIME_INDEX,
     OUTPUT_LP_FILE,
+    IN_MEMORY_SOLVER,
+    TWO_STAGE_PLANNING,
+    INVESTMENT_TIMESTEP,
+    TIMESTEP_SEGMENTATION,
+    SEGMENTATION_RATIO,
+    TIMESTEP_DURATIONS,
+    COST_RANGING,
+    COST_RANGE_MINIMUM,
+    COST_RANGE_MAXIMUM,
+    AVAILABILITY_DISPATCH,
+    INVESTMENT_STAGE_OBJECTIVE_VALUE,
+    TWO_STAGE_OBJECTIVE_GAP,
+    ENERGY_CONVERSION,
+    ENERGY_PRODUCTION,
+    ENERGY_STORAGE,
+    ENERGY_PROVIDERS,
+    CONNECTED_CONSUMPTION_SOURCE,
+    CONNECTED_FEEDIN_SINK,
+    CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS,
+    TIMESTEP,
+    PERIODS,
     SIMULATION_RESULTS,
     OBJECTIVE_VALUE,
     SIMULTATION_TIME,
     MODELLING_TIME,
+    PEAK_DEMAND_PRICING_CONSTRAINT,
+    REDUCED_MODEL,
+    REMOVED_ASSETS,
+    MERGED_BUSSES,
+    KEPT_BUS,
+    AGGREGATED_ASSETS,
+    ENERGY_CONSUMPTION,
+    TIMESERIES,
+    TIMESERIES_NORMALIZED,
+    TIMESERIES_PEAK,
+    INSTALLED_CAP,
+    INSTALLED_CAP_NORMALIZED,
+    MAXIMUM_ADD_CAP,
+    MAXIMUM_ADD_CAP_NORMALIZED,
+    LP_SCALING,
+    ENERGY_SCALING_FACTOR,
+    COST_SCALING_FACTOR,
+    DISPATCH_PRICE,
+    SIMULATION_ANNUITY,
+    EMISSION_FACTOR,
+    INPUT_POWER,
+    OUTPUT_POWER,
+    STORAGE_CAPACITY,
+    THERM_LOSSES_ABS,
+    THERM_LOSSES_REL,
+    OPTIMIZE_CAP,
+    UNIT,
+    UNIT_EMISSIONS,
+    EMISSION_BOUND,
+    MEMORY_BUDGET,
+    LP_SIZE_ESTIMATE,
+    NUMBER_OF_VARIABLES,
+    NUMBER_OF_CONSTRAINTS,
+    NUMBER_OF_NONZEROS,
+    PEAK_MEMORY,
+    SOLUTION_STRATEGY,
+    FULL_RESOLUTION,
+    SOLVER_PROGRESS,
+    ELAPSED_TIME,
+    ITERATIONS,
+    OBJECTIVE,
+    GAP,
+    PRIMAL_INFEASIBILITY,
+    CONSTRAINTS,
+    DISPATCHABILITY,
+    INFLOW_DIRECTION,
+    OUTFLOW_DIRECTION,
+    SOC_MIN,
 )
+from multi_vector_simulator.utils.constants import TYPE_STR
 
 from multi_vector_simulator.utils.exceptions import (
     MVSOemofError,
+    MemoryBudgetExceededError,
     WrongOemofAssetForGroupError,
     UnknownOemofAssetType,
 )
 
+# Approximate memory of each variable, constraint and nonzero coefficient of the linear program,
+# held by pyomo and by the solver, see solution_strategy.estimate_lp_size
+BYTES_PER_VARIABLE = 1000
+BYTES_PER_CONSTRAINT = 1000
+BYTES_PER_NONZERO = 500
+
+# Seconds between two reads of the solver output and between two logged progress events of the
+# solver, see solver_progress.monitor
+SOLVER_PROGRESS_INTERVAL = 0.5
+SOLVER_PROGRESS_LOG_INTERVAL = 10
+
+# Relative tolerance of the bounds of the constraints without variables which are not fixed,
+# see in_memory_solver.linear_program_arrays
+CONSTANT_ROW_TOLERANCE = 1e-6
 
-def run_oemof(dict_values, save_energy_system_graph=False):
+
+def run_oemof(
+    dict_values, save_energy_system_graph=False, solver_progress_callback=None
+):
     """
     Creates and solves energy system model generated from excel template inputs.
     Each component is included by calling its constructor function in D1_model_components.
@@ -75,6 +209,10 @@ def run_oemof(dict_values, save_energy_system_graph=False):
         technical parameters and components. In C0_data_processing, each component was attributed
         with a certain in/output bus.
 
+    solver_progress_callback: func, optional
+        Called with each progress event of the solver, see :func:`solver_progress.monitor`.
+        Default: None.
+
     Returns
     -------
     saves and returns oemof simulation results
@@ -82,29 +220,88 @@ def run_oemof(dict_values, save_energy_system_graph=False):
 
     start = timer.initalize()
 
-    model, dict_model = model_building.initialize(dict_values)
+    lp_size_estimate = solution_strategy.select(dict_values)
 
-    model = model_building.adding_assets_to_energysystem_model(
-        dict_values, dict_model, model
-    )
+    model_building.define_lp_scaling(dict_values)
 
-    model_building.plot_networkx_graph(
-        dict_values, model, save_energy_system_graph=save_energy_system_graph
-    )
+    investments = None
+    if two_stage_planning.is_requested(dict_values):
+        investments = two_stage_planning.optimize_investments(dict_values)
 
-    logging.debug("Creating oemof model based on created components and busses...")
-    local_energy_system = solph.Model(model)
-    logging.debug("Created oemof model based on created components and busses.")
+    segments = None
+    dict_model_values = dict_values
+    if timestep_segmentation.is_requested(dict_values):
+        segments = timestep_segmentation.define_segments(dict_values)
+        dict_model_values = timestep_segmentation.aggregate_segments(
+            dict_values, segments
+        )
 
-    local_energy_system = D2.add_constraints(
-        local_energy_system, dict_values, dict_model
+    model, local_energy_system = model_building.build_oemof_model(
+        dict_model_values, save_energy_system_graph=save_energy_system_graph
     )
+
+    if investments is not None:
+        two_stage_planning.fix_investments(local_energy_system, investments)
+
+    evaluate_cost_ranging = cost_ranging.is_requested(dict_values)
+    if evaluate_cost_ranging is True:
+        cost_ranging.import_reduced_costs(local_energy_system)
+
+    # written before the solve, as a failed first stage changes the model before solving it again
     model_building.store_lp_file(dict_values, local_energy_system)
 
-    model, results_main, results_meta = model_building.simulating(
-        dict_values, model, local_energy_system
+    try:
+        model, results_main, results_meta = model_building.simulating(
+            dict_values,
+            model,
+            local_energy_system,
+            log_infeasibility=investments is None,
+            solver_progress_callback=solver_progress_callback,
+        )
+    except MVSOemofError:
+        if investments is None:
+            raise
+        logging.warning(
+            f"The capacities optimized with aggregated timesteps in the first stage of the "
+            f"{TWO_STAGE_PLANNING} do not suffice at full resolution. They are used as "
+            f"minimal capacities and optimized again."
+        )
+        two_stage_planning.fix_investments(
+            local_energy_system, investments, lower_bound=True
+        )
+        model, results_main, results_meta = model_building.simulating(
+            dict_values,
+            model,
+            local_energy_system,
+            solver_progress_callback=solver_progress_callback,
+        )
+
+    if investments is not None:
+        two_stage_planning.store_objective_gap(dict_values, investments)
+
+    if evaluate_cost_ranging is True:
+        dict_values[SIMULATION_RESULTS].update(
+            {
+                COST_RANGING: cost_ranging.evaluate(
+                    dict_model_values, local_energy_system
+                )
+            }
+        )
+
+    solution_strategy.store(
+        dict_values,
+        lp_size_estimate,
+        two_stage=investments is not None,
+        segmented=segments is not None,
     )
 
+    if segments is not None:
+        # simulating returns the main results twice, both are expanded
+        results_main = timestep_segmentation.expand_results(
+            dict_values, results_main, segments
+        )
+        results_meta = results_main
+
     timer.stop(dict_values, start)
 
     return results_meta, results_main
@@ -125,8 +322,15 @@ class model_building:
         oemof energy model (oemof.solph.network.EnergySystem), dict_model which gathers the assets added to this model later.
         """
         logging.info("Initializing oemof simulation.")
+        settings = dict_values[SIMULATION_SETTINGS]
+        timeincrement = None
+        if TIMESTEP_DURATIONS in settings:
+            # Timesteps of variable length, oemof expects their length in hours
+            timeincrement = [
+                duration / 60 for duration in settings[TIMESTEP_DURATIONS][VALUE]
+            ]
         model = solph.EnergySystem(
-            timeindex=dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+            timeindex=settings[TIME_INDEX], timeincrement=timeincrement
         )
 
         # this dictionary will include all generated oemof objects
@@ -160,34 +364,81 @@ class model_building:
         """
         logging.info("Adding components to oemof energy system model...")
 
+        # Assets and busses removed by C3.reduce_energy_system_model
+        reduced_model = dict_values.get(
+            REDUCED_MODEL,
+            {REMOVED_ASSETS: {}, MERGED_BUSSES: {}, AGGREGATED_ASSETS: {}},
+        )
+        representatives = {
+            asset: representative
+            for representative, assets in reduced_model[AGGREGATED_ASSETS].items()
+            for asset in assets
+        }
+
         # Busses have to be defined first
         for bus in dict_values[ENERGY_BUSSES]:
-            D1.bus(model, dict_values[ENERGY_BUSSES][bus][LABEL], **dict_model)
+            if bus not in reduced_model[MERGED_BUSSES]:
+                D1.bus(model, dict_values[ENERGY_BUSSES][bus][LABEL], **dict_model)
+        # Assets connected to a merged bus are connected to the bus it is merged into
+        for bus, merge in reduced_model[MERGED_BUSSES].items():
+            dict_model[OEMOF_BUSSES][
+                dict_values[ENERGY_BUSSES][bus][LABEL]
+            ] = dict_model[OEMOF_BUSSES][
+                dict_values[ENERGY_BUSSES][merge[KEPT_BUS]][LABEL]
+            ]
 
         # Adding step by step all assets defined within the asset groups
         for asset_group in ACCEPTED_ASSETS_FOR_ASSET_GROUPS:
             if asset_group in dict_values:
                 for asset in dict_values[asset_group]:
-                    type = dict_values[asset_group][asset][OEMOF_ASSET_TYPE]
+                    if (
+                        dict_values[asset_group][asset].get(
+                            PEAK_DEMAND_PRICING_CONSTRAINT, False
+                        )
+                        is True
+                    ):
+                        # The peak demand pricing period is modelled in D2.constraint_peak_demand_pricing
+                        logging.debug(
+                            f"Asset {asset} is not added to the oemof model, its peak demand is "
+                            f"bounded by a constraint."
+                        )
+                        continue
+                    if asset in reduced_model[REMOVED_ASSETS]:
+                        logging.debug(
+                            f"Asset {asset} is not added to the oemof model, it is removed by "
+                            f"the model reduction ({reduced_model[REMOVED_ASSETS][asset]})."
+                        )
+                        continue
+                    if representatives.get(asset, asset) != asset:
+                        logging.debug(
+                            f"Asset {asset} is not added to the oemof model, it is aggregated "
+                            f"into asset {representatives[asset]}."
+                        )
+                        continue
+                    if asset in reduced_model[AGGREGATED_ASSETS]:
+                        dict_asset = model_building.aggregate_assets(
+                            dict_values,
+                            asset_group,
+                            reduced_model[AGGREGATED_ASSETS][asset],
+                        )
+                    else:
+                        dict_asset = dict_values[asset_group][asset]
+                    if LP_SCALING in dict_values:
+                        dict_asset = model_building.scale_asset(
+                            dict_asset, dict_values[LP_SCALING]
+                        )
+                    type = dict_asset[OEMOF_ASSET_TYPE]
                     # Checking if the asset type is one accepted for the asset group (security measure)
                     if type in ACCEPTED_ASSETS_FOR_ASSET_GROUPS[asset_group]:
                         # if so, then the appropriate function of D1 should be called
                         if type == OEMOF_TRANSFORMER:
-                            D1.transformer(
-                                model, dict_values[asset_group][asset], **dict_model
-                            )
+                            D1.transformer(model, dict_asset, **dict_model)
                         elif type == OEMOF_SINK:
-                            D1.sink(
-                                model, dict_values[asset_group][asset], **dict_model
-                            )
+                            D1.sink(model, dict_asset, **dict_model)
                         elif type == OEMOF_SOURCE:
-                            D1.source(
-                                model, dict_values[asset_group][asset], **dict_model
-                            )
+                            D1.source(model, dict_asset, **dict_model)
                         elif type == OEMOF_GEN_STORAGE:
-                            D1.storage(
-                                model, dict_values[asset_group][asset], **dict_model
-                            )
+                            D1.storage(model, dict_asset, **dict_model)
                         else:
                             raise UnknownOemofAssetType(
                                 f"Asset {asset} has type {type}, "
@@ -204,6 +455,268 @@ class model_building:
         logging.debug("All components added.")
         return model
 
+    def build_oemof_model(dict_values, save_energy_system_graph=False):
+        """
+        Builds the oemof model of the energy system including all constraints
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        save_energy_system_graph: bool
+            Stores the network graph of the energy system if True
+
+        Returns
+        -------
+        oemof energy model (oemof.solph.network.EnergySystem) and pyomo object including
+        all constraints of the energy system (oemof.solph.Model)
+        """
+        model, dict_model = model_building.initialize(dict_values)
+
+        model = model_building.adding_assets_to_energysystem_model(
+            dict_values, dict_model, model
+        )
+
+        model_building.plot_networkx_graph(
+            dict_values, model, save_energy_system_graph=save_energy_system_graph
+        )
+
+        logging.debug("Creating oemof model based on created components and busses...")
+        local_energy_system = solph.Model(model)
+        logging.debug("Created oemof model based on created components and busses.")
+
+        local_energy_system = D2.add_constraints(
+            local_energy_system, dict_values, dict_model
+        )
+        return model, local_energy_system
+
+    def aggregate_assets(dict_values, asset_group, assets):
+        """
+        Defines one asset representing the assets aggregated by C3.aggregate_identical_assets
+
+        Parameters
+        ----------
+        dict_values: dict
+            dict of simulation data
+
+        asset_group: str
+            Asset group of the aggregated assets
+
+        assets: list
+            Keys of the aggregated assets, the first one represents the aggregated assets
+
+        Returns
+        -------
+        dict_asset: dict
+            Copy of the first asset, with the summed up timeseries (non-dispatchable sinks)
+            or capacities (non-dispatchable sources) of all aggregated assets
+
+        Notes
+        -----
+        Tested with:
+        - test_aggregate_assets_sinks()
+        - test_aggregate_assets_sources()
+        """
+        dict_assets = [dict_values[asset_group][asset] for asset in assets]
+        dict_asset = dict(dict_assets[0])
+        if asset_group == ENERGY_CONSUMPTION:
+            dict_asset.update(
+                {
+                    TIMESERIES: sum(
+                        aggregated_asset[TIMESERIES] for aggregated_asset in dict_assets
+                    )
+                }
+            )
+        else:
+            for parameter in [
+                INSTALLED_CAP,
+                INSTALLED_CAP_NORMALIZED,
+                MAXIMUM_ADD_CAP,
+                MAXIMUM_ADD_CAP_NORMALIZED,
+            ]:
+                if parameter not in dict_asset:
+                    continue
+                values = [
+                    aggregated_asset[parameter][VALUE]
+                    for aggregated_asset in dict_assets
+                ]
+                dict_asset.update(
+                    {
+                        parameter: {
+                            **dict_asset[parameter],
+                            VALUE: None if None in values else sum(values),
+                        }
+                    }
+                )
+        return dict_asset
+
+    def define_lp_scaling(dict_values):
+        """
+        Defines the factors by which energy and costs are scaled in the linear program.
+
+        If the simulation setting LP_SCALING is True, the energy (and power) values of the model
+        are expressed in units of the energy scaling factor and the costs in units of the cost
+        scaling factor. Both are powers of ten chosen so that the capacities, demand peaks and cost
+        coefficients of the model are close to 1, which improves the numerical conditioning of the
+        linear program. The results are rescaled in `E1.rescale_results_of_scaled_model`.
+
+        Parameters
+        ----------
+        dict_values: dict
+            dict of simulation data
+
+        Returns
+        -------
+        lp_scaling: dict or None
+            ENERGY_SCALING_FACTOR and COST_SCALING_FACTOR, also stored in dict_values[LP_SCALING].
+            None if the simulation setting LP_SCALING is not True.
+
+        Notes
+        -----
+        The energy is not scaled if a storage with thermal losses is optimized, as the minimal
+        capacity of such a storage is set to 1 in `D1.storage_optimize`.
+
+        Tested with:
+        - test_define_lp_scaling()
+        - test_define_lp_scaling_not_applied()
+        - test_define_lp_scaling_storage_with_thermal_losses()
+        """
+        dict_values.pop(LP_SCALING, None)
+        if (
+            dict_values[SIMULATION_SETTINGS].get(LP_SCALING, {VALUE: False})[VALUE]
+            is not True
+        ):
+            return None
+
+        def magnitudes(parameter):
+            value = parameter.get(VALUE) if isinstance(parameter, dict) else None
+            try:
+                values = np.abs(np.asarray(value, dtype=float)).flatten()
+            except (TypeError, ValueError):
+                return []
+            return list(values[np.isfinite(values) & (values > 0)])
+
+        energy_values = []
+        cost_values = []
+        scale_energy = True
+        for asset_group in ACCEPTED_ASSETS_FOR_ASSET_GROUPS:
+            for dict_asset in dict_values.get(asset_group, {}).values():
+                parameters = [dict_asset]
+                if dict_asset[OEMOF_ASSET_TYPE] == OEMOF_GEN_STORAGE:
+                    parameters = [
+                        dict_asset[subasset]
+                        for subasset in [INPUT_POWER, OUTPUT_POWER, STORAGE_CAPACITY]
+                    ]
+                    storage_capacity = dict_asset[STORAGE_CAPACITY]
+                    if dict_asset[OPTIMIZE_CAP][VALUE] is True and (
+                        magnitudes(storage_capacity.get(THERM_LOSSES_REL))
+                        or magnitudes(storage_capacity.get(THERM_LOSSES_ABS))
+                    ):
+                        scale_energy = False
+                elif (
+                    dict_asset[OEMOF_ASSET_TYPE] == OEMOF_SINK
+                    and TIMESERIES in dict_asset
+                ):
+                    energy_values += magnitudes({VALUE: dict_asset[TIMESERIES].max()})
+                for dict_parameters in parameters:
+                    for parameter in [INSTALLED_CAP, MAXIMUM_ADD_CAP]:
+                        energy_values += magnitudes(dict_parameters.get(parameter))
+                    for parameter in [DISPATCH_PRICE, SIMULATION_ANNUITY]:
+                        cost_values += magnitudes(dict_parameters.get(parameter))
+
+        energy = 1.0
+        if scale_energy is False:
+            logging.debug(
+                "The energy is not scaled in the linear program, as a storage with thermal losses is optimized."
+            )
+        elif len(energy_values) > 0:
+            energy = 10.0 ** round(np.mean(np.log10(energy_values)))
+        costs = 1.0
+        if len(cost_values) > 0:
+            costs = 10.0 ** round(np.mean(np.log10(np.array(cost_values) * energy)))
+
+        lp_scaling = {
+            ENERGY_SCALING_FACTOR: {VALUE: energy, UNIT: "factor"},
+            COST_SCALING_FACTOR: {VALUE: costs, UNIT: "factor"},
+        }
+        dict_values.update({LP_SCALING: lp_scaling})
+        logging.info(
+            f"The linear program is scaled with an energy scaling factor of {energy} and a cost scaling factor of {costs}."
+        )
+        return lp_scaling
+
+    def scale_asset(dict_asset, lp_scaling):
+        """
+        Scales the energy and cost parameters of an asset for the linear program
+
+        Parameters
+        ----------
+        dict_asset: dict
+            Asset added to the oemof model
+
+        lp_scaling: dict
+            Scaling factors defined by `define_lp_scaling`
+
+        Returns
+        -------
+        scaled_asset: dict
+            Copy of the asset with capacities and absolute losses divided by the energy scaling factor,
+            costs multiplied by the ratio of the energy and the cost scaling factors and emission factors
+            multiplied by the energy scaling factor. The timeseries of non-dispatchable sinks is divided
+            by the energy scaling factor.
+
+        Notes
+        -----
+        Tested with:
+        - test_scale_asset_source()
+        - test_scale_asset_storage()
+        """
+        energy = lp_scaling[ENERGY_SCALING_FACTOR][VALUE]
+        costs = lp_scaling[COST_SCALING_FACTOR][VALUE]
+        factors = {
+            INSTALLED_CAP: 1 / energy,
+            INSTALLED_CAP_NORMALIZED: 1 / energy,
+            MAXIMUM_ADD_CAP: 1 / energy,
+            MAXIMUM_ADD_CAP_NORMALIZED: 1 / energy,
+            THERM_LOSSES_ABS: 1 / energy,
+            DISPATCH_PRICE: energy / costs,
+            SIMULATION_ANNUITY: energy / costs,
+            EMISSION_FACTOR: energy,
+        }
+
+        def scale_value(value, factor):
+            if value is None:
+                return value
+            elif isinstance(value, list):
+                return [scale_value(item, factor) for item in value]
+            else:
+                return value * factor
+
+        def scale_parameters(dict_parameters):
+            scaled_parameters = dict(dict_parameters)
+            for parameter, factor in factors.items():
+                if isinstance(scaled_parameters.get(parameter), dict):
+                    scaled_parameters.update(
+                        {
+                            parameter: {
+                                **scaled_parameters[parameter],
+                                VALUE: scale_value(
+                                    scaled_parameters[parameter][VALUE], factor
+                                ),
+                            }
+                        }
+                    )
+            return scaled_parameters
+
+        scaled_asset = scale_parameters(dict_asset)
+        if dict_asset[OEMOF_ASSET_TYPE] == OEMOF_GEN_STORAGE:
+            for subasset in [INPUT_POWER, OUTPUT_POWER, STORAGE_CAPACITY]:
+                scaled_asset.update({subasset: scale_parameters(dict_asset[subasset])})
+        elif dict_asset[OEMOF_ASSET_TYPE] == OEMOF_SINK and TIMESERIES in dict_asset:
+            scaled_asset.update({TIMESERIES: dict_asset[TIMESERIES] / energy})
+        return scaled_asset
+
     def plot_networkx_graph(dict_values, model, save_energy_system_graph=False):
         """
         Plots a graph of the energy system if that graph is to be displayed or stored.
@@ -242,6 +755,10 @@ class model_building:
         """
         Stores linear equation system generated with pyomo as an "lp file".
 
+        The variables and constraints are numbered instead of being labelled with their names
+        (`symbolic_solver_labels` is False), as generating the labels takes much longer than
+        writing the file itself.
+
         Parameters
         ----------
         dict_values: dict
@@ -260,10 +777,16 @@ class model_building:
             )
             logging.debug("Saving to lp-file.")
             local_energy_system.write(
-                path_lp_file, io_options={"symbolic_solver_labels": True},
+                path_lp_file, io_options={"symbolic_solver_labels": False},
             )
 
-    def simulating(dict_values, model, local_energy_system):
+    def simulating(
+        dict_values,
+        model,
+        local_energy_system,
+        log_infeasibility=True,
+        solver_progress_callback=None,
+    ):
         """
         Initiates the oemof-solph simulation, accesses results and writes main results into dict
 
@@ -275,6 +798,8 @@ class model_building:
         "termination condition infeasible", otherwise the oemof solver warning is re-raised as
         an error.
 
+        The model is solved with the cbc solver, or in memory with the HiGHS solver if the
+        simulation setting IN_MEMORY_SOLVER is True (see :func:`in_memory_solver.solve`).
 
         Parameters
         ----------
@@ -287,22 +812,55 @@ class model_building:
         local_energy_system: object
             pyomo object storing all constraints of the energy system model
 
+        log_infeasibility: bool
+            If False, the MVSOemofError of an infeasible model is raised without being logged,
+            for callers which handle it.
+            Default: True.
+
+        solver_progress_callback: func
+            Called with each progress event of the solver, see :func:`solver_progress.monitor`.
+            The progress is followed if it is provided or if SOLVER_PROGRESS is set.
+            Default: None.
+
         Returns
         -------
         Updated model with results, main results (flows, assets) and meta results (simulation)
         """
 
         logging.info("Starting simulation.")
+        follow_progress = solver_progress.is_requested(
+            dict_values, solver_progress_callback
+        )
+        if follow_progress is True:
+            path_solver_log, temporary_solver_log = solver_progress.log_file(
+                dict_values
+            )
+            progress = solver_progress.monitor(
+                path_solver_log, callback=solver_progress_callback
+            )
+        else:
+            progress = contextlib.nullcontext([])
         # turn warnings into errors
         warnings.filterwarnings("error")
         try:
-            local_energy_system.solve(
-                solver="cbc",
-                solve_kwargs={
-                    "tee": False
-                },  # if tee_switch is true solver messages will be displayed
-                cmdline_options={"ratioGap": str(0.03)},
-            )  # ratioGap allowedGap mipgap
+            if in_memory_solver.is_requested(dict_values):
+                in_memory_solver.solve(local_energy_system)
+            else:
+                with progress as trajectory:
+                    # ratioGap allowedGap mipgap
+                    cmdline_options = {"ratioGap": str(0.03)}
+                    if follow_progress is True:
+                        solver_progress.solve(
+                            local_energy_system,
+                            path_solver_log,
+                            cmdline_options=cmdline_options,
+                        )
+                    else:
+                        local_energy_system.solve(
+                            solver="cbc",
+                            solve_kwargs={"tee": False},
+                            cmdline_options=cmdline_options,
+                        )
         except UserWarning as e:
             error_message = str(e)
             compare_message = "termination condition infeasible"
@@ -317,15 +875,21 @@ class model_building:
                     "production assets and/or energy conversion assets have enough capacity to "
                     "meet the total demand"
                 )
-                logging.error(error_message)
+                if log_infeasibility is True:
+                    logging.error(error_message)
                 raise MVSOemofError(error_message) from None
             else:
                 raise e
+        finally:
+            if follow_progress is True and temporary_solver_log is True:
+                os.remove(path_solver_log)
         # stop turning warnings into errors
         warnings.resetwarnings()
 
         # add results to the energy system to make it possible to store them.
-        results_main = processing.results(local_energy_system)
+        D2.store_peak_demand_pricing_results(local_energy_system, dict_values)
+        with D2.detached_peak_demand_pricing_blocks(local_energy_system):
+            results_main = processing.results(local_energy_system)
         results_meta = processing.meta_results(local_energy_system)
 
         model.results["main"] = results_main
@@ -340,6 +904,11 @@ class model_building:
                 }
             }
         )
+        if follow_progress is True:
+            solver_progress.store(dict_values, trajectory)
+        if LP_SCALING in dict_values:
+            # The results are rescaled in E1.rescale_results_of_scaled_model
+            dict_values[SIMULATION_RESULTS].update(dict_values[LP_SCALING])
         logging.info(
             "Simulation time: %s minutes.",
             round(dict_values[SIMULATION_RESULTS][SIMULTATION_TIME] / 60, 2),
@@ -347,6 +916,1804 @@ class model_building:
         return model, results_main, results_main
 
 
+class solver_progress:
+    # Lines of the cbc output reporting the progress of the solver
+    LP_ITERATION = re.compile(r"^\s*(\d+)\s+Obj\s+(\S+)(?:\s+Primal inf\s+(\S+))?")
+    LP_OPTIMUM = re.compile(r"^Optimal objective\s+(\S+)\s+-\s+(\d+) iterations")
+    MIP_PROGRESS = re.compile(
+        r"^Cbc0010I After \d+ nodes, \d+ on tree, (\S+) best solution, best possible (\S+)"
+    )
+    MIP_SOLUTION = re.compile(
+        r"^Cbc0012I Integer solution of (\S+) found .* after (\d+) iterations"
+    )
+    # cbc reports this objective as long as no (integer) solution is found
+    NO_SOLUTION = 1e50
+
+    def is_requested(dict_values, callback=None):
+        """
+        Decides if the progress of the solver is followed while the model is solved
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        callback: func, optional
+            Called with each progress event, if provided the progress is always followed
+
+        Returns
+        -------
+        True if SOLVER_PROGRESS is set in the simulation settings or a callback is provided,
+        and the model is solved with the cbc solver. The in memory solver does not report
+        its progress.
+
+        Notes
+        -----
+        Tested with:
+        - test_solver_progress_is_requested
+        """
+        requested = (
+            callback is not None
+            or dict_values[SIMULATION_SETTINGS].get(SOLVER_PROGRESS, {VALUE: False})[
+                VALUE
+            ]
+        )
+        return requested is True and not in_memory_solver.is_requested(dict_values)
+
+    def parse_line(line):
+        """
+        Parses a line of the cbc output into a progress event
+
+        Parameters
+        ----------
+        line: str
+            Line of the output of the cbc solver
+
+        Returns
+        -------
+        dict with the ITERATIONS, the OBJECTIVE of the linear program (scaled if LP_SCALING
+        applies), the relative GAP to the best possible objective (mixed integer programs only)
+        and the PRIMAL_INFEASIBILITY (simplex iterations only), None for the values not
+        reported by the line. None if the line does not report the progress of the solver.
+
+        Notes
+        -----
+        Tested with:
+        - test_solver_progress_parse_line
+        """
+        event = {
+            ITERATIONS: None,
+            OBJECTIVE: None,
+            GAP: None,
+            PRIMAL_INFEASIBILITY: None,
+        }
+        line = line.strip()
+        match = solver_progress.LP_ITERATION.match(line)
+        if match is not None:
+            iterations, objective, primal_infeasibility = match.groups()
+            event.update(
+                {
+                    ITERATIONS: int(iterations),
+                    OBJECTIVE: float(objective),
+                    PRIMAL_INFEASIBILITY: None
+                    if primal_infeasibility is None
+                    else float(primal_infeasibility),
+                }
+            )
+            return event
+        match = solver_progress.LP_OPTIMUM.match(line)
+        if match is not None:
+            event.update(
+                {
+                    ITERATIONS: int(match.group(2)),
+                    OBJECTIVE: float(match.group(1)),
+                    PRIMAL_INFEASIBILITY: 0.0,
+                }
+            )
+            return event
+        match = solver_progress.MIP_SOLUTION.match(line)
+        if match is not None:
+            event.update(
+                {ITERATIONS: int(match.group(2)), OBJECTIVE: float(match.group(1))}
+            )
+            return event
+        match = solver_progress.MIP_PROGRESS.match(line)
+        if match is not None:
+            objective, bound = float(match.group(1)), float(match.group(2))
+            if abs(objective) < solver_progress.NO_SOLUTION:
+                event[OBJECTIVE] = objective
+                event[GAP] = abs(objective - bound) / max(abs(objective), 1e-10)
+            return event
+        return None
+
+    def log_file(dict_values):
+        """
+        Path of the file the solver output is written to
+
+        The file SOLVER_LOG_FILE is written into the output folder of the simulation if it
+        exists, otherwise into a temporary file which is removed once the model is solved.
+
+        Returns
+        -------
+        tuple of the path and True if the file is temporary
+        """
+        output_folder = dict_values[SIMULATION_SETTINGS].get(PATH_OUTPUT_FOLDER)
+        if output_folder is not None and os.path.isdir(output_folder):
+            return os.path.join(output_folder, SOLVER_LOG_FILE), False
+        file_descriptor, path = tempfile.mkstemp(suffix=".log", prefix="mvs_solver_")
+        os.close(file_descriptor)
+        return path, True
+
+    @contextlib.contextmanager
+    def monitor(path, callback=None, interval=SOLVER_PROGRESS_INTERVAL):
+        """
+        Follows the progress of the solver while the model is solved within the context
+
+        The solver writes its output into the file `path` (see :func:`solver_progress.solve`),
+        which is created when the context is entered and parsed incrementally by a background
+        thread. Each progress event is passed to the callback, and the latest event is logged at
+        most every SOLVER_PROGRESS_LOG_INTERVAL seconds.
+
+        Parameters
+        ----------
+        path: str
+            File the solver output is written to
+
+        callback: func, optional
+            Called with each progress event (dict, see `parse_line`, with the ELAPSED_TIME in
+            seconds since the start of the solver). An exception raised by the callback is
+            logged and does not interrupt the solver.
+
+        interval: float
+            Seconds between two reads of the solver output
+
+        Yields
+        ------
+        list of the progress events, complete when the context is exited
+
+        Notes
+        -----
+        Tested with:
+        - test_solver_progress_monitor
+        """
+        trajectory = []
+        finished = threading.Event()
+        start = timeit.default_timer()
+
+        def report(events):
+            for event in events:
+                if callback is not None:
+                    try:
+                        callback(event)
+                    except Exception as e:
+                        logging.warning(f"The solver progress callback failed: {e}")
+
+        def follow():
+            buffer = ""
+            last_log = None
+            logged = 0
+            with open(path) as solver_output:
+                while True:
+                    done = finished.is_set()
+                    buffer += solver_output.read()
+                    *lines, buffer = buffer.split("\n")
+                    if done:
+                        lines.append(buffer)
+                    events = []
+                    for line in lines:
+                        event = solver_progress.parse_line(line)
+                        if event is not None:
+                            event[ELAPSED_TIME] = round(
+                                timeit.default_timer() - start, 3
+                            )
+                            events.append(event)
+                    trajectory.extend(events)
+                    report(events)
+                    # log the latest event if it is not logged yet, at most once per interval
+                    if len(trajectory) > logged and (
+                        done
+                        or last_log is None
+                        or timeit.default_timer() - last_log
+                        >= SOLVER_PROGRESS_LOG_INTERVAL
+                    ):
+                        last_log = timeit.default_timer()
+                        logged = len(trajectory)
+                        solver_progress.log(trajectory[-1])
+                    if done:
+                        break
+                    finished.wait(interval)
+
+        open(path, "w").close()
+        follower = threading.Thread(target=follow, name="solver_progress")
+        follower.start()
+        try:
+            yield trajectory
+        finally:
+            finished.set()
+            follower.join()
+
+    def solve(local_energy_system, path, cmdline_options=None):
+        """
+        Solves the model with the cbc solver like `oemof.solph.Model.solve()`, writing the solver
+        output into a file
+
+        The output of the solver process is appended to the file `path` as it is printed,
+        instead of being printed with `tee=True` to the standard output, which is shared by all
+        threads of the process. As in `oemof.solph.Model.solve()` a warning is issued if the
+        optimization did not terminate with an optimal solution.
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model
+
+        path: str
+            File the solver output is appended to
+
+        cmdline_options: dict, optional
+            Command line options of the solver
+
+        Returns
+        -------
+        :class:`pyomo.opt.SolverResults` of the optimization
+
+        Notes
+        -----
+        Tested with:
+        - test_solver_progress_mvs_runthrough
+        """
+        opt = SolverFactory("cbc", solver_io="lp")
+        for option, option_value in (cmdline_options or {}).items():
+            opt.options[option] = option_value
+
+        def execute_command(command):
+            # replaces the execution of pyomo, which can only print the output to sys.stdout
+            start = timeit.default_timer()
+            with open(path, "a") as solver_output:
+                offset = solver_output.tell()
+                completed = subprocess.run(
+                    command.cmd,
+                    input=command.script if "script" in command else None,
+                    stdout=solver_output,
+                    stderr=subprocess.STDOUT,
+                    env=command.env,
+                    universal_newlines=True,
+                )
+            with open(path) as solver_output:
+                solver_output.seek(offset)
+                log = solver_output.read()
+            opt._last_solve_time = timeit.default_timer() - start
+            return [completed.returncode, log]
+
+        opt._execute_command = execute_command
+        solver_results = opt.solve(local_energy_system)
+
+        status = solver_results["Solver"][0]["Status"]
+        termination_condition = solver_results["Solver"][0]["Termination condition"]
+        if status == "ok" and termination_condition == "optimal":
+            logging.info("Optimization successful...")
+        else:
+            warnings.warn(
+                f"Optimization ended with status {status} and termination condition "
+                f"{termination_condition}",
+                UserWarning,
+            )
+        local_energy_system.es.results = solver_results
+        local_energy_system.solver_results = solver_results
+        return solver_results
+
+    def log(event):
+        """Logs a progress event of the solver"""
+        gap = "-" if event[GAP] is None else f"{round(100 * event[GAP], 2)} %"
+        iterations = "-" if event[ITERATIONS] is None else event[ITERATIONS]
+        logging.info(
+            f"Solver progress after {round(event[ELAPSED_TIME], 1)} s: "
+            f"{iterations} iterations, objective {event[OBJECTIVE]}, gap {gap}."
+        )
+
+    def store(dict_values, trajectory):
+        """
+        Stores the progress events of the solver as SOLVER_PROGRESS in SIMULATION_RESULTS
+
+        The trajectory is a pd.DataFrame with one row per event and the columns ELAPSED_TIME,
+        ITERATIONS, OBJECTIVE, GAP and PRIMAL_INFEASIBILITY.
+        """
+        dict_values[SIMULATION_RESULTS].update(
+            {
+                SOLVER_PROGRESS: pd.DataFrame(
+                    trajectory,
+                    columns=[
+                        ELAPSED_TIME,
+                        ITERATIONS,
+                        OBJECTIVE,
+                        GAP,
+                        PRIMAL_INFEASIBILITY,
+                    ],
+                )
+            }
+        )
+
+
+class in_memory_solver:
+    def is_requested(dict_values):
+        """
+        Decides if the model is solved in memory with the HiGHS solver instead of the cbc solver
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        Returns
+        -------
+        True if IN_MEMORY_SOLVER is set in the simulation settings and the HiGHS solver is
+        available, either through the highspy package or through scipy. Otherwise a warning is
+        logged if applicable and False is returned, so that the cbc solver is used.
+
+        Notes
+        -----
+        Tested with:
+        - test_in_memory_solver_is_requested_default
+        - test_in_memory_solver_is_requested_without_highs_solver
+        """
+        requested = dict_values[SIMULATION_SETTINGS].get(
+            IN_MEMORY_SOLVER, {VALUE: False}
+        )[VALUE]
+        if requested is True and (HIGHSPY_INSTALLED or SCIPY_INSTALLED) is False:
+            logging.warning(
+                f"The parameter {IN_MEMORY_SOLVER} is set but the HiGHS solver is not "
+                f"available, the simulation is run with the cbc solver instead. Install "
+                f"the solver with `pip install multi-vector-simulator[highs]`."
+            )
+            requested = False
+        return requested
+
+    def linear_program_arrays(local_energy_system):
+        """
+        Extracts the linear program of the pyomo model as arrays
+
+        Each active constraint is a row and each variable which is not fixed a column of the
+        constraint matrix, which is stored in compressed sparse row format. Fixed variables and
+        constant terms are moved to the row bounds and the objective offset. Constraints whose
+        variables are all fixed are not rows, their bounds are checked instead.
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model
+
+        Returns
+        -------
+        dict with the variables (list of pyomo variables of the columns), the objective
+        (cost, offset, maximize), the bounds of the columns and rows (col_lower, col_upper,
+        row_lower, row_upper) and the constraint matrix (start, index, value)
+
+        Notes
+        -----
+        Tested with:
+        - test_linear_program_arrays
+        - test_linear_program_arrays_integer_variable
+        - test_linear_program_arrays_constant_constraint
+        """
+        variables = []
+        columns = {}
+        for var in local_energy_system.component_data_objects(Var, descend_into=True):
+            if var.fixed:
+                continue
+            if var.is_continuous() is False:
+                raise ValueError(
+                    f"The variable {var.name} is not continuous, mixed integer problems "
+                    f"can not be solved with the parameter {IN_MEMORY_SOLVER}."
+                )
+            columns[id(var)] = len(variables)
+            variables.append(var)
+
+        def linear_terms(repn, component):
+            if repn.is_linear() is False:
+                raise ValueError(
+                    f"The expression of {component.name} is not linear and can not be solved with "
+                    f"the parameter {IN_MEMORY_SOLVER}."
+                )
+            return [columns[id(var)] for var in repn.linear_vars], repn.linear_coefs
+
+        objective = next(
+            local_energy_system.component_data_objects(
+                Objective, active=True, descend_into=True
+            )
+        )
+        repn = generate_standard_repn(objective.expr, compute_values=True)
+        cost = np.zeros(len(variables))
+        for column, coefficient in zip(*linear_terms(repn, objective)):
+            cost[column] += coefficient
+
+        start = [0]
+        index = []
+        coefficients = []
+        row_lower = []
+        row_upper = []
+        for constraint in local_energy_system.component_data_objects(
+            Constraint, active=True, descend_into=True
+        ):
+            repn_constraint = generate_standard_repn(
+                constraint.body, compute_values=True
+            )
+            row_columns, row_coefficients = linear_terms(repn_constraint, constraint)
+            constant = value(repn_constraint.constant)
+            if len(row_columns) == 0:
+                # e.g. all variables of the constraint are fixed, the solver would not see it
+                lower = value(constraint.lower) if constraint.has_lb() else -np.inf
+                upper = value(constraint.upper) if constraint.has_ub() else np.inf
+                below = constant < lower - CONSTANT_ROW_TOLERANCE * max(1, abs(lower))
+                above = constant > upper + CONSTANT_ROW_TOLERANCE * max(1, abs(upper))
+                if below or above:
+                    raise MVSOemofError(
+                        f"The following error occurred during the mvs solver: termination "
+                        f"condition infeasible. The constraint {constraint.name} does not "
+                        f"depend on any variable which is not fixed and its value {constant} "
+                        f"is not within its bounds [{lower}, {upper}]."
+                    )
+                continue
+            row_lower.append(
+                value(constraint.lower) - constant if constraint.has_lb() else -np.inf
+            )
+            row_upper.append(
+                value(constraint.upper) - constant if constraint.has_ub() else np.inf
+            )
+            index.extend(row_columns)
+            coefficients.extend(row_coefficients)
+            start.append(len(index))
+
+        return {
+            "variables": variables,
+            "cost": cost,
+            "offset": value(repn.constant),
+            "maximize": objective.sense == maximize,
+            "col_lower": np.array(
+                [-np.inf if var.lb is None else var.lb for var in variables],
+                dtype=float,
+            ),
+            "col_upper": np.array(
+                [np.inf if var.ub is None else var.ub for var in variables],
+                dtype=float,
+            ),
+            "row_lower": np.array(row_lower, dtype=float),
+            "row_upper": np.array(row_upper, dtype=float),
+            "start": np.array(start, dtype=int),
+            "index": np.array(index, dtype=int),
+            "value": np.array(coefficients, dtype=float),
+        }
+
+    def run_highspy(lp):
+        """
+        Solves the linear program with the highspy bindings of the HiGHS solver
+
+        Parameters
+        ----------
+        lp: dict
+            Linear program as returned by :func:`in_memory_solver.linear_program_arrays`
+
+        Returns
+        -------
+        Termination condition, message of the solver and values of the columns
+        """
+        highs = highspy.Highs()
+        highs.setOptionValue("output_flag", False)
+        model = highspy.HighsLp()
+        model.num_col_ = len(lp["cost"])
+        model.num_row_ = len(lp["row_lower"])
+        model.col_cost_ = lp["cost"]
+        model.col_lower_ = lp["col_lower"]
+        model.col_upper_ = lp["col_upper"]
+        model.row_lower_ = lp["row_lower"]
+        model.row_upper_ = lp["row_upper"]
+        model.offset_ = lp["offset"]
+        if lp["maximize"] is True:
+            model.sense_ = highspy.ObjSense.kMaximize
+        model.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+        model.a_matrix_.start_ = lp["start"]
+        model.a_matrix_.index_ = lp["index"]
+        model.a_matrix_.value_ = lp["value"]
+        highs.passModel(model)
+        highs.run()
+
+        status = highs.getModelStatus()
+        termination_conditions = {
+            highspy.HighsModelStatus.kOptimal: TerminationCondition.optimal,
+            highspy.HighsModelStatus.kInfeasible: TerminationCondition.infeasible,
+            highspy.HighsModelStatus.kUnbounded: TerminationCondition.unbounded,
+            highspy.HighsModelStatus.kUnboundedOrInfeasible: TerminationCondition.infeasibleOrUnbounded,
+        }
+        return (
+            termination_conditions.get(status, TerminationCondition.error),
+            highs.modelStatusToString(status),
+            np.array(highs.getSolution().col_value),
+        )
+
+    def run_scipy_highs(lp):
+        """
+        Solves the linear program with the HiGHS solver shipped with scipy
+
+        Parameters
+        ----------
+        lp: dict
+            Linear program as returned by :func:`in_memory_solver.linear_program_arrays`
+
+        Returns
+        -------
+        Termination condition, message of the solver and values of the columns
+        """
+        matrix = csr_matrix(
+            (lp["value"], lp["index"], lp["start"]),
+            shape=(len(lp["row_lower"]), len(lp["cost"])),
+        )
+        equality = lp["row_lower"] == lp["row_upper"]
+        upper = ~equality & np.isfinite(lp["row_upper"])
+        lower = ~equality & np.isfinite(lp["row_lower"])
+        cost = -lp["cost"] if lp["maximize"] is True else lp["cost"]
+
+        result = linprog(
+            cost,
+            A_ub=vstack([matrix[upper], -matrix[lower]]),
+            b_ub=np.concatenate([lp["row_upper"][upper], -lp["row_lower"][lower]]),
+            A_eq=matrix[equality],
+            b_eq=lp["row_lower"][equality],
+            bounds=np.column_stack([lp["col_lower"], lp["col_upper"]]),
+            method="highs",
+        )
+        termination_conditions = {
+            0: TerminationCondition.optimal,
+            2: TerminationCondition.infeasible,
+            3: TerminationCondition.unbounded,
+        }
+        return (
+            termination_conditions.get(result.status, TerminationCondition.error),
+            result.message,
+            result.x,
+        )
+
+    def solve(local_energy_system):
+        """
+        Solves the pyomo model in memory with the HiGHS solver
+
+        The linear program is passed to the solver as arrays instead of being written to an lp
+        file which the solver parses, and the solution is loaded back from the solver's
+        memory instead of from a solution file. The highspy bindings are used if installed,
+        otherwise the HiGHS solver shipped with scipy.
+
+        The optimal values are stored in the variables of the model and the solver results are
+        stored like in `oemof.solph.Model.solve()`, so that the results can be processed with
+        `oemof.solph.processing`. As in `oemof.solph.Model.solve()` a warning is issued if the
+        optimization did not terminate with an optimal solution.
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model
+
+        Returns
+        -------
+        :class:`pyomo.opt.SolverResults` of the optimization
+
+        Notes
+        -----
+        Tested with:
+        - test_in_memory_solver_solve_equals_cbc
+        - test_in_memory_solver_solve_infeasible
+        """
+        start = timeit.default_timer()
+        lp = in_memory_solver.linear_program_arrays(local_energy_system)
+        if HIGHSPY_INSTALLED is True:
+            termination_condition, message, values = in_memory_solver.run_highspy(lp)
+        else:
+            termination_condition, message, values = in_memory_solver.run_scipy_highs(
+                lp
+            )
+
+        solver_results = SolverResults()
+        solver_results.problem.name = local_energy_system.name
+        solver_results.problem.number_of_constraints = len(lp["row_lower"])
+        solver_results.problem.number_of_variables = len(lp["variables"])
+        solver_results.problem.number_of_nonzeros = len(lp["value"])
+        solver_results.solver.name = "HiGHS"
+        solver_results.solver.termination_condition = termination_condition
+        solver_results.solver.termination_message = str(message)
+
+        if termination_condition == TerminationCondition.optimal:
+            for var, var_value in zip(lp["variables"], values):
+                # skips the validation of the domain, as the solver may exceed the bounds
+                # of the variables within its tolerances
+                var.set_value(float(var_value), True)
+            objective = local_energy_system.objective()
+            solver_results.problem.lower_bound = objective
+            solver_results.problem.upper_bound = objective
+            solver_results.solver.status = SolverStatus.ok
+            logging.info("Optimization successful...")
+        else:
+            solver_results.solver.status = SolverStatus.warning
+            warnings.warn(
+                f"Optimization ended with status {solver_results.solver.status} and "
+                f"termination condition {termination_condition}",
+                UserWarning,
+            )
+        solver_results.solver.time = timeit.default_timer() - start
+
+        local_energy_system.es.results = solver_results
+        local_energy_system.solver_results = solver_results
+        return solver_results
+
+
+class two_stage_planning:
+    def is_requested(dict_values):
+        """
+        Decides if the capacities are optimized with aggregated timesteps before the dispatch
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        Returns
+        -------
+        True if TWO_STAGE_PLANNING is set in the simulation settings and INVESTMENT_TIMESTEP
+        spans at least two timesteps of the simulation. Otherwise a warning is logged if
+        applicable and False is returned, so that the simulation is run in a single stage.
+
+        Notes
+        -----
+        Tested with:
+        - test_two_stage_planning_is_requested_default
+        - test_two_stage_planning_is_requested_investment_timestep_too_short
+        """
+        settings = dict_values[SIMULATION_SETTINGS]
+        requested = settings.get(TWO_STAGE_PLANNING, {VALUE: False})[VALUE]
+        if (
+            requested is True
+            and two_stage_planning.timesteps_per_investment_timestep(dict_values) < 2
+        ):
+            logging.warning(
+                f"The parameter {TWO_STAGE_PLANNING} is set but the {INVESTMENT_TIMESTEP} "
+                f"does not span several timesteps of the simulation, the simulation is run "
+                f"in a single stage instead."
+            )
+            requested = False
+        return requested
+
+    def timesteps_per_investment_timestep(dict_values):
+        """
+        Number of timesteps of the simulation aggregated into one investment timestep
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        Returns
+        -------
+        int
+        """
+        settings = dict_values[SIMULATION_SETTINGS]
+        investment_timestep = settings.get(INVESTMENT_TIMESTEP, {VALUE: 240})[VALUE]
+        return int(round(investment_timestep / settings[TIMESTEP][VALUE]))
+
+    def aggregate_timesteps(dict_values, number_of_timesteps):
+        """
+        Aggregates consecutive timesteps of all timeseries of the simulation inputs
+
+        All pandas.Series indexed with the time index of the simulation are replaced by the
+        mean of each block of `number_of_timesteps` consecutive timesteps, so that the energy
+        of the timeseries is kept (see :func:`timestep_segmentation.aggregate_segments`). The
+        timestep of the simulation settings is adapted accordingly, the last block may be
+        shorter.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        number_of_timesteps: int
+            Number of consecutive timesteps aggregated into one timestep
+
+        Returns
+        -------
+        dict
+            Aggregated simulation inputs. The nested dicts and lists are copied, the other
+            values are shared with dict_values.
+
+        Notes
+        -----
+        Tested with:
+        - test_aggregate_timesteps
+        """
+        settings = dict_values[SIMULATION_SETTINGS]
+        time_index = settings[TIME_INDEX]
+        blocks = np.arange(len(time_index)) // number_of_timesteps
+        timestep = settings[TIMESTEP][VALUE] * number_of_timesteps
+        aggregated_time_index = pd.date_range(
+            start=time_index[0], periods=blocks[-1] + 1, freq=f"{timestep}min"
+        )
+        dict_aggregated = timestep_segmentation.aggregate_segments(
+            dict_values, blocks, aggregated_time_index=aggregated_time_index
+        )
+        dict_aggregated[SIMULATION_SETTINGS][TIMESTEP] = {
+            **settings[TIMESTEP],
+            VALUE: timestep,
+        }
+        return dict_aggregated
+
+    def optimize_investments(dict_values):
+        """
+        First stage of the two stage planning: optimizes the capacities with aggregated timesteps
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs, they are not modified
+
+        Returns
+        -------
+        dict
+            objective value of the first stage and optimized investments of the planned assets
+            (see :func:`two_stage_planning.planned_assets`), keyed by the labels of the nodes
+            of the investment flows and of the investment storages
+
+        Notes
+        -----
+        Tested with:
+        - test_two_stage_planning_mvs_runthrough
+        """
+        number_of_timesteps = two_stage_planning.timesteps_per_investment_timestep(
+            dict_values
+        )
+        logging.info(
+            f"Two stage planning: optimizing the capacities with {number_of_timesteps} "
+            f"aggregated timesteps."
+        )
+        dict_aggregated = two_stage_planning.aggregate_timesteps(
+            dict_values, number_of_timesteps
+        )
+        model, local_energy_system = model_building.build_oemof_model(dict_aggregated)
+        model_building.simulating(dict_aggregated, model, local_energy_system)
+
+        investments = {
+            OBJECTIVE_VALUE: local_energy_system.objective(),
+            "flows": {},
+            "storages": {},
+        }
+        planned_assets = two_stage_planning.planned_assets(dict_values)
+        if hasattr(local_energy_system, "InvestmentFlow"):
+            for (i, o), var in local_energy_system.InvestmentFlow.invest.items():
+                if str(i) in planned_assets or str(o) in planned_assets:
+                    investments["flows"][(str(i), str(o))] = var.value
+        if hasattr(local_energy_system, "GenericInvestmentStorageBlock"):
+            block = local_energy_system.GenericInvestmentStorageBlock
+            for n, var in block.invest.items():
+                if str(n) in planned_assets:
+                    investments["storages"][str(n)] = var.value
+        return investments
+
+    def planned_assets(dict_values):
+        """
+        Labels of the assets whose capacities are fixed in the second stage of the two stage planning
+
+        These are the capacity optimized energy conversion, production and storage assets. The
+        capacities of the assets defined by the energy providers (consumption source, peak
+        demand pricing transformers and feed-in sink) and of the excess sinks are not planned,
+        but follow from the peak flows of the dispatch, which the aggregated timesteps
+        underestimate. They are optimized again in the second stage.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        Returns
+        -------
+        set of asset labels
+
+        Notes
+        -----
+        Tested with:
+        - test_planned_assets
+        """
+        energy_provider_assets = set()
+        for dso in dict_values.get(ENERGY_PROVIDERS, {}).values():
+            energy_provider_assets.update(
+                [dso.get(CONNECTED_CONSUMPTION_SOURCE), dso.get(CONNECTED_FEEDIN_SINK)]
+                + list(dso.get(CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS, []))
+            )
+        return {
+            dict_asset[LABEL]
+            for asset_group in (ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_STORAGE)
+            for asset_key, dict_asset in dict_values.get(asset_group, {}).items()
+            if dict_asset[OPTIMIZE_CAP][VALUE] is True
+            and asset_key not in energy_provider_assets
+            and dict_asset[LABEL] not in energy_provider_assets
+        }
+
+    def fix_investments(local_energy_system, investments, lower_bound=False):
+        """
+        Fixes the investments of the second stage to the capacities optimized in the first stage
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object including all constraints of the energy system
+
+        investments: dict
+            Investments as returned by :func:`two_stage_planning.optimize_investments`
+
+        lower_bound: bool
+            If True, the investments are not fixed but bounded below by the capacities of the
+            first stage, so that the capacities can be extended where the dispatch at full
+            resolution requires it.
+            Default: False.
+
+        Returns
+        -------
+        Nothing, the investment variables of the planned assets in local_energy_system are fixed.
+
+        Notes
+        -----
+        Tested with:
+        - test_fix_investments
+        """
+
+        def fix(var, capacity):
+            if lower_bound is True:
+                var.unfix()
+                var.setlb(capacity)
+            else:
+                var.fix(capacity)
+
+        if hasattr(local_energy_system, "InvestmentFlow"):
+            for (i, o), var in local_energy_system.InvestmentFlow.invest.items():
+                if (str(i), str(o)) in investments["flows"]:
+                    fix(var, investments["flows"][(str(i), str(o))])
+        if hasattr(local_energy_system, "GenericInvestmentStorageBlock"):
+            block = local_energy_system.GenericInvestmentStorageBlock
+            for n, var in block.invest.items():
+                if str(n) in investments["storages"]:
+                    fix(var, investments["storages"][str(n)])
+
+    def store_objective_gap(dict_values, investments):
+        """
+        Adds the objective value of the first stage and its gap to the second stage to the results
+
+        The gap is relative to the objective value of the second stage, which is the cost of the
+        energy system with the capacities of the first stage at full resolution.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs, including the SIMULATION_RESULTS of the second stage
+
+        investments: dict
+            Investments as returned by :func:`two_stage_planning.optimize_investments`
+
+        Returns
+        -------
+        Updated SIMULATION_RESULTS of dict_values with INVESTMENT_STAGE_OBJECTIVE_VALUE and
+        TWO_STAGE_OBJECTIVE_GAP
+
+        Notes
+        -----
+        Tested with:
+        - test_store_objective_gap
+        """
+        objective_investment_stage = investments[OBJECTIVE_VALUE]
+        objective = dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+        if objective != 0:
+            gap = (objective - objective_investment_stage) / abs(objective)
+        else:
+            gap = 0
+        dict_values[SIMULATION_RESULTS].update(
+            {
+                INVESTMENT_STAGE_OBJECTIVE_VALUE: objective_investment_stage,
+                TWO_STAGE_OBJECTIVE_GAP: gap,
+            }
+        )
+        logging.info(
+            f"Two stage planning: the objective value of the dispatch at full resolution "
+            f"deviates by {round(gap * 100, 2)} % from the one of the capacity optimization."
+        )
+
+
+class timestep_segmentation:
+    def is_requested(dict_values):
+        """
+        Decides if the energy system is optimized with timesteps of variable length
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        Returns
+        -------
+        True if TIMESTEP_SEGMENTATION is set in the simulation settings and SEGMENTATION_RATIO
+        is between 0 and 1. Otherwise a warning is logged if applicable and False is returned,
+        so that the simulation is run with the timesteps of the input timeseries.
+
+        Notes
+        -----
+        Tested with:
+        - test_timestep_segmentation_is_requested_default
+        - test_timestep_segmentation_is_requested_segmentation_ratio_out_of_bounds
+        """
+        settings = dict_values[SIMULATION_SETTINGS]
+        requested = settings.get(TIMESTEP_SEGMENTATION, {VALUE: False})[VALUE]
+        segmentation_ratio = settings.get(SEGMENTATION_RATIO, {VALUE: 0.25})[VALUE]
+        if requested is True and not 0 < segmentation_ratio < 1:
+            logging.warning(
+                f"The parameter {TIMESTEP_SEGMENTATION} is set but the {SEGMENTATION_RATIO} "
+                f"of {segmentation_ratio} is not between 0 and 1, the simulation is run with "
+                f"the timesteps of the input timeseries instead."
+            )
+            requested = False
+        return requested
+
+    def define_segments(dict_values):
+        """
+        Merges consecutive timesteps of similar input timeseries into segments
+
+        All pandas.Series indexed with the time index of the simulation are normalized by their
+        maximal absolute value. Starting with one segment per timestep, the two neighbouring
+        segments whose merge increases the variance of the normalized timeseries within the
+        segments the least (Ward's criterion) are merged, until the number of segments is the
+        share SEGMENTATION_RATIO of the number of timesteps. Segments therefore stay short
+        around peaks and steep changes of the timeseries and get long in periods of low
+        variance, for example at night. Segments never span two peak demand pricing periods.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        Returns
+        -------
+        numpy.ndarray
+            Number of the segment of each timestep, increasing from 0
+
+        Notes
+        -----
+        Tested with:
+        - test_define_segments
+        - test_define_segments_peak_demand_pricing_periods
+        """
+        settings = dict_values[SIMULATION_SETTINGS]
+        time_index = settings[TIME_INDEX]
+        number_of_timesteps = len(time_index)
+        segmentation_ratio = settings.get(SEGMENTATION_RATIO, {VALUE: 0.25})[VALUE]
+        number_of_segments = max(
+            1, int(round(segmentation_ratio * number_of_timesteps))
+        )
+
+        profiles = {}
+
+        def collect(item):
+            if isinstance(item, dict):
+                for value in item.values():
+                    collect(value)
+            elif isinstance(item, list):
+                for value in item:
+                    collect(value)
+            elif isinstance(item, pd.Series) and item.index.equals(time_index):
+                values = item.values.astype(float)
+                maximum = np.abs(values).max()
+                if maximum > 0 and values.min() != values.max():
+                    profiles[id(item)] = values / maximum
+
+        collect(dict_values)
+        profiles = np.array(list(profiles.values())).reshape(-1, number_of_timesteps).T
+
+        # Timesteps at which a new peak demand pricing period starts
+        period_starts = np.zeros(number_of_timesteps, dtype=bool)
+        for dso in dict_values.get(ENERGY_PROVIDERS, {}).values():
+            period_of_timestep = np.zeros(number_of_timesteps, dtype=int)
+            for number, label in enumerate(
+                dso.get(CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS, []), 1
+            ):
+                availability = dict_values[ENERGY_CONVERSION][label].get(
+                    AVAILABILITY_DISPATCH
+                )
+                if isinstance(availability, pd.Series):
+                    period_of_timestep[availability.values > 0] = number
+            period_starts[1:] |= np.diff(period_of_timestep) != 0
+
+        # Each segment is represented by its first timestep
+        size = np.ones(number_of_timesteps)
+        total = profiles.copy()
+        next_segment = np.arange(1, number_of_timesteps + 1)
+        previous_segment = np.arange(-1, number_of_timesteps - 1)
+        merged = np.zeros(number_of_timesteps, dtype=bool)
+
+        def merge_cost(a, b):
+            difference = total[a] / size[a] - total[b] / size[b]
+            return size[a] * size[b] / (size[a] + size[b]) * difference.dot(difference)
+
+        candidates = [
+            (merge_cost(t - 1, t), t - 1, t, 1, 1)
+            for t in range(1, number_of_timesteps)
+            if not period_starts[t]
+        ]
+        heapq.heapify(candidates)
+        segments = number_of_timesteps
+        while segments > number_of_segments and len(candidates) > 0:
+            cost, a, b, size_a, size_b = heapq.heappop(candidates)
+            # Skip candidates whose segments were changed since they were added
+            if (
+                merged[a]
+                or merged[b]
+                or next_segment[a] != b
+                or size[a] != size_a
+                or size[b] != size_b
+            ):
+                continue
+            size[a] += size[b]
+            total[a] += total[b]
+            merged[b] = True
+            next_segment[a] = next_segment[b]
+            if next_segment[b] < number_of_timesteps:
+                previous_segment[next_segment[b]] = a
+            segments -= 1
+            for left, right in ((previous_segment[a], a), (a, next_segment[a])):
+                if (
+                    0 <= left
+                    and right < number_of_timesteps
+                    and not period_starts[right]
+                ):
+                    heapq.heappush(
+                        candidates,
+                        (merge_cost(left, right), left, right, size[left], size[right]),
+                    )
+
+        logging.info(
+            f"Timestep segmentation: {number_of_timesteps} timesteps are merged into "
+            f"{segments} segments."
+        )
+        return np.cumsum(~merged) - 1
+
+    def aggregate_segments(dict_values, segments, aggregated_time_index=None):
+        """
+        Aggregates the timesteps of each segment in all timeseries of the simulation inputs
+
+        All pandas.Series indexed with the time index of the simulation are replaced by their
+        mean in each segment, so that the energy of the timeseries is kept. The time index and
+        number of periods of the simulation settings are adapted accordingly and the length of
+        each segment is stored as TIMESTEP_DURATIONS. oemof weights the flows of the segments
+        with their length in the objective and the storage balances, the constraints on energy
+        amounts with `D2.energy_of_flow`.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        segments: numpy.ndarray
+            Number of the segment of each timestep, increasing from 0
+
+        aggregated_time_index: pandas.DatetimeIndex
+            Time index of the segments.
+            Default: None, the first timestep of each segment.
+
+        Returns
+        -------
+        dict
+            Aggregated simulation inputs. The nested dicts and lists are copied, the other
+            values are shared with dict_values.
+
+        Notes
+        -----
+        Tested with:
+        - test_aggregate_segments
+        - test_aggregate_timesteps
+        """
+        settings = dict_values[SIMULATION_SETTINGS]
+        time_index = settings[TIME_INDEX]
+        segment_starts = np.flatnonzero(np.diff(segments, prepend=-1))
+        if aggregated_time_index is None:
+            aggregated_time_index = time_index[segment_starts]
+        durations = (
+            np.diff(np.append(segment_starts, len(time_index)))
+            * settings[TIMESTEP][VALUE]
+        )
+
+        def aggregate(item):
+            if isinstance(item, dict):
+                return {key: aggregate(value) for key, value in item.items()}
+            elif isinstance(item, list):
+                return [aggregate(value) for value in item]
+            elif isinstance(item, pd.Series) and item.index.equals(time_index):
+                return pd.Series(
+                    item.groupby(segments).mean().values, index=aggregated_time_index
+                )
+            else:
+                return item
+
+        dict_aggregated = aggregate(dict_values)
+        dict_aggregated[SIMULATION_SETTINGS].update(
+            {
+                TIME_INDEX: aggregated_time_index,
+                PERIODS: len(aggregated_time_index),
+                TIMESTEP_DURATIONS: {
+                    VALUE: durations.tolist(),
+                    UNIT: settings[TIMESTEP][UNIT],
+                },
+            }
+        )
+        return dict_aggregated
+
+    def expand_results(dict_values, results_main, segments):
+        """
+        Expands the results of the segments to the time index of the simulation
+
+        The flows are constant within each segment. The storage contents, which oemof reports
+        at the end of each segment, are interpolated linearly between the ends of the segments,
+        starting from the content at the end of the simulation as storages are balanced. The
+        sums of the flows over the simulation period are thereby the ones of the optimization,
+        so that the results are evaluated as without segmentation.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        results_main: dict
+            Main results of the optimization with segments
+
+        segments: numpy.ndarray
+            Number of the segment of each timestep, increasing from 0
+
+        Returns
+        -------
+        dict
+            Main results with the sequences indexed by the time index of the simulation
+
+        Notes
+        -----
+        Tested with:
+        - test_expand_results
+        """
+        time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+        segment_ends = np.flatnonzero(np.diff(segments, append=segments[-1] + 1))
+        expanded_results = {}
+        for key, results in results_main.items():
+            sequences = results["sequences"]
+            expanded = pd.DataFrame(
+                sequences.values[segments], index=time_index, columns=sequences.columns
+            )
+            for column in sequences.columns:
+                if column == "storage_content":
+                    content = sequences[column].values
+                    expanded[column] = np.interp(
+                        np.arange(len(time_index)),
+                        np.append(-1, segment_ends),
+                        np.append(content[-1], content),
+                    )
+            expanded_results[key] = {**results, "sequences": expanded}
+        return expanded_results
+
+
+class cost_ranging:
+    def is_requested(dict_values):
+        """
+        Decides if the cost ranges of the optimized assets are derived from the reduced costs
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        Returns
+        -------
+        True if COST_RANGING is set in the simulation settings and the model is solved with the
+        cbc solver. Otherwise a warning is logged if applicable and False is returned, as the
+        reduced costs are only imported from the cbc solver.
+
+        Notes
+        -----
+        Tested with:
+        - test_cost_ranging_is_requested_default
+        - test_cost_ranging_is_requested_with_in_memory_solver
+        """
+        requested = dict_values[SIMULATION_SETTINGS].get(COST_RANGING, {VALUE: False})[
+            VALUE
+        ]
+        if requested is True and in_memory_solver.is_requested(dict_values):
+            logging.warning(
+                f"The parameter {COST_RANGING} is set but the reduced costs are only "
+                f"imported from the cbc solver and the parameter {IN_MEMORY_SOLVER} is set, "
+                f"the cost ranges of the optimized assets are not evaluated."
+            )
+            requested = False
+        return requested
+
+    def import_reduced_costs(local_energy_system):
+        """
+        Lets the solver return the reduced costs of the variables of the model
+
+        Unlike `oemof.solph.Model.receive_duals()`, the duals of the constraints are not
+        imported, so that they are not added to the results of the busses.
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object of the energy system model, before it is solved
+
+        Returns
+        -------
+        Nothing, the reduced costs are imported into the `rc` suffix of local_energy_system.
+        """
+        del local_energy_system.rc
+        local_energy_system.rc = Suffix(direction=Suffix.IMPORT)
+
+    def evaluate(dict_values, local_energy_system):
+        """
+        Derives the cost ranges of the optimized assets from the reduced costs of the solved model
+
+        The annuity (SIMULATION_ANNUITY, the `ep_costs` of the investment) and the DISPATCH_PRICE
+        of an optimized asset are the cost coefficients of its investment variable and of the
+        flow variables of its investment flow. If the cost parameter changes by an amount, the
+        reduced costs of these variables change by that amount times their weight in the
+        objective function. The optimal basis, and so the capacity and dispatch decision of the
+        asset, stays the same as long as all variables with a positive reduced cost (at their
+        lower bound, e.g. no investment) keep a non-negative one and all variables with a negative
+        reduced cost (at their upper bound, e.g. investment up to MAXIMUM_ADD_CAP) keep a
+        non-positive one. For a timeseries, the range applies to its mean, with all values
+        shifted by the same amount.
+
+        If one of the variables has a reduced cost of 0, it is in the optimal basis (e.g. an
+        investment between 0 and MAXIMUM_ADD_CAP) and its cost range can not be derived from the
+        reduced costs alone: the range is then NaN. The ranges are only valid for the change of
+        one cost parameter at a time.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs, used to build the model
+
+        local_energy_system: object
+            pyomo object of the energy system model solved with the reduced costs imported in
+            its `rc` suffix
+
+        Returns
+        -------
+        dict
+            Per label of optimized asset (or storage subasset) and cost parameter, the VALUE of
+            the parameter and the COST_RANGE_MINIMUM and COST_RANGE_MAXIMUM between which the
+            optimal basis stays the same, in the units of the asset. Unbounded ranges are
+            -inf or inf.
+
+        Notes
+        -----
+        Tested with:
+        - test_cost_ranging_evaluate
+        """
+        # weight of the cost parameters of the assets in the cost coefficients of the model
+        weight = 1.0
+        if LP_SCALING in dict_values:
+            weight = (
+                dict_values[LP_SCALING][ENERGY_SCALING_FACTOR][VALUE]
+                / dict_values[LP_SCALING][COST_SCALING_FACTOR][VALUE]
+            )
+
+        assets = {}
+        for asset_group in ACCEPTED_ASSETS_FOR_ASSET_GROUPS:
+            for dict_asset in dict_values.get(asset_group, {}).values():
+                assets.update({dict_asset[LABEL]: dict_asset})
+
+        # variables of the cost parameters of each (sub)asset, with their weight
+        variables = {}
+
+        def add_variables(dict_asset, parameter, items):
+            variables.setdefault(dict_asset[LABEL], (dict_asset, {}))[1].setdefault(
+                parameter, []
+            ).extend(items)
+
+        if hasattr(local_energy_system, "InvestmentFlow"):
+            for (i, o), var in local_energy_system.InvestmentFlow.invest.items():
+                if str(i) in assets:
+                    dict_asset = assets[str(i)]
+                    subasset = OUTPUT_POWER
+                elif str(o) in assets:
+                    dict_asset = assets[str(o)]
+                    subasset = INPUT_POWER
+                else:
+                    continue
+                asset_weight = weight
+                if dict_asset[OEMOF_ASSET_TYPE] == OEMOF_GEN_STORAGE:
+                    dict_asset = dict_asset[subasset]
+                elif (
+                    dict_asset[OEMOF_ASSET_TYPE] == OEMOF_SOURCE
+                    and TIMESERIES_NORMALIZED in dict_asset
+                ):
+                    # the costs of sources with normalized timeseries are divided by their peak
+                    asset_weight = weight / dict_asset[TIMESERIES_PEAK][VALUE]
+                add_variables(dict_asset, SIMULATION_ANNUITY, [(var, asset_weight)])
+                add_variables(
+                    dict_asset,
+                    DISPATCH_PRICE,
+                    [
+                        (
+                            local_energy_system.flow[i, o, t],
+                            asset_weight * local_energy_system.objective_weighting[t],
+                        )
+                        for t in local_energy_system.TIMESTEPS
+                    ],
+                )
+        if hasattr(local_energy_system, "GenericInvestmentStorageBlock"):
+            block = local_energy_system.GenericInvestmentStorageBlock
+            for n, var in block.invest.items():
+                if str(n) in assets:
+                    add_variables(
+                        assets[str(n)][STORAGE_CAPACITY],
+                        SIMULATION_ANNUITY,
+                        [(var, weight)],
+                    )
+
+        cost_ranges = {}
+        for label, (dict_asset, parameters) in variables.items():
+            cost_ranges.update({label: {}})
+            for parameter, items in parameters.items():
+                parameter_value = float(
+                    np.mean(np.asarray(dict_asset[parameter][VALUE], dtype=float))
+                )
+                tolerance = 1e-6 * max(1, abs(parameter_value))
+                minimum = -np.inf
+                maximum = np.inf
+                for var, var_weight in items:
+                    reduced_cost = local_energy_system.rc.get(var)
+                    # fixed variables are not part of the linear program
+                    if reduced_cost is None:
+                        continue
+                    # change of the cost parameter which sets the reduced cost to 0
+                    shift = -reduced_cost / var_weight
+                    if shift < -tolerance:
+                        minimum = max(minimum, shift)
+                    elif shift > tolerance:
+                        maximum = min(maximum, shift)
+                    else:
+                        minimum = maximum = np.nan
+                        break
+                if minimum == -np.inf and maximum == np.inf:
+                    minimum = maximum = np.nan
+                cost_ranges[label].update(
+                    {
+                        parameter: {
+                            VALUE: parameter_value,
+                            COST_RANGE_MINIMUM: parameter_value + minimum,
+                            COST_RANGE_MAXIMUM: parameter_value + maximum,
+                        }
+                    }
+                )
+        logging.debug(
+            f"Evaluated the cost ranges of {len(cost_ranges)} optimized assets from the "
+            f"reduced costs."
+        )
+        return cost_ranges
+
+
+class pareto_front:
+    def add_emission_bound(local_energy_system):
+        """
+        Adds the emissions of the energy system as bounded expression and as alternative objective
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model
+
+        Returns
+        -------
+        Nothing, the model is extended by
+        - the expression `pareto_emissions`, see `D2.emissions_of_energy_system`,
+        - the mutable parameter `pareto_emission_bound` and the constraint
+          `pareto_emission_constraint` bounding the emissions by it, deactivated,
+        - the objective `pareto_emission_objective` minimizing the emissions, deactivated.
+
+        Notes
+        -----
+        Tested with:
+        - test_pareto_front_add_emission_bound
+        """
+        local_energy_system.pareto_emissions = Expression(
+            expr=D2.emissions_of_energy_system(local_energy_system)
+        )
+        local_energy_system.pareto_emission_bound = Param(initialize=0, mutable=True)
+        local_energy_system.pareto_emission_constraint = Constraint(
+            expr=local_energy_system.pareto_emissions
+            <= local_energy_system.pareto_emission_bound
+        )
+        local_energy_system.pareto_emission_constraint.deactivate()
+        local_energy_system.pareto_emission_objective = Objective(
+            expr=local_energy_system.pareto_emissions
+        )
+        local_energy_system.pareto_emission_objective.deactivate()
+
+    def solve_points(dict_values, number_of_points):
+        """
+        Solves the points of the pareto front of the costs and emissions of the energy system
+
+        The pareto front is generated with the epsilon-constraint method: the cost optimum and
+        the minimal emissions of the energy system are the anchor points of the front, in between
+        the costs are minimized with the emissions bounded by equidistant values. The model is
+        only built once, the points are solved by changing the bound of the emissions.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs, processed by C0
+
+        number_of_points: int
+            Number of points of the pareto front, including both anchor points. Only the cost
+            optimum is solved if it has the minimal emissions.
+
+        Yields
+        ------
+        Tuple of the emission bound in kgCO2eq, the simulation inputs of the point with their
+        SIMULATION_RESULTS, and the meta and main results of the optimization, as returned by
+        `run_oemof`, starting with the cost optimum (emission bound None).
+
+        Notes
+        -----
+        The two stage planning is not applied, as the capacities are the outcome of each point.
+        The cost ranges are not evaluated.
+
+        Tested with:
+        - test_pareto_front_solve_points
+        - test_pareto_front_solve_points_too_few_points
+        """
+        if number_of_points < 2:
+            raise ValueError(
+                f"The pareto front needs at least two points, {number_of_points} were requested."
+            )
+        if dict_values[SIMULATION_SETTINGS].get(TWO_STAGE_PLANNING, {VALUE: False})[
+            VALUE
+        ]:
+            logging.warning(
+                f"The parameter {TWO_STAGE_PLANNING} is not applied to the points of the "
+                f"pareto front, they are optimized in a single stage."
+            )
+
+        model_building.define_lp_scaling(dict_values)
+
+        segments = None
+        dict_model_values = dict_values
+        if timestep_segmentation.is_requested(dict_values):
+            segments = timestep_segmentation.define_segments(dict_values)
+            dict_model_values = timestep_segmentation.aggregate_segments(
+                dict_values, segments
+            )
+
+        model, local_energy_system = model_building.build_oemof_model(dict_model_values)
+        pareto_front.add_emission_bound(local_energy_system)
+
+        def solve(emission_bound):
+            start = timer.initalize()
+            dict_point = copy.deepcopy(dict_values)
+            model_point, results_main, results_meta = model_building.simulating(
+                dict_point, model, local_energy_system
+            )
+            if segments is not None:
+                results_main = timestep_segmentation.expand_results(
+                    dict_values, results_main, segments
+                )
+                results_meta = results_main
+            dict_point[SIMULATION_RESULTS].update(
+                {EMISSION_BOUND: {VALUE: emission_bound, UNIT: UNIT_EMISSIONS}}
+            )
+            timer.stop(dict_point, start)
+            return emission_bound, dict_point, results_meta, results_main
+
+        cost_optimum = solve(None)
+        maximal_emissions = value(local_energy_system.pareto_emissions)
+        yield cost_optimum
+
+        local_energy_system.objective.deactivate()
+        local_energy_system.pareto_emission_objective.activate()
+        model_building.simulating(
+            copy.deepcopy(dict_values), model, local_energy_system
+        )
+        minimal_emissions = value(local_energy_system.pareto_emissions)
+        local_energy_system.pareto_emission_objective.deactivate()
+        local_energy_system.objective.activate()
+
+        tolerance = 1e-6 * max(1, abs(minimal_emissions))
+        if maximal_emissions - minimal_emissions <= tolerance:
+            logging.warning(
+                f"The emissions of the cost optimum ({maximal_emissions} {UNIT_EMISSIONS}) "
+                f"are the minimal emissions of the energy system, the pareto front consists "
+                f"of a single point."
+            )
+            return
+
+        local_energy_system.pareto_emission_constraint.activate()
+        emission_bounds = np.linspace(
+            maximal_emissions, minimal_emissions, number_of_points
+        )[1:]
+        for point, emission_bound in enumerate(emission_bounds, start=2):
+            logging.info(
+                f"Solving point {point} of {number_of_points} of the pareto front with "
+                f"emissions of at most {round(emission_bound, 2)} {UNIT_EMISSIONS}."
+            )
+            # the tolerance avoids an infeasible anchor point due to the solver's tolerances
+            local_energy_system.pareto_emission_bound = emission_bound + tolerance
+            yield solve(float(emission_bound))
+        local_energy_system.pareto_emission_constraint.deactivate()
+
+
+class solution_strategy:
+    def estimate_lp_size(dict_values, number_of_timesteps=None):
+        """
+        Estimates the size and memory of the linear program before the model is built
+
+        The variables, constraints and nonzero coefficients are counted from the assets the way
+        they are added to the oemof model (see `model_building.adding_assets_to_energysystem_model`
+        and `D1_model_components`): each flow which is not fixed is a variable per timestep and
+        a coefficient of the balance of its bus, the capacity of an optimized flow bounds it in
+        a constraint per timestep, a transformer relates each of its inputs to each output and a
+        storage adds its content and balance. Each constraint of `D2.add_constraints` adds one row
+        with the flows of the sources. The memory is derived with BYTES_PER_VARIABLE,
+        BYTES_PER_CONSTRAINT and BYTES_PER_NONZERO.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs, processed by C0
+
+        number_of_timesteps: int
+            Number of timesteps of the linear program.
+            Default: None, the number of timesteps of the simulation.
+
+        Returns
+        -------
+        dict
+            NUMBER_OF_VARIABLES, NUMBER_OF_CONSTRAINTS, NUMBER_OF_NONZEROS and the PEAK_MEMORY in MB
+
+        Notes
+        -----
+        Tested with:
+        - test_estimate_lp_size
+        - test_estimate_lp_size_number_of_timesteps
+        """
+        if number_of_timesteps is None:
+            number_of_timesteps = len(dict_values[SIMULATION_SETTINGS][TIME_INDEX])
+        reduced_model = dict_values.get(
+            REDUCED_MODEL,
+            {REMOVED_ASSETS: {}, MERGED_BUSSES: {}, AGGREGATED_ASSETS: {}},
+        )
+        aggregated_assets = {
+            asset
+            for representative, assets in reduced_model[AGGREGATED_ASSETS].items()
+            for asset in assets
+            if asset != representative
+        }
+
+        # counts per timestep and constant counts of variables, constraints and nonzeros
+        per_timestep = np.zeros(3)
+        constant = np.zeros(3)
+        per_timestep += [
+            0,
+            len(
+                [
+                    bus
+                    for bus in dict_values[ENERGY_BUSSES]
+                    if bus not in reduced_model[MERGED_BUSSES]
+                ]
+            ),
+            0,
+        ]
+
+        def number_of_flows(dict_asset, direction):
+            flows = dict_asset.get(direction, [])
+            return len(flows) if isinstance(flows, list) else 1
+
+        source_flows = 0
+        peak_demand_pricing_sources = set()
+        for asset_group in ACCEPTED_ASSETS_FOR_ASSET_GROUPS:
+            for asset, dict_asset in dict_values.get(asset_group, {}).items():
+                if dict_asset.get(PEAK_DEMAND_PRICING_CONSTRAINT, False) is True:
+                    # one peak demand variable per period, see D2.constraint_peak_demand_pricing
+                    constant += [1, 0, 0]
+                    peak_demand_pricing_sources.add(
+                        dict_asset[CONNECTED_CONSUMPTION_SOURCE]
+                    )
+                    continue
+                if asset in reduced_model[REMOVED_ASSETS] or asset in aggregated_assets:
+                    continue
+                optimize = dict_asset.get(OPTIMIZE_CAP, {VALUE: False})[VALUE] is True
+                inputs = number_of_flows(dict_asset, INFLOW_DIRECTION)
+                outputs = number_of_flows(dict_asset, OUTFLOW_DIRECTION)
+                asset_type = dict_asset[OEMOF_ASSET_TYPE]
+                if asset_type == OEMOF_TRANSFORMER:
+                    flows = inputs + outputs
+                    invest_flows = outputs if optimize else 0
+                    # conversion relation of each input to each output
+                    per_timestep += [0, inputs * outputs, 2 * inputs * outputs]
+                elif asset_type == OEMOF_GEN_STORAGE:
+                    flows = 2
+                    invest_flows = 2 if optimize else 0
+                    # storage content and storage balance
+                    per_timestep += [1, 1, 4]
+                    if optimize:
+                        soc_min = dict_asset[STORAGE_CAPACITY].get(SOC_MIN, {VALUE: 0})
+                        content_bounds = 2 if np.any(soc_min[VALUE]) else 1
+                        per_timestep += [0, content_bounds, 2 * content_bounds]
+                        constant += [2, 3, 6]
+                elif asset_type == OEMOF_SOURCE:
+                    fixed = dict_asset.get(DISPATCHABILITY) is not True and not optimize
+                    flows = 0 if fixed else outputs
+                    invest_flows = outputs if optimize else 0
+                    source_flows += flows
+                else:
+                    fixed = TIMESERIES in dict_asset
+                    flows = 0 if fixed else inputs
+                    invest_flows = 0 if fixed else inputs
+                # each flow is a variable and a coefficient of its bus balance, each optimized
+                # flow is bounded by its capacity
+                per_timestep += [flows, invest_flows, flows + 2 * invest_flows]
+                constant += [invest_flows, 0, 0]
+
+        per_timestep += [
+            0,
+            len(peak_demand_pricing_sources),
+            2 * len(peak_demand_pricing_sources),
+        ]
+        for constraint in dict_values.get(CONSTRAINTS, {}).values():
+            if constraint.get(VALUE) not in (None, False, 0):
+                constant += [0, 1, 0]
+                per_timestep += [0, 0, source_flows]
+
+        variables, constraints, nonzeros = (
+            per_timestep * number_of_timesteps + constant
+        ).astype(int)
+        peak_memory = (
+            variables * BYTES_PER_VARIABLE
+            + constraints * BYTES_PER_CONSTRAINT
+            + nonzeros * BYTES_PER_NONZERO
+        ) / 1e6
+        return {
+            NUMBER_OF_VARIABLES: {VALUE: int(variables), UNIT: "variables"},
+            NUMBER_OF_CONSTRAINTS: {VALUE: int(constraints), UNIT: "constraints"},
+            NUMBER_OF_NONZEROS: {VALUE: int(nonzeros), UNIT: "nonzeros"},
+            PEAK_MEMORY: {VALUE: peak_memory, UNIT: "MB"},
+        }
+
+    def select(dict_values):
+        """
+        Selects the strategy to solve the energy system within the memory budget
+
+        If the estimated memory of the linear program exceeds the MEMORY_BUDGET of the simulation
+        settings, the timesteps are segmented (see `timestep_segmentation`) with the largest
+        SEGMENTATION_RATIO for which the estimated memory is within the budget. The simulation
+        settings are updated accordingly.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs, processed by C0
+
+        Returns
+        -------
+        dict
+            Estimate of the size of the linear program which is solved, see `estimate_lp_size`
+
+        Raises
+        ------
+        MemoryBudgetExceededError
+            If the linear program exceeds the memory budget even with a single timestep, so that
+            the simulation fails before the model is built instead of running out of memory
+
+        Notes
+        -----
+        The two stage planning does not reduce the memory, as the dispatch is optimized at full
+        resolution.
+
+        Tested with:
+        - test_solution_strategy_select_without_memory_budget
+        - test_solution_strategy_select_within_memory_budget
+        - test_solution_strategy_select_timestep_segmentation
+        - test_solution_strategy_select_memory_budget_exceeded
+        """
+        settings = dict_values[SIMULATION_SETTINGS]
+        memory_budget = settings.get(MEMORY_BUDGET, {VALUE: None})[VALUE]
+        number_of_timesteps = len(settings[TIME_INDEX])
+        if timestep_segmentation.is_requested(dict_values):
+            number_of_timesteps = max(
+                1,
+                int(round(settings[SEGMENTATION_RATIO][VALUE] * number_of_timesteps)),
+            )
+        lp_size_estimate = solution_strategy.estimate_lp_size(
+            dict_values, number_of_timesteps
+        )
+        peak_memory = lp_size_estimate[PEAK_MEMORY][VALUE]
+        logging.info(
+            f"The linear program is estimated to have {lp_size_estimate[NUMBER_OF_VARIABLES][VALUE]} "
+            f"variables, {lp_size_estimate[NUMBER_OF_CONSTRAINTS][VALUE]} constraints and "
+            f"{lp_size_estimate[NUMBER_OF_NONZEROS][VALUE]} nonzeros, using {round(peak_memory, 1)} MB."
+        )
+        if memory_budget is None or peak_memory <= memory_budget:
+            return lp_size_estimate
+
+        # the memory grows linearly with the number of timesteps
+        memory_without_timesteps = solution_strategy.estimate_lp_size(dict_values, 0)[
+            PEAK_MEMORY
+        ][VALUE]
+        memory_of_one_timestep = (
+            solution_strategy.estimate_lp_size(dict_values, 1)[PEAK_MEMORY][VALUE]
+            - memory_without_timesteps
+        )
+        number_of_segments = int(
+            (memory_budget - memory_without_timesteps) // memory_of_one_timestep
+        )
+        if number_of_segments < 1:
+            raise MemoryBudgetExceededError(
+                f"The linear program is estimated to use {round(peak_memory, 1)} MB, which exceeds the "
+                f"{MEMORY_BUDGET} of {memory_budget} MB even with timesteps segmented into a "
+                f"single segment. Increase the {MEMORY_BUDGET} or reduce the energy system."
+            )
+        segmentation_ratio = number_of_segments / len(settings[TIME_INDEX])
+        logging.warning(
+            f"The estimated memory of the linear program ({round(peak_memory, 1)} MB) exceeds the "
+            f"{MEMORY_BUDGET} of {memory_budget} MB, the timesteps are segmented with a "
+            f"{SEGMENTATION_RATIO} of {round(segmentation_ratio, 4)}."
+        )
+        settings.update(
+            {
+                TIMESTEP_SEGMENTATION: {VALUE: True, UNIT: "bool"},
+                SEGMENTATION_RATIO: {VALUE: segmentation_ratio, UNIT: "factor"},
+            }
+        )
+        return solution_strategy.estimate_lp_size(dict_values, number_of_segments)
+
+    def store(dict_values, lp_size_estimate, two_stage=False, segmented=False):
+        """
+        Stores the estimated size of the linear program and the strategy to solve it
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs, including SIMULATION_RESULTS
+
+        lp_size_estimate: dict
+            Estimate of the size of the linear program, see `solution_strategy.select`
+
+        two_stage: bool
+            True if the capacities were optimized with the two stage planning
+
+        segmented: bool
+            True if the timesteps were segmented
+
+        Returns
+        -------
+        Updated SIMULATION_RESULTS of dict_values with LP_SIZE_ESTIMATE and SOLUTION_STRATEGY,
+        TWO_STAGE_PLANNING and/or TIMESTEP_SEGMENTATION if applied, FULL_RESOLUTION otherwise
+
+        Notes
+        -----
+        Tested with:
+        - test_solution_strategy_store_full_resolution
+        - test_solution_strategy_mvs_runthrough
+        """
+        strategies = [
+            strategy
+            for strategy, applied in [
+                (TWO_STAGE_PLANNING, two_stage),
+                (TIMESTEP_SEGMENTATION, segmented),
+            ]
+            if applied is True
+        ]
+        dict_values[SIMULATION_RESULTS].update(
+            {
+                LP_SIZE_ESTIMATE: lp_size_estimate,
+                SOLUTION_STRATEGY: {
+                    VALUE: ", ".join(strategies or [FULL_RESOLUTION]),
+                    UNIT: TYPE_STR,
+                },
+            }
+        )
+
+
 class timer:
     def initalize():
         """
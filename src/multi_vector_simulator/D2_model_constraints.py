@@ -10,12 +10,19 @@ Future constraints are discussed in issue #133 (https://github.com/rl-institut/m
 constraints should be tested in-code (examples) and by comparing the lp file generated.
 """
 import logging
+from contextlib import contextmanager
+
+import numpy as np
 import pyomo.environ as po
 from oemof.solph import constraints
+from oemof.solph.plumbing import sequence
 
 from multi_vector_simulator.utils.constants import DEFAULT_WEIGHTS_ENERGY_CARRIERS
 
 from multi_vector_simulator.utils.constants_json_strings import (
+    LP_SCALING,
+    ENERGY_SCALING_FACTOR,
+    COST_SCALING_FACTOR,
     OEMOF_SOURCE,
     OEMOF_SINK,
     OEMOF_BUSSES,
@@ -37,6 +44,16 @@ from multi_vector_simulator.utils.constants_json_strings import (
     MINIMAL_DEGREE_OF_AUTONOMY,
     DSO_FEEDIN,
     NET_ZERO_ENERGY,
+    ENERGY_CONVERSION,
+    CONNECTED_CONSUMPTION_SOURCE,
+    CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS,
+    PEAK_DEMAND_PRICING_CONSTRAINT,
+    AVAILABILITY_DISPATCH,
+    SIMULATION_ANNUITY,
+    MAXIMUM_ADD_CAP,
+    INSTALLED_CAP,
+    OPTIMIZED_PEAK_DEMAND,
+    UNIT,
 )
 
 # Keys for dicts renewable_assets and non_renewable_assets
@@ -45,6 +62,9 @@ WEIGHTING_FACTOR_ENERGY_CARRIER = "weighting_factor_energy_carrier"
 RENEWABLE_SHARE_ASSET_FLOW = "renewable_share_asset_flow"
 OEMOF_SOLPH_OBJECT_BUS = "oemof_solph_object_bus"
 
+# Prefix of the pyomo block holding the peak demand variables of an energy provider
+PEAK_DEMAND_PRICING_BLOCK = "peak_demand_pricing_"
+
 
 def add_constraints(local_energy_system, dict_values, dict_model):
     r"""
@@ -107,6 +127,10 @@ def add_constraints(local_energy_system, dict_values, dict_model):
     else:
         logging.debug(f"Number of added constraints: {count_added_constraints}")
 
+    # The peak demand pricing is part of the energy system model rather than a constraint set by
+    # the user, it is therefore not counted
+    constraint_peak_demand_pricing(local_energy_system, dict_values, dict_model)
+
     return local_energy_system
 
 
@@ -187,12 +211,10 @@ def constraint_minimal_renewable_share(model, dict_values, dict_model):
             # Get the flows from all renewable assets
             for asset in renewable_assets:
                 generation = (
-                    sum(
-                        model.flow[
-                            renewable_assets[asset][OEMOF_SOLPH_OBJECT_ASSET],
-                            renewable_assets[asset][OEMOF_SOLPH_OBJECT_BUS],
-                            :,
-                        ]
+                    energy_of_flow(
+                        model,
+                        renewable_assets[asset][OEMOF_SOLPH_OBJECT_ASSET],
+                        renewable_assets[asset][OEMOF_SOLPH_OBJECT_BUS],
                     )
                     * renewable_assets[asset][WEIGHTING_FACTOR_ENERGY_CARRIER]
                     * renewable_assets[asset][RENEWABLE_SHARE_ASSET_FLOW]
@@ -203,12 +225,10 @@ def constraint_minimal_renewable_share(model, dict_values, dict_model):
             # Get the flows from all non renewable assets
             for asset in non_renewable_assets:
                 generation = (
-                    sum(
-                        model.flow[
-                            non_renewable_assets[asset][OEMOF_SOLPH_OBJECT_ASSET],
-                            non_renewable_assets[asset][OEMOF_SOLPH_OBJECT_BUS],
-                            :,
-                        ]
+                    energy_of_flow(
+                        model,
+                        non_renewable_assets[asset][OEMOF_SOLPH_OBJECT_ASSET],
+                        non_renewable_assets[asset][OEMOF_SOLPH_OBJECT_BUS],
                     )
                     * non_renewable_assets[asset][WEIGHTING_FACTOR_ENERGY_CARRIER]
                     * (1 - non_renewable_assets[asset][RENEWABLE_SHARE_ASSET_FLOW])
@@ -267,6 +287,9 @@ def prepare_constraint_minimal_renewable_share(
     # DSO sources are added separately (as they do not have parameter "RENEWABLE_ASSET_BOOL".
     assets_without_renewable_asset_bool = []
     for asset in dict_values[ENERGY_PRODUCTION]:
+        # Assets removed by C3.reduce_energy_system_model are not part of the model
+        if dict_values[ENERGY_PRODUCTION][asset][LABEL] not in dict_model[OEMOF_SOURCE]:
+            continue
         if RENEWABLE_ASSET_BOOL in dict_values[ENERGY_PRODUCTION][asset]:
             if (
                 dict_values[ENERGY_PRODUCTION][asset][RENEWABLE_ASSET_BOOL][VALUE]
@@ -440,12 +463,10 @@ def constraint_minimal_degree_of_autonomy(model, dict_values, dict_model):
             # Get the flows from demands and add weighing
             for asset in demands:
                 demand_one_asset = (
-                    sum(
-                        model.flow[
-                            demands[asset][OEMOF_SOLPH_OBJECT_BUS],
-                            demands[asset][OEMOF_SOLPH_OBJECT_ASSET],
-                            :,
-                        ]
+                    energy_of_flow(
+                        model,
+                        demands[asset][OEMOF_SOLPH_OBJECT_BUS],
+                        demands[asset][OEMOF_SOLPH_OBJECT_ASSET],
                     )
                     * demands[asset][WEIGHTING_FACTOR_ENERGY_CARRIER]
                 )
@@ -454,16 +475,14 @@ def constraint_minimal_degree_of_autonomy(model, dict_values, dict_model):
             # Get the flows from providers and add weighing
             for asset in energy_provider_consumption_sources:
                 consumption_of_one_provider = (
-                    sum(
-                        model.flow[
-                            energy_provider_consumption_sources[asset][
-                                OEMOF_SOLPH_OBJECT_ASSET
-                            ],
-                            energy_provider_consumption_sources[asset][
-                                OEMOF_SOLPH_OBJECT_BUS
-                            ],
-                            :,
-                        ]
+                    energy_of_flow(
+                        model,
+                        energy_provider_consumption_sources[asset][
+                            OEMOF_SOLPH_OBJECT_ASSET
+                        ],
+                        energy_provider_consumption_sources[asset][
+                            OEMOF_SOLPH_OBJECT_BUS
+                        ],
                     )
                     * energy_provider_consumption_sources[asset][
                         WEIGHTING_FACTOR_ENERGY_CARRIER
@@ -524,7 +543,12 @@ def prepare_demand_assets(
     # Determine energy demands
     for asset in dict_values[ENERGY_CONSUMPTION]:
         # Do not add flows into excess sink of feedin sink to the demands to be supplied
-        if EXCESS_SINK not in asset and DSO_FEEDIN not in asset:
+        # nor demands removed by C3.reduce_energy_system_model
+        if (
+            EXCESS_SINK not in asset
+            and DSO_FEEDIN not in asset
+            and dict_values[ENERGY_CONSUMPTION][asset][LABEL] in dict_model[OEMOF_SINK]
+        ):
             demands.update(
                 {
                     asset: {
@@ -728,16 +752,14 @@ def constraint_net_zero_energy(model, dict_values, dict_model):
             # Get the flows from provider sources and add weighing
             for asset in energy_provider_consumption_sources:
                 consumption_of_one_provider = (
-                    sum(
-                        model.flow[
-                            energy_provider_consumption_sources[asset][
-                                OEMOF_SOLPH_OBJECT_ASSET
-                            ],
-                            energy_provider_consumption_sources[asset][
-                                OEMOF_SOLPH_OBJECT_BUS
-                            ],
-                            :,
-                        ]
+                    energy_of_flow(
+                        model,
+                        energy_provider_consumption_sources[asset][
+                            OEMOF_SOLPH_OBJECT_ASSET
+                        ],
+                        energy_provider_consumption_sources[asset][
+                            OEMOF_SOLPH_OBJECT_BUS
+                        ],
                     )
                     * energy_provider_consumption_sources[asset][
                         WEIGHTING_FACTOR_ENERGY_CARRIER
@@ -748,14 +770,10 @@ def constraint_net_zero_energy(model, dict_values, dict_model):
             # Get the flows from provider sources and add weighing
             for asset in energy_provider_feedin_sinks:
                 feedin_of_one_provider = (
-                    sum(
-                        model.flow[
-                            energy_provider_feedin_sinks[asset][OEMOF_SOLPH_OBJECT_BUS],
-                            energy_provider_feedin_sinks[asset][
-                                OEMOF_SOLPH_OBJECT_ASSET
-                            ],
-                            :,
-                        ]
+                    energy_of_flow(
+                        model,
+                        energy_provider_feedin_sinks[asset][OEMOF_SOLPH_OBJECT_BUS],
+                        energy_provider_feedin_sinks[asset][OEMOF_SOLPH_OBJECT_ASSET],
                     )
                     * energy_provider_feedin_sinks[asset][
                         WEIGHTING_FACTOR_ENERGY_CARRIER
@@ -776,3 +794,275 @@ def constraint_net_zero_energy(model, dict_values, dict_model):
         answer = None
 
     return answer
+
+
+def lp_scaling_factors(dict_values):
+    r"""
+    Returns the energy and cost scaling factors of the linear program
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    energy: float
+        Energy scaling factor defined by `D0.model_building.define_lp_scaling`, 1 if the linear program is not scaled
+
+    costs: float
+        Cost scaling factor defined by `D0.model_building.define_lp_scaling`, 1 if the linear program is not scaled
+    """
+    lp_scaling = dict_values.get(LP_SCALING)
+    if lp_scaling is None:
+        return 1, 1
+    return (
+        lp_scaling[ENERGY_SCALING_FACTOR][VALUE],
+        lp_scaling[COST_SCALING_FACTOR][VALUE],
+    )
+
+
+def energy_of_flow(model, source, target):
+    r"""
+    Returns the energy of a flow over the simulation period as pyomo expression
+
+    Parameters
+    ----------
+    model: :oemof-solph: <oemof.solph.model>
+        Model including the flow
+
+    source: :oemof-solph: <oemof.solph.network.Node>
+        Node from which the flow starts
+
+    target: :oemof-solph: <oemof.solph.network.Node>
+        Node at which the flow ends
+
+    Returns
+    -------
+    Sum of the flow in all timesteps, weighted by their length in hours.
+
+    Notes
+    -----
+    With timesteps of different length (see `D0.timestep_segmentation`), the flows of the
+    timesteps do not weigh the same in the constraints on energy amounts. For hourly timesteps,
+    the expression equals the sum of the flow.
+
+    Tested with:
+    - D2.test_energy_of_flow()
+    """
+    return sum(
+        model.flow[source, target, t] * model.timeincrement[t] for t in model.TIMESTEPS
+    )
+
+
+def emissions_of_energy_system(model):
+    r"""
+    Returns the emissions of the energy system over the simulation period as pyomo expression
+
+    Parameters
+    ----------
+    model: :oemof-solph: <oemof.solph.model>
+        Model of the energy system
+
+    Returns
+    -------
+    Sum of the energy of all flows with an emission factor, weighted by their emission factor.
+    This is the expression bounded by `constraint_maximum_emissions`.
+
+    Notes
+    -----
+    Tested with:
+    - D2.test_emissions_of_energy_system()
+    """
+    return sum(
+        model.flow[i, o, t] * model.timeincrement[t] * sequence(flow.emission_factor)[t]
+        for (i, o), flow in model.flows.items()
+        if hasattr(flow, "emission_factor")
+        for t in model.TIMESTEPS
+    )
+
+
+def constraint_peak_demand_pricing(model, dict_values, dict_model):
+    r"""
+    Bounds the consumption from each energy provider by one peak demand variable per pricing period.
+
+    This is the compact alternative to the peak demand pricing transformers, applied to the
+    peak demand pricing assets defined by `C0.define_transformer_for_peak_demand_pricing` with
+    PEAK_DEMAND_PRICING_CONSTRAINT. Instead of an extra bus and one transformer flow per period
+    and timestep, one variable is added per period and the existing flow of the consumption source
+    is bounded by it.
+
+    Parameters
+    ----------
+    model: :oemof-solph: <oemof.solph.model>
+        Model to which constraint is added.
+
+    dict_values: dict
+        All simulation parameters
+
+    dict_model: dict of :oemof-solph: <oemof.solph.assets>
+        Dictionary including the oemof-solph component assets, which need to be connected with constraints
+
+    Notes
+    -----
+    For each pricing period :math:`p` with the availability timeseries :math:`a_p(t)` of its
+    peak demand pricing asset:
+
+    .. math::
+        E_{consumption}(t) \leq P_{installed,p} + P_{p} \qquad \forall t: a_p(t) > 0
+
+        0 \leq P_{p} \leq P_{max,add,p}
+
+    and :math:`P_{p}` is added to the objective function with the simulation annuity of the peak
+    demand pricing asset. The consumption in timesteps which do not belong to any period is 0,
+    as it is the case with the transformers. Both formulations lead to the same optimum.
+
+    Tested with:
+    - D2.test_constraint_peak_demand_pricing()
+    - D2.test_constraint_peak_demand_pricing_not_applied()
+
+    Returns
+    -------
+    Updated model with one pyomo block per energy provider, None if the peak demand pricing is
+    modelled with transformers
+    """
+    answer = None
+    energy, costs = lp_scaling_factors(dict_values)
+    for dso in dict_values[ENERGY_PROVIDERS].values():
+        periods = [
+            dict_values[ENERGY_CONVERSION][label]
+            for label in dso.get(CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS, [])
+            if dict_values[ENERGY_CONVERSION][label].get(
+                PEAK_DEMAND_PRICING_CONSTRAINT, False
+            )
+            is True
+        ]
+        if len(periods) == 0:
+            continue
+
+        source = dict_model[OEMOF_SOURCE][periods[0][CONNECTED_CONSUMPTION_SOURCE]]
+        bus = dict_model[OEMOF_BUSSES][periods[0][OUTFLOW_DIRECTION]]
+
+        # Pricing period of each timestep, 0 if the timestep does not belong to any period
+        period_of_timestep = np.zeros(len(model.TIMESTEPS), dtype=int)
+        for number, period in enumerate(periods, 1):
+            period_of_timestep[period[AVAILABILITY_DISPATCH].values > 0] = number
+
+        block = po.Block()
+        model.add_component(PEAK_DEMAND_PRICING_BLOCK + dso[LABEL], block)
+        block.PERIODS = po.Set(initialize=range(1, len(periods) + 1))
+
+        def peak_demand_bounds(b, p):
+            maximum_add_cap = periods[p - 1][MAXIMUM_ADD_CAP][VALUE]
+            if maximum_add_cap is not None:
+                maximum_add_cap = maximum_add_cap / energy
+            return (0, maximum_add_cap)
+
+        block.peak_demand = po.Var(
+            block.PERIODS, within=po.NonNegativeReals, bounds=peak_demand_bounds,
+        )
+
+        def peak_demand_rule(b, t):
+            number = int(period_of_timestep[t])
+            if number == 0:
+                expr = model.flow[source, bus, t] <= 0
+            else:
+                expr = (
+                    model.flow[source, bus, t]
+                    <= periods[number - 1][INSTALLED_CAP][VALUE] / energy
+                    + b.peak_demand[number]
+                )
+            return expr
+
+        block.peak_demand_constraint = po.Constraint(
+            model.TIMESTEPS, rule=peak_demand_rule
+        )
+        model.objective.expr += sum(
+            periods[p - 1][SIMULATION_ANNUITY][VALUE]
+            * energy
+            / costs
+            * block.peak_demand[p]
+            for p in block.PERIODS
+        )
+        logging.info(
+            f"Added peak demand pricing constraint for {len(periods)} period(s) of {dso[LABEL]}."
+        )
+        answer = model
+
+    return answer
+
+
+def store_peak_demand_pricing_results(model, dict_values):
+    r"""
+    Stores the optimized peak demand of each period modelled by `constraint_peak_demand_pricing`
+
+    Parameters
+    ----------
+    model: :oemof-solph: <oemof.solph.model>
+        Solved model
+
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    Updated peak demand pricing assets of dict_values[ENERGY_CONVERSION] with OPTIMIZED_PEAK_DEMAND,
+    which is evaluated in `E1.get_peak_demand_pricing_results`. If the linear program is scaled,
+    the optimized peak demand is rescaled by the energy scaling factor.
+
+    Notes
+    -----
+    Tested with:
+    - D2.test_constraint_peak_demand_pricing()
+    - D2.test_constraint_peak_demand_pricing_lp_scaling()
+    """
+    energy, costs = lp_scaling_factors(dict_values)
+    for dso in dict_values[ENERGY_PROVIDERS].values():
+        block = model.component(PEAK_DEMAND_PRICING_BLOCK + dso[LABEL])
+        if block is None:
+            continue
+        for number, label in enumerate(
+            dso[CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS], 1
+        ):
+            dict_asset = dict_values[ENERGY_CONVERSION][label]
+            dict_asset.update(
+                {
+                    OPTIMIZED_PEAK_DEMAND: {
+                        VALUE: block.peak_demand[number].value * energy,
+                        UNIT: dict_asset[UNIT],
+                    }
+                }
+            )
+
+
+@contextmanager
+def detached_peak_demand_pricing_blocks(model):
+    r"""
+    Detaches the blocks added by `constraint_peak_demand_pricing` from the model within the context
+
+    The results processing of oemof-solph expects all variables of the model to be indexed by
+    oemof nodes or timesteps, which is not the case of the peak demand variables. They are
+    therefore detached while the oemof results are processed, and attached again afterwards.
+
+    Parameters
+    ----------
+    model: :oemof-solph: <oemof.solph.model>
+        Solved model
+
+    Notes
+    -----
+    Tested with:
+    - D2.test_constraint_peak_demand_pricing()
+    """
+    blocks = {
+        name: model.component(name)
+        for name in list(model.component_map(po.Block))
+        if name.startswith(PEAK_DEMAND_PRICING_BLOCK)
+    }
+    for block in blocks.values():
+        model.del_component(block)
+    try:
+        yield model
+    finally:
+        for name, block in blocks.items():
+            model.add_component(name, block)
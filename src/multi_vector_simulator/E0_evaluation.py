@@ -13,6 +13,7 @@ import logging
 import oemof.solph as solph
 import pandas as pd
 
+import multi_vector_simulator.C0_data_processing as C0
 import multi_vector_simulator.E1_process_results as E1
 import multi_vector_simulator.E2_economics as E2
 import multi_vector_simulator.E3_indicator_calculation as E3
@@ -20,6 +21,13 @@ import multi_vector_simulator.E3_indicator_calculation as E3
 import multi_vector_simulator.E4_verification as E4
 
 from multi_vector_simulator.utils.constants import SOC
+from multi_vector_simulator.utils.timeseries_store import share_timeseries
+from multi_vector_simulator.utils.asset_records import (
+    AssetRecord,
+    get_value,
+    set_parameter,
+    set_value,
+)
 
 from multi_vector_simulator.utils.constants_json_strings import (
     UNIT,
@@ -57,11 +65,25 @@ from multi_vector_simulator.utils.constants_json_strings import (
     LIFETIME_PRICE_DISPATCH,
     FLOW,
     COST_DISPATCH,
+    OPTIMIZED_PEAK_DEMAND,
+    ENERGY_PROVIDERS,
+    DISCOUNTFACTOR,
+    PROJECT_DURATION,
+    TAX,
+    SIMULATION_RESULTS,
+    ECONOMIC_REEVALUATION,
+    REOPTIMIZED,
+    ECONOMIC_DATA_OVERRIDES,
+    ORIGINAL_VALUE,
+    KPI_COST_RANGING,
+    COST_RANGING,
+    COST_PARAMETER,
 )
 
 from multi_vector_simulator.utils.constants_output import (
     KPI_COST_MATRIX_ENTRIES,
     KPI_SCALAR_MATRIX_ENTRIES,
+    KPI_COST_RANGING_ENTRIES,
 )
 
 
@@ -94,6 +116,15 @@ def evaluate_dict(dict_values, results_main, results_meta):
 
     initalize_kpi(dict_values)
 
+    # Rescale the results of the linear program if it was scaled in D0
+    results_main = E1.rescale_results_of_scaled_model(dict_values, results_main)
+
+    # Restore the flows of assets and busses removed from the model by C3
+    results_main = E1.restore_results_of_reduced_model(dict_values, results_main)
+
+    # Round the values of all flows and capacities within the precision of the solver
+    results_main = E1.cut_results_below_micro(dict_values, results_main)
+
     bus_data = {}
     # Store all information related to busses in bus_data
     for bus in dict_values[ENERGY_BUSSES]:
@@ -166,12 +197,17 @@ def evaluate_dict(dict_values, results_main, results_meta):
 
     for group in [ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_CONSUMPTION]:
         for asset in dict_values[group]:
-            E1.get_results(
-                settings=dict_values[SIMULATION_SETTINGS],
-                bus_data=bus_data,
-                dict_asset=dict_values[group][asset],
-                asset_group=group,
-            )
+            if OPTIMIZED_PEAK_DEMAND in dict_values[group][asset]:
+                E1.get_peak_demand_pricing_results(
+                    dict_values, bus_data, dict_values[group][asset]
+                )
+            else:
+                E1.get_results(
+                    settings=dict_values[SIMULATION_SETTINGS],
+                    bus_data=bus_data,
+                    dict_asset=dict_values[group][asset],
+                    asset_group=group,
+                )
             E2.get_costs(dict_values[group][asset], dict_values[ECONOMIC_DATA])
             E2.lcoe_assets(dict_values[group][asset], group)
             if group == ENERGY_PRODUCTION:
@@ -181,6 +217,9 @@ def evaluate_dict(dict_values, results_main, results_meta):
     # Add fix project costs
     process_fixcost(dict_values)
 
+    if COST_RANGING in dict_values[SIMULATION_RESULTS]:
+        store_cost_ranging(dict_values)
+
     logging.info("Evaluating key performance indicators of the system")
     E3.all_totals(dict_values)
     E3.total_demand_and_excess_each_sector(dict_values)
@@ -224,6 +263,164 @@ def evaluate_dict(dict_values, results_main, results_meta):
         dict_values[KPI][KPI_UNCOUPLED_DICT], orient="index"
     )
 
+    # Aggregate the result timeseries once all KPI are calculated in full resolution
+    E1.aggregate_result_timeseries(dict_values)
+
+    # let the result timeseries share the arrays of the timeseries store as well
+    share_timeseries(dict_values)
+
+
+# Parameters of ECONOMIC_DATA which can be overridden by reevaluate_economics
+ECONOMIC_DATA_PARAMETERS = (DISCOUNTFACTOR, PROJECT_DURATION, TAX)
+
+
+def convert_economic_data_override(parameter, value):
+    r"""
+    Converts the new value of a parameter of ECONOMIC_DATA to the type of the parameter
+
+    Parameters
+    ----------
+    parameter: str
+        One of ECONOMIC_DATA_PARAMETERS
+    value: str or number
+        New value, e.g. as provided on the command line
+
+    Returns
+    -------
+    The value as a positive int for PROJECT_DURATION, as float otherwise
+
+    Notes
+    -----
+
+    Tested with:
+    - test_E0_evaluation.test_convert_economic_data_override()
+    - test_E0_evaluation.test_convert_economic_data_override_invalid_value()
+    """
+    if parameter not in ECONOMIC_DATA_PARAMETERS:
+        raise ValueError(
+            f"The parameter {parameter} of {ECONOMIC_DATA} can not be re-evaluated, "
+            f"only {', '.join(ECONOMIC_DATA_PARAMETERS)} can be overridden."
+        )
+    try:
+        converted = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"The new value {value} of the parameter {parameter} of {ECONOMIC_DATA} is not a "
+            f"number."
+        ) from None
+    if parameter == PROJECT_DURATION:
+        # the project duration is a number of years, it is used as range of the lifetime costs
+        if converted.is_integer() is False or converted < 1:
+            raise ValueError(
+                f"The new value {value} of the parameter {parameter} of {ECONOMIC_DATA} should "
+                f"be a positive integer number of years."
+            )
+        converted = int(converted)
+    return converted
+
+
+def reevaluate_economics(dict_values, economic_data_overrides):
+    r"""
+    Re-evaluates the costs and the economic KPI of simulation results with other economic data.
+
+    The dispatch and the capacities of the assets are the ones of the original optimization,
+    they are not re-optimized for the new economic data. Only the lifetime costs of the
+    assets (C0.evaluate_lifetime_costs), their costs and levelized costs (E2.get_costs,
+    E2.lcoe_assets), the cost matrix and the economic KPI (E3.all_totals,
+    E3.add_levelized_cost_of_energy_carriers) are updated.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs and results, as loaded from the json file with results. The
+        assets can be provided as dicts or as asset records (B0.load_json(asset_records=True))
+
+    economic_data_overrides: dict
+        New values of the parameters of ECONOMIC_DATA, one of ECONOMIC_DATA_PARAMETERS each,
+        converted with convert_economic_data_override
+
+    Returns
+    -------
+    Updated dict_values, the overrides are listed under ECONOMIC_REEVALUATION in SIMULATION_RESULTS
+    together with a REOPTIMIZED flag set to False
+
+    Notes
+    -----
+
+    Tested with:
+    - test_E0_evaluation.test_reevaluate_economics_without_overrides_reproduces_cost_matrix()
+    - test_E0_evaluation.test_reevaluate_economics_updates_costs_and_flags_results()
+    - test_E0_evaluation.test_reevaluate_economics_unknown_parameter()
+    - test_E0_evaluation.test_reevaluate_economics_project_duration()
+    """
+    economic_data_overrides = {
+        parameter: convert_economic_data_override(parameter, value)
+        for parameter, value in economic_data_overrides.items()
+    }
+
+    reevaluation = dict_values[SIMULATION_RESULTS].setdefault(
+        ECONOMIC_REEVALUATION, {REOPTIMIZED: False, ECONOMIC_DATA_OVERRIDES: {}}
+    )
+    for parameter, value in economic_data_overrides.items():
+        # the original value is kept if the results were already re-evaluated before
+        override = reevaluation[ECONOMIC_DATA_OVERRIDES].setdefault(
+            parameter, {ORIGINAL_VALUE: dict_values[ECONOMIC_DATA][parameter][VALUE]}
+        )
+        override.update({VALUE: value})
+        dict_values[ECONOMIC_DATA][parameter][VALUE] = value
+
+    logging.warning(
+        f"The economic KPI are re-evaluated with {economic_data_overrides}, the dispatch and "
+        f"the capacities of the assets are not re-optimized for the new {ECONOMIC_DATA}."
+    )
+
+    C0.add_economic_parameters(dict_values[ECONOMIC_DATA])
+
+    # Update the lifetime costs of all assets (C2)
+    for group in [
+        FIX_COST,
+        ENERGY_PROVIDERS,
+        ENERGY_CONVERSION,
+        ENERGY_PRODUCTION,
+        ENERGY_CONSUMPTION,
+    ]:
+        for asset in dict_values[group].values():
+            C0.evaluate_lifetime_costs(
+                dict_values[SIMULATION_SETTINGS], dict_values[ECONOMIC_DATA], asset,
+            )
+    for storage in dict_values[ENERGY_STORAGE].values():
+        for storage_item in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
+            C0.evaluate_lifetime_costs(
+                dict_values[SIMULATION_SETTINGS],
+                dict_values[ECONOMIC_DATA],
+                get_value(storage, storage_item),
+            )
+
+    # Rebuild the cost and scalar matrices in the same order as evaluate_dict
+    dict_values[KPI].update(
+        {
+            KPI_COST_MATRIX: pd.DataFrame(columns=KPI_COST_MATRIX_ENTRIES),
+            KPI_SCALAR_MATRIX: pd.DataFrame(columns=KPI_SCALAR_MATRIX_ENTRIES),
+        }
+    )
+    for storage in dict_values[ENERGY_STORAGE].values():
+        for storage_item in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
+            E2.get_costs(get_value(storage, storage_item), dict_values[ECONOMIC_DATA])
+        E2.lcoe_assets(storage, ENERGY_STORAGE)
+        for storage_item in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
+            store_result_matrix(dict_values[KPI], get_value(storage, storage_item))
+
+    for group in [ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_CONSUMPTION]:
+        for asset in dict_values[group].values():
+            E2.get_costs(asset, dict_values[ECONOMIC_DATA])
+            E2.lcoe_assets(asset, group)
+            store_result_matrix(dict_values[KPI], asset)
+
+    process_fixcost(dict_values)
+
+    E3.all_totals(dict_values)
+    E3.add_levelized_cost_of_energy_carriers(dict_values)
+
 
 def store_result_matrix(dict_kpi, dict_asset, fix_cost=False):
     """
@@ -235,7 +432,7 @@ def store_result_matrix(dict_kpi, dict_asset, fix_cost=False):
     dict_kpi: dict
         dictionary with the two kpi groups (costs and scalars), which are pd.DF
 
-    dict_asset: dict
+    dict_asset: dict or :class:`multi_vector_simulator.utils.asset_records.AssetRecord`
         all information known for a specific asset
 
     fix_cost: Boolean
@@ -259,22 +456,24 @@ def store_result_matrix(dict_kpi, dict_asset, fix_cost=False):
             for key in dict_kpi[kpi_storage].columns.values:
                 # Check if called value is in oemof results -> Remember: check if pandas index has certain index: pd.object.index.contains(key)
                 if key in dict_asset:
-                    if isinstance(dict_asset[key], str):
-                        asset_result_dict.update({key: dict_asset[key]})
-                    elif isinstance(dict_asset[key], bool):
-                        asset_result_dict.update({key: dict_asset[key]})
-                    elif dict_asset[key] is None:
+                    if isinstance(dict_asset, AssetRecord):
+                        entry = dict_asset.entry(key)
+                    else:
+                        entry = dict_asset[key]
+                    if isinstance(entry, str):
+                        asset_result_dict.update({key: entry})
+                    elif isinstance(entry, bool):
+                        asset_result_dict.update({key: entry})
+                    elif entry is None:
                         asset_result_dict.update({key: None})
-                    elif isinstance(dict_asset[key], dict):
-                        if VALUE in dict_asset[key].keys():
-                            if dict_asset[key][VALUE] is not None:
+                    elif isinstance(entry, dict):
+                        if VALUE in entry.keys():
+                            if entry[VALUE] is not None:
                                 asset_result_dict.update(
-                                    {key: round(dict_asset[key][VALUE], round_to_comma)}
+                                    {key: round(entry[VALUE], round_to_comma)}
                                 )
                     else:
-                        asset_result_dict.update(
-                            {key: round(dict_asset[key], round_to_comma)}
-                        )
+                        asset_result_dict.update({key: round(entry, round_to_comma)})
 
             asset_result_df = pd.DataFrame([asset_result_dict])
 
@@ -308,6 +507,36 @@ def initalize_kpi(dict_values):
     )
 
 
+def store_cost_ranging(dict_values):
+    r"""
+    Adds the cost ranges of the optimized assets to the KPI as a matrix.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation data with the cost ranges evaluated in `D0.cost_ranging.evaluate` under
+        COST_RANGING in SIMULATION_RESULTS
+
+    Returns
+    -------
+    Updated dict_values with the KPI_COST_RANGING matrix, with one row per optimized asset and
+    cost parameter. A range of NaN could not be derived from the reduced costs.
+
+    Notes
+    -----
+
+    Function is tested with:
+    - test_E0_evaluation.test_store_cost_ranging()
+    """
+    rows = []
+    for label, cost_ranges in dict_values[SIMULATION_RESULTS][COST_RANGING].items():
+        for parameter, cost_range in cost_ranges.items():
+            rows.append({LABEL: label, COST_PARAMETER: parameter, **cost_range})
+    dict_values[KPI].update(
+        {KPI_COST_RANGING: pd.DataFrame(rows, columns=KPI_COST_RANGING_ENTRIES)}
+    )
+
+
 def process_fixcost(dict_values):
     r"""
     Adds fix costs of the project to the economic evaluation of the energy system.
@@ -328,17 +557,14 @@ def process_fixcost(dict_values):
     - test_E0_evaluation.test_process_fixcost()
     """
     for asset in dict_values[FIX_COST]:
+        fix_cost = dict_values[FIX_COST][asset]
         # Add parameters that are needed for E2.get_costs()
-        dict_values[FIX_COST][asset].update(
-            {
-                OPTIMIZED_ADD_CAP: {VALUE: 1},
-                INSTALLED_CAP: {VALUE: 0},
-                LIFETIME_PRICE_DISPATCH: {VALUE: 0},
-                FLOW: pd.Series([0, 0]),
-            }
-        )
+        set_value(fix_cost, OPTIMIZED_ADD_CAP, 1)
+        set_value(fix_cost, INSTALLED_CAP, 0)
+        set_value(fix_cost, LIFETIME_PRICE_DISPATCH, 0)
+        set_parameter(fix_cost, FLOW, pd.Series([0, 0]))
 
-        E2.get_costs(dict_values[FIX_COST][asset], dict_values[ECONOMIC_DATA])
+        E2.get_costs(fix_cost, dict_values[ECONOMIC_DATA])
         # Remove all parameters that were added before and the KPI that do not apply
         for key in [
             OPTIMIZED_ADD_CAP,
@@ -347,7 +573,5 @@ def process_fixcost(dict_values):
             FLOW,
             COST_DISPATCH,
         ]:
-            dict_values[FIX_COST][asset].pop(key)
-        store_result_matrix(
-            dict_values[KPI], dict_values[FIX_COST][asset], fix_cost=True
-        )
+            fix_cost.pop(key)
+        store_result_matrix(dict_values[KPI], fix_cost, fix_cost=True)
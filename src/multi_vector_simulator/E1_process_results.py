@@ -10,10 +10,10 @@ Module E1 processes the oemof results.
 
 """
 import logging
-import copy
+import numpy as np
 import pandas as pd
 
-from multi_vector_simulator.utils.constants import TYPE_NONE, TOTAL_FLOW
+from multi_vector_simulator.utils.constants import TYPE_NONE, TOTAL_FLOW, SOC
 from multi_vector_simulator.utils.constants_json_strings import (
     ECONOMIC_DATA,
     FLOW,
@@ -69,6 +69,40 @@ from multi_vector_simulator.utils.constants_json_strings import (
     FIX_COST,
     LIFETIME_PRICE_DISPATCH,
     AVERAGE_SOC,
+    AVAILABILITY_DISPATCH,
+    CONNECTED_CONSUMPTION_SOURCE,
+    OPTIMIZED_PEAK_DEMAND,
+    REDUCED_MODEL,
+    LP_SCALING,
+    ENERGY_SCALING_FACTOR,
+    COST_SCALING_FACTOR,
+    SIMULATION_RESULTS,
+    OBJECTIVE_VALUE,
+    INVESTMENT_STAGE_OBJECTIVE_VALUE,
+    RESULTS_BELOW_THRESHOLD,
+    NEGATIVE_VALUES_SET_TO_0,
+    POSITIVE_VALUES_SET_TO_0,
+    NEGATIVE_VALUES_KEPT,
+    MINIMAL_VALUE,
+    REMOVED_ASSETS,
+    MERGED_BUSSES,
+    KEPT_BUS,
+    PASS_THROUGH_TRANSFORMER,
+    AGGREGATED_ASSETS,
+    TIMESERIES,
+    INSTALLED_CAP_NORMALIZED,
+    MAXIMUM_ADD_CAP,
+    MAXIMUM_ADD_CAP_NORMALIZED,
+    ENERGY_PROVIDERS,
+    RESULT_GRANULARITY,
+    FULL_RESOLUTION_ASSETS,
+    PERIOD_PEAK_FLOW,
+    PERIOD_AVERAGE_FLOW,
+    GRANULARITY_FULL,
+    GRANULARITY_HOURLY,
+    GRANULARITY_DAILY,
+    GRANULARITY_MONTHLY,
+    GRANULARITY_TOTALS,
 )
 
 # Oemof.solph variables
@@ -87,6 +121,14 @@ ASSET_GROUPS_DEFINED_BY_OUTFLUX = [ENERGY_CONVERSION, ENERGY_PRODUCTION]
 # Threshold for precision limit:
 THRESHOLD = 10 ** (-6)
 
+# Pandas resampling rules of the result granularities, see aggregate_result_timeseries
+RESAMPLING_RULES = {
+    GRANULARITY_HOURLY: "H",
+    GRANULARITY_DAILY: "D",
+    GRANULARITY_MONTHLY: "MS",
+    GRANULARITY_TOTALS: None,
+}
+
 
 def cut_below_micro(value, label):
     r"""
@@ -194,6 +236,398 @@ def cut_below_micro(value, label):
     return value
 
 
+def cut_results_below_micro(dict_values, results_main):
+    r"""
+    Applies the precision threshold of `cut_below_micro` to all results of the oemof optimization at once
+
+    All sequences of the results are stacked into one array, so that the values are checked and
+    rounded in a single vectorized pass instead of once per flow. The rules are the ones of
+    `cut_below_micro`: negative values of a sequence are set to 0 if all of them are within the
+    threshold, otherwise they are kept, and positive values below the threshold are set to 0. Each
+    scalar (eg. an optimized capacity) is treated as a sequence of its own.
+
+    Instead of log messages per flow, the rounded values are summarized per flow in
+    dict_values[SIMULATION_RESULTS][RESULTS_BELOW_THRESHOLD], with the number of negative and
+    positive values set to 0 and, for negative values exceeding the threshold, their number and the
+    minimal value.
+
+    Parameters
+    ----------
+    dict_values : dict
+        Contains all input data of the simulation, including SIMULATION_RESULTS
+
+    results_main : dict
+        Results of the oemof-solph model
+
+    Returns
+    -------
+    results_main : dict
+        Results with the rounded sequences and scalars. The getters of the flows and capacities
+        (eg. `get_flow`, `get_optimal_cap`, `get_storage_results`) use them without further rounding.
+
+    Notes
+    -----
+    Tested with:
+    - test_cut_results_below_micro()
+    - test_cut_results_below_micro_negative_values_exceeding_threshold()
+    """
+
+    def flow_label(key, variable):
+        label = "/".join(str(node) for node in key if node is not None)
+        if variable != OEMOF_FLOW:
+            label += " " + str(variable)
+        return label
+
+    def cut_columns(values):
+        negative = values < 0
+        negative_kept = (values <= -THRESHOLD).any(axis=0)
+        negative_set_to_0 = negative & ~negative_kept
+        positive_set_to_0 = (values > 0) & (values < THRESHOLD)
+        cut_values = np.where(negative_set_to_0 | positive_set_to_0, 0.0, values)
+        summary = pd.DataFrame(
+            {
+                NEGATIVE_VALUES_SET_TO_0: negative_set_to_0.sum(axis=0),
+                POSITIVE_VALUES_SET_TO_0: positive_set_to_0.sum(axis=0),
+                NEGATIVE_VALUES_KEPT: (negative & negative_kept).sum(axis=0),
+                MINIMAL_VALUE: values.min(axis=0, initial=0),
+            }
+        )
+        return cut_values, summary
+
+    keys = list(results_main.keys())
+    sequences = [results_main[key][OEMOF_SEQUENCES] for key in keys]
+    scalars = [
+        results_main[key].get(OEMOF_SCALARS, pd.Series(dtype=float)) for key in keys
+    ]
+    sequence_labels = [
+        flow_label(key, column)
+        for key, values in zip(keys, sequences)
+        for column in values.columns
+    ]
+    scalar_labels = [
+        flow_label(key, name)
+        for key, values in zip(keys, scalars)
+        for name in values.index
+    ]
+
+    cut_sequences, sequence_summary = cut_columns(
+        np.hstack(
+            [np.asarray(values.values, dtype=float) for values in sequences]
+            or [np.empty((0, 0))]
+        )
+    )
+    cut_scalars, scalar_summary = cut_columns(
+        np.concatenate(
+            [np.asarray(values.values, dtype=float) for values in scalars] or [[]]
+        ).reshape(1, -1)
+    )
+
+    cut_results = {}
+    sequence_start = scalar_start = 0
+    for key, values, scalar_values in zip(keys, sequences, scalars):
+        sequence_end = sequence_start + len(values.columns)
+        scalar_end = scalar_start + len(scalar_values)
+        cut_results[key] = {
+            **results_main[key],
+            OEMOF_SEQUENCES: pd.DataFrame(
+                cut_sequences[:, sequence_start:sequence_end],
+                index=values.index,
+                columns=values.columns,
+            ),
+            OEMOF_SCALARS: pd.Series(
+                cut_scalars[0, scalar_start:scalar_end],
+                index=scalar_values.index,
+                dtype=float,
+            ),
+        }
+        sequence_start, scalar_start = sequence_end, scalar_end
+
+    summary = pd.concat([sequence_summary, scalar_summary], ignore_index=True)
+    summary.index = sequence_labels + scalar_labels
+    summary = summary[
+        summary[
+            [NEGATIVE_VALUES_SET_TO_0, POSITIVE_VALUES_SET_TO_0, NEGATIVE_VALUES_KEPT]
+        ]
+        .sum(axis=1)
+        .gt(0)
+    ]
+    results_below_threshold = {}
+    for label, row in summary.iterrows():
+        results_below_threshold[label] = {
+            NEGATIVE_VALUES_SET_TO_0: int(row[NEGATIVE_VALUES_SET_TO_0]),
+            POSITIVE_VALUES_SET_TO_0: int(row[POSITIVE_VALUES_SET_TO_0]),
+        }
+        if row[NEGATIVE_VALUES_KEPT] > 0:
+            results_below_threshold[label].update(
+                {
+                    NEGATIVE_VALUES_KEPT: int(row[NEGATIVE_VALUES_KEPT]),
+                    MINIMAL_VALUE: row[MINIMAL_VALUE],
+                }
+            )
+    dict_values[SIMULATION_RESULTS].update(
+        {RESULTS_BELOW_THRESHOLD: results_below_threshold}
+    )
+
+    negative_values_kept = summary.index[summary[NEGATIVE_VALUES_KEPT] > 0]
+    if len(negative_values_kept) > 0:
+        logging.warning(
+            f"The results of {', '.join(negative_values_kept)} have values below -{THRESHOLD}. "
+            f"They are so far below 0 that they are not changed. All oemof decision variables "
+            f"should be positive so this needs to be investigated, see "
+            f"{SIMULATION_RESULTS}/{RESULTS_BELOW_THRESHOLD} in the results."
+        )
+    logging.debug(
+        f"Values of the results of {len(summary)} flow(s) and capacities within the "
+        f"precision threshold ({THRESHOLD}) were set to 0."
+    )
+    return cut_results
+
+
+def rescale_results_of_scaled_model(dict_values, results_main):
+    r"""
+    Rescales the results of a linear program scaled by `D0.model_building.define_lp_scaling`.
+
+    The flows and optimized capacities are multiplied by the energy scaling factor and the
+    objective value by the cost scaling factor.
+
+    Parameters
+    ----------
+    dict_values : dict
+        Contains all input data of the simulation, including dict_values[LP_SCALING]
+
+    results_main : dict
+        Results of the oemof-solph model
+
+    Returns
+    -------
+    results_main : dict
+        Rescaled results. Unchanged if the linear program was not scaled.
+
+    Notes
+    -----
+    Tested with:
+    - test_rescale_results_of_scaled_model()
+    - test_rescale_results_of_scaled_model_not_scaled()
+    """
+    if LP_SCALING not in dict_values:
+        return results_main
+
+    energy = dict_values[LP_SCALING][ENERGY_SCALING_FACTOR][VALUE]
+    costs = dict_values[LP_SCALING][COST_SCALING_FACTOR][VALUE]
+    rescaled_results = {}
+    for key, results in results_main.items():
+        rescaled_results[key] = {
+            result_type: values * energy for result_type, values in results.items()
+        }
+    dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE] *= costs
+    if INVESTMENT_STAGE_OBJECTIVE_VALUE in dict_values[SIMULATION_RESULTS]:
+        dict_values[SIMULATION_RESULTS][INVESTMENT_STAGE_OBJECTIVE_VALUE] *= costs
+    logging.debug(
+        f"The results were rescaled with an energy scaling factor of {energy} and a cost scaling factor of {costs}."
+    )
+    return rescaled_results
+
+
+def restore_results_of_reduced_model(dict_values, results_main):
+    r"""
+    Restores the results of the assets and busses removed by `C3.reduce_energy_system_model`.
+
+    The flows of assets connected to a merged bus are assigned to the merged bus again,
+    the removed assets get flows of 0 and the flow of a pass-through transformer is the sum of
+    the flows of the merged bus on the side of the transformer that was merged. If the transformer is optimized,
+    the minimal capacity covering this flow is its optimized capacity.
+    The flows of aggregated sinks are their timeseries, the optimized capacity of aggregated sources is split
+    with `split_aggregated_capacity` and their flow proportionally to their total capacity.
+
+    Parameters
+    ----------
+    dict_values : dict
+        Contains all input data of the simulation, including dict_values[REDUCED_MODEL]
+
+    results_main : dict
+        Results of the oemof-solph model
+
+    Returns
+    -------
+    results_main : dict
+        Results with labels as keys (see `oemof.solph.processing.convert_keys_to_strings`),
+        as if the model had not been reduced. Unchanged if the model was not reduced.
+
+    Notes
+    -----
+    Tested with:
+    - test_restore_results_of_reduced_model_removed_asset()
+    - test_restore_results_of_reduced_model_merged_bus()
+    - test_restore_results_of_reduced_model_aggregated_sources()
+    - test_restore_results_of_reduced_model_aggregated_sinks()
+    """
+    if REDUCED_MODEL not in dict_values:
+        return results_main
+
+    reduced_model = dict_values[REDUCED_MODEL]
+    merged_busses = reduced_model[MERGED_BUSSES]
+    pass_through_transformers = [
+        merge[PASS_THROUGH_TRANSFORMER] for merge in merged_busses.values()
+    ]
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    results = {tuple(map(str, key)): value for key, value in results_main.items()}
+
+    def as_list(busses):
+        return busses if isinstance(busses, list) else [busses]
+
+    def flow_results(flow, scalars=None):
+        return {
+            OEMOF_SCALARS: pd.Series(scalars, dtype=float),
+            OEMOF_SEQUENCES: pd.DataFrame({OEMOF_FLOW: flow}, index=time_index),
+        }
+
+    for asset_group in [
+        ENERGY_CONVERSION,
+        ENERGY_PRODUCTION,
+        ENERGY_CONSUMPTION,
+        ENERGY_STORAGE,
+    ]:
+        for asset, dict_asset in dict_values[asset_group].items():
+            if asset in pass_through_transformers:
+                continue
+            label = dict_asset[LABEL]
+            flow_keys = [
+                (bus, label) for bus in as_list(dict_asset.get(INFLOW_DIRECTION, []))
+            ] + [(label, bus) for bus in as_list(dict_asset.get(OUTFLOW_DIRECTION, []))]
+            for flow_key in flow_keys:
+                if asset in reduced_model[REMOVED_ASSETS]:
+                    results[flow_key] = flow_results(0.0)
+                else:
+                    model_key = tuple(
+                        merged_busses[node][KEPT_BUS] if node in merged_busses else node
+                        for node in flow_key
+                    )
+                    if model_key != flow_key and model_key in results:
+                        results[flow_key] = results.pop(model_key)
+
+    for assets in reduced_model.get(AGGREGATED_ASSETS, {}).values():
+        if assets[0] in dict_values[ENERGY_CONSUMPTION]:
+            # The flows of non-dispatchable sinks are fixed to their timeseries
+            for asset in assets:
+                dict_asset = dict_values[ENERGY_CONSUMPTION][asset]
+                results[
+                    (dict_asset[INFLOW_DIRECTION], dict_asset[LABEL])
+                ] = flow_results(dict_asset[TIMESERIES])
+            continue
+
+        dict_assets = [dict_values[ENERGY_PRODUCTION][asset] for asset in assets]
+        aggregated_results = results.pop(
+            (dict_assets[0][LABEL], dict_assets[0][OUTFLOW_DIRECTION])
+        )
+        optimized_add_cap = aggregated_results[OEMOF_SCALARS].get(OEMOF_INVEST, 0)
+        add_caps = split_aggregated_capacity(dict_assets, optimized_add_cap)
+        # The flows of non-dispatchable sources are proportional to their total capacity
+        capacities = [
+            model_capacity(dict_asset, INSTALLED_CAP) + add_cap
+            for dict_asset, add_cap in zip(dict_assets, add_caps)
+        ]
+        for dict_asset, add_cap, capacity in zip(dict_assets, add_caps, capacities):
+            share = capacity / sum(capacities) if sum(capacities) > 0 else 0
+            scalars = None
+            if OEMOF_INVEST in aggregated_results[OEMOF_SCALARS]:
+                scalars = {OEMOF_INVEST: add_cap}
+            results[(dict_asset[LABEL], dict_asset[OUTFLOW_DIRECTION])] = flow_results(
+                aggregated_results[OEMOF_SEQUENCES][OEMOF_FLOW] * share, scalars
+            )
+
+    for bus, merge in merged_busses.items():
+        dict_asset = dict_values[ENERGY_CONVERSION][merge[PASS_THROUGH_TRANSFORMER]]
+        label = dict_asset[LABEL]
+        if bus == dict_asset[INFLOW_DIRECTION]:
+            # The transformer transports everything that flows into the merged bus
+            flows = [
+                value[OEMOF_SEQUENCES][OEMOF_FLOW]
+                for key, value in results.items()
+                if key[1] == bus and key[0] != label
+            ]
+        else:
+            # The transformer supplies everything that flows out of the merged bus
+            flows = [
+                value[OEMOF_SEQUENCES][OEMOF_FLOW]
+                for key, value in results.items()
+                if key[0] == bus and key[1] != label
+            ]
+        flow = pd.Series(0.0, index=time_index).add(sum(flows), fill_value=0)
+        scalars = None
+        if dict_asset[OPTIMIZE_CAP][VALUE] is True:
+            scalars = {
+                OEMOF_INVEST: max(flow.max() - dict_asset[INSTALLED_CAP][VALUE], 0)
+            }
+        results[(dict_asset[INFLOW_DIRECTION], label)] = flow_results(flow)
+        results[(label, dict_asset[OUTFLOW_DIRECTION])] = flow_results(flow, scalars)
+
+    logging.debug(
+        f"Restored the results of {len(reduced_model[REMOVED_ASSETS])} asset(s) removed, "
+        f"{len(merged_busses)} bus(ses) merged and "
+        f"{len(reduced_model.get(AGGREGATED_ASSETS, {}))} group(s) of assets aggregated by the model reduction."
+    )
+    return results
+
+
+def model_capacity(dict_asset, parameter):
+    r"""
+    Returns the capacity of an asset in the unit of the oemof-solph model.
+
+    The capacities of non-dispatchable sources with a timeseries peak are normalized in C0,
+    see `C0.process_normalized_installed_cap`.
+    """
+    normalized = {
+        INSTALLED_CAP: INSTALLED_CAP_NORMALIZED,
+        MAXIMUM_ADD_CAP: MAXIMUM_ADD_CAP_NORMALIZED,
+    }[parameter]
+    if normalized in dict_asset:
+        parameter = normalized
+    return dict_asset[parameter][VALUE]
+
+
+def split_aggregated_capacity(dict_assets, optimized_add_cap):
+    r"""
+    Splits the optimized additional capacity of aggregated sources between the aggregated assets.
+
+    As the aggregated assets have the same costs, any split is an optimal solution. The capacity is
+    split proportionally to their maximum additional capacity, or, if it is not limited, proportionally
+    to their installed capacity. If no asset has any installed capacity, the capacity is split equally.
+
+    Parameters
+    ----------
+    dict_assets: list
+        Aggregated assets, see `C3.aggregate_identical_assets`
+
+    optimized_add_cap: float
+        Optimized additional capacity of the aggregated assets, in the unit of the oemof-solph model
+
+    Returns
+    -------
+    add_caps: list
+        Optimized additional capacity of each aggregated asset
+
+    Notes
+    -----
+    Tested with:
+    - test_split_aggregated_capacity_maximum_add_cap()
+    - test_split_aggregated_capacity_installed_cap()
+    """
+    weights = [0] * len(dict_assets)
+    if all(
+        dict_asset[MAXIMUM_ADD_CAP][VALUE] is not None for dict_asset in dict_assets
+    ):
+        weights = [
+            model_capacity(dict_asset, MAXIMUM_ADD_CAP) for dict_asset in dict_assets
+        ]
+    if sum(weights) == 0:
+        weights = [
+            model_capacity(dict_asset, INSTALLED_CAP) for dict_asset in dict_assets
+        ]
+    if sum(weights) == 0:
+        weights = [1] * len(dict_assets)
+    return [optimized_add_cap * weight / sum(weights) for weight in weights]
+
+
 def get_timeseries_per_bus(dict_values, bus_data):
     r"""
     Reads simulation results of all busses and stores time series.
@@ -215,8 +649,6 @@ def get_timeseries_per_bus(dict_values, bus_data):
     Tested with:
     - test_get_timeseries_per_bus_two_timeseries_for_directly_connected_storage()
 
-    #Todo: This is a duplicate of the `E1.get_flow()` assertions, and thus `E1.cut_below_micro` is applied twice for each flow. This should rather be merged into the other functions.
-
     Returns
     -------
     Indirectly updated `dict_values` with 'optimizedFlows' - one data frame for each bus.
@@ -238,9 +670,9 @@ def get_timeseries_per_bus(dict_values, bus_data):
             if key[0][1] == bus and key[1] == OEMOF_FLOW
         }
         for asset in to_bus:
-            flow = bus_data[bus][OEMOF_SEQUENCES][to_bus[asset]]
-            flow = cut_below_micro(flow, bus + "/" + asset)
-            bus_data_timeseries[bus][asset] = flow
+            bus_data_timeseries[bus][asset] = bus_data[bus][OEMOF_SEQUENCES][
+                to_bus[asset]
+            ]
         # obtain flows that flow out of the bus
         from_bus = {
             key[0][1]: key
@@ -295,7 +727,6 @@ def get_storage_results(settings, storage_bus, dict_asset):
     power_charge = storage_bus[OEMOF_SEQUENCES][
         ((dict_asset[INFLOW_DIRECTION], dict_asset[LABEL]), OEMOF_FLOW)
     ]
-    power_charge = cut_below_micro(power_charge, dict_asset[LABEL] + " charge flow")
     add_info_flows(
         evaluated_period=settings[EVALUATED_PERIOD][VALUE],
         dict_asset=dict_asset[INPUT_POWER],
@@ -305,9 +736,6 @@ def get_storage_results(settings, storage_bus, dict_asset):
     power_discharge = storage_bus[OEMOF_SEQUENCES][
         ((dict_asset[LABEL], dict_asset[OUTFLOW_DIRECTION]), OEMOF_FLOW)
     ]
-    power_discharge = cut_below_micro(
-        power_discharge, dict_asset[LABEL] + " discharge flow"
-    )
 
     add_info_flows(
         evaluated_period=settings[EVALUATED_PERIOD][VALUE],
@@ -318,9 +746,6 @@ def get_storage_results(settings, storage_bus, dict_asset):
     storage_capacity = storage_bus[OEMOF_SEQUENCES][
         ((dict_asset[LABEL], TYPE_NONE), OEMOF_STORAGE_CONTENT)
     ]
-    storage_capacity = cut_below_micro(
-        storage_capacity, dict_asset[LABEL] + " " + STORAGE_CAPACITY
-    )
 
     add_info_flows(
         evaluated_period=settings[EVALUATED_PERIOD][VALUE],
@@ -519,6 +944,63 @@ def get_results(settings, bus_data, dict_asset, asset_group):
             get_optimal_cap(bus_data[bus_instance], dict_asset, flow_tuple)
 
 
+def get_peak_demand_pricing_results(dict_values, bus_data, dict_asset):
+    r"""
+    Reads the results of a peak demand pricing period modelled by `D2.constraint_peak_demand_pricing`.
+
+    The flow of the period is the flow of the consumption source of the energy provider during the
+    period, and its optimized capacity the peak demand of the period. Both are stored as they would
+    be for a peak demand pricing transformer, and the flows of the outflow bus of the energy
+    provider are split per period accordingly.
+
+    Parameters
+    ----------
+    dict_values : dict
+        Contains all input data of the simulation, and OPTIMIZED_FLOWS
+
+    bus_data : dict
+        Contains information about all busses in a nested dict, see `get_results`
+
+    dict_asset : dict
+        Peak demand pricing asset with OPTIMIZED_PEAK_DEMAND
+
+    Returns
+    -------
+    Indirectly updates `dict_asset` with the results and `dict_values[OPTIMIZED_FLOWS]`
+
+    Notes
+    -----
+    Tested with:
+    - test_get_peak_demand_pricing_results()
+    """
+    bus = dict_asset[OUTFLOW_DIRECTION]
+    source = dict_asset[CONNECTED_CONSUMPTION_SOURCE]
+    flow = (
+        bus_data[bus][OEMOF_SEQUENCES][((source, bus), OEMOF_FLOW)]
+        * dict_asset[AVAILABILITY_DISPATCH].values
+    )
+    add_info_flows(
+        evaluated_period=dict_values[SIMULATION_SETTINGS][EVALUATED_PERIOD][VALUE],
+        dict_asset=dict_asset,
+        flow=flow,
+    )
+    dict_asset.update(
+        {
+            OPTIMIZED_ADD_CAP: {
+                VALUE: cut_below_micro(
+                    dict_asset[OPTIMIZED_PEAK_DEMAND][VALUE], dict_asset[LABEL]
+                ),
+                UNIT: dict_asset[UNIT],
+            }
+        }
+    )
+
+    bus_flows = dict_values[OPTIMIZED_FLOWS][bus]
+    bus_flows[dict_asset[LABEL]] = flow
+    if source in bus_flows.columns:
+        bus_flows.drop(columns=source, inplace=True)
+
+
 def get_parameter_to_be_evaluated_from_oemof_results(asset_group, asset_label):
     r"""
     Determine the parameter that needs to be evaluated to determine an asset`s optimized flow and capacity.
@@ -633,7 +1115,6 @@ def get_optimal_cap(bus, dict_asset, flow_tuple):
             and (flow_tuple, OEMOF_INVEST) in bus[OEMOF_SCALARS]
         ):
             optimal_capacity = bus[OEMOF_SCALARS][(flow_tuple, OEMOF_INVEST)]
-            optimal_capacity = cut_below_micro(optimal_capacity, dict_asset[LABEL])
             if TIMESERIES_PEAK in dict_asset:
                 if dict_asset[TIMESERIES_PEAK][VALUE] > 0:
                     dict_asset.update(
@@ -702,7 +1183,6 @@ def get_flow(settings, bus, dict_asset, flow_tuple):
 
     """
     flow = bus[OEMOF_SEQUENCES][(flow_tuple, OEMOF_FLOW)]
-    flow = cut_below_micro(flow, dict_asset[LABEL] + FLOW)
     add_info_flows(
         evaluated_period=settings[EVALUATED_PERIOD][VALUE],
         dict_asset=dict_asset,
@@ -768,6 +1248,237 @@ def add_info_flows(evaluated_period, dict_asset, flow, type=None):
         )
 
 
+def get_result_granularity(settings):
+    r"""
+    Reads the result granularity and the assets kept in full resolution from the simulation settings.
+
+    Parameters
+    ----------
+    settings: dict
+        Simulation settings, optionally with RESULT_GRANULARITY and FULL_RESOLUTION_ASSETS
+
+    Returns
+    -------
+    granularity: str
+        One of GRANULARITY_FULL, GRANULARITY_HOURLY, GRANULARITY_DAILY, GRANULARITY_MONTHLY
+        and GRANULARITY_TOTALS, GRANULARITY_FULL if the parameter is not provided
+
+    full_resolution_assets: list
+        Labels of the assets whose timeseries are not aggregated
+
+    Notes
+    -----
+    Both parameters have the unit "str" and are therefore provided either as
+    {VALUE: ..., UNIT: "str"} or, when parsed from csv, as bare values.
+
+    Tested with:
+    - E1.test_get_result_granularity_default()
+    - E1.test_get_result_granularity_from_csv_values()
+    - E1.test_get_result_granularity_unknown_value()
+    """
+    parameters = []
+    for parameter, default in (
+        (RESULT_GRANULARITY, GRANULARITY_FULL),
+        (FULL_RESOLUTION_ASSETS, []),
+    ):
+        value = settings.get(parameter, default)
+        if isinstance(value, dict):
+            value = value[VALUE]
+        parameters.append(value)
+    granularity, full_resolution_assets = parameters
+
+    if granularity is None:
+        granularity = GRANULARITY_FULL
+    if granularity != GRANULARITY_FULL and granularity not in RESAMPLING_RULES:
+        raise ValueError(
+            f"The {RESULT_GRANULARITY} '{granularity}' is unknown, it should be one of "
+            f"{', '.join([GRANULARITY_FULL] + list(RESAMPLING_RULES))}."
+        )
+    if full_resolution_assets is None:
+        full_resolution_assets = []
+    elif isinstance(full_resolution_assets, str):
+        full_resolution_assets = [full_resolution_assets]
+    return granularity, list(full_resolution_assets)
+
+
+def aggregate_timeseries(timeseries, granularity):
+    r"""
+    Groups a result timeseries into the periods of the result granularity.
+
+    Parameters
+    ----------
+    timeseries: pd.Series or pd.DataFrame
+        Result timeseries with a pd.DatetimeIndex
+
+    granularity: str
+        One of the keys of RESAMPLING_RULES
+
+    Returns
+    -------
+    Grouped timeseries, its aggregates (eg. `.sum()`, `.max()`, `.mean()`) are indexed by
+    the start of each period. With GRANULARITY_TOTALS the whole timeseries is one period.
+
+    Tested with:
+    - E1.test_aggregate_timeseries_daily()
+    - E1.test_aggregate_timeseries_totals()
+    """
+    if granularity == GRANULARITY_TOTALS:
+        return timeseries.groupby([timeseries.index[0]] * len(timeseries))
+    else:
+        return timeseries.resample(RESAMPLING_RULES[granularity])
+
+
+def get_period_index(time_index, granularity):
+    r"""
+    Returns the start of the periods of the result granularity.
+
+    Parameters
+    ----------
+    time_index: pd.DatetimeIndex
+        Time index of the simulation
+
+    granularity: str
+        One of the keys of RESAMPLING_RULES
+
+    Returns
+    -------
+    pd.DatetimeIndex of the aggregated result timeseries, used to restore their index when
+    they are loaded from json
+
+    Tested with:
+    - E1.test_get_period_index()
+    """
+    return aggregate_timeseries(pd.Series(0, index=time_index), granularity).sum().index
+
+
+def aggregate_flow(dict_asset, granularity, type=None):
+    r"""
+    Replaces the FLOW of an asset by its sums per period and adds its peaks and averages per period.
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Asset (or storage subasset) with a FLOW
+
+    granularity: str
+        One of the keys of RESAMPLING_RULES
+
+    type: str, default: None
+        type of the flow, only exception is "STORAGE_CAPACITY", whose FLOW is the energy
+        stored in the storage and is replaced by its averages per period
+
+    Returns
+    -------
+    Indirectly updates `dict_asset`. The sums of the flow per period keep TOTAL_FLOW and the
+    dispatch costs consistent with the aggregated FLOW.
+    """
+    periods = aggregate_timeseries(dict_asset[FLOW], granularity)
+    if type == STORAGE_CAPACITY:
+        dict_asset.update({FLOW: periods.mean()})
+    else:
+        dict_asset.update(
+            {
+                FLOW: periods.sum(),
+                PERIOD_PEAK_FLOW: periods.max(),
+                PERIOD_AVERAGE_FLOW: periods.mean(),
+            }
+        )
+
+
+def aggregate_result_timeseries(dict_values):
+    r"""
+    Aggregates the result timeseries to the RESULT_GRANULARITY of the simulation settings.
+
+    With GRANULARITY_FULL (default) the results are not changed. Otherwise, for each
+    period (hour, day, month or the whole simulation for GRANULARITY_TOTALS):
+
+    - the FLOW of the assets and storage subassets is replaced by its sums per period and
+      complemented by its peaks (PERIOD_PEAK_FLOW) and averages (PERIOD_AVERAGE_FLOW)
+      per period
+    - the energy stored in the storages and TIMESERIES_SOC are replaced by their averages
+      per period
+    - the OPTIMIZED_FLOWS of each bus are replaced by their sums per period, except for
+      the state of charge of the storages which is replaced by its averages per period
+
+    The assets listed in FULL_RESOLUTION_ASSETS keep their timeseries in full resolution,
+    their columns in OPTIMIZED_FLOWS are aggregated as well so that each bus keeps a
+    single time index.
+
+    This function has to be applied after all KPI are calculated, as they are based on
+    the timeseries in full resolution.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs and results
+
+    Returns
+    -------
+    Indirectly updates `dict_values`
+
+    Notes
+    -----
+    Tested with:
+    - E1.test_aggregate_result_timeseries_full()
+    - E1.test_aggregate_result_timeseries_daily()
+    - E1.test_aggregate_result_timeseries_totals()
+    - E1.test_aggregate_result_timeseries_full_resolution_assets()
+    """
+    granularity, full_resolution_assets = get_result_granularity(
+        dict_values[SIMULATION_SETTINGS]
+    )
+    if granularity == GRANULARITY_FULL:
+        return
+
+    logging.info(
+        f"The result timeseries are aggregated to the {RESULT_GRANULARITY} '{granularity}'."
+    )
+    labels = []
+    for group in [
+        ENERGY_CONSUMPTION,
+        ENERGY_CONVERSION,
+        ENERGY_PRODUCTION,
+        ENERGY_PROVIDERS,
+        ENERGY_STORAGE,
+    ]:
+        for asset_label, dict_asset in dict_values.get(group, {}).items():
+            labels.append(asset_label)
+            if asset_label in full_resolution_assets:
+                continue
+            if FLOW in dict_asset:
+                aggregate_flow(dict_asset, granularity)
+            if group == ENERGY_STORAGE:
+                for subasset in [INPUT_POWER, OUTPUT_POWER, STORAGE_CAPACITY]:
+                    if FLOW in dict_asset[subasset]:
+                        aggregate_flow(dict_asset[subasset], granularity, type=subasset)
+                if TIMESERIES_SOC in dict_asset:
+                    dict_asset.update(
+                        {
+                            TIMESERIES_SOC: aggregate_timeseries(
+                                dict_asset[TIMESERIES_SOC], granularity
+                            ).mean()
+                        }
+                    )
+
+    for asset_label in full_resolution_assets:
+        if asset_label not in labels:
+            logging.warning(
+                f"The asset {asset_label} listed in {FULL_RESOLUTION_ASSETS} does not exist, its timeseries can not be kept in full resolution."
+            )
+
+    for bus, df_flows in dict_values.get(OPTIMIZED_FLOWS, {}).items():
+        aggregated_flows = aggregate_timeseries(df_flows, granularity).sum()
+        # The state of charge of the storages added to the flows by E0.evaluate_dict is averaged
+        soc_columns = [
+            column for column in df_flows.columns if str(column).endswith(f" {SOC}")
+        ]
+        if len(soc_columns) > 0:
+            aggregated_flows[soc_columns] = aggregate_timeseries(
+                df_flows[soc_columns], granularity
+            ).mean()
+        dict_values[OPTIMIZED_FLOWS][bus] = aggregated_flows
+
+
 def convert_demand_to_dataframe(dict_values, sector_demands=None):
     """Dataframe used for the demands table of the report
 
@@ -786,35 +1497,20 @@ def convert_demand_to_dataframe(dict_values, sector_demands=None):
 
     """
 
-    # Make a dict which is a sub-dict of the JSON results file with only the consumption components of the energy system
-    demands = copy.deepcopy(dict_values[ENERGY_CONSUMPTION])
-
-    # The following block removes all the non-current sectoral demands from the demands dict
-    if sector_demands is not None:
-        non_sec_demands = []
-        # Loop through the demands checking if there are keys which do not belong to the current sector
-        for demand_key in demands.keys():
-            if demands[demand_key][ENERGY_VECTOR] != (sector_demands.title()):
-                non_sec_demands.append(demand_key)
-        # Drop the non-sectoral demands from the demands dict
-        for demand_to_drop in non_sec_demands:
-            del demands[demand_to_drop]
-
-    # Removing all the keys that do not represent actual demands
-    drop_list = []
-
-    # Loop though the demands identifying irrelevant demands
-    for column_label in demands:
-        # Identifies excess sink in demands for removal
-        if EXCESS_SINK in column_label:
-            drop_list.append(column_label)
-        # Identifies DSO_feedin sink in demands for removal
-        elif DSO_FEEDIN in column_label:
-            drop_list.append(column_label)
-
-    # Remove some elements from drop_list (ie. sinks that are not demands) from data
-    for item in drop_list:
-        del demands[item]
+    # Make a dict which is a sub-dict of the JSON results file with only the consumption components of the energy system,
+    # the asset dicts are only read, therefore they are referenced instead of copied
+    demands = {}
+    for demand_key, demand in dict_values[ENERGY_CONSUMPTION].items():
+        # Skip the non-current sectoral demands
+        if (
+            sector_demands is not None
+            and demand[ENERGY_VECTOR] != sector_demands.title()
+        ):
+            continue
+        # Skip the sinks that are not demands (excess and DSO feedin sinks)
+        if EXCESS_SINK in demand_key or DSO_FEEDIN in demand_key:
+            continue
+        demands[demand_key] = demand
 
     # Create empty dict to hold the current-sector demands' data
     demand_data = {}
@@ -63,6 +63,11 @@ from multi_vector_simulator.utils.constants_json_strings import (
     SPECIFIC_REPLACEMENT_COSTS_INSTALLED,
     SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED,
 )
+from multi_vector_simulator.utils.asset_records import (
+    AssetRecord,
+    get_value,
+    set_value,
+)
 
 
 class MissingParametersForEconomicEvaluation(UserWarning):
@@ -76,7 +81,7 @@ def get_costs(dict_asset, economic_data):
 
     Parameters
     ----------
-    dict_asset: dict
+    dict_asset: dict or :class:`multi_vector_simulator.utils.asset_records.AssetRecord`
         Asset to be evaluated.
         Warning messages in place in case that the asset should not be evaluated.
 
@@ -102,18 +107,19 @@ def get_costs(dict_asset, economic_data):
 
     """
 
-    logging.debug("Calculating costs of asset %s", dict_asset[LABEL])
+    label = get_value(dict_asset, LABEL)
+    logging.debug("Calculating costs of asset %s", label)
 
     # helper for developing get_costs() and E modules
-    if not isinstance(dict_asset, dict):
+    if not isinstance(dict_asset, (dict, AssetRecord)):
         logging.warning(
             f"Function E2.get_costs() is used on {dict_asset}, eventhough it is not a dict. Check loops in E modules."
         )
 
     # helper for developing get_costs() and E modules
-    if dict_asset[LABEL] in [ECONOMIC_DATA, SIMULATION_SETTINGS, SIMULATION_RESULTS]:
+    if label in [ECONOMIC_DATA, SIMULATION_SETTINGS, SIMULATION_RESULTS]:
         logging.warning(
-            f"Function E2.get_costs() is used on {dict_asset[LABEL]}, eventhough it should not be applied to it. Check loops in E modules."
+            f"Function E2.get_costs() is used on {label}, eventhough it should not be applied to it. Check loops in E modules."
         )
 
     # Testing, if the dict_asset includes all parameters necessary for the proceeding evaluation
@@ -131,98 +137,80 @@ def get_costs(dict_asset, economic_data):
 
     # Part of the investment costs to be paid upfront at t=0
     costs_investment_upfront = calculate_costs_upfront_investment(
-        capacity=dict_asset[OPTIMIZED_ADD_CAP][VALUE],
-        specific_cost=dict_asset[SPECIFIC_COSTS][VALUE],
-        development_costs=dict_asset[DEVELOPMENT_COSTS][VALUE],
+        capacity=get_value(dict_asset, OPTIMIZED_ADD_CAP),
+        specific_cost=get_value(dict_asset, SPECIFIC_COSTS),
+        development_costs=get_value(dict_asset, DEVELOPMENT_COSTS),
     )
 
-    dict_asset.update(
-        {COST_UPFRONT: {VALUE: costs_investment_upfront, UNIT: economic_data[CURR]}}
-    )
+    set_value(dict_asset, COST_UPFRONT, costs_investment_upfront, economic_data[CURR])
 
     # Part of the investment costs to be paid due to replacements
     costs_replacement = calculate_costs_replacement(
-        specific_replacement_of_initial_capacity=dict_asset[
-            SPECIFIC_REPLACEMENT_COSTS_INSTALLED
-        ][VALUE],
-        specific_replacement_of_optimized_capacity=dict_asset[
-            SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED
-        ][VALUE],
-        initial_capacity=dict_asset[INSTALLED_CAP][VALUE],
-        optimized_capacity=dict_asset[OPTIMIZED_ADD_CAP][VALUE],
+        specific_replacement_of_initial_capacity=get_value(
+            dict_asset, SPECIFIC_REPLACEMENT_COSTS_INSTALLED
+        ),
+        specific_replacement_of_optimized_capacity=get_value(
+            dict_asset, SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED
+        ),
+        initial_capacity=get_value(dict_asset, INSTALLED_CAP),
+        optimized_capacity=get_value(dict_asset, OPTIMIZED_ADD_CAP),
     )
 
-    dict_asset.update(
-        {COST_REPLACEMENT: {VALUE: costs_replacement, UNIT: economic_data[CURR]}}
-    )
+    set_value(dict_asset, COST_REPLACEMENT, costs_replacement, economic_data[CURR])
 
     # Total investment costs including investments into the asset, replacement costs and development costs
     costs_investment_lifetime = calculate_total_capital_costs(
-        upfront=dict_asset[COST_UPFRONT][VALUE],
-        replacement=dict_asset[COST_REPLACEMENT][VALUE],
+        upfront=costs_investment_upfront, replacement=costs_replacement,
     )
 
-    dict_asset.update(
-        {COST_INVESTMENT: {VALUE: costs_investment_lifetime, UNIT: economic_data[CURR]}}
+    set_value(
+        dict_asset, COST_INVESTMENT, costs_investment_lifetime, economic_data[CURR]
     )
 
     # Operation and management expenditures over the project lifetime
     operation_and_management_expenditures = calculate_operation_and_management_expenditures(
-        specific_om_cost=dict_asset[LIFETIME_SPECIFIC_COST_OM][VALUE],
-        installed_capacity=dict_asset[INSTALLED_CAP][VALUE],
-        optimized_add_capacity=dict_asset[OPTIMIZED_ADD_CAP][VALUE],
+        specific_om_cost=get_value(dict_asset, LIFETIME_SPECIFIC_COST_OM),
+        installed_capacity=get_value(dict_asset, INSTALLED_CAP),
+        optimized_add_capacity=get_value(dict_asset, OPTIMIZED_ADD_CAP),
     )
-    dict_asset.update(
-        {
-            COST_OM: {
-                VALUE: operation_and_management_expenditures,
-                UNIT: economic_data[CURR],
-            }
-        }
+    set_value(
+        dict_asset, COST_OM, operation_and_management_expenditures, economic_data[CURR]
     )
 
     # Dispatch expenditures of the asset over the project lifetime
     costs_dispatch = calculate_dispatch_expenditures(
-        dispatch_price=dict_asset[LIFETIME_PRICE_DISPATCH][VALUE],
-        flow=dict_asset[FLOW],
-        asset=dict_asset[LABEL],
+        dispatch_price=get_value(dict_asset, LIFETIME_PRICE_DISPATCH),
+        flow=get_value(dict_asset, FLOW),
+        asset=label,
     )
 
-    dict_asset.update(
-        {COST_DISPATCH: {VALUE: costs_dispatch, UNIT: economic_data[CURR]}}
-    )
+    set_value(dict_asset, COST_DISPATCH, costs_dispatch, economic_data[CURR])
 
     # Total operational expenditures over the lifetime
     total_operational_expenditures = calculate_total_operational_expenditures(
-        dict_asset[COST_OM][VALUE], dict_asset[COST_DISPATCH][VALUE]
+        operation_and_management_expenditures, costs_dispatch
     )
-    dict_asset.update({COST_OPERATIONAL_TOTAL: {VALUE: total_operational_expenditures}})
+    set_value(dict_asset, COST_OPERATIONAL_TOTAL, total_operational_expenditures)
 
     # Total costs of the assets, capital and operational
     total_asset_costs_over_lifetime = calculate_total_asset_costs_over_lifetime(
-        dict_asset[COST_INVESTMENT][VALUE], dict_asset[COST_OPERATIONAL_TOTAL][VALUE]
+        costs_investment_lifetime, total_operational_expenditures
     )
-    dict_asset.update(
-        {
-            COST_TOTAL: {
-                VALUE: total_asset_costs_over_lifetime,
-                UNIT: economic_data[CURR],
-            }
-        }
+    set_value(
+        dict_asset, COST_TOTAL, total_asset_costs_over_lifetime, economic_data[CURR]
     )
 
-    dict_asset.update(
-        {
-            ANNUITY_TOTAL: {
-                VALUE: dict_asset[COST_TOTAL][VALUE] * economic_data[CRF][VALUE],
-                UNIT: CURR + "/" + UNIT_YEAR,
-            },
-            ANNUITY_OM: {
-                VALUE: dict_asset[COST_OPERATIONAL_TOTAL][VALUE]
-                * economic_data[CRF][VALUE],
-                UNIT: CURR + "/" + UNIT_YEAR,
-            },
-        }
+    set_value(
+        dict_asset,
+        ANNUITY_TOTAL,
+        total_asset_costs_over_lifetime * economic_data[CRF][VALUE],
+        CURR + "/" + UNIT_YEAR,
+    )
+    set_value(
+        dict_asset,
+        ANNUITY_OM,
+        total_operational_expenditures * economic_data[CRF][VALUE],
+        CURR + "/" + UNIT_YEAR,
     )
 
 
@@ -466,7 +454,7 @@ def all_list_in_dict(dict_asset, list):
                 missing_parameters.append(name)
         missing_parameters = ", ".join(map(str, missing_parameters))
         raise MissingParametersForEconomicEvaluation(
-            f"Asset {dict_asset[LABEL]} is missing parameters for the economic evaluation: {missing_parameters}."
+            f"Asset {get_value(dict_asset, LABEL)} is missing parameters for the economic evaluation: {missing_parameters}."
             f"These parameters are needed for E2.get_costs(). Please check the E modules."
         )
     return boolean
@@ -478,7 +466,7 @@ def lcoe_assets(dict_asset, asset_group):
 
     Parameters
     ----------
-    dict_asset: dict
+    dict_asset: dict or :class:`multi_vector_simulator.utils.asset_records.AssetRecord`
         Dictionary defining an asset
 
     asset_group: str
@@ -502,41 +490,38 @@ def lcoe_assets(dict_asset, asset_group):
     lcoe_a = 0
 
     if asset_group == ENERGY_STORAGE:
-        if dict_asset[OUTPUT_POWER][TOTAL_FLOW][VALUE] > 0:
+        input_power = get_value(dict_asset, INPUT_POWER)
+        output_power = get_value(dict_asset, OUTPUT_POWER)
+        storage_capacity = get_value(dict_asset, STORAGE_CAPACITY)
+        if get_value(output_power, TOTAL_FLOW) > 0:
             storage_annuity = (
-                dict_asset[INPUT_POWER][ANNUITY_TOTAL][VALUE]
-                + dict_asset[OUTPUT_POWER][ANNUITY_TOTAL][VALUE]
-                + dict_asset[STORAGE_CAPACITY][ANNUITY_TOTAL][VALUE]
+                get_value(input_power, ANNUITY_TOTAL)
+                + get_value(output_power, ANNUITY_TOTAL)
+                + get_value(storage_capacity, ANNUITY_TOTAL)
             )
-            lcoe_a = storage_annuity / dict_asset[OUTPUT_POWER][TOTAL_FLOW][VALUE]
+            lcoe_a = storage_annuity / get_value(output_power, TOTAL_FLOW)
 
-        for component in [INPUT_POWER, OUTPUT_POWER]:
-            if dict_asset[component][TOTAL_FLOW][VALUE] > 0:
-                lcoe_a_component = (
-                    dict_asset[component][ANNUITY_TOTAL][VALUE]
-                    / dict_asset[component][TOTAL_FLOW][VALUE]
+        for component in [input_power, output_power]:
+            if get_value(component, TOTAL_FLOW) > 0:
+                lcoe_a_component = get_value(component, ANNUITY_TOTAL) / get_value(
+                    component, TOTAL_FLOW
                 )
-                dict_asset[component].update(
-                    {LCOE_ASSET: {VALUE: lcoe_a_component, UNIT: CURR + "/kWh"}}
-                )
-                if component == INPUT_POWER:
-                    lcoe_a_component = (
-                        dict_asset[STORAGE_CAPACITY][ANNUITY_TOTAL][VALUE]
-                        / dict_asset[component][TOTAL_FLOW][VALUE]
-                    )
-                    dict_asset[STORAGE_CAPACITY].update(
-                        {LCOE_ASSET: {VALUE: lcoe_a_component, UNIT: CURR + "/kWh"}}
+                set_value(component, LCOE_ASSET, lcoe_a_component, CURR + "/kWh")
+                if component is input_power:
+                    lcoe_a_component = get_value(
+                        storage_capacity, ANNUITY_TOTAL
+                    ) / get_value(component, TOTAL_FLOW)
+                    set_value(
+                        storage_capacity, LCOE_ASSET, lcoe_a_component, CURR + "/kWh"
                     )
             else:
-                dict_asset[component].update(
-                    {LCOE_ASSET: {VALUE: 0, UNIT: CURR + "/kWh"}}
-                )
-                if component == INPUT_POWER:
-                    dict_asset[STORAGE_CAPACITY].update(
-                        {LCOE_ASSET: {VALUE: 0, UNIT: CURR + "/kWh"}}
-                    )
+                set_value(component, LCOE_ASSET, 0, CURR + "/kWh")
+                if component is input_power:
+                    set_value(storage_capacity, LCOE_ASSET, 0, CURR + "/kWh")
 
-    elif dict_asset[TOTAL_FLOW][VALUE] > 0:
-        lcoe_a = dict_asset[ANNUITY_TOTAL][VALUE] / dict_asset[TOTAL_FLOW][VALUE]
+    elif get_value(dict_asset, TOTAL_FLOW) > 0:
+        lcoe_a = get_value(dict_asset, ANNUITY_TOTAL) / get_value(
+            dict_asset, TOTAL_FLOW
+        )
 
-    dict_asset.update({LCOE_ASSET: {VALUE: lcoe_a, UNIT: CURR + "/kWh"}})
+    set_value(dict_asset, LCOE_ASSET, lcoe_a, CURR + "/kWh")
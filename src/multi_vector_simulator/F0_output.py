@@ -14,6 +14,7 @@ The model F0 output defines all functions that store evaluation results to file.
 """
 
 
+import functools
 import json
 import logging
 import os
@@ -22,15 +23,6 @@ import pandas as pd
 
 from multi_vector_simulator.B0_data_input_json import convert_from_special_types_to_json
 from multi_vector_simulator.E1_process_results import get_units_of_cost_matrix_entries
-import multi_vector_simulator.F1_plotting as F1_plots
-
-try:
-    import multi_vector_simulator.F2_autoreport as autoreport
-
-    AUTOREPORT = True
-except ModuleNotFoundError:
-    logging.warning("The reporting feature is disabled")
-    AUTOREPORT = False
 
 from multi_vector_simulator.utils.constants import (
     SIMULATION_SETTINGS,
@@ -62,6 +54,7 @@ from multi_vector_simulator.utils.constants_json_strings import (
     WARNINGS,
     FIX_COST,
     ENERGY_BUSSES,
+    TIMESERIES_STORE,
 )
 
 
@@ -111,6 +104,9 @@ def evaluate_dict(dict_values, path_pdf_report=None, path_png_figs=None):
 
     # generate png figures
     if path_png_figs is not None:
+        # the plotting libraries are only imported if figures are requested
+        import multi_vector_simulator.F1_plotting as F1_plots
+
         # plot demand timeseries
         F1_plots.plot_timeseries(
             dict_values, data_type=DEMANDS, file_path=path_png_figs
@@ -140,6 +136,15 @@ def evaluate_dict(dict_values, path_pdf_report=None, path_png_figs=None):
 
     # generate a pdf report
     if path_pdf_report is not None:
+        # the reporting libraries are only imported if a report is requested
+        try:
+            import multi_vector_simulator.F2_autoreport as autoreport
+        except ModuleNotFoundError:
+            logging.warning(
+                "The reporting feature is disabled, if you want to install it use \n\t"
+                "pip install multi-vector-simulator[report]"
+            )
+            return
         app = autoreport.create_app(dict_values)
         autoreport.print_pdf(app, path_pdf_report=path_pdf_report)
         logging.info(
@@ -147,7 +152,7 @@ def evaluate_dict(dict_values, path_pdf_report=None, path_png_figs=None):
         )
 
 
-def store_scalars_to_excel(dict_values):
+def store_scalars_to_excel(dict_values, file_name="scalars"):
     """All output data that is a scalar is storage to an excellent file tab. This could for example be economical data or technical data.
 
     Parameters
@@ -155,13 +160,17 @@ def store_scalars_to_excel(dict_values):
     dict_values :
         dict Of all input and output parameters up to F0
 
+    file_name : (str)
+        Name of the excel file, without extension
+        Default "scalars"
+
     Returns
     -------
     type
         Excel file with scalar data
 
     """
-    results_scalar_output_file = "/scalars" + ".xlsx"
+    results_scalar_output_file = "/" + file_name + ".xlsx"
 
     with pd.ExcelWriter(
         dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER]
@@ -286,11 +295,17 @@ def store_as_json(dict_values, output_folder=None, file_name=None):
     If file_name is provided, the json variable converted from the dict_values is saved under
     this file_name, otherwise the json variable is returned
     """
+    # the timeseries which are views on the timeseries store are stored as references to it
+    timeseries_store = None
+    if isinstance(dict_values, dict):
+        timeseries_store = dict_values.get(TIMESERIES_STORE)
     json_data = json.dumps(
         dict_values,
         skipkeys=False,
         sort_keys=True,
-        default=convert_from_special_types_to_json,
+        default=functools.partial(
+            convert_from_special_types_to_json, timeseries_store=timeseries_store
+        ),
         indent=4,
     )
     if file_name is not None:
@@ -38,17 +38,6 @@ import multi_vector_simulator.D0_modelling_and_optimization as D0
 import multi_vector_simulator.E0_evaluation as E0
 import multi_vector_simulator.F0_output as F0
 
-try:
-    from multi_vector_simulator.F2_autoreport import (
-        create_app,
-        open_in_browser,
-        print_pdf,
-    )
-except ModuleNotFoundError:
-    logging.warning(
-        "Some packages are mising to generate automatic report, if you want to install them use \n\tpip install multi-vector-simulator[report]"
-    )
-
 from multi_vector_simulator.version import version_num, version_date
 
 from multi_vector_simulator.utils import copy_inputs_template
@@ -73,6 +62,9 @@ from multi_vector_simulator.utils.constants import (
     JSON_PROCESSED,
     JSON_FILE_EXTENSION,
     MVS_CONFIG,
+    JSON_ECONOMIC_REEVALUATION,
+    SCALARS_ECONOMIC_REEVALUATION,
+    ARG_ECONOMIC_DATA_OVERRIDES,
 )
 
 
@@ -222,6 +214,19 @@ def report(pdf=None, path_simulation_output_json=None, path_pdf_report=None):
     Save a pdf report if option -pdf is provided, otherwise display the report as an app
     """
 
+    # the reporting libraries are only imported when a report is requested
+    try:
+        from multi_vector_simulator.F2_autoreport import (
+            create_app,
+            open_in_browser,
+            print_pdf,
+        )
+    except ModuleNotFoundError:
+        logging.error(
+            "Some packages are mising to generate automatic report, if you want to install them use \n\tpip install multi-vector-simulator[report]"
+        )
+        raise
+
     # Parse the arguments from the command line
     parser = A0.report_arg_parser()
     args = vars(parser.parse_args())
@@ -282,6 +287,94 @@ def report(pdf=None, path_simulation_output_json=None, path_pdf_report=None):
                 )
 
 
+def reevaluate(
+    path_simulation_output_json=None,
+    economic_data_overrides=None,
+    path_output_folder=None,
+):
+    """Re-evaluate the economic KPI of a MVS simulation with other economic data
+
+    The dispatch and the capacities of the assets are not re-optimized, only the costs and
+    the economic KPI are re-evaluated (see E0.reevaluate_economics)
+
+    Command line use:
+
+    .. code-block:: bash
+
+        mvs_reevaluate [-h] [-i [PATH_SIM_OUTPUT]] [-o [OUTPUT_FOLDER]] [-e PARAMETER=VALUE]
+
+    optional command line arguments:
+      -h, --help           show this help message and exit
+      -i [OUTPUT_FOLDER]   path to the simulation result json file
+                           'json_with_results.json'
+      -o [OUTPUT_FOLDER]   folder in which the re-evaluated results are saved
+      -e PARAMETER=VALUE   new value of a parameter of the economic data, can be repeated
+
+    Parameters
+    ----------
+    path_simulation_output_json: str
+        path to the simulation result json file 'json_with_results.json'
+    economic_data_overrides: dict
+        new values of the parameters of the economic data
+    path_output_folder: str
+        folder in which the re-evaluated results are saved
+        Default: folder of the simulation result json file
+
+    Returns
+    -------
+    Path to the json file with the re-evaluated results, the scalar results are saved to an
+    excel file in the same folder
+    """
+
+    # Parse the arguments from the command line
+    parser = A0.reevaluate_arg_parser()
+    args = vars(parser.parse_args())
+
+    # Give priority from user input kwargs over command line arguments
+    if path_simulation_output_json is None:
+        path_simulation_output_json = args.get(ARG_PATH_SIM_OUTPUT)
+    if path_output_folder is None:
+        path_output_folder = args.get(PATH_OUTPUT_FOLDER)
+    if economic_data_overrides is None:
+        economic_data_overrides = {}
+        for override in args.get(ARG_ECONOMIC_DATA_OVERRIDES):
+            if "=" not in override:
+                raise ValueError(
+                    f"The economic data override {override} should be formatted as PARAMETER=VALUE"
+                )
+            parameter, value = override.split("=", 1)
+            # converted to the type of the parameter by E0.reevaluate_economics
+            economic_data_overrides[parameter.strip()] = value.strip()
+
+    # if the user only provided the path to the folder, we complete with default json file
+    if os.path.isdir(path_simulation_output_json) is True:
+        path_simulation_output_json = os.path.join(
+            path_simulation_output_json, JSON_WITH_RESULTS + JSON_FILE_EXTENSION
+        )
+
+    if os.path.exists(path_simulation_output_json) is False:
+        raise FileNotFoundError(
+            "Simulation results file {} not found. You need to run a simulation to generate "
+            "the data before you can re-evaluate it\n\n\tsee `mvs_tool -h` for help on how "
+            "to run a simulation\n".format(path_simulation_output_json)
+        )
+
+    if path_output_folder is None:
+        path_output_folder = os.path.dirname(path_simulation_output_json)
+
+    # the economic evaluation of the assets runs on their compact records
+    dict_values = B0.load_json(
+        path_simulation_output_json, flag_missing_values=False, asset_records=True
+    )
+    E0.reevaluate_economics(dict_values, economic_data_overrides)
+
+    dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER] = path_output_folder
+    F0.store_scalars_to_excel(dict_values, file_name=SCALARS_ECONOMIC_REEVALUATION)
+    return F0.store_as_json(
+        dict_values, path_output_folder, JSON_ECONOMIC_REEVALUATION,
+    )
+
+
 def create_input_template_folder():
     """Create a copy of the input_template folder in the current directory
 
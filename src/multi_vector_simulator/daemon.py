@@ -0,0 +1,474 @@
+"""
+Simulation daemon
+=================
+
+Runs a pool of warm worker processes which execute `mvs_tool` simulations handed over by a thin
+client through a local socket.
+
+Every `mvs_tool` call re-imports pandas, oemof.solph, pyomo and the report stack, and initializes
+the solver plugins. For short simulations this startup dominates the run time. The workers of the
+daemon do it once, when they are started, and then execute one simulation after the other.
+
+Start the daemon (it runs until it is stopped):
+
+.. code-block:: bash
+
+    mvs_daemon [-h] [-n [N_WORKERS]] [-port [PORT]] [-tasks [MAX_TASKS]]
+
+Run a simulation through the daemon, the arguments are the ones of `mvs_tool`. The log messages
+of the simulation are streamed back to the console:
+
+.. code-block:: bash
+
+    mvs_client [-port [PORT]] [mvs_tool arguments]
+
+Stop the daemon:
+
+.. code-block:: bash
+
+    mvs_client -stop
+
+This module only imports lightweight libraries at module level, so that the client starts fast.
+"""
+
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import secrets
+import sys
+import threading
+import traceback
+from multiprocessing.connection import Listener, Client
+
+from multi_vector_simulator.A0_initialization import (
+    daemon_arg_parser,
+    client_arg_parser,
+    mvs_arg_parser,
+)
+from multi_vector_simulator.utils.constants import (
+    DAEMON_HOST,
+    DAEMON_KEY_FILE,
+    DAEMON_PORT,
+    DAEMON_COMMAND,
+    DAEMON_RUN,
+    DAEMON_PING,
+    DAEMON_STOP,
+    DAEMON_EVENT,
+    DAEMON_LOG,
+    DAEMON_RESULT,
+    DAEMON_ERROR,
+    DAEMON_CONTENT,
+    DAEMON_STARTED,
+    DAEMON_POLL_INTERVAL,
+    PATH_OUTPUT_FOLDER,
+)
+from multi_vector_simulator.utils.exceptions import MVSDaemonError
+
+# name of the program as seen by the argument parser of mvs_tool within the workers
+MVS_TOOL_PROG = "mvs_tool"
+
+
+def send_message(connection, message):
+    """Sends a dict as json through a connection (no pickling of untrusted data)"""
+    connection.send_bytes(json.dumps(message).encode("utf-8"))
+
+
+def receive_message(connection):
+    """Receives a dict sent with `send_message`"""
+    return json.loads(connection.recv_bytes().decode("utf-8"))
+
+
+def create_authkey(key_file=DAEMON_KEY_FILE):
+    """Writes a new random key, only readable by the user, used to authenticate the clients
+
+    Parameters
+    ----------
+    key_file: str
+        path to the file storing the key
+
+    Returns
+    -------
+    The key as bytes
+    """
+    authkey = secrets.token_hex(32)
+    file_descriptor = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(file_descriptor, "w") as fp:
+        fp.write(authkey)
+    return authkey.encode("utf-8")
+
+
+def read_authkey(key_file=DAEMON_KEY_FILE):
+    """Reads the key written by the daemon when it started
+
+    Parameters
+    ----------
+    key_file: str
+        path to the file storing the key
+
+    Returns
+    -------
+    The key as bytes
+    """
+    if os.path.exists(key_file) is False:
+        raise MVSDaemonError(
+            f"The key file {key_file} of the MVS daemon does not exist, start the daemon with "
+            f"`mvs_daemon` first"
+        )
+    with open(key_file) as fp:
+        authkey = fp.read().strip()
+    return authkey.encode("utf-8")
+
+
+class _EventStream:
+    """File-like object turning each line written to it into a log event"""
+
+    def __init__(self, events):
+        self.events = events
+        self.buffer = ""
+
+    def write(self, text):
+        self.buffer += text
+        while "\n" in self.buffer:
+            line, self.buffer = self.buffer.split("\n", 1)
+            self.events.put({DAEMON_EVENT: DAEMON_LOG, DAEMON_CONTENT: line})
+        return len(text)
+
+    def flush(self):
+        if self.buffer != "":
+            self.events.put({DAEMON_EVENT: DAEMON_LOG, DAEMON_CONTENT: self.buffer})
+            self.buffer = ""
+
+
+def _initialize_worker():
+    """Imports all libraries of a simulation once, when the worker process starts"""
+    import pandas  # noqa: F401
+    import oemof.solph  # noqa: F401
+    from pyomo.opt import SolverFactory
+
+    import multi_vector_simulator.cli  # noqa: F401
+
+    # The report stack is imported lazily by the cli, preload it for -pdf and -png runs
+    try:
+        import multi_vector_simulator.F1_plotting  # noqa: F401
+        import multi_vector_simulator.F2_autoreport  # noqa: F401
+    except ModuleNotFoundError:
+        pass
+
+    # Load the solver plugin and look up its executable once
+    SolverFactory("cbc").available(exception_flag=False)
+
+
+def _run_job(argv, cwd, events):
+    """Runs `mvs_tool` with the arguments of the client within a worker process
+
+    The first event of the job is the process id of the worker. The console output of the
+    simulation is sent as log events to the daemon, which forwards them to the client. The last
+    event of the job is either a result or an error, followed by None.
+
+    Parameters
+    ----------
+    argv: list of str
+        command line arguments of `mvs_tool`
+    cwd: str
+        working directory of the client, relative paths of argv are relative to it
+    events: :class:`multiprocessing.Queue`
+        queue shared with the daemon
+    """
+    from multi_vector_simulator.cli import main
+
+    events.put({DAEMON_EVENT: DAEMON_STARTED, DAEMON_CONTENT: os.getpid()})
+    root_logger = logging.getLogger()
+    previous_handlers = list(root_logger.handlers)
+    previous_level = root_logger.level
+    previous_argv = sys.argv
+    previous_cwd = os.getcwd()
+    stream = _EventStream(events)
+    try:
+        os.chdir(cwd)
+        # The argument parser of mvs_tool reads sys.argv
+        sys.argv = [MVS_TOOL_PROG] + list(argv)
+        with contextlib.redirect_stdout(stream), contextlib.redirect_stderr(stream):
+            main()
+        stream.flush()
+        path_output_folder = vars(mvs_arg_parser().parse_args(argv))[PATH_OUTPUT_FOLDER]
+        events.put(
+            {
+                DAEMON_EVENT: DAEMON_RESULT,
+                DAEMON_CONTENT: os.path.abspath(path_output_folder),
+            }
+        )
+    except BaseException:
+        stream.flush()
+        events.put({DAEMON_EVENT: DAEMON_ERROR, DAEMON_CONTENT: traceback.format_exc()})
+    finally:
+        # The logging defined by the simulation writes into its output folder
+        for handler in root_logger.handlers:
+            if handler not in previous_handlers:
+                handler.close()
+        root_logger.handlers = previous_handlers
+        root_logger.setLevel(previous_level)
+        sys.argv = previous_argv
+        os.chdir(previous_cwd)
+        events.put(None)
+
+
+class SimulationDaemon:
+    r"""
+    Pool of pre-imported worker processes listening on a local socket
+
+    Parameters
+    ----------
+    n_workers: int, optional
+        Number of worker processes, i.e. maximal number of simulations running in parallel.
+        Default: number of processors of the machine
+    port: int, optional
+        Port of the socket on localhost, use 0 to pick a free port. Default: DAEMON_PORT
+    max_tasks_per_worker: int, optional
+        Number of simulations after which a worker process is replaced by a new one, to release
+        its memory. Default: None (workers live as long as the daemon)
+    key_file: str, optional
+        Path to the file where the authentication key of the clients is written.
+        Default: DAEMON_KEY_FILE
+    """
+
+    def __init__(
+        self,
+        n_workers=None,
+        port=DAEMON_PORT,
+        max_tasks_per_worker=None,
+        key_file=DAEMON_KEY_FILE,
+    ):
+        self.authkey = create_authkey(key_file)
+        self.listener = Listener((DAEMON_HOST, port), authkey=self.authkey)
+        self.address = self.listener.address
+        self.sync_manager = multiprocessing.Manager()
+        # The processes of a multiprocessing.Pool are all started right away
+        self.pool = multiprocessing.Pool(
+            processes=n_workers,
+            initializer=_initialize_worker,
+            maxtasksperchild=max_tasks_per_worker,
+        )
+        self.stopped = threading.Event()
+        # number of jobs whose events are streamed to a client
+        self.n_running_jobs = 0
+        # number of jobs lost because their worker process died
+        self.n_lost_jobs = 0
+        self.jobs_finished = threading.Condition()
+
+    def serve_forever(self):
+        """Accepts client connections until a client sends the stop command"""
+        logging.info(f"MVS daemon listening on {self.address[0]}:{self.address[1]}")
+        while self.stopped.is_set() is False:
+            try:
+                connection = self.listener.accept()
+            except multiprocessing.AuthenticationError:
+                logging.warning("Connection refused to a client with a wrong key")
+                continue
+            if self.stopped.is_set() is True:
+                # This is the connection opened by stop() to release accept()
+                connection.close()
+                break
+            threading.Thread(
+                target=self.handle_connection, args=(connection,), daemon=True
+            ).start()
+        self.close()
+
+    def handle_connection(self, connection):
+        """Executes the command of a single client"""
+        with connection:
+            try:
+                request = receive_message(connection)
+            except (EOFError, OSError, ValueError):
+                return
+            command = request.get(DAEMON_COMMAND)
+            if command == DAEMON_RUN:
+                self.run_job(connection, request["argv"], request["cwd"])
+            elif command == DAEMON_PING:
+                send_message(
+                    connection, {DAEMON_EVENT: DAEMON_RESULT, DAEMON_CONTENT: "pong"}
+                )
+            elif command == DAEMON_STOP:
+                send_message(
+                    connection,
+                    {DAEMON_EVENT: DAEMON_RESULT, DAEMON_CONTENT: "stopping"},
+                )
+                self.stop()
+            else:
+                send_message(
+                    connection,
+                    {
+                        DAEMON_EVENT: DAEMON_ERROR,
+                        DAEMON_CONTENT: f"Unknown command {command}",
+                    },
+                )
+
+    def run_job(self, connection, argv, cwd):
+        """Hands a simulation over to a worker and streams its events back to the client
+
+        If the worker process dies during the simulation (e.g. killed because it ran out of
+        memory), the pool replaces it but the job is lost: an error event is sent to the client.
+        """
+        events = self.sync_manager.Queue()
+
+        def job_error(exception):
+            events.put({DAEMON_EVENT: DAEMON_ERROR, DAEMON_CONTENT: repr(exception)})
+            events.put(None)
+
+        with self.jobs_finished:
+            self.n_running_jobs += 1
+        try:
+            self.pool.apply_async(
+                _run_job, (argv, cwd, events), error_callback=job_error
+            )
+            self.stream_events(connection, events)
+        finally:
+            with self.jobs_finished:
+                self.n_running_jobs -= 1
+                self.jobs_finished.notify_all()
+
+    def stream_events(self, connection, events):
+        """Forwards the events of a job to the client until the job is finished or lost"""
+        worker_pid = None
+        client_connected = True
+        while True:
+            try:
+                event = events.get(timeout=DAEMON_POLL_INTERVAL)
+            except queue.Empty:
+                if worker_pid is None or worker_pid in [
+                    process.pid for process in multiprocessing.active_children()
+                ]:
+                    continue
+                # the worker died without closing the event stream of the job
+                with self.jobs_finished:
+                    self.n_lost_jobs += 1
+                event = {
+                    DAEMON_EVENT: DAEMON_ERROR,
+                    DAEMON_CONTENT: f"The worker process {worker_pid} running the "
+                    f"simulation died",
+                }
+                events.put(None)
+            if event is None:
+                break
+            if event[DAEMON_EVENT] == DAEMON_STARTED:
+                worker_pid = event[DAEMON_CONTENT]
+                continue
+            if client_connected is True:
+                try:
+                    send_message(connection, event)
+                except OSError:
+                    # The simulation still runs to the end, but nobody listens anymore
+                    client_connected = False
+
+    def stop(self):
+        """Stops accepting new clients, running simulations are finished first"""
+        self.stopped.set()
+        # accept() is not interrupted when the listener is closed from another thread
+        Client(self.address, authkey=self.authkey).close()
+
+    def close(self):
+        """Terminates the worker processes once their simulations are finished"""
+        self.listener.close()
+        self.pool.close()
+        with self.jobs_finished:
+            self.jobs_finished.wait_for(lambda: self.n_running_jobs == 0)
+        if self.n_lost_jobs > 0:
+            # the jobs of dead workers are never removed from the pool, join() would wait for
+            # them, the workers are idle and can be terminated
+            self.pool.terminate()
+        self.pool.join()
+        self.sync_manager.shutdown()
+
+
+def submit(
+    argv, port=DAEMON_PORT, key_file=DAEMON_KEY_FILE, stream=None, command=DAEMON_RUN
+):
+    r"""
+    Sends a command to the daemon and writes the streamed log messages to a stream
+
+    Parameters
+    ----------
+    argv: list of str
+        command line arguments of `mvs_tool`
+    port: int, optional
+        Port of the daemon on localhost. Default: DAEMON_PORT
+    key_file: str, optional
+        Path to the authentication key written by the daemon. Default: DAEMON_KEY_FILE
+    stream: file-like, optional
+        Where the log messages of the simulation are written. Default: sys.stdout
+    command: str, optional
+        One of DAEMON_RUN, DAEMON_PING or DAEMON_STOP. Default: DAEMON_RUN
+
+    Returns
+    -------
+    The absolute path of the output folder of the simulation (run command), or the answer of
+    the daemon (other commands). MVSDaemonError is raised if the simulation failed.
+    """
+    if stream is None:
+        stream = sys.stdout
+    try:
+        connection = Client((DAEMON_HOST, port), authkey=read_authkey(key_file))
+    except ConnectionRefusedError:
+        raise MVSDaemonError(
+            f"No MVS daemon is listening on port {port}, start it with `mvs_daemon` first"
+        ) from None
+    with connection:
+        send_message(
+            connection,
+            {DAEMON_COMMAND: command, "argv": list(argv), "cwd": os.getcwd()},
+        )
+        answer = None
+        while True:
+            try:
+                event = receive_message(connection)
+            except EOFError:
+                raise MVSDaemonError(
+                    "The MVS daemon closed the connection before the end of the simulation"
+                ) from None
+            if event[DAEMON_EVENT] == DAEMON_LOG:
+                stream.write(event[DAEMON_CONTENT] + "\n")
+                stream.flush()
+            elif event[DAEMON_EVENT] == DAEMON_RESULT:
+                answer = event[DAEMON_CONTENT]
+                break
+            elif event[DAEMON_EVENT] == DAEMON_ERROR:
+                raise MVSDaemonError(event[DAEMON_CONTENT])
+    return answer
+
+
+def start():
+    """Starts the MVS daemon from the command line (entry point `mvs_daemon`)"""
+    args = vars(daemon_arg_parser().parse_args())
+    logging.basicConfig(format="%(levelname)s:%(message)s", level=logging.INFO)
+    daemon = SimulationDaemon(
+        n_workers=args["n_workers"],
+        port=args["port"],
+        max_tasks_per_worker=args["max_tasks"],
+    )
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.close()
+
+
+def client():
+    """Runs a simulation through the MVS daemon from the command line (entry point `mvs_client`)
+
+    The arguments which are not specific to the client are forwarded to `mvs_tool`.
+    """
+    args, mvs_tool_argv = client_arg_parser().parse_known_args()
+    args = vars(args)
+    if args["stop"] is True:
+        command = DAEMON_STOP
+    else:
+        command = DAEMON_RUN
+    try:
+        answer = submit(mvs_tool_argv, port=args["port"], command=command)
+    except MVSDaemonError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if command == DAEMON_RUN:
+        print(f"The results of the simulation are stored in {answer}")
+    return 0
@@ -0,0 +1,733 @@
+"""
+Job queue
+=========
+
+Spreads MVS simulations over several machines without any service besides a shared filesystem.
+The jobs are stored in a sqlite database, worker processes on any node sharing the filesystem
+claim them one at a time, run them in a child process, send heartbeats while they run and write
+their results back to the database.
+
+- An attempt of a job which raises an exception, exceeds the timeout of the job or whose worker
+  stops sending heartbeats for longer than the lease timeout (e.g. because its node went down)
+  is retried after a delay, until the job reaches its maximal number of attempts. It is then
+  moved to the dead letter state, from which it can be requeued.
+- A failed attempt of a `mvs_tool` job can leave a partial output folder. If the output folder
+  did not exist when the job was first run, all further attempts overwrite it.
+- Jobs are claimed within an exclusive sqlite transaction, so that each attempt is run by a
+  single worker. This relies on the file locks of the shared filesystem: sqlite databases on
+  network filesystems without working locks are not safe. The lease timeout should be larger
+  than the clock difference between the nodes.
+
+Queue a `mvs_tool` simulation, the arguments are the ones of `mvs_tool`. Relative paths are
+relative to the current folder, which should be reachable under the same path from all nodes:
+
+.. code-block:: bash
+
+    mvs_queue [-db [DATABASE]] submit [-attempts [MAX_ATTEMPTS]] [-timeout [TIMEOUT]]
+    [mvs_tool arguments]
+
+Run the queued jobs with worker processes on a node:
+
+.. code-block:: bash
+
+    mvs_queue [-db [DATABASE]] worker [-n [N_WORKERS]] [-jobs [MAX_JOBS]] [-idle]
+
+Show the state of the jobs, and requeue jobs in the dead letter state:
+
+.. code-block:: bash
+
+    mvs_queue [-db [DATABASE]] status [-id [JOB_ID]]
+    mvs_queue [-db [DATABASE]] requeue JOB_ID [JOB_ID ...]
+
+Jobs running `server.run_simulation` on an input json are queued with
+`JobQueue.submit_simulation`. The queue itself only relies on the standard library, the
+simulation libraries are imported by the child processes running the jobs.
+"""
+
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+import traceback
+
+from multi_vector_simulator.A0_initialization import queue_arg_parser, mvs_arg_parser
+from multi_vector_simulator.daemon import MVS_TOOL_PROG
+from multi_vector_simulator.utils.constants import (
+    JOB_PENDING,
+    JOB_RUNNING,
+    JOB_DONE,
+    JOB_DEAD_LETTER,
+    QUEUE_DATABASE,
+    QUEUE_JOB_MVS_TOOL,
+    QUEUE_JOB_SIMULATION,
+    QUEUE_MAX_ATTEMPTS,
+    QUEUE_LEASE_TIMEOUT,
+    QUEUE_HEARTBEAT_INTERVAL,
+    QUEUE_POLL_INTERVAL,
+    QUEUE_RETRY_DELAY,
+    PATH_OUTPUT_FOLDER,
+)
+from multi_vector_simulator.utils.exceptions import MVSQueueError
+
+QUEUE_STATES = (JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_DEAD_LETTER)
+# seconds a connection waits for the lock of the database held by another worker
+SQLITE_BUSY_TIMEOUT = 60
+
+_CREATE_JOBS_TABLE = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    timeout REAL,
+    worker TEXT,
+    submitted REAL NOT NULL,
+    available REAL NOT NULL,
+    started REAL,
+    heartbeat REAL,
+    finished REAL,
+    result TEXT,
+    error TEXT
+)
+"""
+_CREATE_STATUS_INDEX = (
+    "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available)"
+)
+
+
+class JobQueue:
+    r"""
+    Queue of simulation jobs stored in a sqlite database
+
+    Each process accessing the queue should open its own JobQueue.
+
+    Parameters
+    ----------
+    path_database: str, optional
+        Path to the sqlite database, created if it does not exist. Default: QUEUE_DATABASE
+    lease_timeout: float, optional
+        Seconds without heartbeat after which a running job is considered abandoned by its
+        worker. Default: QUEUE_LEASE_TIMEOUT
+    retry_delay: float, optional
+        Seconds between a failed attempt of a job and its next attempt. Default: QUEUE_RETRY_DELAY
+    """
+
+    def __init__(
+        self,
+        path_database=QUEUE_DATABASE,
+        lease_timeout=QUEUE_LEASE_TIMEOUT,
+        retry_delay=QUEUE_RETRY_DELAY,
+    ):
+        self.path_database = os.path.abspath(path_database)
+        self.lease_timeout = lease_timeout
+        self.retry_delay = retry_delay
+        # transactions are started explicitly, see _transaction()
+        self.connection = sqlite3.connect(
+            self.path_database, timeout=SQLITE_BUSY_TIMEOUT, isolation_level=None
+        )
+        self.connection.row_factory = sqlite3.Row
+        with self._transaction() as cursor:
+            cursor.execute(_CREATE_JOBS_TABLE)
+            cursor.execute(_CREATE_STATUS_INDEX)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Cursor within a transaction holding the write lock of the database"""
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        else:
+            cursor.execute("COMMIT")
+        finally:
+            cursor.close()
+
+    def _submit(self, kind, payload, max_attempts, timeout):
+        if max_attempts < 1:
+            raise ValueError("A job needs at least one attempt")
+        now = time.time()
+        with self._transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO jobs (kind, payload, status, max_attempts, timeout, submitted, "
+                "available) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    kind,
+                    json.dumps(payload),
+                    JOB_PENDING,
+                    max_attempts,
+                    timeout,
+                    now,
+                    now,
+                ),
+            )
+            job_id = cursor.lastrowid
+        logging.debug(f"Queued the {kind} job {job_id}")
+        return job_id
+
+    def submit_mvs_tool(
+        self, argv, cwd=None, max_attempts=QUEUE_MAX_ATTEMPTS, timeout=None
+    ):
+        r"""
+        Queues a `mvs_tool` simulation
+
+        Parameters
+        ----------
+        argv: list of str
+            command line arguments of `mvs_tool`
+        cwd: str, optional
+            folder the relative paths of argv are relative to. Default: current folder
+        max_attempts: int, optional
+            Number of attempts before the job is moved to the dead letter state.
+            Default: QUEUE_MAX_ATTEMPTS
+        timeout: float, optional
+            Seconds after which an attempt is stopped. Default: None (no timeout)
+
+        Returns
+        -------
+        The id of the job. Its result is the absolute path of the output folder.
+        """
+        if cwd is None:
+            cwd = os.getcwd()
+        payload = {"argv": list(argv), "cwd": os.path.abspath(cwd)}
+        return self._submit(QUEUE_JOB_MVS_TOOL, payload, max_attempts, timeout)
+
+    def submit_simulation(
+        self, json_input, max_attempts=QUEUE_MAX_ATTEMPTS, timeout=None
+    ):
+        r"""
+        Queues a simulation of an input json with `server.run_simulation`
+
+        Parameters
+        ----------
+        json_input: dict
+            Input json of the simulation, as accepted by `server.run_simulation`
+        max_attempts: int, optional
+            Number of attempts before the job is moved to the dead letter state.
+            Default: QUEUE_MAX_ATTEMPTS
+        timeout: float, optional
+            Seconds after which an attempt is stopped. Default: None (no timeout)
+
+        Returns
+        -------
+        The id of the job. Its result is the EPA json of the simulation results.
+        """
+        payload = {"json_input": json_input}
+        return self._submit(QUEUE_JOB_SIMULATION, payload, max_attempts, timeout)
+
+    def _end_attempt(self, cursor, job, error, now):
+        """Queues the job for its next attempt, or moves it to the dead letter state"""
+        if job["attempts"] >= job["max_attempts"]:
+            status = JOB_DEAD_LETTER
+            finished = now
+            logging.warning(
+                f"Job {job['id']} failed {job['attempts']} attempts, it is moved to the "
+                f"dead letter state"
+            )
+        else:
+            status = JOB_PENDING
+            finished = None
+        cursor.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, available = ?, finished = ?, "
+            "error = ? WHERE id = ?",
+            (status, now + self.retry_delay, finished, error, job["id"]),
+        )
+
+    def _expire_leases(self, cursor, now):
+        """Ends the attempts of the running jobs whose worker stopped sending heartbeats"""
+        cursor.execute(
+            "SELECT * FROM jobs WHERE status = ? AND heartbeat < ?",
+            (JOB_RUNNING, now - self.lease_timeout),
+        )
+        for job in cursor.fetchall():
+            self._end_attempt(
+                cursor,
+                job,
+                f"The worker {job['worker']} sent no heartbeat for more than "
+                f"{self.lease_timeout} s",
+                now,
+            )
+
+    def claim(self, worker_id):
+        r"""
+        Claims the oldest pending job for a worker
+
+        Parameters
+        ----------
+        worker_id: str
+            Name of the worker, unique among all nodes
+
+        Returns
+        -------
+        The claimed job as dict (see `get`), None if no job is pending
+        """
+        now = time.time()
+        with self._transaction() as cursor:
+            self._expire_leases(cursor, now)
+            cursor.execute(
+                "SELECT id FROM jobs WHERE status = ? AND available <= ? ORDER BY id "
+                "LIMIT 1",
+                (JOB_PENDING, now),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            cursor.execute(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, "
+                "started = ?, heartbeat = ? WHERE id = ?",
+                (JOB_RUNNING, worker_id, now, now, row["id"]),
+            )
+            cursor.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],))
+            return _job_as_dict(cursor.fetchone())
+
+    def _update_running_job(self, job_id, worker_id, assignments, parameters):
+        """Updates a job running on a worker, False if the worker lost the job meanwhile"""
+        with self._transaction() as cursor:
+            cursor.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND worker = ? AND status = ?",
+                tuple(parameters) + (job_id, worker_id, JOB_RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    def heartbeat(self, job_id, worker_id):
+        """Extends the lease of a running job, False if the lease expired meanwhile"""
+        return self._update_running_job(
+            job_id, worker_id, "heartbeat = ?", (time.time(),)
+        )
+
+    def complete(self, job_id, worker_id, result):
+        """Stores the result of a job, False if the lease of the worker expired meanwhile"""
+        return self._update_running_job(
+            job_id,
+            worker_id,
+            "status = ?, finished = ?, result = ?",
+            (JOB_DONE, time.time(), json.dumps(result)),
+        )
+
+    def fail(self, job_id, worker_id, error):
+        """Ends a failed attempt of a job, False if the lease of the worker expired meanwhile"""
+        with self._transaction() as cursor:
+            cursor.execute(
+                "SELECT * FROM jobs WHERE id = ? AND worker = ? AND status = ?",
+                (job_id, worker_id, JOB_RUNNING),
+            )
+            job = cursor.fetchone()
+            if job is None:
+                return False
+            self._end_attempt(cursor, job, error, time.time())
+            return True
+
+    def set_payload(self, job_id, worker_id, payload):
+        """Replaces the payload of a running job, False if the lease of the worker expired meanwhile"""
+        return self._update_running_job(
+            job_id, worker_id, "payload = ?", (json.dumps(payload),)
+        )
+
+    def release(self, job_id, worker_id):
+        """Hands a running job back to the queue without counting its attempt"""
+        return self._update_running_job(
+            job_id,
+            worker_id,
+            "status = ?, worker = NULL, attempts = attempts - 1, available = ?",
+            (JOB_PENDING, time.time()),
+        )
+
+    def requeue(self, job_id):
+        """Queues a job of the dead letter state again, with all its attempts"""
+        with self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, available = ?, finished = NULL "
+                "WHERE id = ? AND status = ?",
+                (JOB_PENDING, time.time(), job_id, JOB_DEAD_LETTER),
+            )
+            if cursor.rowcount == 0:
+                raise MVSQueueError(
+                    f"The job {job_id} can not be requeued, it is not in the "
+                    f"{JOB_DEAD_LETTER} state"
+                )
+
+    def get(self, job_id):
+        r"""
+        State of a job
+
+        Returns
+        -------
+        dict with the columns of the job: id, kind, payload, status, attempts, max_attempts,
+        timeout, worker (running the job, or which ran it once it is done), submitted,
+        available, started, heartbeat, finished (time stamps in seconds since the epoch), result
+        and error of the last failed attempt
+        """
+        row = self.connection.execute(
+            "SELECT * FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            raise MVSQueueError(f"The job {job_id} does not exist in the queue")
+        return _job_as_dict(row)
+
+    def result(self, job_id):
+        """Result of a job which is done"""
+        job = self.get(job_id)
+        if job["status"] != JOB_DONE:
+            raise MVSQueueError(
+                f"The job {job_id} is {job['status']}, it has no result"
+            )
+        return job["result"]
+
+    def jobs(self, status=None):
+        """All jobs as dict (see `get`), in their order of submission"""
+        if status is None:
+            rows = self.connection.execute("SELECT * FROM jobs ORDER BY id")
+        else:
+            rows = self.connection.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY id", (status,)
+            )
+        return [_job_as_dict(row) for row in rows]
+
+    def counts(self):
+        """Number of jobs of each state of QUEUE_STATES"""
+        counts = {status: 0 for status in QUEUE_STATES}
+        for row in self.connection.execute(
+            "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+        ):
+            counts[row["status"]] = row["n"]
+        return counts
+
+
+def _job_as_dict(row):
+    job = dict(row)
+    job["payload"] = json.loads(job["payload"])
+    if job["result"] is not None:
+        job["result"] = json.loads(job["result"])
+    return job
+
+
+def _mvs_tool_arguments(payload):
+    """Arguments of a `mvs_tool` job, the output folder is overwritten if the job owns it"""
+    argv = list(payload["argv"])
+    if payload.get("owns_output_folder") is True:
+        argv.append("-f")
+    return argv
+
+
+def _set_output_folder_owner(queue, job, worker_id):
+    """Records whether a `mvs_tool` job owns its output folder, before its first attempt
+
+    A job owns its output folder if the folder does not exist before the job first runs. The
+    output folder may then be a partial one of a failed attempt, which the next attempts
+    overwrite.
+    """
+    payload = job["payload"]
+    if "owns_output_folder" in payload:
+        return
+    try:
+        path_output_folder = vars(mvs_arg_parser().parse_args(payload["argv"]))[
+            PATH_OUTPUT_FOLDER
+        ]
+    except SystemExit:
+        # the attempt fails with the error of the argument parser in the child process
+        return
+    payload["owns_output_folder"] = not os.path.exists(
+        os.path.join(payload["cwd"], path_output_folder)
+    )
+    queue.set_payload(job["id"], worker_id, payload)
+
+
+def _execute_job(kind, payload, connection):
+    """Runs a job within a child process of the worker and sends back its outcome
+
+    The outcome is a tuple (True, result) if the job succeeded and (False, traceback) otherwise.
+    """
+    try:
+        if kind == QUEUE_JOB_MVS_TOOL:
+            from multi_vector_simulator.cli import main
+
+            os.chdir(payload["cwd"])
+            argv = _mvs_tool_arguments(payload)
+            # The argument parser of mvs_tool reads sys.argv
+            sys.argv = [MVS_TOOL_PROG] + argv
+            main()
+            path_output_folder = vars(mvs_arg_parser().parse_args(argv))[
+                PATH_OUTPUT_FOLDER
+            ]
+            result = os.path.abspath(path_output_folder)
+        elif kind == QUEUE_JOB_SIMULATION:
+            from multi_vector_simulator.server import run_simulation
+
+            result = run_simulation(payload["json_input"])
+        else:
+            raise MVSQueueError(f"Unknown kind {kind} of job")
+        connection.send((True, result))
+    except BaseException:
+        connection.send((False, traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+def run_job(queue, job, worker_id, heartbeat_interval=QUEUE_HEARTBEAT_INTERVAL):
+    r"""
+    Runs a claimed job in a child process and stores its outcome in the queue
+
+    The child process is terminated if the job exceeds its timeout, or if the lease of the
+    worker expired and the job may run on another worker.
+
+    Parameters
+    ----------
+    queue: :class:`JobQueue`
+        Queue of the job
+    job: dict
+        Job returned by `JobQueue.claim`
+    worker_id: str
+        Name of the worker which claimed the job
+    heartbeat_interval: float, optional
+        Seconds between two heartbeats. Default: QUEUE_HEARTBEAT_INTERVAL
+
+    Returns
+    -------
+    True if the job succeeded
+    """
+    if job["kind"] == QUEUE_JOB_MVS_TOOL:
+        _set_output_folder_owner(queue, job, worker_id)
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_execute_job, args=(job["kind"], job["payload"], sender)
+    )
+    process.start()
+    sender.close()
+    deadline = None
+    if job["timeout"] is not None:
+        deadline = time.monotonic() + job["timeout"]
+    outcome = None
+    try:
+        while True:
+            wait = heartbeat_interval
+            if deadline is not None:
+                wait = max(0, min(wait, deadline - time.monotonic()))
+            if receiver.poll(wait) is True:
+                try:
+                    outcome = receiver.recv()
+                except EOFError:
+                    process.join()
+                    outcome = (
+                        False,
+                        f"The process running the job exited with code {process.exitcode}",
+                    )
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                outcome = (False, f"The job exceeded its timeout of {job['timeout']} s")
+                break
+            if queue.heartbeat(job["id"], worker_id) is False:
+                logging.warning(
+                    f"The lease of the job {job['id']} expired, it is stopped on {worker_id}"
+                )
+                break
+    except BaseException:
+        # e.g. KeyboardInterrupt, another worker takes the job over
+        process.terminate()
+        process.join()
+        queue.release(job["id"], worker_id)
+        raise
+    finally:
+        receiver.close()
+    if outcome is None or outcome[0] is False:
+        process.terminate()
+    process.join()
+
+    if outcome is None:
+        return False
+    succeeded, content = outcome
+    if succeeded is True:
+        queue.complete(job["id"], worker_id, content)
+        logging.info(f"Job {job['id']} done on {worker_id}")
+    else:
+        queue.fail(job["id"], worker_id, content)
+        logging.warning(
+            f"Attempt {job['attempts']} of job {job['id']} failed on {worker_id}: "
+            f"{content.strip().splitlines()[-1]}"
+        )
+    return succeeded
+
+
+def run_worker(
+    path_database=QUEUE_DATABASE,
+    worker_id=None,
+    max_jobs=None,
+    exit_when_idle=False,
+    poll_interval=QUEUE_POLL_INTERVAL,
+    heartbeat_interval=QUEUE_HEARTBEAT_INTERVAL,
+    lease_timeout=QUEUE_LEASE_TIMEOUT,
+    retry_delay=QUEUE_RETRY_DELAY,
+):
+    r"""
+    Claims and runs the jobs of a queue one after the other
+
+    Parameters
+    ----------
+    path_database: str, optional
+        Path to the sqlite database of the queue. Default: QUEUE_DATABASE
+    worker_id: str, optional
+        Name of the worker, unique among all nodes. Default: `<host name>:<process id>`
+    max_jobs: int, optional
+        Number of jobs after which the worker exits. Default: None (never)
+    exit_when_idle: bool, optional
+        Exit once the queue holds no pending or running job. Default: False
+    poll_interval: float, optional
+        Seconds between two claims while no job is available. Default: QUEUE_POLL_INTERVAL
+    heartbeat_interval: float, optional
+        Seconds between two heartbeats of a running job. Default: QUEUE_HEARTBEAT_INTERVAL
+    lease_timeout: float, optional
+        See :class:`JobQueue`. Default: QUEUE_LEASE_TIMEOUT
+    retry_delay: float, optional
+        See :class:`JobQueue`. Default: QUEUE_RETRY_DELAY
+
+    Returns
+    -------
+    The number of jobs run by the worker
+    """
+    if worker_id is None:
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    n_jobs = 0
+    with JobQueue(
+        path_database, lease_timeout=lease_timeout, retry_delay=retry_delay
+    ) as queue:
+        logging.info(f"Worker {worker_id} started on the queue {queue.path_database}")
+        try:
+            while max_jobs is None or n_jobs < max_jobs:
+                job = queue.claim(worker_id)
+                if job is None:
+                    counts = queue.counts()
+                    if exit_when_idle is True and (
+                        counts[JOB_PENDING] + counts[JOB_RUNNING] == 0
+                    ):
+                        break
+                    time.sleep(poll_interval)
+                    continue
+                logging.info(
+                    f"Job {job['id']} claimed by {worker_id} (attempt {job['attempts']})"
+                )
+                run_job(queue, job, worker_id, heartbeat_interval=heartbeat_interval)
+                n_jobs += 1
+        except KeyboardInterrupt:
+            # the running job was handed back to the queue by run_job
+            logging.info(f"Worker {worker_id} stopped")
+    return n_jobs
+
+
+def _format_time(timestamp):
+    if timestamp is None:
+        return "-"
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+def print_status(queue, job_id=None, stream=None):
+    r"""
+    Writes the number of jobs of each state and a line per job, or the details of a single job
+
+    Parameters
+    ----------
+    queue: :class:`JobQueue`
+        Queue of the jobs
+    job_id: int, optional
+        Id of a single job. Default: None (all jobs)
+    stream: file-like, optional
+        Where the status is written. Default: sys.stdout
+    """
+    if stream is None:
+        stream = sys.stdout
+    if job_id is not None:
+        job = queue.get(job_id)
+        for key in ("id", "kind", "status", "attempts", "max_attempts", "timeout"):
+            stream.write(f"{key}: {job[key]}\n")
+        stream.write(f"worker: {job['worker'] or '-'}\n")
+        for key in ("submitted", "started", "heartbeat", "finished"):
+            stream.write(f"{key}: {_format_time(job[key])}\n")
+        stream.write(f"payload: {json.dumps(job['payload'])[:200]}\n")
+        if job["status"] == JOB_DONE:
+            stream.write(f"result: {json.dumps(job['result'])[:200]}\n")
+        if job["error"] is not None:
+            stream.write(f"error:\n{job['error']}\n")
+        return
+    counts = queue.counts()
+    stream.write(
+        ", ".join(f"{status}: {counts[status]}" for status in QUEUE_STATES) + "\n"
+    )
+    for job in queue.jobs():
+        line = (
+            f"{job['id']:>6}  {job['status']:<12} {job['attempts']}/{job['max_attempts']:<3} "
+            f"{job['worker'] or '-':<24}"
+        )
+        if job["status"] != JOB_DONE and job["error"] is not None:
+            line += " " + job["error"].strip().splitlines()[-1]
+        stream.write(line.rstrip() + "\n")
+
+
+def main():
+    """Queues, runs and monitors MVS simulations from the command line (entry point `mvs_queue`)"""
+    parser = queue_arg_parser()
+    args, mvs_tool_argv = parser.parse_known_args()
+    args = vars(args)
+    if args["command"] != "submit" and len(mvs_tool_argv) > 0:
+        parser.error(f"unrecognized arguments: {' '.join(mvs_tool_argv)}")
+    logging.basicConfig(format="%(levelname)s:%(message)s", level=logging.INFO)
+
+    if args["command"] == "worker":
+        kwargs = dict(
+            path_database=args["database"],
+            max_jobs=args["max_jobs"],
+            exit_when_idle=args["exit_when_idle"],
+        )
+        if args["n_workers"] == 1:
+            run_worker(**kwargs)
+            return 0
+        # the workers are not daemonic, as they start a child process per job
+        workers = [
+            multiprocessing.Process(target=run_worker, kwargs=kwargs)
+            for _ in range(args["n_workers"])
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            # the workers received the interruption as well, they stop after their job
+            for worker in workers:
+                worker.join()
+        return 0
+
+    with JobQueue(args["database"]) as queue:
+        try:
+            if args["command"] == "submit":
+                job_id = queue.submit_mvs_tool(
+                    mvs_tool_argv,
+                    max_attempts=args["max_attempts"],
+                    timeout=args["timeout"],
+                )
+                print(f"Queued the job {job_id} in {queue.path_database}")
+            elif args["command"] == "status":
+                print_status(queue, job_id=args["job_id"])
+            elif args["command"] == "requeue":
+                for job_id in args["job_ids"]:
+                    queue.requeue(job_id)
+                    print(f"Requeued the job {job_id}")
+        except MVSQueueError as e:
+            print(e, file=sys.stderr)
+            return 1
+    return 0
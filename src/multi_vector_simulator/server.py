@@ -33,8 +33,12 @@ child:      Child file, one of the main functions of the tool.
 child-sub:  Sub-child function, feeds only back to child functions
 """
 
+import asyncio
+import itertools
 import logging
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 from oemof.tools import logger
 
@@ -46,6 +50,56 @@ import multi_vector_simulator.E0_evaluation as E0
 import multi_vector_simulator.F0_output as F0
 from multi_vector_simulator.version import version_num, version_date
 from multi_vector_simulator.utils import data_parser
+from multi_vector_simulator.utils.constants import (
+    JOB_PENDING,
+    JOB_RUNNING,
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_CANCELLED,
+    JOB_STATUS,
+    JOB_STAGE,
+    JOB_EVENTS,
+    JOB_LOGS,
+    JOB_ERROR,
+    JOB_PROGRESS,
+    JOB_SOLVER_PROGRESS,
+)
+from multi_vector_simulator.utils.exceptions import JobCancelledError
+
+# Stages of the simulation pipeline, in order of execution. Progress events of a job refer to them.
+PIPELINE_STAGES = (
+    "B0_data_input_json",
+    "C0_data_processing",
+    "D0_modelling_and_optimization",
+    "E0_evaluation",
+    "F0_output",
+)
+
+
+def get_screen_level(display_output):
+    r"""
+    Translates the user choice for displayed logging messages into a logging level
+
+    Parameters
+    ----------
+    display_output : str
+        One of "debug", "info", "warning", "error". Any other value falls back to "info".
+
+    Returns
+    -------
+    logging level
+    """
+    if display_output == "debug":
+        screen_level = logging.DEBUG
+    elif display_output == "info":
+        screen_level = logging.INFO
+    elif display_output == "warning":
+        screen_level = logging.WARNING
+    elif display_output == "error":
+        screen_level = logging.ERROR
+    else:
+        screen_level = logging.INFO
+    return screen_level
 
 
 def run_simulation(json_dict, epa_format=True, **kwargs):
@@ -71,24 +125,59 @@ def run_simulation(json_dict, epa_format=True, **kwargs):
      lp_file_output : bool, optional
          Specifies whether linear equation system generated is saved as lp file.
          Default: False.
+     progress_callback : func, optional
+         Called with the name of each pipeline stage (see PIPELINE_STAGES) before the stage runs.
+         Default: None.
+     solver_progress_callback : func, optional
+         Called with each progress event of the solver (elapsed time, iterations, objective,
+         gap), see D0.solver_progress.monitor.
+         Default: None.
 
     """
-    display_output = kwargs.get("display_output", None)
-
-    if display_output == "debug":
-        screen_level = logging.DEBUG
-    elif display_output == "info":
-        screen_level = logging.INFO
-    elif display_output == "warning":
-        screen_level = logging.WARNING
-    elif display_output == "error":
-        screen_level = logging.ERROR
-    else:
-        screen_level = logging.INFO
+    screen_level = get_screen_level(kwargs.get("display_output", None))
 
     # Define logging settings and path for saving log
     logger.define_logging(screen_level=screen_level)
 
+    return run_pipeline(
+        json_dict,
+        epa_format=epa_format,
+        progress_callback=kwargs.get("progress_callback", None),
+        solver_progress_callback=kwargs.get("solver_progress_callback", None),
+    )
+
+
+def run_pipeline(
+    json_dict, epa_format=True, progress_callback=None, solver_progress_callback=None
+):
+    r"""
+    Runs all stages of a MVS simulation on an input json, without touching the logging settings
+
+    Parameters
+    ----------
+    json_dict: dict
+        json from http request
+    epa_format: bool, optional
+        Specifies whether the output is formatted for EPA standards
+        Default: True
+    progress_callback: func, optional
+        Called with the name of each pipeline stage (see PIPELINE_STAGES) before the stage runs.
+        It may raise an exception to abort the simulation between two stages.
+        Default: None
+    solver_progress_callback: func, optional
+        Called with each progress event of the solver, see D0.solver_progress.monitor.
+        Default: None
+
+    Returns
+    -------
+    The simulation results, as EPA json if epa_format is True, as dict_values otherwise
+    """
+
+    def enter_stage(stage):
+        logging.debug(f"Accessing script: {stage}")
+        if progress_callback is not None:
+            progress_callback(stage)
+
     welcome_text = (
         "\n \n Multi-Vector Simulation Tool (MVS) V"
         + version_num
@@ -104,21 +193,24 @@ def run_simulation(json_dict, epa_format=True, **kwargs):
 
     logging.info(welcome_text)
 
-    logging.debug("Accessing script: B0_data_input_json")
+    enter_stage(PIPELINE_STAGES[0])
     dict_values = B0.convert_from_json_to_special_types(json_dict)
 
     print("")
-    logging.debug("Accessing script: C0_data_processing")
+    enter_stage(PIPELINE_STAGES[1])
     C0.all(dict_values)
 
     print("")
-    logging.debug("Accessing script: D0_modelling_and_optimization")
-    results_meta, results_main = D0.run_oemof(dict_values)
+    enter_stage(PIPELINE_STAGES[2])
+    results_meta, results_main = D0.run_oemof(
+        dict_values, solver_progress_callback=solver_progress_callback
+    )
 
     print("")
-    logging.debug("Accessing script: E0_evaluation")
+    enter_stage(PIPELINE_STAGES[3])
     E0.evaluate_dict(dict_values, results_main, results_meta)
 
+    enter_stage(PIPELINE_STAGES[4])
     logging.debug("Convert results to json")
 
     if epa_format is True:
@@ -131,3 +223,320 @@ def run_simulation(json_dict, epa_format=True, **kwargs):
         answer = dict_values
 
     return answer
+
+
+# Event kinds sent from the worker processes to the job manager
+_EVENT_STAGE = "stage"
+_EVENT_LOG = "log"
+_EVENT_START = "start"
+_EVENT_SOLVER = "solver"
+
+# Set in each worker process by _initialize_worker
+_worker_events = None
+_worker_cancel_flags = None
+
+
+class _JobLogHandler(logging.Handler):
+    """Forwards the log records of a single job to the job manager"""
+
+    def __init__(self, job_id, events, level=logging.NOTSET):
+        super().__init__(level=level)
+        self.job_id = job_id
+        self.events = events
+        self.setFormatter(logging.Formatter("%(asctime)s-%(levelname)s-%(message)s"))
+
+    def emit(self, record):
+        try:
+            self.events.put((self.job_id, _EVENT_LOG, self.format(record)))
+        except Exception:
+            self.handleError(record)
+
+
+def _initialize_worker(events, cancel_flags):
+    """Imports the modelling libraries once per worker process and keeps the shared job state"""
+    global _worker_events, _worker_cancel_flags
+    _worker_events = events
+    _worker_cancel_flags = cancel_flags
+    # Loading pyomo's solver plugins is costly, do it once instead of on the first solve
+    import pyomo.environ  # noqa: F401
+    import oemof.solph  # noqa: F401
+
+
+def _run_job(job_id, json_dict, epa_format, display_output):
+    """Runs one simulation job within a worker process
+
+    The log records of the job are sent to the job manager instead of the global logging
+    configuration, and the cancel flag of the job is checked before each pipeline stage and
+    once the pipeline is finished.
+    """
+
+    def check_cancel_flag(message):
+        if _worker_cancel_flags.get(job_id, False) is True:
+            raise JobCancelledError(f"Job {job_id} was cancelled {message}")
+
+    def report_stage(stage):
+        check_cancel_flag(f"before stage {stage}")
+        _worker_events.put((job_id, _EVENT_STAGE, stage))
+
+    def report_solver_progress(event):
+        _worker_events.put((job_id, _EVENT_SOLVER, event))
+
+    root_logger = logging.getLogger()
+    handler = _JobLogHandler(
+        job_id, _worker_events, level=get_screen_level(display_output)
+    )
+    previous_level = root_logger.level
+    root_logger.addHandler(handler)
+    root_logger.setLevel(min(handler.level, previous_level))
+    _worker_events.put((job_id, _EVENT_START, None))
+    try:
+        answer = run_pipeline(
+            json_dict,
+            epa_format=epa_format,
+            progress_callback=report_stage,
+            solver_progress_callback=report_solver_progress,
+        )
+        check_cancel_flag(f"after stage {PIPELINE_STAGES[-1]}")
+    finally:
+        root_logger.removeHandler(handler)
+        root_logger.setLevel(previous_level)
+    return answer
+
+
+class SimulationJobManager:
+    r"""
+    Runs MVS simulations asynchronously in a bounded pool of worker processes
+
+    The worker processes import oemof and pyomo once when they start, and are then reused
+    for all the jobs. Each job reports progress events (one per stage of PIPELINE_STAGES), the
+    latest progress event of the solver and its own log messages, which can be accessed with
+    `status`.
+
+    Parameters
+    ----------
+    max_workers: int, optional
+        Maximal number of simulations running in parallel.
+        Default: number of processors of the machine
+
+    Example
+    -------
+    >>> async def simulate(json_dict):
+    ...     async with SimulationJobManager(max_workers=2) as manager:
+    ...         job_id = await manager.submit(json_dict)
+    ...         return await manager.result(job_id)
+    """
+
+    def __init__(self, max_workers=None):
+        self._sync_manager = multiprocessing.Manager()
+        self._events = self._sync_manager.Queue()
+        self._cancel_flags = self._sync_manager.dict()
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_initialize_worker,
+            initargs=(self._events, self._cancel_flags),
+        )
+        self._jobs = {}
+        # futures of the executor, and their asyncio wrappers awaited by the event loop
+        self._executor_futures = {}
+        self._futures = {}
+        self._job_counter = itertools.count(1)
+        self._listener = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.shutdown()
+
+    async def submit(self, json_dict, epa_format=True, display_output="info"):
+        r"""
+        Queues a new simulation job
+
+        Parameters
+        ----------
+        json_dict: dict
+            json from http request
+        epa_format: bool, optional
+            Specifies whether the output is formatted for EPA standards
+            Default: True
+        display_output : str, optional
+            Level of the log messages gathered for the job.
+            Options: "debug", "info", "warning", "error". Default: "info".
+
+        Returns
+        -------
+        The id of the job
+        """
+        loop = asyncio.get_event_loop()
+        if self._listener is None:
+            self._listener = loop.create_task(self._listen())
+
+        job_id = str(next(self._job_counter))
+        self._jobs[job_id] = {
+            JOB_STATUS: JOB_PENDING,
+            JOB_STAGE: None,
+            JOB_EVENTS: [],
+            JOB_SOLVER_PROGRESS: None,
+            JOB_LOGS: [],
+            JOB_ERROR: None,
+        }
+        self._cancel_flags[job_id] = False
+        executor_future = self._executor.submit(
+            _run_job, job_id, json_dict, epa_format, display_output
+        )
+        # Cancelling the asyncio wrapper would not stop a running job, it is only cancelled
+        # along with the future of the executor
+        future = asyncio.wrap_future(executor_future, loop=loop)
+        future.add_done_callback(lambda f: self._finalize(job_id, f))
+        self._executor_futures[job_id] = executor_future
+        self._futures[job_id] = future
+        return job_id
+
+    async def status(self, job_id):
+        r"""
+        Returns the state of a job
+
+        Parameters
+        ----------
+        job_id: str
+            id returned by `submit`
+
+        Returns
+        -------
+        dict with the status of the job, its current stage, its progress events, the latest
+        progress event of the solver, its log messages and the error message in case the job
+        failed
+        """
+        job = self._get_job(job_id)
+        answer = dict(job)
+        answer[JOB_EVENTS] = list(job[JOB_EVENTS])
+        answer[JOB_LOGS] = list(job[JOB_LOGS])
+        return answer
+
+    async def cancel(self, job_id):
+        r"""
+        Cancels a job
+
+        A pending job is removed from the queue. A running job is stopped before its next
+        pipeline stage, as the solver itself cannot be interrupted. Its status is set once
+        its worker process stopped it.
+
+        Parameters
+        ----------
+        job_id: str
+            id returned by `submit`
+
+        Returns
+        -------
+        True if the job will not deliver a result, False if it is already finished
+        """
+        job = self._get_job(job_id)
+        if job[JOB_STATUS] in (JOB_DONE, JOB_FAILED):
+            answer = False
+        elif job[JOB_STATUS] == JOB_CANCELLED:
+            answer = True
+        else:
+            # kept until the job is finalized, the worker process checks it before each stage
+            self._cancel_flags[job_id] = True
+            if (
+                job[JOB_STATUS] == JOB_PENDING
+                and self._executor_futures[job_id].cancel() is True
+            ):
+                job[JOB_STATUS] = JOB_CANCELLED
+            answer = True
+        return answer
+
+    async def result(self, job_id, timeout=None):
+        r"""
+        Waits for the result of a job
+
+        Parameters
+        ----------
+        job_id: str
+            id returned by `submit`
+        timeout: float, optional
+            Maximal time to wait, in seconds. Default: None (wait until the job is finished)
+
+        Returns
+        -------
+        The simulation results, as returned by `run_simulation`. The exception of the
+        simulation is raised if it failed, JobCancelledError if the job was cancelled.
+        """
+        self._get_job(job_id)
+        try:
+            answer = await asyncio.wait_for(
+                asyncio.shield(self._futures[job_id]), timeout
+            )
+        except asyncio.CancelledError:
+            if self._jobs[job_id][JOB_STATUS] == JOB_CANCELLED:
+                raise JobCancelledError(f"Job {job_id} was cancelled") from None
+            raise
+        return answer
+
+    async def shutdown(self, wait=True):
+        r"""
+        Stops the worker processes, pending jobs are cancelled
+
+        Parameters
+        ----------
+        wait: bool, optional
+            If True, wait for the running jobs to finish. Default: True
+        """
+        for job_id in self._jobs:
+            if self._jobs[job_id][JOB_STATUS] == JOB_PENDING:
+                await self.cancel(job_id)
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, lambda: self._executor.shutdown(wait=wait))
+        if self._listener is not None:
+            self._events.put(None)
+            await self._listener
+            self._listener = None
+        self._sync_manager.shutdown()
+
+    def _get_job(self, job_id):
+        if job_id not in self._jobs:
+            raise KeyError(f"There is no simulation job with id {job_id}")
+        return self._jobs[job_id]
+
+    def _finalize(self, job_id, future):
+        """Sets the final status of a job once its future is done"""
+        job = self._jobs[job_id]
+        if future.cancelled():
+            job[JOB_STATUS] = JOB_CANCELLED
+        elif isinstance(future.exception(), JobCancelledError):
+            job[JOB_STATUS] = JOB_CANCELLED
+        elif future.exception() is not None:
+            job[JOB_STATUS] = JOB_FAILED
+            job[JOB_ERROR] = str(future.exception())
+        else:
+            job[JOB_STATUS] = JOB_DONE
+        self._cancel_flags.pop(job_id, None)
+        self._executor_futures.pop(job_id, None)
+
+    async def _listen(self):
+        """Collects the events sent by the worker processes until shutdown"""
+        loop = asyncio.get_event_loop()
+        while True:
+            event = await loop.run_in_executor(None, self._events.get)
+            if event is None:
+                break
+            job_id, kind, content = event
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            if kind == _EVENT_LOG:
+                job[JOB_LOGS].append(content)
+            elif kind == _EVENT_START:
+                if job[JOB_STATUS] == JOB_PENDING:
+                    job[JOB_STATUS] = JOB_RUNNING
+            elif kind == _EVENT_STAGE:
+                job[JOB_STAGE] = content
+                job[JOB_EVENTS].append(
+                    {
+                        JOB_STAGE: content,
+                        JOB_PROGRESS: PIPELINE_STAGES.index(content)
+                        / len(PIPELINE_STAGES),
+                    }
+                )
+            elif kind == _EVENT_SOLVER:
+                job[JOB_SOLVER_PROGRESS] = content
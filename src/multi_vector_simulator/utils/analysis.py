@@ -1,14 +1,91 @@
+import copy
+import csv
+import itertools
 import json
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # python < 3.8
+    shared_memory = None
+
 from multi_vector_simulator.utils import (
     get_nested_value,
     set_nested_value,
     split_nested_path,
 )
-from multi_vector_simulator.server import run_simulation
+from multi_vector_simulator.server import run_simulation, run_pipeline
+import multi_vector_simulator.C0_data_processing as C0
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.E0_evaluation as E0
 from multi_vector_simulator.B0_data_input_json import (
     load_json,
     convert_from_json_to_special_types,
+    convert_from_special_types_to_json,
+)
+from multi_vector_simulator.utils.scenario_delta import (
+    apply_changes,
+    changes_as_values,
+    content_hash,
+    get_base_path,
+    is_scenario_delta,
+    load_scenario,
+)
+from multi_vector_simulator.utils.exceptions import InvalidScenarioDeltaError
+from multi_vector_simulator.utils.constants_json_strings import (
+    ANNUITY_TOTAL,
+    COST_TOTAL,
+    EMISSION_BOUND,
+    ENERGY_CONVERSION,
+    ENERGY_PRODUCTION,
+    ENERGY_STORAGE,
+    KPI,
+    KPI_SCALARS_DICT,
+    LABEL,
+    LCOeleq,
+    OPTIMIZE_CAP,
+    OPTIMIZED_ADD_CAP,
+    PARETO_POINT,
+    PATCH_ADD,
+    PATCH_OPERATION,
+    PATCH_PATH,
+    RENEWABLE_FACTOR,
+    SCENARIO_BASE_HASH,
+    SCENARIO_CHANGES,
+    STORAGE_CAPACITY,
+    INPUT_POWER,
+    OUTPUT_POWER,
+    TOTAL_EMISSIONS,
+    VALUE,
+)
+
+# Designs of experiment available for multi_param_variation_analysis
+FULL_FACTORIAL = "full_factorial"
+LATIN_HYPERCUBE = "latin_hypercube"
+SOBOL = "sobol"
+DESIGNS = (FULL_FACTORIAL, LATIN_HYPERCUBE, SOBOL)
+
+# Columns of the results file of multi_param_variation_analysis which are not parameters or outputs
+RUN_ID = "run_id"
+RUN_ERROR = "error"
+
+# Column of the results of scenario_delta_analysis holding the path of the scenario delta file
+SCENARIO_FILE = "scenario_file"
+
+# Default quantiles of the output distributions of stochastic_timeseries_analysis
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+# Default outputs of each point of pareto_front_analysis
+DEFAULT_PARETO_OUTPUTS = tuple(
+    (KPI, KPI_SCALARS_DICT, kpi)
+    for kpi in (TOTAL_EMISSIONS, COST_TOTAL, ANNUITY_TOTAL, LCOeleq, RENEWABLE_FACTOR)
 )
 
 
@@ -78,3 +155,964 @@ def single_param_variation_analysis(
                 answer.append(output_parameters)
 
     return {"parameters": param_values, "outputs": answer}
+
+
+def sample_parameters(
+    parameter_space, design=FULL_FACTORIAL, n_samples=None, seed=None
+):
+    r"""Generate the parameter sets of a design of experiment
+
+    Parameters
+    ----------
+    parameter_space: dict
+        Keys are the paths to the varied parameters within the input json, as tuple or str (see
+        `split_nested_path`). For the design FULL_FACTORIAL, values are the lists of values each
+        parameter takes. For the designs LATIN_HYPERCUBE and SOBOL, values are (lower, upper)
+        bounds between which the parameter is sampled uniformly.
+    design: str
+        One of FULL_FACTORIAL, LATIN_HYPERCUBE or SOBOL
+        Default: FULL_FACTORIAL
+    n_samples: int
+        Number of parameter sets of the LATIN_HYPERCUBE and SOBOL designs. It is ignored by the
+        FULL_FACTORIAL design, which has as many sets as combinations of parameter values.
+    seed: int, optional
+        Seed of the random generator of the LATIN_HYPERCUBE and SOBOL designs. The same seed
+        yields the same parameter sets.
+
+    Returns
+    -------
+    List of dicts mapping the path tuple of each parameter to its value
+
+    Notes
+    -----
+    The SOBOL design requires scipy>=1.7, which is not a dependency of the MVS.
+
+    Example
+    -------
+    >>> sample_parameters({"a.b": [1, 2], ("c", "d"): [3, 4]})
+    [{('a', 'b'): 1, ('c', 'd'): 3}, {('a', 'b'): 1, ('c', 'd'): 4}, {('a', 'b'): 2, ('c', 'd'): 3}, {('a', 'b'): 2, ('c', 'd'): 4}]
+    """
+    paths = [split_nested_path(path) for path in parameter_space]
+    specs = list(parameter_space.values())
+
+    if design == FULL_FACTORIAL:
+        samples = [list(values) for values in itertools.product(*specs)]
+    elif design in (LATIN_HYPERCUBE, SOBOL):
+        if n_samples is None:
+            raise ValueError(
+                f"The argument n_samples is required by the {design} design"
+            )
+        bounds = np.array(specs, dtype=float)
+        if bounds.ndim != 2 or bounds.shape[1] != 2:
+            raise ValueError(
+                f"Each parameter of the {design} design should be given as (lower, upper) bounds"
+            )
+        n_parameters = len(paths)
+        if design == LATIN_HYPERCUBE:
+            rng = np.random.default_rng(seed)
+            # one random point within each of the n_samples strata, strata shuffled per parameter
+            unit_samples = (
+                np.argsort(rng.random((n_parameters, n_samples)), axis=1).T
+                + rng.random((n_samples, n_parameters))
+            ) / n_samples
+        else:
+            try:
+                from scipy.stats import qmc
+            except ModuleNotFoundError:
+                raise ModuleNotFoundError(
+                    f"The {SOBOL} design requires scipy>=1.7, install it with \n\tpip install scipy"
+                ) from None
+            unit_samples = qmc.Sobol(n_parameters, scramble=True, seed=seed).random(
+                n_samples
+            )
+        samples = (bounds[:, 0] + unit_samples * (bounds[:, 1] - bounds[:, 0])).tolist()
+    else:
+        raise ValueError(f"Unknown design {design}, it should be one of {DESIGNS}")
+
+    return [dict(zip(paths, sample)) for sample in samples]
+
+
+def _column_name(path):
+    """Name of the column of the results file corresponding to a nested path"""
+    return ".".join(str(key) for key in path)
+
+
+def _to_scalar(value):
+    """Convert an extracted output to a value which can be stored in one cell of a table"""
+    if isinstance(value, dict) and "value" in value:
+        value = value["value"]
+    if isinstance(value, (np.integer, np.floating)):
+        value = value.item()
+    if value is None or isinstance(value, (int, float, str, bool)):
+        answer = value
+    else:
+        answer = json.dumps(value, default=convert_from_special_types_to_json)
+    return answer
+
+
+# Set in each worker process of multi_param_variation_analysis
+_base_input = None
+
+
+def _initialize_analysis_worker(simulation_input):
+    """Keep the base input in the worker process, so that it is sent only once per worker"""
+    global _base_input
+    _base_input = simulation_input
+    # Thousands of runs would flood the console otherwise
+    logging.getLogger().setLevel(logging.ERROR)
+
+
+def _run_variation(run_id, variation, output_paths):
+    """Run one simulation of the design of experiment and extract its outputs
+
+    Parameters
+    ----------
+    run_id: int
+        index of the parameter set within the design
+    variation: dict
+        mapping of the path tuple of each varied parameter to its value
+    output_paths: list of tuple
+        paths of the outputs of interest in the simulation results
+
+    Returns
+    -------
+    Row of the results file, as a dict
+    """
+    simulation_input = copy.deepcopy(_base_input)
+    row = {RUN_ID: run_id}
+    for path, value in variation.items():
+        get_nested_value(simulation_input, path[:-1])[path[-1]] = value
+        row[_column_name(path)] = value
+    try:
+        sim_output = run_pipeline(simulation_input, epa_format=False)
+        for path in output_paths:
+            row[_column_name(path)] = _to_scalar(get_nested_value(sim_output, path))
+        row[RUN_ERROR] = ""
+    except Exception as e:
+        row[RUN_ERROR] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def multi_param_variation_analysis(
+    json_input,
+    parameter_space,
+    json_path_to_output_value,
+    results_file,
+    design=FULL_FACTORIAL,
+    n_samples=None,
+    seed=None,
+    max_workers=None,
+    resume=True,
+):
+    r"""Run mvs simulations for a design of experiment over several input parameters
+
+    The simulations run in parallel in a pool of processes. Only the outputs of interest are
+    extracted from each simulation, and are appended to a csv file (one row per simulation, one
+    column per parameter and output) as soon as the simulation is finished. An interrupted
+    analysis can be resumed, the simulations already stored in the results file are then skipped.
+
+    Parameters
+    ----------
+    json_input: path or dict
+        input parameters for the multi-vector simulation
+    parameter_space: dict
+        Paths to the varied parameters and their values or bounds, see `sample_parameters`
+    json_path_to_output_value: tuple of tuple or str
+        collection of succession of keys which lead the value of an output parameter of interest in
+        the json dict of the simulation's output. The order of keys is to be read from left to
+        right. In the case of str, each key should be separated by a `.` or a `,`.
+    results_file: str
+        path to the csv file where the results are stored
+    design: str
+        One of FULL_FACTORIAL, LATIN_HYPERCUBE or SOBOL
+        Default: FULL_FACTORIAL
+    n_samples: int
+        Number of simulations of the LATIN_HYPERCUBE and SOBOL designs
+    seed: int, optional
+        Seed of the random generator of the LATIN_HYPERCUBE and SOBOL designs, required to
+        resume these designs
+    max_workers: int, optional
+        Number of simulations running in parallel
+        Default: number of processors of the machine
+    resume: bool
+        If True and the results file exists, the simulations already stored are skipped,
+        otherwise the results file is overwritten
+        Default: True
+
+    Returns
+    -------
+    pandas.DataFrame with the content of the results file, the column RUN_ERROR holds the
+    error message of the failed simulations
+    """
+    if isinstance(json_input, str):
+        simulation_input = load_json(json_input)
+    elif isinstance(json_input, dict):
+        simulation_input = json_input
+    else:
+        raise TypeError(
+            f"Simulation input `{json_input}` is neither a file path, nor a json dict. "
+            f"It can therefore not be processed."
+        )
+
+    variations = sample_parameters(
+        parameter_space, design=design, n_samples=n_samples, seed=seed
+    )
+    output_paths = [split_nested_path(path) for path in json_path_to_output_value]
+    columns = (
+        [RUN_ID]
+        + [_column_name(path) for path in variations[0]]
+        + [_column_name(path) for path in output_paths]
+        + [RUN_ERROR]
+    )
+
+    done_runs = set()
+    if resume is True and os.path.exists(results_file):
+        if design != FULL_FACTORIAL and seed is None:
+            raise ValueError(
+                f"The {design} design can only be resumed if a seed is provided, otherwise the "
+                f"parameter sets differ from the ones of the results file {results_file}"
+            )
+        done_runs = set(pd.read_csv(results_file, usecols=[RUN_ID])[RUN_ID])
+        logging.info(
+            f"Resuming the analysis, {len(done_runs)} simulations are already stored in "
+            f"{results_file}"
+        )
+    else:
+        with open(results_file, "w", newline="") as fp:
+            csv.DictWriter(fp, fieldnames=columns).writeheader()
+
+    pending_runs = [
+        run_id for run_id in range(len(variations)) if run_id not in done_runs
+    ]
+    logging.info(f"Running {len(pending_runs)} simulations of the {design} design")
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_initialize_analysis_worker,
+        initargs=(simulation_input,),
+    ) as executor:
+        futures = [
+            executor.submit(_run_variation, run_id, variations[run_id], output_paths)
+            for run_id in pending_runs
+        ]
+        for future in as_completed(futures):
+            row = future.result()
+            if row[RUN_ERROR] != "":
+                logging.warning(f"Simulation {row[RUN_ID]} failed: {row[RUN_ERROR]}")
+            # the file is reopened for each row so that finished runs are never lost
+            with open(results_file, "a", newline="") as fp:
+                csv.DictWriter(fp, fieldnames=columns).writerow(row)
+
+    return pd.read_csv(results_file).sort_values(RUN_ID).reset_index(drop=True)
+
+
+def sample_timeseries_variants(
+    timeseries,
+    n_variants,
+    steps_per_day=24,
+    bootstrap_days=True,
+    ar_coefficient=0.0,
+    noise_std=0.0,
+    noise_correlation=0.0,
+    scaling=None,
+    seed=None,
+    out=None,
+):
+    r"""Generate correlated random variants of a set of timeseries
+
+    Each variant is obtained from the original timeseries by
+
+    1. bootstrapping days: the days of the variant are drawn with replacement among the full days
+       of the original timeseries. The same days are drawn for all timeseries, so that the
+       correlation between e.g. the demand and the pv generation of a day is kept
+    2. adding a relative AR(1) noise of standard deviation `noise_std` and lag-one
+       autocorrelation `ar_coefficient`, the noise of the different timeseries having the
+       correlation `noise_correlation`
+    3. multiplying each timeseries by a factor drawn uniformly within its scaling bounds
+
+    Negative values are set to 0 after the noise is applied.
+
+    Parameters
+    ----------
+    timeseries: :numpy:`numpy.ndarray`
+        Original timeseries, of shape (number of timeseries, number of timesteps)
+    n_variants: int
+        Number of variants
+    steps_per_day: int
+        Number of timesteps in a day
+        Default: 24
+    bootstrap_days: bool
+        If False, the days keep their original order
+        Default: True
+    ar_coefficient: float
+        Lag-one autocorrelation of the noise, between 0 and 1
+        Default: 0
+    noise_std: float
+        Standard deviation of the relative noise, 0 for no noise
+        Default: 0
+    noise_correlation: float
+        Correlation of the noise between the timeseries, between 0 and 1
+        Default: 0
+    scaling: list of tuple, optional
+        (lower, upper) bounds of the scaling factor of each timeseries, None for no scaling
+    seed: int, optional
+        Seed of the random generator, the same seed yields the same variants
+    out: :numpy:`numpy.ndarray`, optional
+        Array of shape (n_variants, number of timeseries, number of timesteps) in which the
+        variants are written
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray` of shape (n_variants, number of timeseries, number of timesteps)
+
+    Example
+    -------
+    >>> sample_timeseries_variants(np.arange(4.0).reshape(1, 4), 1, steps_per_day=2, seed=0)
+    array([[[2., 3., 2., 3.]]])
+    """
+    timeseries = np.asarray(timeseries, dtype=float)
+    if timeseries.ndim != 2:
+        raise ValueError(
+            "The timeseries should be provided as an array of shape (number of timeseries, "
+            "number of timesteps)"
+        )
+    n_series, n_timesteps = timeseries.shape
+    shape = (n_variants, n_series, n_timesteps)
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError(f"The array out should have the shape {shape}")
+
+    rng = np.random.default_rng(seed)
+
+    if bootstrap_days is True:
+        n_days = n_timesteps // steps_per_day
+        if n_days == 0:
+            raise ValueError(
+                f"The timeseries of {n_timesteps} timesteps do not contain a full day of "
+                f"{steps_per_day} timesteps, the days can not be bootstrapped"
+            )
+        step = np.arange(n_timesteps)
+        days = rng.integers(0, n_days, size=(n_variants, n_days + 1))
+        # a partial last day is filled with the beginning of the drawn day
+        timestep_index = (
+            days[:, step // steps_per_day] * steps_per_day + step % steps_per_day
+        )
+        out[:] = timeseries[:, timestep_index].transpose(1, 0, 2)
+    else:
+        out[:] = timeseries
+
+    if noise_std > 0:
+        innovation_std = noise_std * np.sqrt(1 - ar_coefficient ** 2)
+        noise = np.empty((n_variants, n_series))
+        for t in range(n_timesteps):
+            # the shocks of the timeseries share a common component
+            shocks = np.sqrt(noise_correlation) * rng.standard_normal(
+                (n_variants, 1)
+            ) + np.sqrt(1 - noise_correlation) * rng.standard_normal(
+                (n_variants, n_series)
+            )
+            if t == 0:
+                noise[:] = noise_std * shocks
+            else:
+                noise *= ar_coefficient
+                noise += innovation_std * shocks
+            out[:, :, t] *= 1 + noise
+        np.clip(out, 0, None, out=out)
+
+    if scaling is not None:
+        bounds = np.array(
+            [(1, 1) if bound is None else bound for bound in scaling], dtype=float
+        )
+        if bounds.shape != (n_series, 2):
+            raise ValueError(
+                "The scaling should provide (lower, upper) bounds or None for each timeseries"
+            )
+        factors = bounds[:, 0] + rng.random((n_variants, n_series)) * (
+            bounds[:, 1] - bounds[:, 0]
+        )
+        out *= factors[:, :, np.newaxis]
+
+    return out
+
+
+def _timeseries_values(timeseries):
+    """Values of a timeseries of the simulation input, whatever its json representation"""
+    if isinstance(timeseries, pd.Series):
+        answer = timeseries.values
+    elif isinstance(timeseries, dict):
+        answer = timeseries["value"]
+    else:
+        answer = timeseries
+    return np.asarray(answer, dtype=float)
+
+
+# Set in each worker process of stochastic_timeseries_analysis
+_shared_variants = None
+_variant_paths = None
+
+
+def _initialize_sampler_worker(simulation_input, shm_name, shape, timeseries_paths):
+    """Attach the worker process to the shared array of variants, without copying it"""
+    global _shared_variants, _variant_paths
+    _initialize_analysis_worker(simulation_input)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    variants = np.ndarray(shape, dtype=float, buffer=shm.buf)
+    variants.flags.writeable = False
+    # the SharedMemory instance is kept alongside the array, the buffer would be released otherwise
+    _shared_variants = (shm, variants)
+    _variant_paths = timeseries_paths
+
+
+def _run_timeseries_variant(run_id, output_paths):
+    """Run the simulation of one variant of the timeseries and extract its outputs
+
+    Parameters
+    ----------
+    run_id: int
+        index of the variant within the shared array of variants
+    output_paths: list of tuple
+        paths of the outputs of interest in the simulation results
+
+    Returns
+    -------
+    Row of the results, as a dict
+    """
+    simulation_input = copy.deepcopy(_base_input)
+    variants = _shared_variants[1]
+    n_timesteps = variants.shape[1] // len(_variant_paths)
+    for i, path in enumerate(_variant_paths):
+        # the series is a view on the shared array
+        get_nested_value(simulation_input, path[:-1])[path[-1]] = pd.Series(
+            variants[run_id, i * n_timesteps : (i + 1) * n_timesteps]
+        )
+    row = {RUN_ID: run_id}
+    try:
+        sim_output = run_pipeline(simulation_input, epa_format=False)
+        for path in output_paths:
+            row[_column_name(path)] = _to_scalar(get_nested_value(sim_output, path))
+        row[RUN_ERROR] = ""
+    except Exception as e:
+        row[RUN_ERROR] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def stochastic_timeseries_analysis(
+    json_input,
+    timeseries_paths,
+    json_path_to_output_value,
+    n_variants,
+    bootstrap_days=True,
+    ar_coefficient=0.0,
+    noise_std=0.0,
+    noise_correlation=0.0,
+    scaling=None,
+    seed=None,
+    max_workers=None,
+    quantiles=DEFAULT_QUANTILES,
+):
+    r"""Run mvs simulations for random variants of demand and generation timeseries
+
+    The variants of the selected timeseries are generated with `sample_timeseries_variants`
+    and stored once in a shared memory block of shape (n_variants, number of timeseries *
+    number of timesteps). The simulations run in parallel in a pool of processes which read
+    their variant directly from the shared memory, without any copy of the timeseries being
+    sent to them or written to disk.
+
+    Parameters
+    ----------
+    json_input: path or dict
+        input parameters for the multi-vector simulation
+    timeseries_paths: tuple of tuple or str
+        paths to the timeseries to vary within the input json, for example
+        "energyConsumption.demand_01.timeseries", see `split_nested_path`
+    json_path_to_output_value: tuple of tuple or str
+        collection of succession of keys which lead the value of an output parameter of interest in
+        the json dict of the simulation's output. The order of keys is to be read from left to
+        right. In the case of str, each key should be separated by a `.` or a `,`.
+    n_variants: int
+        Number of simulated variants
+    bootstrap_days: bool
+        Whether the days of the timeseries are drawn with replacement
+        Default: True
+    ar_coefficient: float
+        Lag-one autocorrelation of the relative noise
+        Default: 0
+    noise_std: float
+        Standard deviation of the relative noise, 0 for no noise
+        Default: 0
+    noise_correlation: float
+        Correlation of the noise between the timeseries
+        Default: 0
+    scaling: dict, optional
+        Maps the path of some of the timeseries to the (lower, upper) bounds of their scaling
+        factor, e.g. to model an uncertain demand growth
+    seed: int, optional
+        Seed of the random generator, the same seed yields the same variants
+    max_workers: int, optional
+        Number of simulations running in parallel
+        Default: number of processors of the machine
+    quantiles: tuple of float
+        Quantiles of the output distributions reported in the summary
+        Default: DEFAULT_QUANTILES
+
+    Returns
+    -------
+    Tuple of two pandas.DataFrame: the outputs of each variant (one row per variant, the column
+    RUN_ERROR holds the error message of the failed simulations) and the summary of the output
+    distributions over the successful variants (count, mean, std, min, quantiles and max)
+
+    Notes
+    -----
+    The shared memory requires python>=3.8
+    """
+    if shared_memory is None:
+        raise ModuleNotFoundError(
+            "The stochastic timeseries analysis requires python>=3.8 (multiprocessing.shared_memory)"
+        )
+    if isinstance(json_input, str):
+        simulation_input = load_json(json_input)
+    elif isinstance(json_input, dict):
+        simulation_input = json_input
+    else:
+        raise TypeError(
+            f"Simulation input `{json_input}` is neither a file path, nor a json dict. "
+            f"It can therefore not be processed."
+        )
+
+    timeseries_paths = [split_nested_path(path) for path in timeseries_paths]
+    output_paths = [split_nested_path(path) for path in json_path_to_output_value]
+    original = [
+        _timeseries_values(get_nested_value(simulation_input, path))
+        for path in timeseries_paths
+    ]
+    n_timesteps = len(original[0])
+    if any(len(timeseries) != n_timesteps for timeseries in original):
+        raise ValueError("The varied timeseries should all have the same length")
+    if scaling is not None:
+        scaling = {split_nested_path(path): bounds for path, bounds in scaling.items()}
+        scaling = [scaling.get(path) for path in timeseries_paths]
+
+    timestep = get_nested_value(
+        simulation_input, ("simulation_settings", "timestep", "value")
+    )
+    shape = (n_variants, len(timeseries_paths) * n_timesteps)
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+    try:
+        variants = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        sample_timeseries_variants(
+            np.array(original),
+            n_variants,
+            steps_per_day=int(24 * 60 / timestep),
+            bootstrap_days=bootstrap_days,
+            ar_coefficient=ar_coefficient,
+            noise_std=noise_std,
+            noise_correlation=noise_correlation,
+            scaling=scaling,
+            seed=seed,
+            out=variants.reshape(n_variants, len(timeseries_paths), n_timesteps),
+        )
+        logging.info(f"Running the simulations of {n_variants} timeseries variants")
+
+        rows = []
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_initialize_sampler_worker,
+            initargs=(simulation_input, shm.name, shape, timeseries_paths),
+        ) as executor:
+            futures = [
+                executor.submit(_run_timeseries_variant, run_id, output_paths)
+                for run_id in range(n_variants)
+            ]
+            for future in as_completed(futures):
+                row = future.result()
+                if row[RUN_ERROR] != "":
+                    logging.warning(
+                        f"Simulation of variant {row[RUN_ID]} failed: {row[RUN_ERROR]}"
+                    )
+                rows.append(row)
+        del variants
+    finally:
+        shm.close()
+        shm.unlink()
+
+    columns = [RUN_ID] + [_column_name(path) for path in output_paths] + [RUN_ERROR]
+    results = (
+        pd.DataFrame(rows, columns=columns).sort_values(RUN_ID).reset_index(drop=True)
+    )
+    successful = results[results[RUN_ERROR] == ""]
+    summary = (
+        successful[columns[1:-1]]
+        .apply(pd.to_numeric, errors="coerce")
+        .describe(percentiles=list(quantiles))
+    )
+    return results, summary
+
+
+def _optimized_capacities(dict_values):
+    """Optimized additional capacities of the assets whose capacity is optimized, by label"""
+    capacities = {}
+    for asset_group in (ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_STORAGE):
+        for dict_asset in dict_values.get(asset_group, {}).values():
+            if dict_asset.get(OPTIMIZE_CAP, {VALUE: False})[VALUE] is not True:
+                continue
+            if asset_group == ENERGY_STORAGE:
+                for subasset in (INPUT_POWER, OUTPUT_POWER, STORAGE_CAPACITY):
+                    capacities[(dict_asset[LABEL], subasset)] = _to_scalar(
+                        dict_asset[subasset].get(OPTIMIZED_ADD_CAP)
+                    )
+            else:
+                capacities[(dict_asset[LABEL],)] = _to_scalar(
+                    dict_asset.get(OPTIMIZED_ADD_CAP)
+                )
+    return capacities
+
+
+def pareto_front_analysis(
+    json_input,
+    number_of_points=5,
+    json_path_to_output_value=DEFAULT_PARETO_OUTPUTS,
+    results_file=None,
+):
+    r"""Generate the pareto front of the costs and emissions of an energy system
+
+    The costs are minimized with the emissions bounded by equidistant values between the
+    emissions of the cost optimum and the minimal emissions of the energy system
+    (epsilon-constraint method, see `D0.pareto_front`). The model of the energy system is built
+    once and only the bound of the emissions changes between the points.
+
+    Parameters
+    ----------
+    json_input: path or dict
+        input parameters for the multi-vector simulation
+    number_of_points: int
+        Number of points of the pareto front, including the cost optimum and the point with
+        minimal emissions
+        Default: 5
+    json_path_to_output_value: tuple of tuple or str
+        collection of succession of keys which lead the value of an output parameter of interest in
+        the json dict of the simulation's output. The order of keys is to be read from left to
+        right. In the case of str, each key should be separated by a `.` or a `,`.
+        Default: DEFAULT_PARETO_OUTPUTS, the emissions, costs, levelized costs and renewable factor
+    results_file: str, optional
+        path to the csv file where the pareto front is stored
+
+    Returns
+    -------
+    pandas.DataFrame with one row per point of the pareto front, starting with the cost optimum:
+    its number PARETO_POINT, the EMISSION_BOUND (None for the cost optimum), the outputs and the
+    optimized additional capacity of each conversion, production and storage asset whose
+    capacity is optimized (one column per label, or per label and subasset for storages)
+    """
+    if isinstance(json_input, str):
+        simulation_input = load_json(json_input)
+    elif isinstance(json_input, dict):
+        simulation_input = json_input
+    else:
+        raise TypeError(
+            f"Simulation input `{json_input}` is neither a file path, nor a json dict. "
+            f"It can therefore not be processed."
+        )
+
+    output_paths = [split_nested_path(path) for path in json_path_to_output_value]
+    dict_values = convert_from_json_to_special_types(simulation_input)
+    C0.all(dict_values)
+
+    rows = []
+    for point, (emission_bound, dict_point, results_meta, results_main) in enumerate(
+        D0.pareto_front.solve_points(dict_values, number_of_points), start=1
+    ):
+        E0.evaluate_dict(dict_point, results_main, results_meta)
+        row = {PARETO_POINT: point, EMISSION_BOUND: emission_bound}
+        for path in output_paths:
+            row[_column_name(path)] = _to_scalar(get_nested_value(dict_point, path))
+        for path, capacity in _optimized_capacities(dict_point).items():
+            row[_column_name((OPTIMIZED_ADD_CAP,) + path)] = capacity
+        rows.append(row)
+
+    results = pd.DataFrame(rows)
+    if results_file is not None:
+        results.to_csv(results_file, index=False)
+    return results
+
+
+# Set in the analysis process before the worker processes of scenario_variants_analysis are
+# forked, so that they inherit the processed base case without copying it
+_base_processed = None
+_fork_per_variant = False
+
+
+def _initialize_variant_worker(simulation_input=None, processed_input=None):
+    """Keep the base case in the worker process if it is not inherited from the parent process"""
+    global _base_input, _base_processed
+    if simulation_input is not None:
+        _base_input = simulation_input
+        _base_processed = processed_input
+    logging.getLogger().setLevel(logging.ERROR)
+
+
+def _run_scenario_variant(run_id, changes, output_paths):
+    """Run the simulation of one variant of the base case and extract its outputs
+
+    The changes of the variant are applied to the processed base case if they are supported by
+    `C0.apply_parameter_changes`, otherwise to the base case, which is then processed again.
+    The base case is modified in place if the worker process was forked for this variant only.
+
+    Parameters
+    ----------
+    run_id: int
+        index of the variant
+    changes: list of dict
+        changes of the variant, see `scenario_delta.apply_changes`
+    output_paths: list of tuple
+        paths of the outputs of interest in the simulation results
+
+    Returns
+    -------
+    Row of the results, as a dict
+    """
+    row = {RUN_ID: run_id}
+    values = changes_as_values(changes)
+    for path, value in (values or {}).items():
+        row[_column_name(path)] = value
+    try:
+        dict_values = None
+        if _base_processed is not None and values is not None:
+            dict_values = _base_processed
+            if _fork_per_variant is False:
+                dict_values = copy.deepcopy(dict_values)
+            if C0.apply_parameter_changes(dict_values, values) is True:
+                C0.verify_and_reduce_energy_system(dict_values)
+            else:
+                dict_values = None
+        if dict_values is None:
+            dict_values = _base_input
+            if _fork_per_variant is False:
+                dict_values = copy.deepcopy(dict_values)
+            apply_changes(dict_values, changes)
+            dict_values = convert_from_json_to_special_types(dict_values)
+            C0.all(dict_values)
+        results_meta, results_main = D0.run_oemof(dict_values)
+        E0.evaluate_dict(dict_values, results_main, results_meta)
+        for path in output_paths:
+            row[_column_name(path)] = _to_scalar(get_nested_value(dict_values, path))
+        row[RUN_ERROR] = ""
+    except Exception as e:
+        row[RUN_ERROR] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def scenario_variants_analysis(
+    json_input,
+    variations,
+    json_path_to_output_value,
+    results_file=None,
+    max_workers=None,
+):
+    r"""Run mvs simulations of variants of a base case which differ in a few parameters
+
+    The base case is loaded and processed (`C0.process_input_data`) once. Each variant applies
+    its parameter changes to the processed base case and re-runs only the processing steps
+    affected by them (see `C0.apply_parameter_changes`) before the energy system is optimized.
+    Changes which are not supported, e.g. of the economic data or removed parameters, are
+    applied to the loaded base case, which is then processed again for this variant.
+
+    The simulations run in parallel in a pool of processes. Where processes can be forked
+    (Linux, macOS), a new worker process is forked from the analysis process for each variant:
+    the base case is inherited copy-on-write and never copied, serialized or sent to the
+    workers. Otherwise, the base case is sent once to each worker and copied for each variant.
+
+    Parameters
+    ----------
+    json_input: path or dict
+        input parameters of the base case
+    variations: list of dict or list of list
+        Each variant maps the paths to its changed parameters (tuple or str, see
+        `split_nested_path`) to their values, for example the output of `sample_parameters`, or
+        is the list of changes of a scenario delta (see `scenario_delta.apply_changes`)
+    json_path_to_output_value: tuple of tuple or str
+        collection of succession of keys which lead the value of an output parameter of interest in
+        the json dict of the simulation's output. The order of keys is to be read from left to
+        right. In the case of str, each key should be separated by a `.` or a `,`.
+    results_file: str, optional
+        path to the csv file where the results are stored
+    max_workers: int, optional
+        Number of simulations running in parallel
+        Default: number of processors of the machine
+
+    Returns
+    -------
+    pandas.DataFrame with one row per variant: its RUN_ID, its changed parameters, the outputs
+    and the column RUN_ERROR holding the error message of the failed simulations
+    """
+    global _base_input, _base_processed, _fork_per_variant
+    if isinstance(json_input, str):
+        simulation_input = load_json(json_input)
+    elif isinstance(json_input, dict):
+        simulation_input = json_input
+    else:
+        raise TypeError(
+            f"Simulation input `{json_input}` is neither a file path, nor a json dict. "
+            f"It can therefore not be processed."
+        )
+
+    variations = [
+        [
+            {
+                PATCH_OPERATION: PATCH_ADD,
+                PATCH_PATH: split_nested_path(path),
+                VALUE: value,
+            }
+            for path, value in variation.items()
+        ]
+        if isinstance(variation, dict)
+        else variation
+        for variation in variations
+    ]
+    output_paths = [split_nested_path(path) for path in json_path_to_output_value]
+
+    # the changes which can not be applied to the processed base case are applied to the base
+    # case before the conversion of its values to special types, as for a scenario delta
+    base_input = copy.deepcopy(simulation_input)
+    base_processed = convert_from_json_to_special_types(copy.deepcopy(base_input))
+    try:
+        C0.process_input_data(base_processed)
+    except Exception as e:
+        logging.warning(
+            f"The base case could not be processed ({type(e).__name__}: {e}), each variant "
+            f"is processed completely"
+        )
+        base_processed = None
+
+    fork_available = "fork" in multiprocessing.get_all_start_methods()
+    if fork_available is True:
+        # one worker process per variant, forked from this process with the base case
+        pool_arguments = dict(maxtasksperchild=1)
+        context = multiprocessing.get_context("fork")
+    else:
+        pool_arguments = dict(initargs=(base_input, base_processed))
+        context = multiprocessing.get_context()
+    logging.info(f"Running the simulations of {len(variations)} scenario variants")
+
+    _base_input, _base_processed = base_input, base_processed
+    _fork_per_variant = fork_available
+    try:
+        with context.Pool(
+            max_workers, initializer=_initialize_variant_worker, **pool_arguments
+        ) as pool:
+            # one variant per task, so that each forked worker process runs one variant only
+            rows = pool.starmap(
+                _run_scenario_variant,
+                [
+                    (run_id, variation, output_paths)
+                    for run_id, variation in enumerate(variations)
+                ],
+                chunksize=1,
+            )
+    finally:
+        _base_input, _base_processed, _fork_per_variant = None, None, False
+
+    for row in rows:
+        if row[RUN_ERROR] != "":
+            logging.warning(
+                f"Simulation of variant {row[RUN_ID]} failed: {row[RUN_ERROR]}"
+            )
+    parameter_columns = []
+    for variation in variations:
+        for path in changes_as_values(variation) or {}:
+            if _column_name(path) not in parameter_columns:
+                parameter_columns.append(_column_name(path))
+    columns = (
+        [RUN_ID]
+        + parameter_columns
+        + [_column_name(path) for path in output_paths]
+        + [RUN_ERROR]
+    )
+    results = pd.DataFrame(rows, columns=columns)
+    if results_file is not None:
+        results.to_csv(results_file, index=False)
+    return results
+
+
+def scenario_delta_analysis(
+    delta_files, json_path_to_output_value, results_file=None, max_workers=None
+):
+    r"""Run mvs simulations of a library of scenario deltas
+
+    The scenario deltas (see :mod:`multi_vector_simulator.utils.scenario_delta`) are grouped by
+    their base input. The scenarios of each base input are simulated with
+    `scenario_variants_analysis`, so each base input is loaded and processed only once.
+
+    Parameters
+    ----------
+    delta_files: list of str
+        paths to the scenario delta files
+    json_path_to_output_value: tuple of tuple or str
+        collection of succession of keys which lead the value of an output parameter of interest in
+        the json dict of the simulation's output. The order of keys is to be read from left to
+        right. In the case of str, each key should be separated by a `.` or a `,`.
+    results_file: str, optional
+        path to the csv file where the results are stored
+    max_workers: int, optional
+        Number of simulations running in parallel
+        Default: number of processors of the machine
+
+    Returns
+    -------
+    pandas.DataFrame with one row per scenario delta: its RUN_ID (index within delta_files),
+    the SCENARIO_FILE, its changed parameters, the outputs and the column RUN_ERROR holding the
+    error message of the failed simulations
+    """
+    scenarios_of_base = {}
+    for run_id, path_delta_file in enumerate(delta_files):
+        with open(path_delta_file) as json_file:
+            delta = json.load(json_file)
+        if not is_scenario_delta(delta):
+            raise InvalidScenarioDeltaError(
+                f"The file {path_delta_file} is not a scenario delta"
+            )
+        scenarios_of_base.setdefault(get_base_path(path_delta_file, delta), []).append(
+            (run_id, delta)
+        )
+
+    results = []
+    for path_base, scenarios in scenarios_of_base.items():
+        base_hash = content_hash(load_scenario(path_base))
+        for run_id, delta in scenarios:
+            expected_hash = delta.get(SCENARIO_BASE_HASH)
+            if expected_hash is not None and expected_hash != base_hash:
+                raise InvalidScenarioDeltaError(
+                    f"The base input {path_base} of the scenario delta "
+                    f"{delta_files[run_id]} was modified after the delta was written, its "
+                    f"content hash differs from {expected_hash}"
+                )
+        logging.info(
+            f"Running the simulations of {len(scenarios)} scenario deltas of the base input "
+            f"{path_base}"
+        )
+        base_results = scenario_variants_analysis(
+            path_base,
+            [delta[SCENARIO_CHANGES] for _, delta in scenarios],
+            json_path_to_output_value,
+            max_workers=max_workers,
+        )
+        run_ids = [run_id for run_id, _ in scenarios]
+        base_results[RUN_ID] = [run_ids[i] for i in base_results[RUN_ID]]
+        base_results.insert(
+            1, SCENARIO_FILE, [delta_files[i] for i in base_results[RUN_ID]]
+        )
+        results.append(base_results)
+
+    results = pd.concat(results, ignore_index=True)
+    # the outputs and the error message are the last columns of the results
+    output_columns = [
+        _column_name(split_nested_path(path)) for path in json_path_to_output_value
+    ] + [RUN_ERROR]
+    results = results[
+        [column for column in results.columns if column not in output_columns]
+        + output_columns
+    ]
+    results = results.sort_values(RUN_ID).reset_index(drop=True)
+    if results_file is not None:
+        results.to_csv(results_file, index=False)
+    return results
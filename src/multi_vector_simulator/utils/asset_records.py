@@ -0,0 +1,582 @@
+"""
+Asset records
+=============
+
+Compact typed representation of the assets of dict_values. In dict_values each parameter
+of an asset is a {VALUE: x, UNIT: u} dict, an asset record instead holds the values in the
+`__slots__` of a class per asset group and the units in a unit schema shared by all records
+with the same units.
+
+- AssetRecord.from_dict() / AssetRecord.to_dict(): convert an asset from / to its dict
+- dict_values_to_asset_records() / asset_records_to_dict_values(): convert all asset groups
+  of dict_values, used at the boundaries of the MVS (B0.load_json and F0.store_as_json)
+- get_value(), get_unit(), set_value(), set_parameter(): access the parameters of an asset
+  provided either as dict or as record, used by the economic evaluation of the assets
+  (C0.evaluate_lifetime_costs, E2.get_costs, E2.lcoe_assets, E0.store_result_matrix)
+  which runs on records for the re-evaluation of the economic KPI (`mvs_reevaluate`)
+
+A parameter which is not part of the record type of the asset group raises an
+UnknownParameterError when the asset is converted, and an AttributeError when it is accessed,
+therefore typos in the parameter names do not go unnoticed.
+"""
+
+import difflib
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    AGE_INSTALLED,
+    ANNUAL_TOTAL_FLOW,
+    ANNUITY_OM,
+    ANNUITY_SPECIFIC_INVESTMENT_AND_OM,
+    ANNUITY_TOTAL,
+    AVAILABILITY_DISPATCH,
+    AVERAGE_FLOW,
+    AVERAGE_SOC,
+    C_RATE,
+    CONNECTED_CONSUMPTION_SOURCE,
+    CONNECTED_FEEDIN_SINK,
+    CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS,
+    COST_DISPATCH,
+    COST_INVESTMENT,
+    COST_OM,
+    COST_OPERATIONAL_TOTAL,
+    COST_REPLACEMENT,
+    COST_TOTAL,
+    COST_UPFRONT,
+    DEVELOPMENT_COSTS,
+    DISPATCH_PRICE,
+    DISPATCHABILITY,
+    DSM,
+    EFFICIENCY,
+    EMISSION_FACTOR,
+    ENERGY_CONSUMPTION,
+    ENERGY_CONVERSION,
+    ENERGY_PRICE,
+    ENERGY_PRODUCTION,
+    ENERGY_PROVIDERS,
+    ENERGY_STORAGE,
+    ENERGY_VECTOR,
+    FEEDIN_TARIFF,
+    FILENAME,
+    FIX_COST,
+    FLOW,
+    INFLOW_DIRECTION,
+    INPUT_POWER,
+    INSTALLED_CAP,
+    INSTALLED_CAP_NORMALIZED,
+    LABEL,
+    LCOE_ASSET,
+    LIFETIME,
+    LIFETIME_PRICE_DISPATCH,
+    LIFETIME_SPECIFIC_COST,
+    LIFETIME_SPECIFIC_COST_OM,
+    MAXIMUM_ADD_CAP,
+    MAXIMUM_ADD_CAP_NORMALIZED,
+    MAXIMUM_CAP,
+    MAXIMUM_CAP_NORMALIZED,
+    OEMOF_ASSET_TYPE,
+    OPTIMIZE_CAP,
+    OPTIMIZED_ADD_CAP,
+    OPTIMIZED_PEAK_DEMAND,
+    OUTFLOW_DIRECTION,
+    OUTPUT_POWER,
+    PEAK_DEMAND_PRICING,
+    PEAK_DEMAND_PRICING_PERIOD,
+    PEAK_FLOW,
+    PERIOD_AVERAGE_FLOW,
+    PERIOD_PEAK_FLOW,
+    RENEWABLE_ASSET_BOOL,
+    RENEWABLE_SHARE_DSO,
+    SIMULATION_ANNUITY,
+    SOC_INITIAL,
+    SOC_MAX,
+    SOC_MIN,
+    SPECIFIC_COSTS,
+    SPECIFIC_COSTS_OM,
+    SPECIFIC_REPLACEMENT_COSTS_INSTALLED,
+    SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED,
+    STORAGE_CAPACITY,
+    STORAGE_FILENAME,
+    THERM_LOSSES_ABS,
+    THERM_LOSSES_REL,
+    TIMESERIES,
+    TIMESERIES_AVERAGE,
+    TIMESERIES_NORMALIZED,
+    TIMESERIES_PEAK,
+    TIMESERIES_SOC,
+    TIMESERIES_TOTAL,
+    TOTAL_EMISSIONS,
+    TOTAL_FLOW,
+    TYPE_ASSET,
+    UNIT,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import UnknownParameterError
+
+# Unit of the parameters provided as {VALUE: x} without UNIT
+NO_UNIT = None
+
+# Parameters shared by the asset groups
+ASSET_PARAMETERS = (LABEL, UNIT, ENERGY_VECTOR, OEMOF_ASSET_TYPE, TYPE_ASSET)
+ECONOMIC_PARAMETERS = (
+    AGE_INSTALLED,
+    DEVELOPMENT_COSTS,
+    SPECIFIC_COSTS,
+    SPECIFIC_COSTS_OM,
+    DISPATCH_PRICE,
+    LIFETIME,
+    LIFETIME_SPECIFIC_COST,
+    LIFETIME_SPECIFIC_COST_OM,
+    LIFETIME_PRICE_DISPATCH,
+    ANNUITY_SPECIFIC_INVESTMENT_AND_OM,
+    SIMULATION_ANNUITY,
+    SPECIFIC_REPLACEMENT_COSTS_INSTALLED,
+    SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED,
+)
+CAPACITY_PARAMETERS = (
+    OPTIMIZE_CAP,
+    INSTALLED_CAP,
+    MAXIMUM_CAP,
+    MAXIMUM_ADD_CAP,
+    OPTIMIZED_ADD_CAP,
+)
+FLOW_RESULTS = (
+    FLOW,
+    TOTAL_FLOW,
+    ANNUAL_TOTAL_FLOW,
+    PEAK_FLOW,
+    AVERAGE_FLOW,
+    PERIOD_PEAK_FLOW,
+    PERIOD_AVERAGE_FLOW,
+)
+COST_RESULTS = (
+    ANNUITY_OM,
+    ANNUITY_TOTAL,
+    COST_TOTAL,
+    COST_OPERATIONAL_TOTAL,
+    COST_OM,
+    COST_DISPATCH,
+    COST_INVESTMENT,
+    COST_UPFRONT,
+    COST_REPLACEMENT,
+    LCOE_ASSET,
+)
+TIMESERIES_PARAMETERS = (
+    FILENAME,
+    TIMESERIES,
+    TIMESERIES_NORMALIZED,
+    TIMESERIES_PEAK,
+    TIMESERIES_TOTAL,
+    TIMESERIES_AVERAGE,
+)
+
+
+def attribute_name(parameter):
+    r"""
+    Returns the name of the slot of a record holding the parameter (eg. "input_power" for INPUT_POWER)
+    """
+    return parameter.replace(" ", "_").replace("-", "_")
+
+
+class UnitSchema:
+    """Units of the parameters of the records, shared by all records with the same units
+
+    A parameter with the unit NO_UNIT is provided as {VALUE: x} in dict_values, a parameter
+    which is not in the schema is provided as is (eg. the LABEL or a pd.Series).
+    The schemas are interned, use UnitSchema.of() instead of the constructor.
+    """
+
+    __slots__ = ("units",)
+
+    _interned = {}
+
+    def __init__(self, units):
+        self.units = units
+
+    @classmethod
+    def of(cls, units):
+        """Returns the interned schema with the units (mapping from parameter to unit)"""
+        key = tuple(sorted(units.items()))
+        try:
+            schema = cls._interned.get(key)
+        except TypeError:
+            # a unit which is not hashable (eg. a list) can not be shared
+            return cls(dict(key))
+        if schema is None:
+            schema = cls._interned[key] = cls(dict(key))
+        return schema
+
+    def __contains__(self, parameter):
+        return parameter in self.units
+
+    def __getitem__(self, parameter):
+        return self.units[parameter]
+
+    def __deepcopy__(self, memo):
+        # The schemas are immutable and shared
+        return self
+
+
+class AssetRecord:
+    """Values of the parameters of an asset, the units are held by its UnitSchema
+
+    The subclasses define the PARAMETERS of an asset group, each parameter is held in the
+    slot attribute_name(parameter). A parameter which is not provided is not set and its
+    access raises an AttributeError.
+    """
+
+    PARAMETERS = ()
+    # Parameters holding the dict of a subasset, converted to the given record type
+    SUBASSETS = {}
+
+    __slots__ = ("_schema",)
+
+    def __init__(self, schema=None, **values):
+        self._schema = schema or UnitSchema.of({})
+        for attribute, value in values.items():
+            setattr(self, attribute, value)
+
+    @classmethod
+    def from_dict(cls, dict_asset):
+        r"""
+        Converts the dict of an asset to a record.
+
+        Parameters
+        ----------
+        dict_asset: dict
+            Asset of dict_values, whose parameters are mostly {VALUE: x, UNIT: u} dicts
+
+        Returns
+        -------
+        Record of type `cls`
+
+        Notes
+        -----
+        Raises an UnknownParameterError if a parameter is not in `cls.PARAMETERS`, the
+        closest known parameters are suggested in the error message.
+        """
+        unknown = [
+            parameter for parameter in dict_asset if parameter not in cls.PARAMETERS
+        ]
+        if len(unknown) > 0:
+            suggestions = [
+                f"{parameter} (did you mean {', '.join(matches)}?)"
+                if matches
+                else parameter
+                for parameter, matches in (
+                    (p, difflib.get_close_matches(p, cls.PARAMETERS, n=2))
+                    for p in unknown
+                )
+            ]
+            raise UnknownParameterError(
+                f"The parameters {', '.join(suggestions)} of the asset "
+                f"{dict_asset.get(LABEL)} are unknown to the {cls.__name__}."
+            )
+
+        units = {}
+        values = {}
+        for parameter, value in dict_asset.items():
+            if parameter in cls.SUBASSETS:
+                value = cls.SUBASSETS[parameter].from_dict(value)
+            elif isinstance(value, dict) and VALUE in value:
+                if set(value) == {VALUE, UNIT}:
+                    units[parameter] = value[UNIT]
+                    value = value[VALUE]
+                elif set(value) == {VALUE}:
+                    units[parameter] = NO_UNIT
+                    value = value[VALUE]
+            values[attribute_name(parameter)] = value
+        return cls(UnitSchema.of(units), **values)
+
+    def to_dict(self):
+        r"""
+        Converts the record back to the dict of the asset, the inverse of `from_dict`
+        """
+        return {
+            parameter: self.entry(parameter)
+            for parameter in self.PARAMETERS
+            if parameter in self
+        }
+
+    def entry(self, parameter):
+        r"""
+        Returns the parameter as in the dict of the asset, eg. as {VALUE: x, UNIT: u} dict
+        """
+        value = getattr(self, attribute_name(parameter))
+        if parameter in self.SUBASSETS:
+            value = value.to_dict()
+        elif parameter in self._schema:
+            unit = self._schema[parameter]
+            value = {VALUE: value} if unit is NO_UNIT else {VALUE: value, UNIT: unit}
+        return value
+
+    def __contains__(self, parameter):
+        return parameter in self.PARAMETERS and hasattr(self, attribute_name(parameter))
+
+    def get(self, parameter, default=None):
+        """Returns the value of the parameter, `default` if it is not provided"""
+        return getattr(self, attribute_name(parameter), default)
+
+    def unit_of(self, parameter):
+        """Returns the unit of the parameter, None if it has no unit"""
+        return self._schema.units.get(parameter)
+
+    def set(self, parameter, value, unit=None):
+        r"""
+        Sets the value of a parameter together with its unit.
+
+        Without `unit` the parameter keeps the unit it already has, a new parameter without
+        unit is stored as is.
+        """
+        if unit is not None and self.unit_of(parameter) != unit:
+            units = dict(self._schema.units)
+            units[parameter] = unit
+            self._schema = UnitSchema.of(units)
+        setattr(self, attribute_name(parameter), value)
+
+    def set_value(self, parameter, value, unit=NO_UNIT):
+        r"""
+        Sets a parameter which is a {VALUE: value, UNIT: unit} dict in the dict of the asset,
+        or a {VALUE: value} dict if `unit` is NO_UNIT
+        """
+        if parameter not in self._schema or self._schema[parameter] != unit:
+            units = dict(self._schema.units)
+            units[parameter] = unit
+            self._schema = UnitSchema.of(units)
+        setattr(self, attribute_name(parameter), value)
+
+    def pop(self, parameter):
+        """Removes a parameter and returns its value, as `dict.pop` for the dict of the asset"""
+        value = getattr(self, attribute_name(parameter))
+        delattr(self, attribute_name(parameter))
+        return value
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.get(LABEL)!r})"
+
+
+class StorageComponentRecord(AssetRecord):
+    """Input power, output power or storage capacity of a storage asset"""
+
+    PARAMETERS = (
+        (LABEL, UNIT, EFFICIENCY, C_RATE, SOC_INITIAL, SOC_MAX, SOC_MIN)
+        + (THERM_LOSSES_REL, THERM_LOSSES_ABS)
+        + ECONOMIC_PARAMETERS
+        + CAPACITY_PARAMETERS
+        + FLOW_RESULTS
+        + COST_RESULTS
+    )
+    __slots__ = tuple(map(attribute_name, PARAMETERS))
+
+
+class ConsumptionRecord(AssetRecord):
+    """Asset of ENERGY_CONSUMPTION"""
+
+    PARAMETERS = (
+        ASSET_PARAMETERS
+        + (INFLOW_DIRECTION, DSM, DISPATCHABILITY)
+        + TIMESERIES_PARAMETERS
+        + ECONOMIC_PARAMETERS
+        + CAPACITY_PARAMETERS
+        + FLOW_RESULTS
+        + COST_RESULTS
+    )
+    __slots__ = tuple(map(attribute_name, PARAMETERS))
+
+
+class ConversionRecord(AssetRecord):
+    """Asset of ENERGY_CONVERSION"""
+
+    PARAMETERS = (
+        ASSET_PARAMETERS
+        + (INFLOW_DIRECTION, OUTFLOW_DIRECTION, EFFICIENCY, AVAILABILITY_DISPATCH)
+        + (DISPATCHABILITY, OPTIMIZED_PEAK_DEMAND)
+        + ECONOMIC_PARAMETERS
+        + CAPACITY_PARAMETERS
+        + FLOW_RESULTS
+        + COST_RESULTS
+    )
+    __slots__ = tuple(map(attribute_name, PARAMETERS))
+
+
+class ProductionRecord(AssetRecord):
+    """Asset of ENERGY_PRODUCTION"""
+
+    PARAMETERS = (
+        ASSET_PARAMETERS
+        + (OUTFLOW_DIRECTION, DISPATCHABILITY, RENEWABLE_ASSET_BOOL, EMISSION_FACTOR)
+        + (INSTALLED_CAP_NORMALIZED, MAXIMUM_CAP_NORMALIZED, MAXIMUM_ADD_CAP_NORMALIZED)
+        + TIMESERIES_PARAMETERS
+        + ECONOMIC_PARAMETERS
+        + CAPACITY_PARAMETERS
+        + FLOW_RESULTS
+        + COST_RESULTS
+        + (TOTAL_EMISSIONS,)
+    )
+    __slots__ = tuple(map(attribute_name, PARAMETERS))
+
+
+class ProviderRecord(AssetRecord):
+    """Asset of ENERGY_PROVIDERS"""
+
+    PARAMETERS = (
+        ASSET_PARAMETERS
+        + (INFLOW_DIRECTION, OUTFLOW_DIRECTION, ENERGY_PRICE, FEEDIN_TARIFF)
+        + (PEAK_DEMAND_PRICING, PEAK_DEMAND_PRICING_PERIOD)
+        + (RENEWABLE_SHARE_DSO, EMISSION_FACTOR)
+        + (CONNECTED_CONSUMPTION_SOURCE, CONNECTED_FEEDIN_SINK)
+        + (CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS,)
+        + ECONOMIC_PARAMETERS
+        + CAPACITY_PARAMETERS
+        + FLOW_RESULTS
+        + COST_RESULTS
+    )
+    __slots__ = tuple(map(attribute_name, PARAMETERS))
+
+
+class StorageRecord(AssetRecord):
+    """Asset of ENERGY_STORAGE, its components are StorageComponentRecord"""
+
+    PARAMETERS = ASSET_PARAMETERS + (
+        INFLOW_DIRECTION,
+        OUTFLOW_DIRECTION,
+        STORAGE_FILENAME,
+        OPTIMIZE_CAP,
+        INPUT_POWER,
+        OUTPUT_POWER,
+        STORAGE_CAPACITY,
+        TIMESERIES_SOC,
+        AVERAGE_SOC,
+        LCOE_ASSET,
+    )
+    SUBASSETS = {
+        INPUT_POWER: StorageComponentRecord,
+        OUTPUT_POWER: StorageComponentRecord,
+        STORAGE_CAPACITY: StorageComponentRecord,
+    }
+    __slots__ = tuple(map(attribute_name, PARAMETERS))
+
+
+class FixCostRecord(AssetRecord):
+    """Asset of FIX_COST, its capacities and flow are only set within E0.process_fixcost"""
+
+    PARAMETERS = (
+        (LABEL,)
+        + ECONOMIC_PARAMETERS
+        + COST_RESULTS
+        + (INSTALLED_CAP, OPTIMIZED_ADD_CAP, FLOW)
+    )
+    __slots__ = tuple(map(attribute_name, PARAMETERS))
+
+
+# Record type of each asset group
+RECORD_TYPES = {
+    ENERGY_CONSUMPTION: ConsumptionRecord,
+    ENERGY_CONVERSION: ConversionRecord,
+    ENERGY_PRODUCTION: ProductionRecord,
+    ENERGY_PROVIDERS: ProviderRecord,
+    ENERGY_STORAGE: StorageRecord,
+    FIX_COST: FixCostRecord,
+}
+
+
+def dict_values_to_asset_records(dict_values):
+    r"""
+    Converts the assets of all asset groups of dict_values to records.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs (and results)
+
+    Returns
+    -------
+    Copy of dict_values (not nested) in which each asset group maps the asset labels to
+    their record, the other entries of dict_values are not copied
+    """
+    records = dict(dict_values)
+    for group, record_type in RECORD_TYPES.items():
+        if group in dict_values:
+            records[group] = {
+                label: record_type.from_dict(dict_asset)
+                for label, dict_asset in dict_values[group].items()
+            }
+    return records
+
+
+def asset_records_to_dict_values(records):
+    r"""
+    Converts the asset records back to dicts, the inverse of `dict_values_to_asset_records`
+
+    Parameters
+    ----------
+    records: dict
+        dict_values whose asset groups hold records (dicts are kept as they are)
+
+    Returns
+    -------
+    Copy of `records` (not nested) with the assets as dicts
+    """
+    dict_values = dict(records)
+    for group in RECORD_TYPES:
+        if group in records:
+            dict_values[group] = {
+                label: record.to_dict() if isinstance(record, AssetRecord) else record
+                for label, record in records[group].items()
+            }
+    return dict_values
+
+
+def get_value(asset, parameter):
+    r"""
+    Returns the value of a parameter of an asset
+
+    Parameters
+    ----------
+    asset: dict or :class:`AssetRecord`
+        Asset of dict_values, as dict or as record
+
+    parameter: str
+        Parameter of the asset
+
+    Returns
+    -------
+    The VALUE of the parameter if it is a {VALUE: x, UNIT: u} dict in the dict of the
+    asset, else the parameter itself (eg. the LABEL, the FLOW or a storage component)
+    """
+    if isinstance(asset, AssetRecord):
+        value = getattr(asset, attribute_name(parameter))
+    else:
+        value = asset[parameter]
+    if isinstance(value, dict) and VALUE in value:
+        value = value[VALUE]
+    return value
+
+
+def get_unit(asset, parameter):
+    """Returns the UNIT of a parameter of an asset, as dict or as record"""
+    if isinstance(asset, AssetRecord):
+        return asset.unit_of(parameter)
+    return asset[parameter][UNIT]
+
+
+def set_value(asset, parameter, value, unit=NO_UNIT):
+    r"""
+    Sets a parameter of an asset, as dict or as record, to a value with its unit
+
+    In the dict of the asset the parameter is a {VALUE: value, UNIT: unit} dict, or a
+    {VALUE: value} dict if `unit` is NO_UNIT.
+    """
+    if isinstance(asset, AssetRecord):
+        asset.set_value(parameter, value, unit)
+    elif unit is NO_UNIT:
+        asset[parameter] = {VALUE: value}
+    else:
+        asset[parameter] = {VALUE: value, UNIT: unit}
+
+
+def set_parameter(asset, parameter, value):
+    """Sets a parameter of an asset, as dict or as record, which has no unit (eg. the FLOW)"""
+    if isinstance(asset, AssetRecord):
+        asset.set(parameter, value)
+    else:
+        asset[parameter] = value
@@ -41,6 +41,8 @@ LOGFILE = "mvs_logfile.log"
 PDF_REPORT = "simulation_report.pdf"
 # name of lp file stored to dick
 LP_FILE = "lp_file.lp"
+# Output of the solver, see D0.solver_progress
+SOLVER_LOG_FILE = "solver_log.txt"
 
 # path of the pdf report path
 REPORT_FOLDER = "report"
@@ -52,6 +54,9 @@ ARG_REPORT_PATH = "report_path"
 ARG_PATH_SIM_OUTPUT = "output_folder"
 ARG_DEBUG_REPORT = "debug_report"
 
+# variables used for the economic re-evaluation parser
+ARG_ECONOMIC_DATA_OVERRIDES = "economic_data_overrides"
+
 # default paths to input, output and sequences folders
 DEFAULT_INPUT_PATH = os.path.join(REPO_PATH, INPUT_FOLDER)
 DEFAULT_OUTPUT_PATH = os.path.join(REPO_PATH, OUTPUT_FOLDER)
@@ -65,10 +70,60 @@ OVERWRITE = "overwrite"
 DISPLAY_OUTPUT = "display_output"
 SAVE_PNG = "save_png"
 
+# Simulation jobs run by the server
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+# keys of the status of a simulation job
+JOB_STATUS = "status"
+JOB_STAGE = "stage"
+JOB_PROGRESS = "progress"
+JOB_EVENTS = "events"
+JOB_SOLVER_PROGRESS = "solver_progress"
+JOB_LOGS = "logs"
+JOB_ERROR = "error"
+
+# Daemon with warm worker processes
+DAEMON_HOST = "localhost"
+DAEMON_PORT = 50715
+DAEMON_KEY_FILE = os.path.join(os.path.expanduser("~"), ".mvs_daemon_key")
+# keys and values of the messages exchanged with the daemon
+DAEMON_COMMAND = "command"
+DAEMON_RUN = "run"
+DAEMON_PING = "ping"
+DAEMON_STOP = "stop"
+DAEMON_EVENT = "event"
+DAEMON_LOG = "log"
+DAEMON_RESULT = "result"
+DAEMON_ERROR = "error"
+DAEMON_CONTENT = "content"
+# first event of a job, with the process id of the worker running it
+DAEMON_STARTED = "started"
+# seconds between two checks that the worker of a job is still alive
+DAEMON_POLL_INTERVAL = 1
+
+# Queue of simulation jobs shared by worker nodes through a sqlite database
+QUEUE_DATABASE = "mvs_queue.sqlite"
+QUEUE_JOB_MVS_TOOL = "mvs_tool"
+QUEUE_JOB_SIMULATION = "simulation"
+# state of the jobs which failed all their attempts
+JOB_DEAD_LETTER = "dead_letter"
+QUEUE_MAX_ATTEMPTS = 3
+# seconds
+QUEUE_LEASE_TIMEOUT = 60
+QUEUE_HEARTBEAT_INTERVAL = 10
+QUEUE_POLL_INTERVAL = 2
+QUEUE_RETRY_DELAY = 10
+
 # Filenames of the json files stored to disc:
 JSON_PROCESSED = "json_input_processed"
 JSON_WITH_RESULTS = "json_with_results"
+JSON_ECONOMIC_REEVALUATION = "json_with_economic_reevaluation"
 JSON_FILE_EXTENSION = ".json"
+# Filename of the excel file with the scalar results of an economic re-evaluation
+SCALARS_ECONOMIC_REEVALUATION = "scalars_economic_reevaluation"
 
 USER_INPUT_ARGUMENTS = (
     PATH_INPUT_FILE,
@@ -212,6 +267,7 @@ TYPE_SERIES = "pandas_Series"
 TYPE_DATAFRAME = "pandas_Dataframe"
 TYPE_NDARRAY = "numpy_ndarray"
 TYPE_TIMESTAMP = "pandas_Timestamp"
+TYPE_TIMESERIES_STORE = "mvs_TimeseriesStore"
 TYPE_BOOL = "bool"
 TYPE_INT64 = "numpy_int64"
 TYPE_STR = "str"
@@ -273,6 +329,90 @@ KNOWN_EXTRA_PARAMETERS = {
         WARNING_TEXT: "allows to add a net zero energy constraint to optimization problem (activate by setting to `True`). ",
         REQUIRED_IN_CSV_ELEMENTS: [CONSTRAINTS,],
     },
+    PEAK_DEMAND_PRICING_CONSTRAINT: {
+        DEFAULT_VALUE: False,
+        UNIT: TYPE_BOOL,
+        WARNING_TEXT: "allows to model the peak demand pricing with one peak demand variable per pricing period instead of one transformer per period (activate by setting to `True`). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    MODEL_REDUCTION: {
+        DEFAULT_VALUE: False,
+        UNIT: TYPE_BOOL,
+        WARNING_TEXT: "allows to remove assets and busses that do not change the optimal solution from the energy system model before the optimization (activate by setting to `True`). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    LP_SCALING: {
+        DEFAULT_VALUE: False,
+        UNIT: TYPE_BOOL,
+        WARNING_TEXT: "allows to scale the energy and cost coefficients of the linear program to improve its numerical conditioning, the results are rescaled after the optimization (activate by setting to `True`). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    FEASIBILITY_SCREENING: {
+        DEFAULT_VALUE: True,
+        UNIT: TYPE_BOOL,
+        WARNING_TEXT: "allows to reject energy systems that can be proven infeasible without solving the linear program (deactivate by setting to `False`). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    IN_MEMORY_SOLVER: {
+        DEFAULT_VALUE: False,
+        UNIT: TYPE_BOOL,
+        WARNING_TEXT: "allows to pass the linear program to the HiGHS solver in memory instead of exchanging files with the cbc solver (activate by setting to `True`). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    TWO_STAGE_PLANNING: {
+        DEFAULT_VALUE: False,
+        UNIT: TYPE_BOOL,
+        WARNING_TEXT: "allows to optimize the capacities with aggregated timesteps and to optimize the dispatch with these capacities at full resolution (activate by setting to `True`). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    INVESTMENT_TIMESTEP: {
+        DEFAULT_VALUE: 240,
+        UNIT: TYPE_FLOAT,
+        WARNING_TEXT: "defines the length of the aggregated timesteps in minutes with which the capacities are optimized in the two stage planning (Values: Float). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    TIMESTEP_SEGMENTATION: {
+        DEFAULT_VALUE: False,
+        UNIT: TYPE_BOOL,
+        WARNING_TEXT: "allows to optimize the energy system with timesteps of variable length, merging consecutive timesteps of similar input timeseries (activate by setting to `True`). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    SEGMENTATION_RATIO: {
+        DEFAULT_VALUE: 0.25,
+        UNIT: TYPE_FLOAT,
+        WARNING_TEXT: "defines the share of the timesteps of the simulation which are kept as segments of variable length by the timestep segmentation (Values: Float between 0 and 1). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    COST_RANGING: {
+        DEFAULT_VALUE: False,
+        UNIT: TYPE_BOOL,
+        WARNING_TEXT: "allows to report the range of the costs of the optimized assets over which their capacity stays optimal, derived from the reduced costs of the linear program (activate by setting to `True`). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    MEMORY_BUDGET: {
+        DEFAULT_VALUE: None,
+        UNIT: TYPE_NONE,
+        WARNING_TEXT: "defines the memory in MB which the linear program may use, the timesteps are segmented if the estimated memory of the linear program exceeds it (Values: None/Float). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    SOLVER_PROGRESS: {
+        DEFAULT_VALUE: False,
+        UNIT: TYPE_BOOL,
+        WARNING_TEXT: "allows to follow the progress of the solver (iterations, objective, gap) while the model is solved, and to report it in the simulation results (activate by setting to `True`). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    RESULT_GRANULARITY: {
+        DEFAULT_VALUE: GRANULARITY_FULL,
+        UNIT: TYPE_STR,
+        WARNING_TEXT: "defines the granularity of the stored result timeseries (Values: full/hourly/daily/monthly/totals). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
+    FULL_RESOLUTION_ASSETS: {
+        DEFAULT_VALUE: [],
+        UNIT: TYPE_STR,
+        WARNING_TEXT: "lists the assets whose result timeseries are kept in full resolution whatever the result granularity (Values: list of asset labels). ",
+        REQUIRED_IN_CSV_ELEMENTS: [SIMULATION_SETTINGS,],
+    },
 }
 
 ENERGY_CARRIER_UNIT = "energy_carrier_unit"
@@ -69,6 +69,21 @@ LATITUDE = "latitude"
 # Project data and simulation settings (true/false)
 SIMULATION_SETTINGS = "simulation_settings"
 OUTPUT_LP_FILE = "output_lp_file"
+PEAK_DEMAND_PRICING_CONSTRAINT = "peak_demand_pricing_constraint"
+MODEL_REDUCTION = "model_reduction"
+LP_SCALING = "lp_scaling"
+FEASIBILITY_SCREENING = "feasibility_screening"
+IN_MEMORY_SOLVER = "in_memory_solver"
+TWO_STAGE_PLANNING = "two_stage_planning"
+INVESTMENT_TIMESTEP = "investment_timestep"
+TIMESTEP_SEGMENTATION = "timestep_segmentation"
+SEGMENTATION_RATIO = "segmentation_ratio"
+COST_RANGING = "cost_ranging"
+MEMORY_BUDGET = "memory_budget"
+RESULT_GRANULARITY = "result_granularity"
+FULL_RESOLUTION_ASSETS = "full_resolution_assets"
+SOLVER_PROGRESS = "solver_progress"
+TIMESTEP_DURATIONS = "timestep_durations"
 PROJECT_NAME = "project_name"
 SCENARIO_NAME = "scenario_name"
 COUNTRY = "country"
@@ -190,6 +205,21 @@ CONNECTED_FEEDIN_SINK = "connected_feedin_sink"
 DISPATCHABILITY = "dispatchable"
 AVAILABILITY_DISPATCH = "availability_timeseries"
 ASSET_DICT = "asset_list"
+
+# Model reduction, see C3_model_reduction
+REDUCED_MODEL = "reduced_model"
+REMOVED_ASSETS = "removed_assets"
+MERGED_BUSSES = "merged_busses"
+KEPT_BUS = "kept_bus"
+PASS_THROUGH_TRANSFORMER = "pass_through_transformer"
+AGGREGATED_ASSETS = "aggregated_assets"
+
+# Scaling of the linear program, see D0.model_building.define_lp_scaling
+ENERGY_SCALING_FACTOR = "energy_scaling_factor"
+COST_SCALING_FACTOR = "cost_scaling_factor"
+
+# Arrays of values shared by the timeseries, see utils.timeseries_store
+TIMESERIES_STORE = "timeseries_store"
 #######################################
 # Parameters added in post-processing #
 #######################################
@@ -200,6 +230,50 @@ SIMULATION_RESULTS = "simulation_results"
 OBJECTIVE_VALUE = "objective_value"
 SIMULTATION_TIME = "simulation_time"
 MODELLING_TIME = "modelling_time"
+# Two stage planning, see D0.two_stage_planning
+INVESTMENT_STAGE_OBJECTIVE_VALUE = "investment_stage_objective_value"
+TWO_STAGE_OBJECTIVE_GAP = "two_stage_objective_gap"
+# Size of the linear program and strategy to solve it, see D0.solution_strategy
+LP_SIZE_ESTIMATE = "lp_size_estimate"
+NUMBER_OF_VARIABLES = "number_of_variables"
+NUMBER_OF_CONSTRAINTS = "number_of_constraints"
+NUMBER_OF_NONZEROS = "number_of_nonzeros"
+PEAK_MEMORY = "peak_memory"
+SOLUTION_STRATEGY = "solution_strategy"
+FULL_RESOLUTION = "full_resolution"
+# Progress events of the solver, see D0.solver_progress
+ELAPSED_TIME = "elapsed_time"
+ITERATIONS = "iterations"
+OBJECTIVE = "objective"
+GAP = "gap"
+PRIMAL_INFEASIBILITY = "primal_infeasibility"
+# Scenario delta input files, see utils.scenario_delta
+SCENARIO_BASE = "base"
+SCENARIO_BASE_HASH = "base_hash"
+SCENARIO_CHANGES = "changes"
+PATCH_OPERATION = "op"
+PATCH_PATH = "path"
+PATCH_ADD = "add"
+PATCH_REPLACE = "replace"
+PATCH_REMOVE = "remove"
+# Values of the oemof results rounded to 0, see E1.cut_results_below_micro
+RESULTS_BELOW_THRESHOLD = "results_below_threshold"
+NEGATIVE_VALUES_SET_TO_0 = "negative_values_set_to_0"
+POSITIVE_VALUES_SET_TO_0 = "positive_values_set_to_0"
+NEGATIVE_VALUES_KEPT = "negative_values_kept"
+MINIMAL_VALUE = "minimal_value"
+# Economic re-evaluation of the results without re-optimization, see E0.reevaluate_economics
+ECONOMIC_REEVALUATION = "economic_reevaluation"
+REOPTIMIZED = "reoptimized"
+ECONOMIC_DATA_OVERRIDES = "economic_data_overrides"
+ORIGINAL_VALUE = "original_value"
+# Cost ranging of the optimized assets, see D0.cost_ranging
+COST_PARAMETER = "cost_parameter"
+COST_RANGE_MINIMUM = "cost_range_minimum"
+COST_RANGE_MAXIMUM = "cost_range_maximum"
+# Pareto front of the costs and emissions, see D0.pareto_front
+PARETO_POINT = "pareto_point"
+EMISSION_BOUND = "emission_bound"
 
 # Logs
 LOGS = "logs"
@@ -212,6 +286,7 @@ KPI_SCALARS_DICT = "scalars"
 KPI_UNCOUPLED_DICT = "KPI_individual_sectors"
 KPI_COST_MATRIX = "cost_matrix"
 KPI_SCALAR_MATRIX = "scalar_matrix"
+KPI_COST_RANGING = "cost_ranging"
 
 # Flows
 FLOW = "flow"
@@ -222,9 +297,20 @@ PEAK_FLOW = "peak_flow"
 AVERAGE_FLOW = "average_flow"
 TIMESERIES_SOC = "timeseries_soc"
 AVERAGE_SOC = "average_soc"
+# Flows aggregated per period, see E1.aggregate_result_timeseries
+PERIOD_PEAK_FLOW = "period_peak_flow"
+PERIOD_AVERAGE_FLOW = "period_average_flow"
+# Values of RESULT_GRANULARITY
+GRANULARITY_FULL = "full"
+GRANULARITY_HOURLY = "hourly"
+GRANULARITY_DAILY = "daily"
+GRANULARITY_MONTHLY = "monthly"
+GRANULARITY_TOTALS = "totals"
 
 # Capacity
 OPTIMIZED_ADD_CAP = "optimizedAddCap"
+# Peak demand of a pricing period modelled with D2.constraint_peak_demand_pricing
+OPTIMIZED_PEAK_DEMAND = "optimized_peak_demand"
 
 # Costs - Annuities
 ANNUITY_OM = "annuity_om"
@@ -28,7 +28,13 @@ from multi_vector_simulator.utils.constants import (
     TOTAL_EMISSIONS,
 )
 
-from multi_vector_simulator.utils.constants_json_strings import LABEL
+from multi_vector_simulator.utils.constants_json_strings import (
+    LABEL,
+    VALUE,
+    COST_PARAMETER,
+    COST_RANGE_MINIMUM,
+    COST_RANGE_MAXIMUM,
+)
 
 ######################
 # Tab "cost_matrix"  #
@@ -62,6 +68,18 @@ KPI_SCALAR_MATRIX_ENTRIES = [
     AVERAGE_FLOW,
     TOTAL_EMISSIONS,
 ]
+
+#######################
+# Tab "cost_ranging"  #
+#######################
+
+KPI_COST_RANGING_ENTRIES = [
+    LABEL,
+    COST_PARAMETER,
+    VALUE,
+    COST_RANGE_MINIMUM,
+    COST_RANGE_MAXIMUM,
+]
 ##################
 # Tab "scalars"  #
 ##################
@@ -8,6 +8,24 @@ class MVSOemofError(ValueError):
     """Exception raised for missing parameters of a csv input file."""
 
 
+class InfeasibleEnergySystemError(MVSOemofError):
+    """Exception raised if the energy system can be proven infeasible before the optimization"""
+
+    pass
+
+
+class MemoryBudgetExceededError(MVSOemofError):
+    """Exception raised if the linear program can not be solved within the memory budget"""
+
+    pass
+
+
+class UnknownParameterError(ValueError):
+    """Exception raised when an asset has a parameter which is unknown to its record type"""
+
+    pass
+
+
 class WrongOemofAssetForGroupError(ValueError):
     """Exception raised when an asset group has an asset with an denied oemof type"""
 
@@ -66,3 +84,27 @@ class MaximumCapValueInvalid(ValueError):
     """Exception raised if the defined maximum capacity of an asset is invalid"""
 
     pass
+
+
+class JobCancelledError(RuntimeError):
+    """Exception raised when the result of a cancelled simulation job is requested"""
+
+    pass
+
+
+class MVSDaemonError(RuntimeError):
+    """Exception raised when a simulation handed over to the MVS daemon could not be run"""
+
+    pass
+
+
+class MVSQueueError(RuntimeError):
+    """Exception raised when a job of the MVS job queue does not exist or is in the wrong state"""
+
+    pass
+
+
+class InvalidScenarioDeltaError(ValueError):
+    """Exception raised if a scenario delta can not be applied to its base input"""
+
+    pass
@@ -0,0 +1,366 @@
+"""
+Scenario delta
+==============
+
+Input format describing a scenario as the changes of the parameters of a base input, instead of
+a complete copy of the input. A scenario delta is a json file
+
+    {
+        "base": "<path to the base input json file, relative to the delta file>",
+        "base_hash": "<content hash of the base input, optional>",
+        "changes": [
+            {"op": "replace", "path": "energyProduction.pv_plant_01.specific_costs.value",
+             "value": 3000},
+            {"op": "remove", "path": "constraints.maximum_emissions"}
+        ]
+    }
+
+The changes are applied in their order, similar to a JSON patch: "add" sets a value (and creates
+the key), "replace" sets the value of an existing key and "remove" deletes a key. The paths use
+the syntax of `split_nested_path`, either a str of keys separated by `.` or `,`, or a list of
+keys. The base input may itself be a scenario delta. The timeseries referenced by a file name
+are read from the input folder of the simulation, as for any other input json file.
+
+- load_scenario(): read an input json file, resolving it if it is a scenario delta
+  (used by B0.load_json)
+- store_base(): store a base input once in a library folder, under its content hash
+- write_scenario_delta(): write a scenario as the changes from a base input
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+from multi_vector_simulator.utils import split_nested_path
+from multi_vector_simulator.utils.constants_json_strings import (
+    SCENARIO_BASE,
+    SCENARIO_BASE_HASH,
+    SCENARIO_CHANGES,
+    PATCH_OPERATION,
+    PATCH_PATH,
+    PATCH_ADD,
+    PATCH_REPLACE,
+    PATCH_REMOVE,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidScenarioDeltaError
+
+PATCH_OPERATIONS = (PATCH_ADD, PATCH_REPLACE, PATCH_REMOVE)
+# Bases resolved recursively before a scenario delta is considered to reference itself
+MAXIMUM_BASE_DEPTH = 32
+
+
+def _canonical(json_value):
+    """Canonical json representation of a value, e.g. NaN equals NaN and 1 differs from 1.0"""
+    return json.dumps(json_value, sort_keys=True, separators=(",", ":"))
+
+
+def content_hash(json_dict):
+    """Hash of the content of a json dict, independent of the order of its keys
+
+    Parameters
+    ----------
+    json_dict: dict
+        Input which can be serialized to json, i.e. without special types (see
+        B0.convert_from_special_types_to_json)
+
+    Returns
+    -------
+    sha256 hex digest of the canonical json representation of the dict
+    """
+    return hashlib.sha256(_canonical(json_dict).encode("utf-8")).hexdigest()
+
+
+def is_scenario_delta(json_dict):
+    """True if the json dict is a scenario delta, i.e. references a base input"""
+    return (
+        isinstance(json_dict, dict)
+        and SCENARIO_BASE in json_dict
+        and SCENARIO_CHANGES in json_dict
+    )
+
+
+def _path_keys(path):
+    """Tuple of keys of the path of a change, provided as str or list"""
+    if isinstance(path, list):
+        keys = tuple(path)
+    elif isinstance(path, str) and "." not in path and "," not in path:
+        # path to a key of the top level of the input
+        keys = (path,)
+    elif isinstance(path, (str, tuple)):
+        keys = split_nested_path(path)
+    else:
+        raise InvalidScenarioDeltaError(f"Invalid path {path} of a change")
+    if len(keys) == 0 or "" in keys:
+        raise InvalidScenarioDeltaError(f"Invalid path {path} of a change")
+    return keys
+
+
+def _key(container, key):
+    """Key within the container, the keys of lists are the indices of their items"""
+    if isinstance(container, list):
+        try:
+            key = int(key)
+        except ValueError:
+            raise InvalidScenarioDeltaError(
+                f"The key {key} of a list should be the index of one of its items"
+            ) from None
+    return key
+
+
+def apply_changes(json_dict, changes):
+    """Applies the changes of a scenario delta to an input, in their order
+
+    Parameters
+    ----------
+    json_dict: dict
+        Input json dict, updated in place
+
+    changes: list of dict
+        Each change has an operation PATCH_OPERATION (one of PATCH_OPERATIONS), a PATCH_PATH and,
+        except for PATCH_REMOVE, a VALUE
+
+    Returns
+    -------
+    The updated json dict
+
+    Notes
+    -----
+    Tested with:
+    - test_apply_changes()
+    - test_apply_changes_invalid_change()
+    """
+    for change in changes:
+        operation = change.get(PATCH_OPERATION)
+        if operation not in PATCH_OPERATIONS:
+            raise InvalidScenarioDeltaError(
+                f"Unknown operation {operation} of a change, it should be one of "
+                f"{PATCH_OPERATIONS}"
+            )
+        if operation != PATCH_REMOVE and VALUE not in change:
+            raise InvalidScenarioDeltaError(
+                f"The {operation} change of {change.get(PATCH_PATH)} has no {VALUE}"
+            )
+        keys = _path_keys(change.get(PATCH_PATH))
+        container = json_dict
+        try:
+            for key in keys[:-1]:
+                container = container[_key(container, key)]
+            key = _key(container, keys[-1])
+            if operation == PATCH_ADD:
+                if isinstance(container, list) and key == len(container):
+                    container.append(change[VALUE])
+                else:
+                    container[key] = change[VALUE]
+            else:
+                # raises a KeyError or an IndexError if the key does not exist
+                container[key]
+                if operation == PATCH_REPLACE:
+                    container[key] = change[VALUE]
+                else:
+                    del container[key]
+        except (KeyError, IndexError, TypeError):
+            raise InvalidScenarioDeltaError(
+                f"The {operation} change of {change[PATCH_PATH]} can not be applied, the path "
+                f"does not exist in the input"
+            ) from None
+    return json_dict
+
+
+def changes_as_values(changes):
+    """Maps the path of each changed parameter to its new value
+
+    Returns
+    -------
+    dict mapping the path tuple of each added or replaced value to the value (the last one if
+    a path is changed several times), None if one of the changes removes a value
+    """
+    values = {}
+    for change in changes:
+        if change.get(PATCH_OPERATION) == PATCH_REMOVE:
+            return None
+        values[_path_keys(change.get(PATCH_PATH))] = change[VALUE]
+    return values
+
+
+def compute_changes(base, scenario, path=()):
+    """Changes which turn the base input into the scenario input
+
+    Nested dicts are compared key by key, all other values (including lists) are replaced as a
+    whole if they differ.
+
+    Parameters
+    ----------
+    base: dict
+        Base input json dict
+    scenario: dict
+        Scenario input json dict
+    path: tuple
+        Path of the compared dicts within the input
+
+    Returns
+    -------
+    list of changes, to be applied with `apply_changes`
+    """
+    changes = []
+    for key in base:
+        if key not in scenario:
+            changes.append({PATCH_OPERATION: PATCH_REMOVE, PATCH_PATH: path + (key,)})
+    for key, value in scenario.items():
+        if key not in base:
+            changes.append(
+                {PATCH_OPERATION: PATCH_ADD, PATCH_PATH: path + (key,), VALUE: value}
+            )
+        elif isinstance(value, dict) and isinstance(base[key], dict):
+            changes.extend(compute_changes(base[key], value, path + (key,)))
+        elif _canonical(value) != _canonical(base[key]):
+            changes.append(
+                {
+                    PATCH_OPERATION: PATCH_REPLACE,
+                    PATCH_PATH: path + (key,),
+                    VALUE: value,
+                }
+            )
+    if path == ():
+        for change in changes:
+            keys = change[PATCH_PATH]
+            # the keys are joined as str unless one of them contains a separator
+            if all(
+                isinstance(key, str) and "." not in key and "," not in key
+                for key in keys
+            ):
+                change[PATCH_PATH] = ".".join(keys)
+            else:
+                change[PATCH_PATH] = list(keys)
+    return changes
+
+
+def get_base_path(path_delta_file, json_dict):
+    """Path of the base input of a scenario delta, relative paths start at the delta file"""
+    base = json_dict[SCENARIO_BASE]
+    if not os.path.isabs(base):
+        base = os.path.join(os.path.dirname(os.path.abspath(path_delta_file)), base)
+    return os.path.normpath(base)
+
+
+def resolve_scenario_delta(json_dict, path_delta_file, depth=0):
+    """Input described by a scenario delta: its base input with the changes applied
+
+    Parameters
+    ----------
+    json_dict: dict
+        Scenario delta
+    path_delta_file: str
+        Path of the scenario delta file, relative base paths start at its folder
+    depth: int
+        Number of scenario deltas resolved before this one
+
+    Returns
+    -------
+    The input json dict of the scenario
+
+    Notes
+    -----
+    Tested with:
+    - test_load_scenario_delta()
+    - test_load_scenario_delta_of_modified_base()
+    """
+    if depth >= MAXIMUM_BASE_DEPTH:
+        raise InvalidScenarioDeltaError(
+            f"More than {MAXIMUM_BASE_DEPTH} scenario deltas are based on each other, the "
+            f"scenario delta {path_delta_file} probably references itself"
+        )
+    path_base = get_base_path(path_delta_file, json_dict)
+    base = load_scenario(path_base, depth=depth + 1)
+    expected_hash = json_dict.get(SCENARIO_BASE_HASH)
+    if expected_hash is not None and content_hash(base) != expected_hash:
+        raise InvalidScenarioDeltaError(
+            f"The base input {path_base} of the scenario delta {path_delta_file} was modified "
+            f"after the delta was written, its content hash differs from {expected_hash}"
+        )
+    logging.debug(
+        f"Applying {len(json_dict[SCENARIO_CHANGES])} changes of the scenario delta "
+        f"{path_delta_file} to the base input {path_base}"
+    )
+    return apply_changes(base, json_dict[SCENARIO_CHANGES])
+
+
+def load_scenario(path_input_file, depth=0):
+    """Reads an input json file, resolving it if it is a scenario delta
+
+    Returns
+    -------
+    The input json dict
+    """
+    with open(path_input_file) as json_file:
+        json_dict = json.load(json_file)
+    if is_scenario_delta(json_dict):
+        json_dict = resolve_scenario_delta(json_dict, path_input_file, depth=depth)
+    return json_dict
+
+
+def store_base(json_dict, library_folder):
+    """Stores a base input in a library folder under its content hash
+
+    Identical base inputs are stored only once, whatever the scenarios referencing them.
+
+    Parameters
+    ----------
+    json_dict: dict
+        Input json dict, without special types
+    library_folder: str
+        Folder of the base inputs, created if it does not exist
+
+    Returns
+    -------
+    Path of the stored base input, `<library_folder>/<content hash>.json`
+
+    Notes
+    -----
+    Tested with:
+    - test_store_base_deduplicates_identical_inputs()
+    """
+    os.makedirs(library_folder, exist_ok=True)
+    path_base = os.path.join(library_folder, content_hash(json_dict) + ".json")
+    if not os.path.exists(path_base):
+        # written to a temporary file first, so that a base input is never partially written
+        path_temporary = f"{path_base}.{os.getpid()}.tmp"
+        with open(path_temporary, "w") as json_file:
+            json.dump(json_dict, json_file, indent=4)
+        os.replace(path_temporary, path_base)
+        logging.debug(f"Stored the base input {path_base}")
+    return path_base
+
+
+def write_scenario_delta(json_dict, path_base, path_delta_file):
+    """Writes a scenario as the changes from a base input
+
+    Parameters
+    ----------
+    json_dict: dict
+        Input json dict of the scenario, without special types
+    path_base: str
+        Path of the base input json file, which may itself be a scenario delta
+    path_delta_file: str
+        Path of the written scenario delta, it references the base input relative to its folder
+
+    Returns
+    -------
+    The scenario delta, as dict
+
+    Notes
+    -----
+    Tested with:
+    - test_write_scenario_delta()
+    """
+    base = load_scenario(path_base)
+    folder = os.path.dirname(os.path.abspath(path_delta_file))
+    delta = {
+        SCENARIO_BASE: os.path.relpath(os.path.abspath(path_base), folder),
+        SCENARIO_BASE_HASH: content_hash(base),
+        SCENARIO_CHANGES: compute_changes(base, json_dict),
+    }
+    with open(path_delta_file, "w") as json_file:
+        json.dump(delta, json_file, indent=4)
+    return delta
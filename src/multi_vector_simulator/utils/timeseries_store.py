@@ -0,0 +1,222 @@
+"""
+Timeseries store
+================
+
+Central store of the timeseries of dict_values. Every distinct array of values is owned once
+by the store, the assets only hold read-only pandas.Series views on it.
+
+- share_timeseries(): replace all numeric timeseries of dict_values by views on the store
+- TimeseriesStore.to_json() / TimeseriesStore.from_json(): serialize each array only once,
+  the timeseries of dict_values are serialized as references to the store
+  (see B0.convert_from_special_types_to_json and B0.convert_from_json_to_special_types)
+"""
+
+import hashlib
+import logging
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from multi_vector_simulator.utils.constants import (
+    DATA_TYPE_JSON_KEY,
+    TYPE_TIMESERIES_STORE,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    TIMESERIES_STORE,
+    VALUE,
+)
+
+# Kinds of numpy dtypes which are stored: bool, signed and unsigned int and float
+STORED_DTYPE_KINDS = "biuf"
+
+
+class TimeseriesStore(Mapping):
+    """Owns the arrays of values of the timeseries, one array per distinct content
+
+    The store is a read-only mapping from the content key of an array to the array itself.
+    The arrays are not writeable, therefore an in-place modification of a view raises
+    a ValueError instead of silently modifying all the timeseries sharing the array.
+    """
+
+    def __init__(self, arrays=None):
+        self._arrays = {}
+        # Map the id of an owned array to its content key, to identify views in constant time
+        self._keys = {}
+        for key, values in (arrays or {}).items():
+            self._own(key, np.array(values))
+
+    def __getitem__(self, key):
+        return self._arrays[key]
+
+    def __iter__(self):
+        return iter(self._arrays)
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def __deepcopy__(self, memo):
+        # The ids of the copied arrays differ from the ones of the owned arrays
+        return type(self)(arrays=self._arrays)
+
+    @property
+    def nbytes(self):
+        """Memory used by the arrays of the store in bytes"""
+        return sum(values.nbytes for values in self._arrays.values())
+
+    @staticmethod
+    def content_key(values):
+        """Hash of the dtype and of the values of an array
+
+        Parameters
+        ----------
+        values: :numpy:`numpy.ndarray`
+            array of values of a timeseries
+
+        Returns
+        -------
+        str
+            key which is identical for arrays with identical dtype and values
+        """
+        values = np.ascontiguousarray(values)
+        content_hash = hashlib.blake2b(values.dtype.str.encode(), digest_size=8)
+        content_hash.update(values.tobytes())
+        return content_hash.hexdigest()
+
+    def _own(self, key, values):
+        values.flags.writeable = False
+        self._arrays[key] = values
+        self._keys[id(values)] = key
+
+    def key_of(self, timeseries):
+        """Content key of a timeseries if it is a view on an array of the store, None otherwise"""
+        answer = None
+        if isinstance(timeseries, pd.Series):
+            values = timeseries.values
+            key = self._keys.get(id(values))
+            if key is not None and self._arrays[key] is values:
+                answer = key
+        return answer
+
+    def view(self, key, index=None, name=None):
+        """Read-only pandas.Series on the array with the content key `key`"""
+        values = self._arrays[key]
+        if index is None:
+            index = pd.RangeIndex(len(values))
+        return pd.Series(values, index=index, name=name, copy=False)
+
+    def add(self, timeseries):
+        """Store the values of a timeseries, if they are not yet stored, and return a view on them
+
+        Parameters
+        ----------
+        timeseries: :pandas:`pandas.Series<series>`
+            timeseries of dict_values
+
+        Returns
+        -------
+        :pandas:`pandas.Series<series>`
+            read-only view with the index and the name of `timeseries`, or `timeseries` itself
+            if its values are not numeric
+        """
+        answer = timeseries
+        if self.key_of(timeseries) is None and (
+            timeseries.dtype.kind in STORED_DTYPE_KINDS
+        ):
+            values = timeseries.values
+            key = self.content_key(values)
+            if key not in self._arrays:
+                self._own(key, np.array(values, copy=True))
+                answer = self.view(key, timeseries.index, timeseries.name)
+            elif np.array_equal(self._arrays[key], values):
+                answer = self.view(key, timeseries.index, timeseries.name)
+        return answer
+
+    def share(self, dict_values):
+        """Replace all numeric timeseries of dict_values by views on the store
+
+        Arrays of the store which are not used by any timeseries of dict_values anymore are
+        released.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs and results
+
+        Returns
+        -------
+        int
+            Number of bytes saved compared to each timeseries owning a copy of its values
+        """
+        used_keys = set()
+        nbytes = 0
+
+        def share_in(container, keys):
+            nonlocal nbytes
+            for k in keys:
+                item = container[k]
+                if isinstance(item, pd.Series):
+                    container[k] = self.add(item)
+                    key = self.key_of(container[k])
+                    if key is not None:
+                        used_keys.add(key)
+                        nbytes += container[k].values.nbytes
+                elif isinstance(item, dict):
+                    share_in(item, list(item.keys()))
+                elif isinstance(item, list):
+                    share_in(item, range(len(item)))
+
+        share_in(
+            dict_values, [k for k in dict_values.keys() if k != TIMESERIES_STORE],
+        )
+
+        for key in set(self._arrays) - used_keys:
+            del self._keys[id(self._arrays[key])]
+            del self._arrays[key]
+
+        return nbytes - self.nbytes
+
+    def to_json(self):
+        """Json-storable value of the store, each array of values is stored once"""
+        return {
+            DATA_TYPE_JSON_KEY: TYPE_TIMESERIES_STORE,
+            VALUE: {key: values.tolist() for key, values in self._arrays.items()},
+        }
+
+    @classmethod
+    def from_json(cls, a_dict):
+        """Rebuild the store from its json-storable value, see TimeseriesStore.to_json()"""
+        return cls(arrays=a_dict[VALUE])
+
+
+def share_timeseries(dict_values):
+    """Let all the numeric timeseries of dict_values share the arrays of a single store
+
+    The store is created under the TIMESERIES_STORE key of dict_values, if not already existing
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs and results
+
+    Returns
+    -------
+    :class:`TimeseriesStore`
+        store owning the arrays of the timeseries of dict_values
+
+    Notes
+    -----
+    Tested with:
+    - test_share_timeseries_identical_timeseries_share_one_array()
+    - test_share_timeseries_views_are_read_only()
+    - test_share_timeseries_releases_unused_arrays()
+    """
+    if not isinstance(dict_values.get(TIMESERIES_STORE), TimeseriesStore):
+        dict_values[TIMESERIES_STORE] = TimeseriesStore()
+    timeseries_store = dict_values[TIMESERIES_STORE]
+    nbytes = timeseries_store.share(dict_values)
+    logging.debug(
+        f"{len(timeseries_store)} distinct timeseries are stored in {timeseries_store.nbytes} bytes, "
+        f"sharing the arrays saves {nbytes} bytes."
+    )
+    return timeseries_store
@@ -0,0 +1,20 @@
+import json
+import os
+
+import pytest
+
+from multi_vector_simulator.utils.data_parser import convert_epa_params_to_mvs
+
+from _constants import TEST_REPO_PATH, BENCHMARK_TEST_INPUT_FOLDER
+
+EPA_BENCHMARK = os.path.join(
+    TEST_REPO_PATH, BENCHMARK_TEST_INPUT_FOLDER, "epa_benchmark.json"
+)
+
+
+@pytest.fixture
+def json_input():
+    """Input json of the EPA benchmark, as received by the server"""
+    with open(EPA_BENCHMARK) as json_file:
+        epa_dict = json.load(json_file)
+    return convert_epa_params_to_mvs(epa_dict)
@@ -1,3 +1,4 @@
+import logging
 import os
 import shutil
 
@@ -18,7 +19,9 @@ from multi_vector_simulator.utils.constants_json_strings import (
     END_DATE,
     TIME_INDEX,
     PERIODS,
+    TIMESERIES_STORE,
 )
+from multi_vector_simulator.utils.timeseries_store import TimeseriesStore
 from _constants import (
     JSON_PATH,
     CSV_PATH,
@@ -210,3 +213,35 @@ class TestConversionJsonToPythonTypes:
             in log_msg[2]
         )
         assert (pd_series["series"].values == self.test_result_series.values).all()
+
+
+def test_convert_from_json_to_special_types_parse_pandas_series_aggregated_to_periods(
+    caplog,
+):
+    time_index = pd.date_range(start="2018-01-01", periods=48, freq="H")
+    period_index = pd.date_range(start="2018-01-01", periods=2, freq="D")
+    test_dict = {"series": {DATA_TYPE_JSON_KEY: TYPE_SERIES, VALUE: [24, 48]}}
+    with caplog.at_level(logging.WARNING):
+        dict_values = B0.convert_from_json_to_special_types(
+            test_dict, time_index=time_index, period_index=period_index
+        )
+    assert caplog.text == ""
+    assert dict_values["series"].index.equals(period_index)
+
+
+def test_convert_from_json_to_special_types_parse_pandas_series_referencing_timeseries_store():
+    time_index = pd.date_range(start="2018-01-01", periods=4, freq="1D")
+    timeseries = pd.Series([1, 2, 3, 4], index=time_index)
+    timeseries_store = TimeseriesStore()
+    key = timeseries_store.key_of(timeseries_store.add(timeseries))
+    test_dict = {
+        "series": {DATA_TYPE_JSON_KEY: TYPE_SERIES, TIMESERIES_STORE: key},
+        "nested": {"series": {DATA_TYPE_JSON_KEY: TYPE_SERIES, TIMESERIES_STORE: key}},
+        TIMESERIES_STORE: timeseries_store.to_json(),
+    }
+    dict_values = B0.convert_from_json_to_special_types(
+        test_dict, time_index=time_index
+    )
+    assert isinstance(dict_values[TIMESERIES_STORE], TimeseriesStore)
+    assert dict_values["series"].equals(timeseries)
+    assert dict_values["series"].values is dict_values["nested"]["series"].values
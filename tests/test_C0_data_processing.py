@@ -4,9 +4,12 @@ import numpy as np
 import pytest
 import logging
 import copy
+import json
 from copy import deepcopy
 
 import multi_vector_simulator.C0_data_processing as C0
+from multi_vector_simulator.B0_data_input_json import convert_from_json_to_special_types
+from multi_vector_simulator.utils.data_parser import convert_epa_params_to_mvs
 
 from multi_vector_simulator.utils.constants import (
     TYPE_BOOL,
@@ -22,6 +25,8 @@ from multi_vector_simulator.utils.constants_json_strings import (
     ENERGY_CONSUMPTION,
     ENERGY_PRODUCTION,
     ENERGY_CONVERSION,
+    CONNECTED_CONSUMPTION_SOURCE,
+    PEAK_DEMAND_PRICING_CONSTRAINT,
     ENERGY_BUSSES,
     PROJECT_DURATION,
     DISCOUNTFACTOR,
@@ -96,7 +101,11 @@ from multi_vector_simulator.utils.exceptions import InvalidPeakDemandPricingPeri
 
 from multi_vector_simulator.version import version_num
 
-from _constants import TEST_REPO_PATH, TEST_INPUT_DIRECTORY
+from _constants import (
+    TEST_REPO_PATH,
+    TEST_INPUT_DIRECTORY,
+    BENCHMARK_TEST_INPUT_FOLDER,
+)
 
 
 def test_add_economic_parameters():
@@ -253,6 +262,42 @@ def test_define_transformer_for_peak_demand_pricing():
     ), f"The {SPECIFIC_COSTS_OM} of the newly defined {transformer_name} is not equal to the {PEAK_DEMAND_PRICING} of the energy provider it is defined from."
 
 
+def test_define_transformer_for_peak_demand_pricing_constraint():
+    dict_test = {
+        ENERGY_CONVERSION: {},
+        ENERGY_PROVIDERS: {
+            "dso": {
+                LABEL: "a_label",
+                INFLOW_DIRECTION: "a_direction",
+                OUTFLOW_DIRECTION: "b_direction",
+                PEAK_DEMAND_PRICING: {VALUE: 60},
+                UNIT: "unit",
+                ENERGY_VECTOR: "a_vector",
+            }
+        },
+    }
+    dict_test_dso = dict_test[ENERGY_PROVIDERS]["dso"].copy()
+    transformer_name = "a_name"
+    timeseries_availability = pd.Series()
+    C0.define_transformer_for_peak_demand_pricing(
+        dict_test,
+        dict_test_dso,
+        transformer_name,
+        timeseries_availability,
+        peak_demand_pricing_constraint=True,
+    )
+    transformer = dict_test[ENERGY_CONVERSION][transformer_name]
+    assert (
+        transformer[PEAK_DEMAND_PRICING_CONSTRAINT] is True
+    ), f"The {transformer_name} is not marked to be modelled by the peak demand pricing constraint."
+    assert (
+        transformer[INFLOW_DIRECTION] == transformer[OUTFLOW_DIRECTION] == "b_direction"
+    ), f"The {transformer_name} should only be connected to the outflow bus of the energy provider."
+    assert (
+        transformer[CONNECTED_CONSUMPTION_SOURCE] == "a_label" + DSO_CONSUMPTION
+    ), f"The consumption source of the energy provider is not connected to the {transformer_name}."
+
+
 def test_define_energy_vectors_from_busses():
     bus_name = "a_bus"
     bus_label = bus_name + "label"
@@ -1362,3 +1407,71 @@ def test_defined_energyBusses_complete():
 def test_verification_executing_C1():
     assert 1 == 0
 """
+
+
+def benchmark_input():
+    with open(
+        os.path.join(TEST_REPO_PATH, BENCHMARK_TEST_INPUT_FOLDER, "epa_benchmark.json")
+    ) as json_file:
+        epa_dict = json.load(json_file)
+    return convert_from_json_to_special_types(convert_epa_params_to_mvs(epa_dict))
+
+
+def test_apply_parameter_changes_cost_parameter():
+    path = (ENERGY_PRODUCTION, "pv_plant_01", SPECIFIC_COSTS_OM, VALUE)
+    dict_values = benchmark_input()
+    C0.process_input_data(dict_values)
+    assert C0.apply_parameter_changes(dict_values, {path: 50}) is True
+    expected = benchmark_input()
+    expected[ENERGY_PRODUCTION]["pv_plant_01"][SPECIFIC_COSTS_OM][VALUE] = 50
+    C0.process_input_data(expected)
+    for parameter in (ANNUITY_SPECIFIC_INVESTMENT_AND_OM, SIMULATION_ANNUITY):
+        assert (
+            dict_values[ENERGY_PRODUCTION]["pv_plant_01"][parameter]
+            == expected[ENERGY_PRODUCTION]["pv_plant_01"][parameter]
+        )
+
+
+def test_apply_parameter_changes_capacity_parameter():
+    timeseries_peak = 0.8
+    dict_values = {
+        ENERGY_PRODUCTION: {
+            asset: {
+                LABEL: asset,
+                UNIT: unit,
+                INSTALLED_CAP: {VALUE: installed_cap},
+                MAXIMUM_CAP: {VALUE: 100},
+                FILENAME: "a_name",
+                TIMESERIES_PEAK: {VALUE: timeseries_peak},
+            }
+        }
+    }
+    C0.process_maximum_cap_constraint(dict_values, ENERGY_PRODUCTION, asset)
+    changes = {
+        (ENERGY_PRODUCTION, asset, INSTALLED_CAP, VALUE): 20,
+        (ENERGY_PRODUCTION, asset, MAXIMUM_CAP, VALUE): None,
+    }
+    assert C0.apply_parameter_changes(dict_values, changes) is True
+    asset_dict = dict_values[ENERGY_PRODUCTION][asset]
+    assert asset_dict[INSTALLED_CAP_NORMALIZED][VALUE] == 20 * timeseries_peak
+    assert asset_dict[MAXIMUM_CAP][VALUE] is None
+    assert MAXIMUM_CAP_NORMALIZED not in asset_dict
+    assert MAXIMUM_ADD_CAP_NORMALIZED not in asset_dict
+
+
+def test_apply_parameter_changes_unsupported_change():
+    dict_values = benchmark_input()
+    C0.process_input_data(dict_values)
+    expected = deepcopy(dict_values)
+    changes = {
+        (ENERGY_PRODUCTION, "pv_plant_01", SPECIFIC_COSTS_OM, VALUE): 50,
+        (ECONOMIC_DATA, DISCOUNTFACTOR, VALUE): 0.1,
+    }
+    assert C0.apply_parameter_changes(dict_values, changes) is False
+    changes = {(ENERGY_PRODUCTION, "pv_plant_01", TIMESERIES): pd.Series([1, 2])}
+    assert C0.apply_parameter_changes(dict_values, changes) is False
+    assert (
+        dict_values[ENERGY_PRODUCTION]["pv_plant_01"][SPECIFIC_COSTS_OM]
+        == expected[ENERGY_PRODUCTION]["pv_plant_01"][SPECIFIC_COSTS_OM]
+    )
+    assert dict_values[ECONOMIC_DATA] == expected[ECONOMIC_DATA]
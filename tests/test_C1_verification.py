@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import pandas as pd
 import os
 import json
@@ -888,3 +889,258 @@ def test_check_energy_system_can_fulfill_max_demand_fails_mvs_runthrough(caplog)
 # def test_all_valid_intervals():
 #     pass
 #     # todo note: function is not used so far
+
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    TIME_INDEX,
+    TIMESTEP,
+    FEASIBILITY_SCREENING,
+    INFLOW_DIRECTION,
+    INPUT_POWER,
+    THERM_LOSSES_REL,
+    THERM_LOSSES_ABS,
+    MAXIMUM_ADD_CAP,
+    TIMESERIES_NORMALIZED,
+    MINIMAL_RENEWABLE_FACTOR,
+    NET_ZERO_ENERGY,
+)
+from multi_vector_simulator.utils.exceptions import InfeasibleEnergySystemError
+
+
+def dict_values_feasibility(pv_capacity=10, energy_provider=True):
+    """Electricity bus with a demand, a pv plant and optionally a consumption source of an energy provider"""
+    time_index = pd.date_range("2021-01-01", periods=4, freq="H")
+    dict_values = {
+        SIMULATION_SETTINGS: {TIME_INDEX: time_index, TIMESTEP: {VALUE: 60}},
+        CONSTRAINTS: {
+            MINIMAL_RENEWABLE_FACTOR: {VALUE: 0},
+            MAXIMUM_EMISSIONS: {VALUE: None},
+            NET_ZERO_ENERGY: {VALUE: False},
+        },
+        ENERGY_BUSSES: {
+            "Electricity": {LABEL: "Electricity", ENERGY_VECTOR: "Electricity"}
+        },
+        ENERGY_CONSUMPTION: {
+            "demand": {
+                LABEL: "demand",
+                INFLOW_DIRECTION: "Electricity",
+                TIMESERIES: pd.Series([1, 2, 3, 4], index=time_index),
+            }
+        },
+        ENERGY_PRODUCTION: {
+            "pv": {
+                LABEL: "pv",
+                OUTFLOW_DIRECTION: "Electricity",
+                DISPATCHABILITY: False,
+                OPTIMIZE_CAP: {VALUE: False},
+                INSTALLED_CAP: {VALUE: pv_capacity},
+                TIMESERIES: pd.Series([0.5, 0.5, 0, 0], index=time_index),
+                RENEWABLE_ASSET_BOOL: {VALUE: True},
+                EMISSION_FACTOR: {VALUE: 0},
+            }
+        },
+        ENERGY_CONVERSION: {},
+        ENERGY_STORAGE: {},
+        ENERGY_PROVIDERS: {},
+    }
+    if energy_provider is True:
+        dict_values[ENERGY_PROVIDERS].update(
+            {"DSO": {LABEL: "DSO", RENEWABLE_SHARE_DSO: {VALUE: 0}}}
+        )
+        dict_values[ENERGY_PRODUCTION].update(
+            {
+                "DSO_consumption": {
+                    LABEL: "DSO_consumption",
+                    OUTFLOW_DIRECTION: "Electricity",
+                    DISPATCHABILITY: True,
+                    OPTIMIZE_CAP: {VALUE: True},
+                    INSTALLED_CAP: {VALUE: 0},
+                    MAXIMUM_ADD_CAP: {VALUE: None},
+                    EMISSION_FACTOR: {VALUE: 0.5},
+                }
+            }
+        )
+    return dict_values
+
+
+def battery(output_power=10):
+    return {
+        LABEL: "battery",
+        INFLOW_DIRECTION: "Electricity",
+        OUTFLOW_DIRECTION: "Electricity",
+        OPTIMIZE_CAP: {VALUE: False},
+        INPUT_POWER: {INSTALLED_CAP: {VALUE: 10}, EFFICIENCY: {VALUE: 0.9}},
+        OUTPUT_POWER: {INSTALLED_CAP: {VALUE: output_power}, EFFICIENCY: {VALUE: 0.9}},
+        STORAGE_CAPACITY: {
+            INSTALLED_CAP: {VALUE: 100},
+            EFFICIENCY: {VALUE: 1},
+            THERM_LOSSES_REL: {VALUE: 0},
+            THERM_LOSSES_ABS: {VALUE: 0},
+        },
+    }
+
+
+def test_get_bounds_of_source_flow_non_dispatchable():
+    dict_asset = {
+        OPTIMIZE_CAP: {VALUE: True},
+        INSTALLED_CAP: {VALUE: 2},
+        MAXIMUM_ADD_CAP: {VALUE: None},
+        TIMESERIES_NORMALIZED: pd.Series([0, 0.5, 1]),
+    }
+    lower_bound, upper_bound = C1.get_bounds_of_source_flow(dict_asset, 3)
+    assert list(lower_bound) == [0, 1, 2]
+    assert list(upper_bound) == [
+        0,
+        np.inf,
+        np.inf,
+    ], f"The flow of a non-dispatchable source without maximum capacity should only be limited if its timeseries is 0."
+
+
+def test_get_bounds_of_source_flow_dispatchable():
+    dict_asset = {
+        DISPATCHABILITY: True,
+        OPTIMIZE_CAP: {VALUE: True},
+        INSTALLED_CAP: {VALUE: 2},
+        MAXIMUM_ADD_CAP: {VALUE: 3},
+    }
+    lower_bound, upper_bound = C1.get_bounds_of_source_flow(dict_asset, 3)
+    assert list(lower_bound) == [0, 0, 0]
+    assert list(upper_bound) == [5, 5, 5]
+    dict_asset.update({OPTIMIZE_CAP: {VALUE: False}})
+    lower_bound, upper_bound = C1.get_bounds_of_source_flow(dict_asset, 3)
+    assert (
+        list(upper_bound) == [np.inf] * 3
+    ), f"The flow of a dispatchable source with a fixed capacity is not limited in D1."
+
+
+def test_get_bounds_of_energy_system_conversion():
+    dict_values = dict_values_feasibility(pv_capacity=0, energy_provider=False)
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    dict_values[ENERGY_BUSSES].update({"Heat": {LABEL: "Heat", ENERGY_VECTOR: "Heat"}})
+    dict_values[ENERGY_CONSUMPTION].update(
+        {
+            "heat_demand": {
+                LABEL: "heat_demand",
+                INFLOW_DIRECTION: "Heat",
+                TIMESERIES: pd.Series([1, 1, 1, 1], index=time_index),
+            }
+        }
+    )
+    dict_values[ENERGY_PRODUCTION].update(
+        {
+            "heat": {
+                LABEL: "heat",
+                OUTFLOW_DIRECTION: "Heat",
+                DISPATCHABILITY: True,
+                OPTIMIZE_CAP: {VALUE: True},
+                INSTALLED_CAP: {VALUE: 4},
+                MAXIMUM_ADD_CAP: {VALUE: 0},
+            }
+        }
+    )
+    dict_values[ENERGY_CONVERSION].update(
+        {
+            "generator": {
+                LABEL: "generator",
+                INFLOW_DIRECTION: "Heat",
+                OUTFLOW_DIRECTION: "Electricity",
+                OPTIMIZE_CAP: {VALUE: False},
+                INSTALLED_CAP: {VALUE: 10},
+                EFFICIENCY: {VALUE: 0.5},
+            }
+        }
+    )
+    bounds = C1.get_bounds_of_energy_system(dict_values)
+    assert bounds["busses"] == ["Electricity", "Heat"]
+    assert (
+        list(bounds["supply"][0]) == [1.5] * 4
+    ), f"The supply of the generator should be limited by the heat that is not needed for the heat demand, multiplied with its efficiency."
+    assert bounds["dissipative"] is True
+
+
+def test_get_bounds_of_energy_system_storage():
+    dict_values = dict_values_feasibility(energy_provider=False)
+    dict_values[ENERGY_STORAGE].update({"battery": battery()})
+    bounds = C1.get_bounds_of_energy_system(dict_values)
+    assert list(bounds["supply"][0]) == [15, 15, 10, 10]
+    assert list(bounds["supply_without_storage"][0]) == [5, 5, 0, 0]
+    assert bounds["storage_round_trip_efficiency"][0] == pytest.approx(0.81)
+
+
+def test_check_feasibility_of_energy_system_feasible():
+    C1.check_feasibility_of_energy_system(dict_values_feasibility())
+
+
+def test_check_feasibility_of_energy_system_not_applied():
+    dict_values = dict_values_feasibility(energy_provider=False)
+    dict_values[SIMULATION_SETTINGS].update({FEASIBILITY_SCREENING: {VALUE: False}})
+    C1.check_feasibility_of_energy_system(dict_values)
+
+
+def test_check_feasibility_of_energy_system_insufficient_supply():
+    dict_values = dict_values_feasibility(energy_provider=False)
+    with pytest.raises(InfeasibleEnergySystemError, match="first in timestep 2"):
+        C1.check_feasibility_of_energy_system(dict_values)
+
+
+def test_check_feasibility_of_energy_system_insufficient_storage():
+    dict_values = dict_values_feasibility(energy_provider=False)
+    dict_values[ENERGY_STORAGE].update({"battery": battery()})
+    # The pv surplus of 4 + 3 can not cover the later demand of 3 + 4 with storage losses
+    with pytest.raises(
+        InfeasibleEnergySystemError, match="storages of bus Electricity"
+    ):
+        C1.check_feasibility_of_energy_system(dict_values)
+    dict_values = dict_values_feasibility(pv_capacity=20, energy_provider=False)
+    dict_values[ENERGY_STORAGE].update({"battery": battery()})
+    C1.check_feasibility_of_energy_system(dict_values)
+
+
+def test_check_feasibility_of_energy_system_minimal_renewable_factor():
+    dict_values = dict_values_feasibility()
+    dict_values[CONSTRAINTS].update({MINIMAL_RENEWABLE_FACTOR: {VALUE: 0.9}})
+    C1.check_feasibility_of_energy_system(dict_values)
+    dict_values = dict_values_feasibility(pv_capacity=5)
+    dict_values[CONSTRAINTS].update({MINIMAL_RENEWABLE_FACTOR: {VALUE: 0.9}})
+    with pytest.raises(InfeasibleEnergySystemError, match="minimal renewable factor"):
+        C1.check_feasibility_of_energy_system(dict_values)
+
+
+def test_check_feasibility_of_energy_system_maximum_emissions():
+    dict_values = dict_values_feasibility()
+    dict_values[ENERGY_PRODUCTION]["pv"].update({EMISSION_FACTOR: {VALUE: 1}})
+    dict_values[CONSTRAINTS].update({MAXIMUM_EMISSIONS: {VALUE: 10}})
+    C1.check_feasibility_of_energy_system(dict_values)
+    dict_values[CONSTRAINTS].update({MAXIMUM_EMISSIONS: {VALUE: 9}})
+    with pytest.raises(InfeasibleEnergySystemError, match="maximum emissions"):
+        C1.check_feasibility_of_energy_system(dict_values)
+
+
+def test_check_feasibility_of_energy_system_net_zero_energy():
+    dict_values = dict_values_feasibility()
+    dict_values[CONSTRAINTS].update({NET_ZERO_ENERGY: {VALUE: True}})
+    C1.check_feasibility_of_energy_system(dict_values)
+    dict_values = dict_values_feasibility(pv_capacity=5)
+    dict_values[CONSTRAINTS].update({NET_ZERO_ENERGY: {VALUE: True}})
+    with pytest.raises(InfeasibleEnergySystemError, match="net zero energy"):
+        C1.check_feasibility_of_energy_system(dict_values)
+
+
+@mock.patch("argparse.ArgumentParser.parse_args", return_value=argparse.Namespace())
+def test_check_feasibility_of_energy_system_fails_mvs_runthrough(margs):
+    TEST_INPUT_PATH = os.path.join(TEST_REPO_PATH, BENCHMARK_TEST_INPUT_FOLDER)
+    TEST_OUTPUT_PATH = os.path.join(TEST_REPO_PATH, BENCHMARK_TEST_OUTPUT_FOLDER)
+    use_case = "validity_check_insufficient_capacities"
+    with pytest.raises(
+        InfeasibleEnergySystemError,
+        match="The demand of bus Electricity can not be supplied",
+    ):
+        main(
+            overwrite=True,
+            display_output="warning",
+            path_input_folder=os.path.join(TEST_INPUT_PATH, use_case),
+            input_type=CSV_EXT,
+            path_output_folder=os.path.join(TEST_OUTPUT_PATH, use_case),
+        )
+    shutil.rmtree(TEST_OUTPUT_PATH, ignore_errors=True)
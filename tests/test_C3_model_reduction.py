@@ -0,0 +1,316 @@
+from copy import deepcopy
+
+import pandas as pd
+
+import multi_vector_simulator.C3_model_reduction as C3
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    VALUE,
+    LABEL,
+    SIMULATION_SETTINGS,
+    CONSTRAINTS,
+    ENERGY_BUSSES,
+    ENERGY_VECTOR,
+    ENERGY_CONVERSION,
+    ENERGY_PRODUCTION,
+    ENERGY_CONSUMPTION,
+    ENERGY_STORAGE,
+    INFLOW_DIRECTION,
+    OUTFLOW_DIRECTION,
+    EXCESS_SINK,
+    DISPATCHABILITY,
+    DISPATCH_PRICE,
+    INSTALLED_CAP,
+    OPTIMIZE_CAP,
+    MAXIMUM_ADD_CAP,
+    SIMULATION_ANNUITY,
+    EFFICIENCY,
+    TIMESERIES,
+    OEMOF_ASSET_TYPE,
+    OEMOF_TRANSFORMER,
+    OEMOF_SOURCE,
+    OEMOF_SINK,
+    MINIMAL_RENEWABLE_FACTOR,
+    MODEL_REDUCTION,
+    REDUCED_MODEL,
+    REMOVED_ASSETS,
+    MERGED_BUSSES,
+    KEPT_BUS,
+    PASS_THROUGH_TRANSFORMER,
+    AGGREGATED_ASSETS,
+)
+
+ELECTRICITY = "Electricity"
+DSO_BUS = "Electricity (DSO)"
+DSO_PDP_BUS = "Electricity (DSO)_pdp"
+DSO_SOURCE = "DSO_consumption"
+PDP_TRANSFORMER = "DSO_consumption_period"
+TRANSFORMER_STATION = "transformer_station"
+TIMESERIES_INDEX = pd.date_range("2021-01-01", periods=3, freq="H")
+
+
+def transformer(inflow_direction, outflow_direction, efficiency=1):
+    return {
+        LABEL: inflow_direction + outflow_direction,
+        OEMOF_ASSET_TYPE: OEMOF_TRANSFORMER,
+        INFLOW_DIRECTION: inflow_direction,
+        OUTFLOW_DIRECTION: outflow_direction,
+        EFFICIENCY: {VALUE: efficiency},
+        DISPATCH_PRICE: {VALUE: 0},
+        SIMULATION_ANNUITY: {VALUE: 0},
+        OPTIMIZE_CAP: {VALUE: True},
+        MAXIMUM_ADD_CAP: {VALUE: None},
+        INSTALLED_CAP: {VALUE: 0},
+    }
+
+
+def sink(inflow_direction, timeseries=None):
+    dict_asset = {
+        OEMOF_ASSET_TYPE: OEMOF_SINK,
+        INFLOW_DIRECTION: inflow_direction,
+        DISPATCHABILITY: {VALUE: timeseries is None},
+    }
+    if timeseries is not None:
+        dict_asset.update({TIMESERIES: pd.Series(timeseries, index=TIMESERIES_INDEX)})
+    return dict_asset
+
+
+DICT_VALUES = {
+    SIMULATION_SETTINGS: {
+        MODEL_REDUCTION: {VALUE: True},
+        EXCESS_SINK: [DSO_BUS + EXCESS_SINK, ELECTRICITY + EXCESS_SINK],
+    },
+    CONSTRAINTS: {MINIMAL_RENEWABLE_FACTOR: {VALUE: 0}},
+    ENERGY_BUSSES: {
+        bus: {LABEL: bus, ENERGY_VECTOR: ELECTRICITY}
+        for bus in [ELECTRICITY, DSO_BUS, DSO_PDP_BUS]
+    },
+    ENERGY_PRODUCTION: {
+        DSO_SOURCE: {
+            OEMOF_ASSET_TYPE: OEMOF_SOURCE,
+            OUTFLOW_DIRECTION: DSO_PDP_BUS,
+            DISPATCHABILITY: True,
+            DISPATCH_PRICE: {VALUE: 0.3},
+            OPTIMIZE_CAP: {VALUE: True},
+            INSTALLED_CAP: {VALUE: 0},
+        },
+        "pv": {
+            OEMOF_ASSET_TYPE: OEMOF_SOURCE,
+            OUTFLOW_DIRECTION: ELECTRICITY,
+            DISPATCHABILITY: False,
+            TIMESERIES: pd.Series([0, 0.5, 0], index=TIMESERIES_INDEX),
+            OPTIMIZE_CAP: {VALUE: False},
+            INSTALLED_CAP: {VALUE: 0},
+        },
+    },
+    ENERGY_CONVERSION: {
+        PDP_TRANSFORMER: transformer(DSO_PDP_BUS, DSO_BUS),
+        TRANSFORMER_STATION: transformer(DSO_BUS, ELECTRICITY, efficiency=0.96),
+    },
+    ENERGY_CONSUMPTION: {
+        "demand": sink(ELECTRICITY, [1, 2, 3]),
+        "demand_zero": sink(ELECTRICITY, [0, 0, 0]),
+        DSO_BUS + EXCESS_SINK: sink(DSO_BUS),
+        ELECTRICITY + EXCESS_SINK: sink(ELECTRICITY),
+    },
+    ENERGY_STORAGE: {},
+}
+
+
+def dict_values_to_reduce():
+    dict_values = deepcopy(DICT_VALUES)
+    dict_values.update(
+        {REDUCED_MODEL: {REMOVED_ASSETS: {}, MERGED_BUSSES: {}, AGGREGATED_ASSETS: {}}}
+    )
+    return dict_values
+
+
+def test_reduce_energy_system_model_not_applied():
+    dict_values = deepcopy(DICT_VALUES)
+    dict_values[SIMULATION_SETTINGS][MODEL_REDUCTION][VALUE] = False
+    reduced_model = C3.reduce_energy_system_model(dict_values)
+    assert (
+        reduced_model is None
+    ), f"The model should not be reduced if {MODEL_REDUCTION} is False."
+    assert (
+        REDUCED_MODEL not in dict_values
+    ), f"No {REDUCED_MODEL} should be added to dict_values if the model is not reduced."
+
+
+def test_reduce_energy_system_model_dso_busses_merged():
+    dict_values = deepcopy(DICT_VALUES)
+    reduced_model = C3.reduce_energy_system_model(dict_values)
+    assert reduced_model is dict_values[REDUCED_MODEL]
+    assert reduced_model[MERGED_BUSSES] == {
+        DSO_PDP_BUS: {KEPT_BUS: DSO_BUS, PASS_THROUGH_TRANSFORMER: PDP_TRANSFORMER}
+    }, f"The peak demand pricing bus should be merged into the bus of the energy provider, but the merged busses are {reduced_model[MERGED_BUSSES]}."
+    assert sorted(reduced_model[REMOVED_ASSETS]) == sorted(
+        [PDP_TRANSFORMER, "pv", "demand_zero", DSO_BUS + EXCESS_SINK]
+    ), f"The removed assets are {list(reduced_model[REMOVED_ASSETS])}."
+    assert (
+        reduced_model[REMOVED_ASSETS][DSO_BUS + EXCESS_SINK] == C3.NO_SURPLUS
+    ), f"The excess sink of the energy provider bus should be removed once the busses are merged, as the bus is then only supplied by the consumption source."
+
+
+def test_get_reason_for_removal_zero_capacity():
+    dict_asset = DICT_VALUES[ENERGY_PRODUCTION]["pv"]
+    assert C3.get_reason_for_removal(dict_asset, ENERGY_PRODUCTION) == C3.ZERO_CAPACITY
+
+
+def test_get_reason_for_removal_zero_timeseries():
+    dict_asset = DICT_VALUES[ENERGY_CONSUMPTION]["demand_zero"]
+    assert (
+        C3.get_reason_for_removal(dict_asset, ENERGY_CONSUMPTION) == C3.ZERO_TIMESERIES
+    )
+    dict_asset = DICT_VALUES[ENERGY_CONSUMPTION]["demand"]
+    assert C3.get_reason_for_removal(dict_asset, ENERGY_CONSUMPTION) is None
+
+
+def test_get_reason_for_removal_dispatchable_source():
+    dict_asset = deepcopy(DICT_VALUES[ENERGY_PRODUCTION][DSO_SOURCE])
+    dict_asset[OPTIMIZE_CAP][VALUE] = False
+    assert (
+        C3.get_reason_for_removal(dict_asset, ENERGY_PRODUCTION) is None
+    ), f"A dispatchable source should not be removed, as its installed capacity does not bound its flow."
+
+
+def test_remove_excess_sinks_without_surplus():
+    dict_values = dict_values_to_reduce()
+    dict_values[ENERGY_PRODUCTION][DSO_SOURCE][OUTFLOW_DIRECTION] = DSO_BUS
+    dict_values[ENERGY_CONVERSION].pop(PDP_TRANSFORMER)
+    assert C3.remove_excess_sinks_without_surplus(dict_values) is True
+    assert list(dict_values[REDUCED_MODEL][REMOVED_ASSETS]) == [DSO_BUS + EXCESS_SINK]
+
+    dict_values = dict_values_to_reduce()
+    dict_values[ENERGY_PRODUCTION][DSO_SOURCE][OUTFLOW_DIRECTION] = DSO_BUS
+    dict_values[ENERGY_CONVERSION].pop(PDP_TRANSFORMER)
+    dict_values[CONSTRAINTS][MINIMAL_RENEWABLE_FACTOR][VALUE] = 0.5
+    assert (
+        C3.remove_excess_sinks_without_surplus(dict_values) is False
+    ), f"No excess sink should be removed if the {MINIMAL_RENEWABLE_FACTOR} constraint is applied."
+
+
+def test_remove_excess_sinks_without_surplus_non_dispatchable_source():
+    dict_values = dict_values_to_reduce()
+    dict_values[ENERGY_PRODUCTION][DSO_SOURCE][OUTFLOW_DIRECTION] = ELECTRICITY
+    dict_values[ENERGY_CONVERSION].pop(TRANSFORMER_STATION)
+    dict_values[ENERGY_PRODUCTION]["pv"][INSTALLED_CAP][VALUE] = 10
+    assert (
+        C3.remove_excess_sinks_without_surplus(dict_values) is False
+    ), f"The excess sink of a bus supplied by a non-dispatchable source should not be removed."
+
+
+def test_is_lossless_pass_through():
+    assert (
+        C3.is_lossless_pass_through(DICT_VALUES[ENERGY_CONVERSION][PDP_TRANSFORMER])
+        is True
+    )
+
+
+def test_is_lossless_pass_through_with_losses():
+    assert (
+        C3.is_lossless_pass_through(DICT_VALUES[ENERGY_CONVERSION][TRANSFORMER_STATION])
+        is False
+    )
+    dict_asset = deepcopy(DICT_VALUES[ENERGY_CONVERSION][PDP_TRANSFORMER])
+    dict_asset[SIMULATION_ANNUITY][VALUE] = 10
+    assert (
+        C3.is_lossless_pass_through(dict_asset) is False
+    ), f"A transformer with capacity costs is not a lossless pass-through."
+
+
+def test_merge_lossless_pass_through_busses():
+    dict_values = dict_values_to_reduce()
+    assert C3.merge_lossless_pass_through_busses(dict_values) is True
+    assert C3.model_bus(dict_values, DSO_PDP_BUS) == DSO_BUS
+    supplying_assets, supplied_assets = C3.get_connected_assets(dict_values)
+    assert supplying_assets[DSO_BUS] == [
+        DSO_SOURCE
+    ], f"The consumption source should supply the bus it is merged into."
+
+
+def test_merge_lossless_pass_through_busses_different_energy_vectors():
+    dict_values = dict_values_to_reduce()
+    dict_values[ENERGY_BUSSES][DSO_PDP_BUS][ENERGY_VECTOR] = "Heat"
+    assert C3.merge_lossless_pass_through_busses(dict_values) is False
+    assert dict_values[REDUCED_MODEL][MERGED_BUSSES] == {}
+
+
+def dict_values_with_duplicates():
+    dict_values = dict_values_to_reduce()
+    pv = dict_values[ENERGY_PRODUCTION]["pv"]
+    pv.update(
+        {
+            OPTIMIZE_CAP: {VALUE: True},
+            MAXIMUM_ADD_CAP: {VALUE: None},
+            SIMULATION_ANNUITY: {VALUE: 50},
+            DISPATCH_PRICE: {VALUE: 0},
+        }
+    )
+    pv_scaled = deepcopy(pv)
+    pv_scaled[INSTALLED_CAP][VALUE] = 20
+    dict_values[ENERGY_PRODUCTION].update({"pv_scaled": pv_scaled})
+    dict_values[ENERGY_CONSUMPTION].update(
+        {"demand_scaled": sink(ELECTRICITY, [2, 4, 6])}
+    )
+    return dict_values
+
+
+def test_get_aggregation_key_sources():
+    dict_values = dict_values_with_duplicates()
+    key = C3.get_aggregation_key(
+        dict_values, "pv", dict_values[ENERGY_PRODUCTION]["pv"], ENERGY_PRODUCTION
+    )
+    assert key is not None
+    assert key == C3.get_aggregation_key(
+        dict_values,
+        "pv_scaled",
+        dict_values[ENERGY_PRODUCTION]["pv_scaled"],
+        ENERGY_PRODUCTION,
+    ), f"Sources which only differ in their installed capacity should have the same aggregation key."
+    dict_values[ENERGY_PRODUCTION]["pv_scaled"][SIMULATION_ANNUITY][VALUE] = 60
+    assert key != C3.get_aggregation_key(
+        dict_values,
+        "pv_scaled",
+        dict_values[ENERGY_PRODUCTION]["pv_scaled"],
+        ENERGY_PRODUCTION,
+    ), f"Sources with different costs should not be aggregated."
+
+
+def test_get_aggregation_key_dispatchable_source():
+    dict_values = dict_values_with_duplicates()
+    assert (
+        C3.get_aggregation_key(
+            dict_values,
+            DSO_SOURCE,
+            dict_values[ENERGY_PRODUCTION][DSO_SOURCE],
+            ENERGY_PRODUCTION,
+        )
+        is None
+    ), f"Dispatchable sources should not be aggregated."
+
+
+def test_aggregate_identical_assets():
+    dict_values = dict_values_with_duplicates()
+    assert C3.aggregate_identical_assets(dict_values) is True
+    assert dict_values[REDUCED_MODEL][AGGREGATED_ASSETS] == {
+        "pv": ["pv", "pv_scaled"],
+        "demand": ["demand", "demand_zero", "demand_scaled"],
+    }
+    assert (
+        C3.is_part_of_model(
+            dict_values, "pv_scaled", dict_values[ENERGY_PRODUCTION]["pv_scaled"]
+        )
+        is False
+    ), f"Only the first of the aggregated assets should be part of the model."
+
+
+def test_aggregate_identical_assets_different_timeseries():
+    dict_values = dict_values_with_duplicates()
+    dict_values[ENERGY_PRODUCTION]["pv_scaled"][TIMESERIES] = pd.Series(
+        [0, 0.6, 0], index=TIMESERIES_INDEX
+    )
+    C3.aggregate_identical_assets(dict_values)
+    assert (
+        "pv" not in dict_values[REDUCED_MODEL][AGGREGATED_ASSETS]
+    ), f"Sources with different timeseries should not be aggregated."
@@ -1,9 +1,13 @@
 import os
+import copy
 import shutil
 import argparse
+import sys
 
+import numpy as np
 import oemof.solph
 import pandas as pd
+import pyomo.environ as po
 import pytest
 import mock
 
@@ -27,16 +31,71 @@ from multi_vector_simulator.utils.constants_json_strings import (
     SIMULATION_SETTINGS,
     TIME_INDEX,
     OUTPUT_LP_FILE,
+    IN_MEMORY_SOLVER,
+    TWO_STAGE_PLANNING,
+    INVESTMENT_TIMESTEP,
+    TIMESTEP_SEGMENTATION,
+    SEGMENTATION_RATIO,
+    TIMESTEP_DURATIONS,
+    COST_RANGING,
+    COST_RANGE_MINIMUM,
+    COST_RANGE_MAXIMUM,
+    EMISSION_BOUND,
+    MEMORY_BUDGET,
+    LP_SIZE_ESTIMATE,
+    NUMBER_OF_VARIABLES,
+    NUMBER_OF_CONSTRAINTS,
+    NUMBER_OF_NONZEROS,
+    PEAK_MEMORY,
+    SOLUTION_STRATEGY,
+    FULL_RESOLUTION,
+    AVAILABILITY_DISPATCH,
+    INVESTMENT_STAGE_OBJECTIVE_VALUE,
+    TWO_STAGE_OBJECTIVE_GAP,
+    TIMESTEP,
+    PERIODS,
+    UNIT,
+    ENERGY_CONVERSION,
+    ENERGY_PROVIDERS,
+    CONNECTED_CONSUMPTION_SOURCE,
+    CONNECTED_FEEDIN_SINK,
+    DSO_CONSUMPTION,
+    CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS,
     SIMULATION_RESULTS,
     OBJECTIVE_VALUE,
     SIMULTATION_TIME,
     MODELLING_TIME,
     ASSET_DICT,
     ENERGY_VECTOR,
+    ENERGY_PRODUCTION,
+    TIMESERIES,
+    INSTALLED_CAP,
+    INSTALLED_CAP_NORMALIZED,
+    MAXIMUM_ADD_CAP,
+    LP_SCALING,
+    ENERGY_SCALING_FACTOR,
+    COST_SCALING_FACTOR,
+    DISPATCH_PRICE,
+    SIMULATION_ANNUITY,
+    EMISSION_FACTOR,
+    OPTIMIZE_CAP,
+    INPUT_POWER,
+    OUTPUT_POWER,
+    STORAGE_CAPACITY,
+    THERM_LOSSES_REL,
+    THERM_LOSSES_ABS,
+    ENERGY_STORAGE,
+    SOLVER_PROGRESS,
+    ELAPSED_TIME,
+    ITERATIONS,
+    OBJECTIVE,
+    GAP,
+    PRIMAL_INFEASIBILITY,
 )
 
 from multi_vector_simulator.utils.exceptions import (
     MVSOemofError,
+    MemoryBudgetExceededError,
     WrongOemofAssetForGroupError,
     UnknownOemofAssetType,
 )
@@ -260,3 +319,869 @@ def test_if_simulation_results_added_to_dict_values(dict_values):
     D0.run_oemof(dict_values)
     for k in (LABEL, OBJECTIVE_VALUE, SIMULTATION_TIME):
         assert k in dict_values[SIMULATION_RESULTS].keys()
+
+
+def test_aggregate_assets_sinks():
+    time_index = pd.date_range("2021-01-01", periods=3, freq="H")
+    dict_values = {
+        ENERGY_CONSUMPTION: {
+            "demand_01": {
+                LABEL: "demand_01",
+                TIMESERIES: pd.Series([1, 2, 3], index=time_index),
+            },
+            "demand_02": {
+                LABEL: "demand_02",
+                TIMESERIES: pd.Series([0, 1, 1], index=time_index),
+            },
+        }
+    }
+    dict_asset = D0.model_building.aggregate_assets(
+        dict_values, ENERGY_CONSUMPTION, ["demand_01", "demand_02"]
+    )
+    assert dict_asset[LABEL] == "demand_01"
+    assert list(dict_asset[TIMESERIES]) == [
+        1,
+        3,
+        4,
+    ], f"The timeseries of the aggregated sinks should be summed up."
+    assert list(dict_values[ENERGY_CONSUMPTION]["demand_01"][TIMESERIES]) == [
+        1,
+        2,
+        3,
+    ], f"The aggregated assets should not be changed."
+
+
+def test_aggregate_assets_sources():
+    dict_values = {
+        ENERGY_PRODUCTION: {
+            "pv_01": {
+                LABEL: "pv_01",
+                INSTALLED_CAP: {VALUE: 10, "unit": "kWp"},
+                INSTALLED_CAP_NORMALIZED: {VALUE: 8},
+                MAXIMUM_ADD_CAP: {VALUE: 100},
+            },
+            "pv_02": {
+                LABEL: "pv_02",
+                INSTALLED_CAP: {VALUE: 5, "unit": "kWp"},
+                INSTALLED_CAP_NORMALIZED: {VALUE: 4},
+                MAXIMUM_ADD_CAP: {VALUE: None},
+            },
+        }
+    }
+    dict_asset = D0.model_building.aggregate_assets(
+        dict_values, ENERGY_PRODUCTION, ["pv_01", "pv_02"]
+    )
+    assert dict_asset[INSTALLED_CAP] == {VALUE: 15, "unit": "kWp"}
+    assert dict_asset[INSTALLED_CAP_NORMALIZED][VALUE] == 12
+    assert (
+        dict_asset[MAXIMUM_ADD_CAP][VALUE] is None
+    ), f"The maximum additional capacity of the aggregated sources should not be limited if one of them is not limited."
+    assert dict_values[ENERGY_PRODUCTION]["pv_01"][INSTALLED_CAP][VALUE] == 10
+
+
+def dict_values_lp_scaling(lp_scaling=True, therm_losses_rel=0):
+    time_index = pd.date_range("2021-01-01", periods=3, freq="H")
+    return {
+        SIMULATION_SETTINGS: {LP_SCALING: {VALUE: lp_scaling}},
+        ENERGY_CONSUMPTION: {
+            "demand": {
+                LABEL: "demand",
+                OEMOF_ASSET_TYPE: OEMOF_SINK,
+                TIMESERIES: pd.Series([1000, 5000, 10000], index=time_index),
+            }
+        },
+        ENERGY_PRODUCTION: {
+            "pv": {
+                LABEL: "pv",
+                OEMOF_ASSET_TYPE: OEMOF_SOURCE,
+                INSTALLED_CAP: {VALUE: 1000},
+                MAXIMUM_ADD_CAP: {VALUE: None},
+                DISPATCH_PRICE: {VALUE: 0.01},
+                SIMULATION_ANNUITY: {VALUE: 100},
+            }
+        },
+        ENERGY_STORAGE: {
+            "battery": {
+                LABEL: "battery",
+                OEMOF_ASSET_TYPE: OEMOF_GEN_STORAGE,
+                OPTIMIZE_CAP: {VALUE: True},
+                INPUT_POWER: {INSTALLED_CAP: {VALUE: 0}},
+                OUTPUT_POWER: {INSTALLED_CAP: {VALUE: 0}},
+                STORAGE_CAPACITY: {
+                    INSTALLED_CAP: {VALUE: 100},
+                    THERM_LOSSES_REL: {VALUE: therm_losses_rel},
+                    THERM_LOSSES_ABS: {VALUE: 0},
+                },
+            }
+        },
+    }
+
+
+def test_define_lp_scaling():
+    dict_values = dict_values_lp_scaling()
+    D0.model_building.define_lp_scaling(dict_values)
+    # mean of log10 of 10000, 1000 and 100 is 3, mean of log10 of 0.01*1000 and 100*1000 is 3
+    assert dict_values[LP_SCALING][ENERGY_SCALING_FACTOR][VALUE] == 1000
+    assert dict_values[LP_SCALING][COST_SCALING_FACTOR][VALUE] == 1000
+
+
+def test_define_lp_scaling_not_applied():
+    dict_values = dict_values_lp_scaling(lp_scaling=False)
+    dict_values.update({LP_SCALING: {}})
+    assert D0.model_building.define_lp_scaling(dict_values) is None
+    assert (
+        LP_SCALING not in dict_values
+    ), f"The scaling factors of a previous simulation should be removed if the linear program is not scaled."
+
+
+def test_define_lp_scaling_storage_with_thermal_losses():
+    dict_values = dict_values_lp_scaling(therm_losses_rel=0.01)
+    D0.model_building.define_lp_scaling(dict_values)
+    assert (
+        dict_values[LP_SCALING][ENERGY_SCALING_FACTOR][VALUE] == 1
+    ), f"The energy should not be scaled if a storage with thermal losses is optimized."
+    assert dict_values[LP_SCALING][COST_SCALING_FACTOR][VALUE] == 1
+
+
+def test_scale_asset_source():
+    lp_scaling = {
+        ENERGY_SCALING_FACTOR: {VALUE: 1000},
+        COST_SCALING_FACTOR: {VALUE: 100},
+    }
+    dict_asset = {
+        LABEL: "diesel",
+        OEMOF_ASSET_TYPE: OEMOF_SOURCE,
+        INSTALLED_CAP: {VALUE: 500, "unit": "kW"},
+        MAXIMUM_ADD_CAP: {VALUE: None},
+        DISPATCH_PRICE: {VALUE: [0.1, 0.2]},
+        SIMULATION_ANNUITY: {VALUE: 30},
+        EMISSION_FACTOR: {VALUE: 0.5},
+    }
+    scaled_asset = D0.model_building.scale_asset(dict_asset, lp_scaling)
+    assert scaled_asset[INSTALLED_CAP] == {VALUE: 0.5, "unit": "kW"}
+    assert scaled_asset[MAXIMUM_ADD_CAP][VALUE] is None
+    assert scaled_asset[DISPATCH_PRICE][VALUE] == pytest.approx([1, 2])
+    assert scaled_asset[SIMULATION_ANNUITY][VALUE] == pytest.approx(300)
+    assert scaled_asset[EMISSION_FACTOR][VALUE] == pytest.approx(500)
+    assert (
+        dict_asset[INSTALLED_CAP][VALUE] == 500
+    ), f"The asset in dict_values should not be scaled."
+
+
+def test_scale_asset_storage():
+    lp_scaling = {
+        ENERGY_SCALING_FACTOR: {VALUE: 10},
+        COST_SCALING_FACTOR: {VALUE: 10},
+    }
+    dict_asset = dict_values_lp_scaling()[ENERGY_STORAGE]["battery"]
+    scaled_asset = D0.model_building.scale_asset(dict_asset, lp_scaling)
+    assert scaled_asset[STORAGE_CAPACITY][INSTALLED_CAP][VALUE] == 10
+    assert dict_asset[STORAGE_CAPACITY][INSTALLED_CAP][VALUE] == 100
+
+
+def test_in_memory_solver_is_requested_default(dict_values):
+    assert D0.in_memory_solver.is_requested(dict_values) is False
+
+
+def test_in_memory_solver_is_requested_without_highs_solver(dict_values, monkeypatch):
+    monkeypatch.setattr(D0, "HIGHSPY_INSTALLED", False)
+    monkeypatch.setattr(D0, "SCIPY_INSTALLED", False)
+    dict_values[SIMULATION_SETTINGS].update({IN_MEMORY_SOLVER: {VALUE: True}})
+    assert (
+        D0.in_memory_solver.is_requested(dict_values) is False
+    ), f"The cbc solver should be used if the HiGHS solver is not installed."
+
+
+def pyomo_linear_program():
+    model = po.ConcreteModel()
+    model.x = po.Var(bounds=(0, 4))
+    model.y = po.Var(within=po.NonNegativeReals)
+    model.z = po.Var()
+    model.z.fix(1)
+    model.c1 = po.Constraint(expr=model.x + model.y >= 3)
+    model.c2 = po.Constraint(expr=po.inequality(1, model.x - model.y, 2))
+    model.c3 = po.Constraint(expr=model.x + model.z <= 4)
+    model.objective = po.Objective(expr=2 * model.x + 3 * model.y + 5)
+    return model
+
+
+def test_linear_program_arrays():
+    model = pyomo_linear_program()
+    lp = D0.in_memory_solver.linear_program_arrays(model)
+    assert lp["variables"] == [
+        model.x,
+        model.y,
+    ], f"The fixed variable should not be a column of the linear program."
+    assert list(lp["cost"]) == [2, 3]
+    assert lp["offset"] == 5
+    assert lp["maximize"] is False
+    assert list(lp["col_lower"]) == [0, 0]
+    assert list(lp["col_upper"]) == [4, np.inf]
+    assert list(lp["row_lower"]) == [3, 1, -np.inf]
+    assert list(lp["row_upper"]) == [
+        np.inf,
+        2,
+        3,
+    ], f"The fixed variable should be moved to the bounds of the row."
+    assert list(lp["start"]) == [0, 2, 4, 5]
+    assert list(lp["index"]) == [0, 1, 0, 1, 0]
+    assert list(lp["value"]) == [1, 1, 1, -1, 1]
+
+
+def test_linear_program_arrays_constant_constraint():
+    model = pyomo_linear_program()
+    model.c4 = po.Constraint(expr=2 * model.z <= 2)
+    lp = D0.in_memory_solver.linear_program_arrays(model)
+    assert (
+        len(lp["row_lower"]) == 3
+    ), f"A feasible constraint without variables which are not fixed should not be a row."
+    model.c5 = po.Constraint(expr=model.z >= 5)
+    with pytest.raises(MVSOemofError, match="infeasible"):
+        D0.in_memory_solver.linear_program_arrays(model)
+
+
+def test_linear_program_arrays_integer_variable():
+    model = pyomo_linear_program()
+    model.y.domain = po.NonNegativeIntegers
+    with pytest.raises(ValueError):
+        D0.in_memory_solver.linear_program_arrays(model)
+
+
+@pytest.mark.skipif(
+    (D0.HIGHSPY_INSTALLED or D0.SCIPY_INSTALLED) is False,
+    reason="The HiGHS solver is not installed",
+)
+def test_in_memory_solver_solve_equals_cbc(dict_values):
+    dict_values_in_memory = copy.deepcopy(dict_values)
+    dict_values_in_memory[SIMULATION_SETTINGS].update({IN_MEMORY_SOLVER: {VALUE: True}})
+    D0.run_oemof(dict_values)
+    D0.run_oemof(dict_values_in_memory)
+    assert dict_values_in_memory[SIMULATION_RESULTS][OBJECTIVE_VALUE] == pytest.approx(
+        dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE], rel=1e-6
+    ), f"The in memory solver should find the same optimum as the cbc solver."
+
+
+@pytest.mark.skipif(
+    (D0.HIGHSPY_INSTALLED or D0.SCIPY_INSTALLED) is False,
+    reason="The HiGHS solver is not installed",
+)
+def test_in_memory_solver_solve_infeasible():
+    energy_system = oemof.solph.EnergySystem(
+        timeindex=pd.date_range("2021-01-01", periods=2, freq="H")
+    )
+    bus = oemof.solph.Bus(label="bus")
+    energy_system.add(
+        bus,
+        oemof.solph.Sink(
+            label="demand", inputs={bus: oemof.solph.Flow(fix=[1, 1], nominal_value=2)}
+        ),
+        oemof.solph.Source(
+            label="source", outputs={bus: oemof.solph.Flow(nominal_value=1)}
+        ),
+    )
+    with pytest.warns(UserWarning, match="termination condition infeasible"):
+        D0.in_memory_solver.solve(oemof.solph.Model(energy_system))
+
+
+def test_two_stage_planning_is_requested_default(dict_values):
+    assert D0.two_stage_planning.is_requested(dict_values) is False
+
+
+def test_two_stage_planning_is_requested_investment_timestep_too_short(dict_values):
+    dict_values[SIMULATION_SETTINGS].update(
+        {TWO_STAGE_PLANNING: {VALUE: True}, INVESTMENT_TIMESTEP: {VALUE: 60}}
+    )
+    assert (
+        D0.two_stage_planning.is_requested(dict_values) is False
+    ), f"The simulation should run in a single stage if no timesteps can be aggregated."
+    dict_values[SIMULATION_SETTINGS][INVESTMENT_TIMESTEP].update({VALUE: 120})
+    assert D0.two_stage_planning.is_requested(dict_values) is True
+
+
+def test_aggregate_timesteps():
+    time_index = pd.date_range("2021-01-01", periods=5, freq="H")
+    dict_values = {
+        SIMULATION_SETTINGS: {
+            TIME_INDEX: time_index,
+            PERIODS: 5,
+            TIMESTEP: {VALUE: 60, UNIT: "minutes"},
+        },
+        ENERGY_CONSUMPTION: {
+            "demand": {
+                LABEL: "demand",
+                TIMESERIES: pd.Series([1, 2, 3, 4, 5], index=time_index),
+                INSTALLED_CAP: {VALUE: 5},
+            }
+        },
+    }
+    dict_aggregated = D0.two_stage_planning.aggregate_timesteps(dict_values, 2)
+    aggregated_time_index = dict_aggregated[SIMULATION_SETTINGS][TIME_INDEX]
+    assert list(aggregated_time_index) == list(
+        pd.date_range("2021-01-01", periods=3, freq="2H")
+    )
+    assert aggregated_time_index.freq == "120min"
+    assert dict_aggregated[SIMULATION_SETTINGS][PERIODS] == 3
+    assert dict_aggregated[SIMULATION_SETTINGS][TIMESTEP] == {
+        VALUE: 120,
+        UNIT: "minutes",
+    }
+    assert dict_aggregated[SIMULATION_SETTINGS][TIMESTEP_DURATIONS] == {
+        VALUE: [120, 120, 60],
+        UNIT: "minutes",
+    }, f"The last aggregated timestep should be as long as the timesteps it aggregates."
+    demand = dict_aggregated[ENERGY_CONSUMPTION]["demand"]
+    assert list(demand[TIMESERIES]) == [
+        1.5,
+        3.5,
+        5,
+    ], f"The timeseries should be the mean of the aggregated timesteps."
+    assert demand[TIMESERIES].index.equals(aggregated_time_index)
+    assert demand[INSTALLED_CAP] == {VALUE: 5}
+    assert list(dict_values[ENERGY_CONSUMPTION]["demand"][TIMESERIES]) == [
+        1,
+        2,
+        3,
+        4,
+        5,
+    ], f"The simulation inputs should not be modified."
+    assert dict_values[SIMULATION_SETTINGS][TIME_INDEX] is time_index
+
+
+def test_planned_assets():
+    dict_values = {
+        ENERGY_PRODUCTION: {
+            "pv": {LABEL: "pv", OPTIMIZE_CAP: {VALUE: True}},
+            "DSO_consumption": {LABEL: "DSO_consumption", OPTIMIZE_CAP: {VALUE: True}},
+        },
+        ENERGY_CONVERSION: {
+            "inverter": {LABEL: "inverter", OPTIMIZE_CAP: {VALUE: False}},
+            "DSO_consumption_period": {
+                LABEL: "DSO_consumption_period",
+                OPTIMIZE_CAP: {VALUE: True},
+            },
+        },
+        ENERGY_STORAGE: {"battery": {LABEL: "battery", OPTIMIZE_CAP: {VALUE: True}}},
+        ENERGY_PROVIDERS: {
+            "DSO": {
+                CONNECTED_CONSUMPTION_SOURCE: "DSO_consumption",
+                CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS: ["DSO_consumption_period"],
+                CONNECTED_FEEDIN_SINK: "DSO_feedin",
+            }
+        },
+    }
+    assert D0.two_stage_planning.planned_assets(dict_values) == {"pv", "battery"}
+
+
+def test_fix_investments():
+    energy_system = oemof.solph.EnergySystem(
+        timeindex=pd.date_range("2021-01-01", periods=2, freq="H")
+    )
+    bus = oemof.solph.Bus(label="bus")
+    energy_system.add(
+        bus,
+        oemof.solph.Sink(
+            label="demand", inputs={bus: oemof.solph.Flow(fix=[1, 1], nominal_value=2)}
+        ),
+        oemof.solph.Source(
+            label="pv",
+            outputs={
+                bus: oemof.solph.Flow(investment=oemof.solph.Investment(ep_costs=1))
+            },
+        ),
+        oemof.solph.Source(
+            label="DSO_consumption",
+            outputs={
+                bus: oemof.solph.Flow(investment=oemof.solph.Investment(ep_costs=1))
+            },
+        ),
+    )
+    model = oemof.solph.Model(energy_system)
+    D0.two_stage_planning.fix_investments(
+        model, {"flows": {("pv", "bus"): 5}, "storages": {}}
+    )
+    invest = {
+        (str(i), str(o)): var for (i, o), var in model.InvestmentFlow.invest.items()
+    }
+    assert invest[("pv", "bus")].fixed is True
+    assert invest[("pv", "bus")].value == 5
+    assert (
+        invest[("DSO_consumption", "bus")].fixed is False
+    ), f"Only the investments of the planned assets should be fixed."
+    D0.two_stage_planning.fix_investments(
+        model, {"flows": {("pv", "bus"): 5}, "storages": {}}, lower_bound=True
+    )
+    assert invest[("pv", "bus")].fixed is False
+    assert (
+        invest[("pv", "bus")].lb == 5
+    ), f"The capacity of the first stage should be the minimal capacity."
+
+
+def test_store_objective_gap():
+    dict_values = {SIMULATION_RESULTS: {OBJECTIVE_VALUE: 100}}
+    D0.two_stage_planning.store_objective_gap(dict_values, {OBJECTIVE_VALUE: 90})
+    assert dict_values[SIMULATION_RESULTS][INVESTMENT_STAGE_OBJECTIVE_VALUE] == 90
+    assert dict_values[SIMULATION_RESULTS][TWO_STAGE_OBJECTIVE_GAP] == pytest.approx(
+        0.1
+    )
+
+
+def test_two_stage_planning_mvs_runthrough(dict_values):
+    dict_values[SIMULATION_SETTINGS].update(
+        {TWO_STAGE_PLANNING: {VALUE: True}, INVESTMENT_TIMESTEP: {VALUE: 240}}
+    )
+    # the consumption source of the DSO is connected to the energy provider in C0
+    for dso_key, dso in dict_values[ENERGY_PROVIDERS].items():
+        dso.update({CONNECTED_CONSUMPTION_SOURCE: dso_key + DSO_CONSUMPTION})
+    D0.run_oemof(dict_values)
+    for k in (
+        OBJECTIVE_VALUE,
+        INVESTMENT_STAGE_OBJECTIVE_VALUE,
+        TWO_STAGE_OBJECTIVE_GAP,
+    ):
+        assert k in dict_values[SIMULATION_RESULTS].keys()
+    assert (
+        len(dict_values[SIMULATION_SETTINGS][TIME_INDEX]) == 48
+    ), f"The simulation inputs should not be aggregated by the two stage planning."
+
+
+def test_timestep_segmentation_is_requested_default(dict_values):
+    assert D0.timestep_segmentation.is_requested(dict_values) is False
+
+
+def test_timestep_segmentation_is_requested_segmentation_ratio_out_of_bounds(
+    dict_values,
+):
+    dict_values[SIMULATION_SETTINGS].update(
+        {TIMESTEP_SEGMENTATION: {VALUE: True}, SEGMENTATION_RATIO: {VALUE: 1}}
+    )
+    assert (
+        D0.timestep_segmentation.is_requested(dict_values) is False
+    ), f"The simulation should run with the input timesteps if no timesteps are merged."
+    dict_values[SIMULATION_SETTINGS][SEGMENTATION_RATIO].update({VALUE: 0.5})
+    assert D0.timestep_segmentation.is_requested(dict_values) is True
+
+
+def dict_values_segmentation(demand, segmentation_ratio):
+    time_index = pd.date_range("2021-01-01", periods=len(demand), freq="H")
+    return {
+        SIMULATION_SETTINGS: {
+            TIME_INDEX: time_index,
+            PERIODS: len(demand),
+            TIMESTEP: {VALUE: 60, UNIT: "minutes"},
+            SEGMENTATION_RATIO: {VALUE: segmentation_ratio},
+        },
+        ENERGY_CONSUMPTION: {
+            "demand": {
+                LABEL: "demand",
+                TIMESERIES: pd.Series(demand, index=time_index),
+                INSTALLED_CAP: {VALUE: 5},
+            }
+        },
+    }
+
+
+def test_define_segments():
+    dict_values = dict_values_segmentation([1, 1, 1, 1, 8, 2, 2, 2], 0.375)
+    segments = D0.timestep_segmentation.define_segments(dict_values)
+    assert list(segments) == [
+        0,
+        0,
+        0,
+        0,
+        1,
+        2,
+        2,
+        2,
+    ], f"The peak should be kept as a segment of its own and the constant periods merged."
+
+
+def test_define_segments_peak_demand_pricing_periods():
+    dict_values = dict_values_segmentation([1, 1, 1, 1, 1, 1], 0.1)
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    dict_values.update(
+        {
+            ENERGY_PROVIDERS: {
+                "DSO": {
+                    CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS: [
+                        "DSO_consumption_period_1",
+                        "DSO_consumption_period_2",
+                    ]
+                }
+            },
+            ENERGY_CONVERSION: {
+                "DSO_consumption_period_1": {
+                    AVAILABILITY_DISPATCH: pd.Series(
+                        [1, 1, 1, 1, 0, 0], index=time_index
+                    )
+                },
+                "DSO_consumption_period_2": {
+                    AVAILABILITY_DISPATCH: pd.Series(
+                        [0, 0, 0, 0, 1, 1], index=time_index
+                    )
+                },
+            },
+        }
+    )
+    segments = D0.timestep_segmentation.define_segments(dict_values)
+    assert list(segments) == [
+        0,
+        0,
+        0,
+        0,
+        1,
+        1,
+    ], f"The segments should not span two peak demand pricing periods."
+
+
+def test_aggregate_segments():
+    dict_values = dict_values_segmentation([1, 3, 8, 2, 4], 0.6)
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    segments = np.array([0, 0, 1, 2, 2])
+    dict_aggregated = D0.timestep_segmentation.aggregate_segments(dict_values, segments)
+    settings = dict_aggregated[SIMULATION_SETTINGS]
+    assert list(settings[TIME_INDEX]) == [time_index[0], time_index[2], time_index[3]]
+    assert settings[PERIODS] == 3
+    assert settings[TIMESTEP_DURATIONS] == {VALUE: [120, 60, 120], UNIT: "minutes"}
+    demand = dict_aggregated[ENERGY_CONSUMPTION]["demand"][TIMESERIES]
+    assert list(demand) == [
+        2,
+        8,
+        3,
+    ], f"The timeseries should be the mean of the timesteps of each segment."
+    assert demand.index.equals(settings[TIME_INDEX])
+    assert dict_values[SIMULATION_SETTINGS][PERIODS] == 5
+
+
+def test_energysystem_initialized_with_timestep_durations():
+    dict_values = dict_values_segmentation([1, 3, 8, 2, 4], 0.6)
+    dict_aggregated = D0.timestep_segmentation.aggregate_segments(
+        dict_values, np.array([0, 0, 1, 2, 2])
+    )
+    model, dict_model = D0.model_building.initialize(dict_aggregated)
+    assert model.timeincrement == [2, 1, 2]
+
+
+def test_expand_results():
+    dict_values = dict_values_segmentation([1, 3, 8, 2, 4], 0.6)
+    segments = np.array([0, 0, 1, 2, 2])
+    segment_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX][[0, 2, 3]]
+    results_main = {
+        ("pv", "bus"): {
+            "scalars": pd.Series({"invest": 5}),
+            "sequences": pd.DataFrame({"flow": [2, 8, 3]}, index=segment_index),
+        },
+        ("battery", None): {
+            "scalars": pd.Series(dtype=float),
+            "sequences": pd.DataFrame(
+                {"storage_content": [4, 6, 2]}, index=segment_index
+            ),
+        },
+    }
+    expanded = D0.timestep_segmentation.expand_results(
+        dict_values, results_main, segments
+    )
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    flow = expanded[("pv", "bus")]["sequences"]["flow"]
+    assert flow.index.equals(time_index)
+    assert list(flow) == [2, 2, 8, 3, 3]
+    assert expanded[("pv", "bus")]["scalars"]["invest"] == 5
+    assert list(expanded[("battery", None)]["sequences"]["storage_content"]) == [
+        3,
+        4,
+        6,
+        4,
+        2,
+    ], f"The storage content should be interpolated between the ends of the segments."
+
+
+def test_timestep_segmentation_mvs_runthrough(dict_values):
+    dict_values[SIMULATION_SETTINGS].update(
+        {TIMESTEP_SEGMENTATION: {VALUE: True}, SEGMENTATION_RATIO: {VALUE: 0.25}}
+    )
+    results_meta, results_main = D0.run_oemof(dict_values)
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    assert len(time_index) == 48
+    for results in results_main.values():
+        assert results["sequences"].index.equals(
+            time_index
+        ), f"The results should be expanded to the time index of the simulation."
+
+
+def test_cost_ranging_is_requested_default(dict_values):
+    assert D0.cost_ranging.is_requested(dict_values) is False
+
+
+def test_cost_ranging_is_requested_with_in_memory_solver(dict_values, monkeypatch):
+    monkeypatch.setattr(D0, "SCIPY_INSTALLED", True)
+    dict_values[SIMULATION_SETTINGS].update(
+        {COST_RANGING: {VALUE: True}, IN_MEMORY_SOLVER: {VALUE: True}}
+    )
+    assert (
+        D0.cost_ranging.is_requested(dict_values) is False
+    ), f"The reduced costs are only imported from the cbc solver."
+
+
+def test_cost_ranging_evaluate():
+    energy_system = oemof.solph.EnergySystem(
+        timeindex=pd.date_range("2021-01-01", periods=2, freq="H")
+    )
+    bus = oemof.solph.Bus(label="bus")
+    energy_system.add(bus)
+    energy_system.add(
+        oemof.solph.Sink(
+            label="demand", inputs={bus: oemof.solph.Flow(fix=[1, 1], nominal_value=2)}
+        )
+    )
+    # the DSO supplies the demand which can not be supplied by the cheaper diesel generator
+    dict_values = {ENERGY_PRODUCTION: {}}
+    for label, annuity, maximum in [
+        ("pv", 3, None),
+        ("diesel", 0.5, 1),
+        ("DSO_consumption", 1, None),
+    ]:
+        energy_system.add(
+            oemof.solph.Source(
+                label=label,
+                outputs={
+                    bus: oemof.solph.Flow(
+                        investment=oemof.solph.Investment(
+                            ep_costs=annuity, maximum=maximum
+                        ),
+                        variable_costs=0.1,
+                    )
+                },
+            )
+        )
+        dict_values[ENERGY_PRODUCTION].update(
+            {
+                label: {
+                    LABEL: label,
+                    OEMOF_ASSET_TYPE: OEMOF_SOURCE,
+                    SIMULATION_ANNUITY: {VALUE: annuity},
+                    DISPATCH_PRICE: {VALUE: 0.1},
+                }
+            }
+        )
+    model = oemof.solph.Model(energy_system)
+    D0.cost_ranging.import_reduced_costs(model)
+    model.solve(solver="cbc")
+    cost_ranges = D0.cost_ranging.evaluate(dict_values, model)
+    pv = cost_ranges["pv"][SIMULATION_ANNUITY]
+    assert pv[VALUE] == 3
+    assert pv[COST_RANGE_MINIMUM] == pytest.approx(
+        1
+    ), f"The pv plant should only be invested in if its annuity is lower than the one of the DSO."
+    assert pv[COST_RANGE_MAXIMUM] == np.inf
+    diesel = cost_ranges["diesel"][SIMULATION_ANNUITY]
+    assert diesel[COST_RANGE_MINIMUM] == -np.inf
+    assert diesel[COST_RANGE_MAXIMUM] == pytest.approx(
+        1
+    ), f"The diesel generator should be invested in up to its maximum capacity as long as its annuity is lower than the one of the DSO."
+    dso = cost_ranges["DSO_consumption"][SIMULATION_ANNUITY]
+    assert np.isnan(dso[COST_RANGE_MINIMUM]) and np.isnan(
+        dso[COST_RANGE_MAXIMUM]
+    ), f"The cost range of an investment between its bounds can not be derived from the reduced costs."
+
+
+def test_cost_ranging_mvs_runthrough(dict_values):
+    dict_values[SIMULATION_SETTINGS].update({COST_RANGING: {VALUE: True}})
+    results_meta, results_main = D0.run_oemof(dict_values)
+    assert COST_RANGING in dict_values[SIMULATION_RESULTS]
+    for results in results_main.values():
+        assert (
+            "duals" not in results["sequences"]
+        ), f"The duals of the busses should not be added to the results."
+
+
+def test_pareto_front_add_emission_bound():
+    energy_system = oemof.solph.EnergySystem(
+        timeindex=pd.date_range("2021-01-01", periods=2, freq="H")
+    )
+    bus = oemof.solph.Bus(label="bus")
+    grid = oemof.solph.Source(
+        label="grid",
+        outputs={bus: oemof.solph.Flow(variable_costs=1, emission_factor=0.5)},
+    )
+    demand = oemof.solph.Sink(
+        label="demand", inputs={bus: oemof.solph.Flow(fix=[1, 1], nominal_value=2)}
+    )
+    energy_system.add(bus, grid, demand)
+    model = oemof.solph.Model(energy_system)
+    D0.pareto_front.add_emission_bound(model)
+    assert model.pareto_emission_constraint.active is False
+    assert model.pareto_emission_objective.active is False
+    model.solve(solver="cbc")
+    assert po.value(model.pareto_emissions) == pytest.approx(2)
+
+
+def test_pareto_front_solve_points_too_few_points(dict_values):
+    with pytest.raises(ValueError):
+        next(D0.pareto_front.solve_points(dict_values, 1))
+
+
+def test_pareto_front_solve_points(dict_values):
+    points = list(D0.pareto_front.solve_points(dict_values, 3))
+    emission_bounds = [emission_bound for emission_bound, *_ in points]
+    assert emission_bounds[0] is None, f"The first point should be the cost optimum."
+    assert len(points) == 3
+    assert emission_bounds[1] > emission_bounds[2]
+    objective_values = [
+        dict_point[SIMULATION_RESULTS][OBJECTIVE_VALUE] for _, dict_point, *_ in points
+    ]
+    assert objective_values == sorted(
+        objective_values
+    ), f"The costs should increase with decreasing emissions."
+    assert points[1][1][SIMULATION_RESULTS][EMISSION_BOUND][VALUE] == emission_bounds[1]
+
+
+def test_estimate_lp_size(dict_values):
+    lp_size_estimate = D0.solution_strategy.estimate_lp_size(dict_values)
+    model, local_energy_system = D0.model_building.build_oemof_model(dict_values)
+    lp = D0.in_memory_solver.linear_program_arrays(local_energy_system)
+    for parameter, number in [
+        (NUMBER_OF_VARIABLES, len(lp["variables"])),
+        (NUMBER_OF_CONSTRAINTS, len(lp["row_lower"])),
+        (NUMBER_OF_NONZEROS, len(lp["value"])),
+    ]:
+        assert lp_size_estimate[parameter][VALUE] == pytest.approx(
+            number, rel=0.05
+        ), f"The {parameter} of the linear program is not estimated correctly."
+    assert (
+        lp_size_estimate[PEAK_MEMORY][VALUE]
+        == (
+            lp_size_estimate[NUMBER_OF_VARIABLES][VALUE] * D0.BYTES_PER_VARIABLE
+            + lp_size_estimate[NUMBER_OF_CONSTRAINTS][VALUE] * D0.BYTES_PER_CONSTRAINT
+            + lp_size_estimate[NUMBER_OF_NONZEROS][VALUE] * D0.BYTES_PER_NONZERO
+        )
+        / 1e6
+    )
+
+
+def test_estimate_lp_size_number_of_timesteps(dict_values):
+    sizes = [
+        D0.solution_strategy.estimate_lp_size(dict_values, number_of_timesteps)
+        for number_of_timesteps in [0, 10, 20]
+    ]
+    for parameter in [NUMBER_OF_VARIABLES, NUMBER_OF_CONSTRAINTS, NUMBER_OF_NONZEROS]:
+        assert (
+            sizes[2][parameter][VALUE] - sizes[1][parameter][VALUE]
+            == sizes[1][parameter][VALUE] - sizes[0][parameter][VALUE]
+            > 0
+        ), f"The {parameter} should grow linearly with the number of timesteps."
+
+
+def test_solution_strategy_select_without_memory_budget(dict_values):
+    lp_size_estimate = D0.solution_strategy.select(dict_values)
+    assert lp_size_estimate == D0.solution_strategy.estimate_lp_size(dict_values)
+    assert D0.timestep_segmentation.is_requested(dict_values) is False
+
+
+def test_solution_strategy_select_within_memory_budget(dict_values):
+    peak_memory = D0.solution_strategy.estimate_lp_size(dict_values)[PEAK_MEMORY][VALUE]
+    dict_values[SIMULATION_SETTINGS].update({MEMORY_BUDGET: {VALUE: peak_memory}})
+    D0.solution_strategy.select(dict_values)
+    assert D0.timestep_segmentation.is_requested(dict_values) is False
+
+
+def test_solution_strategy_select_timestep_segmentation(dict_values):
+    peak_memory = D0.solution_strategy.estimate_lp_size(dict_values)[PEAK_MEMORY][VALUE]
+    dict_values[SIMULATION_SETTINGS].update({MEMORY_BUDGET: {VALUE: peak_memory / 2}})
+    lp_size_estimate = D0.solution_strategy.select(dict_values)
+    assert D0.timestep_segmentation.is_requested(dict_values) is True
+    assert lp_size_estimate[PEAK_MEMORY][VALUE] <= peak_memory / 2
+    number_of_timesteps = len(dict_values[SIMULATION_SETTINGS][TIME_INDEX])
+    assert dict_values[SIMULATION_SETTINGS][SEGMENTATION_RATIO][
+        VALUE
+    ] * number_of_timesteps == pytest.approx(
+        int(number_of_timesteps / 2), abs=1
+    ), f"The largest number of segments within the memory budget should be used."
+
+
+def test_solution_strategy_select_memory_budget_exceeded(dict_values):
+    dict_values[SIMULATION_SETTINGS].update({MEMORY_BUDGET: {VALUE: 0.001}})
+    with pytest.raises(MemoryBudgetExceededError):
+        D0.solution_strategy.select(dict_values)
+
+
+def test_solution_strategy_mvs_runthrough(dict_values):
+    peak_memory = D0.solution_strategy.estimate_lp_size(dict_values)[PEAK_MEMORY][VALUE]
+    dict_values[SIMULATION_SETTINGS].update({MEMORY_BUDGET: {VALUE: peak_memory / 2}})
+    D0.run_oemof(dict_values)
+    simulation_results = dict_values[SIMULATION_RESULTS]
+    assert simulation_results[SOLUTION_STRATEGY][VALUE] == TIMESTEP_SEGMENTATION
+    assert simulation_results[LP_SIZE_ESTIMATE][PEAK_MEMORY][VALUE] <= peak_memory / 2
+
+
+def test_solution_strategy_store_full_resolution(dict_values):
+    dict_values[SIMULATION_RESULTS] = {}
+    D0.solution_strategy.store(dict_values, {})
+    assert dict_values[SIMULATION_RESULTS][SOLUTION_STRATEGY][VALUE] == FULL_RESOLUTION
+
+
+def test_solver_progress_is_requested(dict_values):
+    assert D0.solver_progress.is_requested(dict_values) is False
+    assert D0.solver_progress.is_requested(dict_values, callback=print) is True
+    dict_values[SIMULATION_SETTINGS].update({SOLVER_PROGRESS: {VALUE: True}})
+    assert D0.solver_progress.is_requested(dict_values) is True
+
+
+def test_solver_progress_parse_line():
+    event = D0.solver_progress.parse_line("Clp0006I 25  Obj 120.5 Primal inf 3.2 (4)")
+    assert event is None
+    event = D0.solver_progress.parse_line("25  Obj 120.5 Primal inf 3.2 (4)")
+    assert event[ITERATIONS] == 25
+    assert event[OBJECTIVE] == 120.5
+    assert event[PRIMAL_INFEASIBILITY] == 3.2
+    assert event[GAP] is None
+    event = D0.solver_progress.parse_line(
+        "Optimal objective 100 - 40 iterations time 0.01"
+    )
+    assert event[ITERATIONS] == 40
+    assert event[OBJECTIVE] == 100
+    event = D0.solver_progress.parse_line(
+        "Cbc0010I After 100 nodes, 3 on tree, 110 best solution, best possible 99 (0.5 seconds)"
+    )
+    assert event[OBJECTIVE] == 110
+    assert event[GAP] == pytest.approx(0.1)
+    event = D0.solver_progress.parse_line(
+        "Cbc0010I After 0 nodes, 1 on tree, 1e+50 best solution, best possible 99 (0.1 seconds)"
+    )
+    assert event[OBJECTIVE] is None
+    assert D0.solver_progress.parse_line("Welcome to the CBC MILP Solver") is None
+
+
+def test_solver_progress_monitor(tmpdir):
+    path = os.path.join(tmpdir, "solver_log.txt")
+    events = []
+    with D0.solver_progress.monitor(
+        path, callback=events.append, interval=0.01
+    ) as trajectory:
+        with open(path, "a") as solver_output:
+            solver_output.write("Welcome to the CBC MILP Solver\n")
+            solver_output.write("0  Obj 0 Primal inf 10 (2)\n")
+            solver_output.write("Optimal objective 100 - 40 iterations time 0.01\n")
+    assert [event[ITERATIONS] for event in trajectory] == [0, 40]
+    assert events == trajectory
+    assert trajectory[-1][ELAPSED_TIME] >= 0
+    with open(path) as solver_output:
+        assert "Welcome to the CBC MILP Solver" in solver_output.read()
+
+
+def test_solver_progress_mvs_runthrough(dict_values):
+    events = []
+    stdout = sys.stdout
+    stdouts = set()
+
+    def callback(event):
+        events.append(event)
+        stdouts.add(id(sys.stdout))
+
+    D0.run_oemof(dict_values, solver_progress_callback=callback)
+    trajectory = dict_values[SIMULATION_RESULTS][SOLVER_PROGRESS]
+    assert len(trajectory) == len(events) > 0
+    assert stdouts == {
+        id(stdout)
+    }, f"The standard output of the process should not be redirected during the solve."
+    assert trajectory[OBJECTIVE].iloc[-1] == pytest.approx(
+        dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE], rel=1e-3
+    )
@@ -41,6 +41,19 @@ from multi_vector_simulator.utils.constants_json_strings import (
     NET_ZERO_ENERGY,
     EVALUATED_PERIOD,
     SIMULATION_SETTINGS,
+    ENERGY_CONVERSION,
+    CONNECTED_CONSUMPTION_SOURCE,
+    CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS,
+    PEAK_DEMAND_PRICING_CONSTRAINT,
+    AVAILABILITY_DISPATCH,
+    INSTALLED_CAP,
+    MAXIMUM_ADD_CAP,
+    SIMULATION_ANNUITY,
+    OPTIMIZED_PEAK_DEMAND,
+    UNIT,
+    LP_SCALING,
+    ENERGY_SCALING_FACTOR,
+    COST_SCALING_FACTOR,
 )
 
 from multi_vector_simulator.utils.constants import OUTPUT_FOLDER
@@ -504,3 +517,137 @@ class TestConstraints:
         # Remove the output folder
         if os.path.exists(TEST_OUTPUT_PATH):
             shutil.rmtree(TEST_OUTPUT_PATH, ignore_errors=True)
+
+
+def peak_demand_pricing_system(peak_demand_pricing_constraint=True):
+    """Energy system with one energy provider supplying a demand, with two pricing periods"""
+    time_index = pd.date_range("2018-01-01", periods=4, freq="H")
+    dso = "DSO"
+    electricity = "Electricity"
+    periods = [dso + DSO_CONSUMPTION + "_period_1", dso + DSO_CONSUMPTION + "_period_2"]
+    dict_values = {
+        ENERGY_PROVIDERS: {
+            dso: {LABEL: dso, CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS: periods}
+        },
+        ENERGY_CONVERSION: {
+            period: {
+                LABEL: period,
+                UNIT: "kW",
+                OUTFLOW_DIRECTION: electricity,
+                CONNECTED_CONSUMPTION_SOURCE: dso + DSO_CONSUMPTION,
+                PEAK_DEMAND_PRICING_CONSTRAINT: peak_demand_pricing_constraint,
+                AVAILABILITY_DISPATCH: pd.Series(availability, index=time_index),
+                INSTALLED_CAP: {VALUE: 0},
+                MAXIMUM_ADD_CAP: {VALUE: None},
+                SIMULATION_ANNUITY: {VALUE: 10},
+            }
+            for period, availability in zip(periods, ([1, 1, 0, 0], [0, 0, 1, 1]))
+        },
+    }
+    energy_system = solph.EnergySystem(timeindex=time_index)
+    bus = solph.Bus(label=electricity)
+    source = solph.Source(
+        label=dso + DSO_CONSUMPTION, outputs={bus: solph.Flow(variable_costs=1)}
+    )
+    demand = solph.Sink(
+        label="demand", inputs={bus: solph.Flow(fix=[1, 3, 2, 1], nominal_value=1)},
+    )
+    energy_system.add(bus, source, demand)
+    dict_model = {
+        OEMOF_SOURCE: {dso + DSO_CONSUMPTION: source},
+        OEMOF_BUSSES: {electricity: bus},
+    }
+    return dict_values, solph.Model(energy_system), dict_model
+
+
+def test_constraint_peak_demand_pricing():
+    dict_values, model, dict_model = peak_demand_pricing_system()
+    answer = D2.constraint_peak_demand_pricing(model, dict_values, dict_model)
+    assert (
+        answer is not None
+    ), f"The peak demand pricing constraint should be added to the model."
+    model.solve(solver="cbc")
+    D2.store_peak_demand_pricing_results(model, dict_values)
+    for period, exp in zip(dict_values[ENERGY_CONVERSION].values(), (3, 2)):
+        assert period[OPTIMIZED_PEAK_DEMAND][VALUE] == pytest.approx(
+            exp
+        ), f"The peak demand of {period[LABEL]} should be the maximal consumption within the period ({exp}), but is {period[OPTIMIZED_PEAK_DEMAND][VALUE]}."
+    assert model.objective() == pytest.approx(
+        7 + 10 * (3 + 2)
+    ), f"The peak demand should be added to the objective with its annuity."
+    with D2.detached_peak_demand_pricing_blocks(model):
+        solph.processing.results(model)
+    assert (
+        model.component(D2.PEAK_DEMAND_PRICING_BLOCK + "DSO") is not None
+    ), f"The peak demand pricing block should be attached again after the results are processed."
+
+
+def test_constraint_peak_demand_pricing_lp_scaling():
+    dict_values, model, dict_model = peak_demand_pricing_system()
+    dict_values.update(
+        {
+            LP_SCALING: {
+                ENERGY_SCALING_FACTOR: {VALUE: 10},
+                COST_SCALING_FACTOR: {VALUE: 100},
+            }
+        }
+    )
+    D2.constraint_peak_demand_pricing(model, dict_values, dict_model)
+    model.solve(solver="cbc")
+    D2.store_peak_demand_pricing_results(model, dict_values)
+    for period, exp in zip(dict_values[ENERGY_CONVERSION].values(), (30, 20)):
+        assert period[OPTIMIZED_PEAK_DEMAND][VALUE] == pytest.approx(
+            exp
+        ), f"The peak demand of {period[LABEL]} should be rescaled by the energy scaling factor to {exp}, but is {period[OPTIMIZED_PEAK_DEMAND][VALUE]}."
+    assert model.objective() == pytest.approx(
+        7 + 10 * 10 / 100 * (3 + 2)
+    ), f"The annuity of the peak demand should be scaled by the ratio of the energy and cost scaling factors."
+
+
+def test_constraint_peak_demand_pricing_not_applied():
+    dict_values, model, dict_model = peak_demand_pricing_system(
+        peak_demand_pricing_constraint=False
+    )
+    answer = D2.constraint_peak_demand_pricing(model, dict_values, dict_model)
+    assert (
+        answer is None
+    ), f"The peak demand pricing constraint should not be added if the peak demand pricing is modelled with transformers."
+
+
+def test_energy_of_flow():
+    time_index = pd.DatetimeIndex(
+        ["2018-01-01 00:00", "2018-01-01 03:00", "2018-01-01 04:00"]
+    )
+    energy_system = solph.EnergySystem(timeindex=time_index, timeincrement=[3, 1, 2])
+    bus = solph.Bus(label="Electricity")
+    source = solph.Source(label="source", outputs={bus: solph.Flow(variable_costs=1)})
+    demand = solph.Sink(
+        label="demand", inputs={bus: solph.Flow(fix=[1, 3, 2], nominal_value=1)},
+    )
+    energy_system.add(bus, source, demand)
+    model = solph.Model(energy_system)
+    model.solve(solver="cbc")
+    assert D2.energy_of_flow(model, source, bus)() == pytest.approx(
+        1 * 3 + 3 * 1 + 2 * 2
+    ), f"The flows should be weighted by the length of their timesteps."
+
+
+def test_emissions_of_energy_system():
+    time_index = pd.date_range("2018-01-01", periods=3, freq="H")
+    energy_system = solph.EnergySystem(timeindex=time_index, timeincrement=[1, 2, 1])
+    bus = solph.Bus(label="Electricity")
+    grid = solph.Source(
+        label="grid", outputs={bus: solph.Flow(variable_costs=1, emission_factor=0.5)},
+    )
+    diesel = solph.Source(
+        label="diesel", outputs={bus: solph.Flow(variable_costs=0.5, nominal_value=1)},
+    )
+    demand = solph.Sink(
+        label="demand", inputs={bus: solph.Flow(fix=[1, 3, 2], nominal_value=1)},
+    )
+    energy_system.add(bus, grid, diesel, demand)
+    model = solph.Model(energy_system)
+    model.solve(solver="cbc")
+    assert D2.emissions_of_energy_system(model)() == pytest.approx(
+        0.5 * (0 * 1 + 2 * 2 + 1 * 1)
+    ), f"Only the emissions of the flows with an emission factor should be summed up."
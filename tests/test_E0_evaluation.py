@@ -1,3 +1,4 @@
+import json
 import logging
 import os
 import pickle
@@ -6,14 +7,20 @@ import shutil
 import mock
 import pandas as pd
 import numpy as np
+import pytest
 
 import multi_vector_simulator.A0_initialization as A0
 import multi_vector_simulator.B0_data_input_json as B0
 import multi_vector_simulator.C0_data_processing as C0
 import multi_vector_simulator.D0_modelling_and_optimization as D0
 import multi_vector_simulator.E0_evaluation as E0
+import multi_vector_simulator.F0_output as F0
 
 from multi_vector_simulator.utils.constants import OUTPUT_FOLDER
+from multi_vector_simulator.utils.asset_records import (
+    AssetRecord,
+    dict_values_to_asset_records,
+)
 
 from multi_vector_simulator.utils.constants_json_strings import *
 
@@ -139,6 +146,36 @@ def test_evaluate_check_dict_fields_in_output_dict_under_kpi_scalar_fields():
     #    assert k in KPI_SCALARS
 
 
+def test_store_cost_ranging():
+    dict_test = {
+        SIMULATION_RESULTS: {
+            COST_RANGING: {
+                "pv": {
+                    SIMULATION_ANNUITY: {
+                        VALUE: 3,
+                        COST_RANGE_MINIMUM: 1,
+                        COST_RANGE_MAXIMUM: np.inf,
+                    },
+                    DISPATCH_PRICE: {
+                        VALUE: 0,
+                        COST_RANGE_MINIMUM: np.nan,
+                        COST_RANGE_MAXIMUM: np.nan,
+                    },
+                }
+            }
+        }
+    }
+    E0.initalize_kpi(dict_test)
+    E0.store_cost_ranging(dict_test)
+    cost_ranging = dict_test[KPI][KPI_COST_RANGING]
+    assert list(cost_ranging[COST_PARAMETER]) == [SIMULATION_ANNUITY, DISPATCH_PRICE]
+    assert (cost_ranging[LABEL] == "pv").all()
+    assert list(cost_ranging[COST_RANGE_MINIMUM].iloc[:1]) == [1]
+    assert np.isnan(
+        cost_ranging[COST_RANGE_MAXIMUM].iloc[1]
+    ), f"A cost range which could not be derived should be NaN."
+
+
 def test_process_fixcost():
     economic_data = {
         PROJECT_DURATION: {VALUE: 20},
@@ -219,3 +256,119 @@ energysystem.restore(dpath=None, filename=None)
 results = energysystem.results["main"]
 storage = energysystem.groups["storage"]
 """
+
+
+def test_reevaluate_economics_without_overrides_reproduces_cost_matrix():
+    with open(DICT_AFTER, "rb") as handle:
+        dict_values = pickle.load(handle)
+    cost_matrix = dict_values[KPI][KPI_COST_MATRIX].copy()
+    kpi_scalars = dict(dict_values[KPI][KPI_SCALARS_DICT])
+
+    E0.reevaluate_economics(dict_values, {})
+
+    pd.testing.assert_frame_equal(
+        dict_values[KPI][KPI_COST_MATRIX].reset_index(drop=True),
+        cost_matrix.reset_index(drop=True),
+    )
+    for k in [COST_TOTAL, ANNUITY_TOTAL, LCOeleq]:
+        assert dict_values[KPI][KPI_SCALARS_DICT][k] == pytest.approx(
+            kpi_scalars[k]
+        ), f"The re-evaluated KPI {k} should not change if the economic data does not change."
+
+
+def test_reevaluate_economics_updates_costs_and_flags_results():
+    with open(DICT_AFTER, "rb") as handle:
+        dict_values = pickle.load(handle)
+    discount_factor = dict_values[ECONOMIC_DATA][DISCOUNTFACTOR][VALUE]
+    crf = dict_values[ECONOMIC_DATA][CRF][VALUE]
+    annuity_total = dict_values[KPI][KPI_SCALARS_DICT][ANNUITY_TOTAL]
+    total_flow = {
+        label: dict_values[ENERGY_PRODUCTION][label][TOTAL_FLOW][VALUE]
+        for label in dict_values[ENERGY_PRODUCTION]
+    }
+
+    E0.reevaluate_economics(dict_values, {DISCOUNTFACTOR: discount_factor + 0.05})
+
+    assert dict_values[ECONOMIC_DATA][CRF][VALUE] > crf
+    assert dict_values[KPI][KPI_SCALARS_DICT][ANNUITY_TOTAL] != pytest.approx(
+        annuity_total
+    )
+    for label in dict_values[ENERGY_PRODUCTION]:
+        assert (
+            dict_values[ENERGY_PRODUCTION][label][TOTAL_FLOW][VALUE]
+            == total_flow[label]
+        ), f"The dispatch of {label} should not be re-optimized."
+    assert dict_values[SIMULATION_RESULTS][ECONOMIC_REEVALUATION] == {
+        REOPTIMIZED: False,
+        ECONOMIC_DATA_OVERRIDES: {
+            DISCOUNTFACTOR: {
+                ORIGINAL_VALUE: discount_factor,
+                VALUE: discount_factor + 0.05,
+            }
+        },
+    }
+
+
+def test_reevaluate_economics_of_asset_records():
+    with open(DICT_AFTER, "rb") as handle:
+        dict_values = pickle.load(handle)
+    with open(DICT_AFTER, "rb") as handle:
+        records = dict_values_to_asset_records(pickle.load(handle))
+    overrides = {DISCOUNTFACTOR: 0.1}
+
+    E0.reevaluate_economics(dict_values, overrides)
+    E0.reevaluate_economics(records, overrides)
+
+    for group in [ENERGY_STORAGE, ENERGY_PRODUCTION, FIX_COST]:
+        for asset in records[group].values():
+            assert isinstance(asset, AssetRecord)
+    pd.testing.assert_frame_equal(
+        records[KPI][KPI_COST_MATRIX], dict_values[KPI][KPI_COST_MATRIX]
+    )
+    assert json.loads(F0.store_as_json(records)) == json.loads(
+        F0.store_as_json(dict_values)
+    )
+
+
+def test_reevaluate_economics_unknown_parameter():
+    with open(DICT_AFTER, "rb") as handle:
+        dict_values = pickle.load(handle)
+    with pytest.raises(ValueError):
+        E0.reevaluate_economics(dict_values, {CRF: 0.1})
+
+
+def test_reevaluate_economics_project_duration():
+    with open(DICT_AFTER, "rb") as handle:
+        dict_values = pickle.load(handle)
+    annuity_total = dict_values[KPI][KPI_SCALARS_DICT][ANNUITY_TOTAL]
+    project_duration = dict_values[ECONOMIC_DATA][PROJECT_DURATION][VALUE]
+
+    # the values of the command line are provided as str
+    E0.reevaluate_economics(dict_values, {PROJECT_DURATION: str(project_duration + 5)})
+
+    assert dict_values[ECONOMIC_DATA][PROJECT_DURATION][VALUE] == project_duration + 5
+    assert isinstance(dict_values[ECONOMIC_DATA][PROJECT_DURATION][VALUE], int)
+    assert dict_values[KPI][KPI_SCALARS_DICT][ANNUITY_TOTAL] != pytest.approx(
+        annuity_total
+    )
+
+
+def test_convert_economic_data_override():
+    assert E0.convert_economic_data_override(PROJECT_DURATION, "25") == 25
+    assert isinstance(E0.convert_economic_data_override(PROJECT_DURATION, 25.0), int)
+    assert E0.convert_economic_data_override(DISCOUNTFACTOR, "0.1") == 0.1
+    assert isinstance(E0.convert_economic_data_override(TAX, 0), float)
+
+
+@pytest.mark.parametrize(
+    "parameter, value",
+    [
+        (PROJECT_DURATION, "25.5"),
+        (PROJECT_DURATION, "0"),
+        (DISCOUNTFACTOR, "a"),
+        (TAX, None),
+    ],
+)
+def test_convert_economic_data_override_invalid_value(parameter, value):
+    with pytest.raises(ValueError):
+        E0.convert_economic_data_override(parameter, value)
@@ -6,6 +6,7 @@ import numpy as np
 import logging
 import shutil
 import mock
+import pytest
 import oemof.solph as solph
 import pickle
 
@@ -16,7 +17,7 @@ import multi_vector_simulator.C0_data_processing as C0
 import multi_vector_simulator.D0_modelling_and_optimization as D0
 import multi_vector_simulator.E1_process_results as E1
 
-from multi_vector_simulator.utils.constants import OUTPUT_FOLDER, CSV_EXT
+from multi_vector_simulator.utils.constants import OUTPUT_FOLDER, CSV_EXT, SOC
 
 from multi_vector_simulator.utils.constants_json_strings import *
 
@@ -308,6 +309,84 @@ def test_cut_below_micro_pd_Series_larger_0_smaller_threshold(caplog):
     ).all(), f"One value in pd.Series is below 0 but smaller then the threshold, its value should be changed to zero (but it is {result})."
 
 
+def results_below_threshold():
+    time_index = pd.date_range("2018-01-01", periods=3, freq="H")
+    return {
+        ("pv", "Electricity"): {
+            E1.OEMOF_SCALARS: pd.Series({E1.OEMOF_INVEST: 0.5 * E1.THRESHOLD}),
+            E1.OEMOF_SEQUENCES: pd.DataFrame(
+                {E1.OEMOF_FLOW: [1, -0.5 * E1.THRESHOLD, 0.5 * E1.THRESHOLD]},
+                index=time_index,
+            ),
+        },
+        ("battery", None): {
+            E1.OEMOF_SCALARS: pd.Series(dtype=float),
+            E1.OEMOF_SEQUENCES: pd.DataFrame(
+                {E1.OEMOF_STORAGE_CONTENT: [2, 1, 0]}, index=time_index
+            ),
+        },
+    }
+
+
+def test_cut_results_below_micro():
+    dict_values = {SIMULATION_RESULTS: {}}
+    results_main = results_below_threshold()
+    results = E1.cut_results_below_micro(dict_values, results_main)
+    pv = results[("pv", "Electricity")]
+    assert list(pv[E1.OEMOF_SEQUENCES][E1.OEMOF_FLOW]) == [
+        1,
+        0,
+        0,
+    ], f"The values of the flow within the threshold should be set to 0."
+    assert pv[E1.OEMOF_SCALARS][E1.OEMOF_INVEST] == 0
+    assert pv[E1.OEMOF_SEQUENCES].index.equals(
+        results_main[("pv", "Electricity")][E1.OEMOF_SEQUENCES].index
+    )
+    assert list(
+        results[("battery", None)][E1.OEMOF_SEQUENCES][E1.OEMOF_STORAGE_CONTENT]
+    ) == [2, 1, 0]
+    assert dict_values[SIMULATION_RESULTS][RESULTS_BELOW_THRESHOLD] == {
+        "pv/Electricity": {NEGATIVE_VALUES_SET_TO_0: 1, POSITIVE_VALUES_SET_TO_0: 1},
+        "pv/Electricity invest": {
+            NEGATIVE_VALUES_SET_TO_0: 0,
+            POSITIVE_VALUES_SET_TO_0: 1,
+        },
+    }, f"Only the flows and capacities with rounded values should be summarized."
+    assert (
+        results_main[("pv", "Electricity")][E1.OEMOF_SEQUENCES][E1.OEMOF_FLOW][1] < 0
+    ), f"The results of the optimization should not be modified."
+
+
+def test_cut_results_below_micro_negative_values_exceeding_threshold(caplog):
+    dict_values = {SIMULATION_RESULTS: {}}
+    results_main = results_below_threshold()
+    results_main[("battery", None)][E1.OEMOF_SEQUENCES][E1.OEMOF_STORAGE_CONTENT] = [
+        2,
+        -0.5 * E1.THRESHOLD,
+        -1,
+    ]
+    with caplog.at_level(logging.WARNING):
+        results = E1.cut_results_below_micro(dict_values, results_main)
+    assert (
+        "battery storage_content" in caplog.text
+    ), f"A warning should be displayed for values below 0 exceeding the threshold."
+    assert list(
+        results[("battery", None)][E1.OEMOF_SEQUENCES][E1.OEMOF_STORAGE_CONTENT]
+    ) == [
+        2,
+        -0.5 * E1.THRESHOLD,
+        -1,
+    ], f"If any value of a sequence is below 0 by more than the threshold, its negative values should not be changed."
+    assert dict_values[SIMULATION_RESULTS][RESULTS_BELOW_THRESHOLD][
+        "battery storage_content"
+    ] == {
+        NEGATIVE_VALUES_SET_TO_0: 0,
+        POSITIVE_VALUES_SET_TO_0: 0,
+        NEGATIVE_VALUES_KEPT: 2,
+        MINIMAL_VALUE: -1,
+    }
+
+
 def test_add_info_flows_storage_capacity():
     dict_test = {}
     flow = pd.Series(
@@ -585,3 +664,418 @@ def test_get_optimal_cap_optimizeCap_not_in_dict_asset():
     pass
     # check that dict_asset did not change
 """
+
+
+def test_get_peak_demand_pricing_results():
+    time_index = pd.date_range("2018-01-01", periods=4, freq="H")
+    source = "DSO" + DSO_CONSUMPTION
+    period = source + "_period_1"
+    bus = "Electricity"
+    consumption = pd.Series([1, 3, 2, 1], index=time_index, dtype=float)
+    bus_data = {
+        bus: {
+            E1.OEMOF_SEQUENCES: pd.DataFrame(
+                {((source, bus), E1.OEMOF_FLOW): consumption}
+            )
+        }
+    }
+    dict_values = {
+        SIMULATION_SETTINGS: {EVALUATED_PERIOD: {VALUE: 365}},
+        OPTIMIZED_FLOWS: {
+            bus: pd.DataFrame({source: consumption, "demand": -consumption})
+        },
+    }
+    dict_asset = {
+        LABEL: period,
+        UNIT: "kW",
+        OUTFLOW_DIRECTION: bus,
+        CONNECTED_CONSUMPTION_SOURCE: source,
+        AVAILABILITY_DISPATCH: pd.Series([1, 1, 0, 0], index=time_index),
+        OPTIMIZED_PEAK_DEMAND: {VALUE: 3, UNIT: "kW"},
+    }
+    E1.get_peak_demand_pricing_results(dict_values, bus_data, dict_asset)
+    assert (
+        dict_asset[OPTIMIZED_ADD_CAP][VALUE] == 3
+    ), f"The {OPTIMIZED_ADD_CAP} of the period should be its optimized peak demand (3), but is {dict_asset[OPTIMIZED_ADD_CAP][VALUE]}."
+    assert_series_equal(
+        dict_asset[FLOW],
+        pd.Series([1, 3, 0, 0], index=time_index, dtype=float),
+        check_names=False,
+    )
+    assert (
+        dict_asset[TOTAL_FLOW][VALUE] == 4
+    ), f"The {TOTAL_FLOW} of the period should only include the consumption within the period."
+    assert list(dict_values[OPTIMIZED_FLOWS][bus].columns) == [
+        "demand",
+        period,
+    ], f"The consumption of the energy provider should be replaced by the flows of its periods in the {OPTIMIZED_FLOWS}."
+
+
+def test_rescale_results_of_scaled_model():
+    time_index = pd.date_range("2020-01-01", periods=2, freq="H")
+    dict_values = {
+        SIMULATION_RESULTS: {OBJECTIVE_VALUE: 2.5},
+        LP_SCALING: {
+            ENERGY_SCALING_FACTOR: {VALUE: 1000},
+            COST_SCALING_FACTOR: {VALUE: 100},
+        },
+    }
+    results_main = {
+        ("pv", "Electricity"): {
+            E1.OEMOF_SCALARS: pd.Series({"invest": 0.5}),
+            E1.OEMOF_SEQUENCES: pd.DataFrame(
+                {E1.OEMOF_FLOW: pd.Series([0.1, 0.2], index=time_index)}
+            ),
+        }
+    }
+    results_main = E1.rescale_results_of_scaled_model(dict_values, results_main)
+    assert results_main[("pv", "Electricity")][E1.OEMOF_SCALARS][
+        "invest"
+    ] == pytest.approx(500)
+    assert list(
+        results_main[("pv", "Electricity")][E1.OEMOF_SEQUENCES][E1.OEMOF_FLOW]
+    ) == pytest.approx([100, 200])
+    assert dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE] == pytest.approx(250)
+
+
+def test_rescale_results_of_scaled_model_two_stage_planning():
+    dict_values = {
+        SIMULATION_RESULTS: {
+            OBJECTIVE_VALUE: 2.5,
+            INVESTMENT_STAGE_OBJECTIVE_VALUE: 2,
+        },
+        LP_SCALING: {
+            ENERGY_SCALING_FACTOR: {VALUE: 1000},
+            COST_SCALING_FACTOR: {VALUE: 100},
+        },
+    }
+    E1.rescale_results_of_scaled_model(dict_values, {})
+    assert dict_values[SIMULATION_RESULTS][
+        INVESTMENT_STAGE_OBJECTIVE_VALUE
+    ] == pytest.approx(200)
+
+
+def test_rescale_results_of_scaled_model_not_scaled():
+    dict_values = {SIMULATION_RESULTS: {OBJECTIVE_VALUE: 2.5}}
+    results_main = {("pv", "Electricity"): {}}
+    assert E1.rescale_results_of_scaled_model(dict_values, results_main) is results_main
+    assert dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE] == 2.5
+
+
+def reduced_model_results():
+    time_index = pd.date_range("2018-01-01", periods=3, freq="H")
+
+    def flow_results(flow, scalars=None):
+        return {
+            E1.OEMOF_SCALARS: pd.Series(scalars, dtype=float),
+            E1.OEMOF_SEQUENCES: pd.DataFrame(
+                {E1.OEMOF_FLOW: pd.Series(flow, index=time_index, dtype=float)}
+            ),
+        }
+
+    dict_values = {
+        SIMULATION_SETTINGS: {TIME_INDEX: time_index},
+        ENERGY_CONVERSION: {
+            "period": {
+                LABEL: "period",
+                INFLOW_DIRECTION: "Electricity_pdp",
+                OUTFLOW_DIRECTION: "Electricity",
+                OPTIMIZE_CAP: {VALUE: True},
+                INSTALLED_CAP: {VALUE: 1},
+            }
+        },
+        ENERGY_PRODUCTION: {
+            "DSO_consumption": {
+                LABEL: "DSO_consumption",
+                OUTFLOW_DIRECTION: "Electricity_pdp",
+            },
+            "pv": {LABEL: "pv", OUTFLOW_DIRECTION: "Electricity"},
+        },
+        ENERGY_CONSUMPTION: {
+            "demand": {LABEL: "demand", INFLOW_DIRECTION: "Electricity"}
+        },
+        ENERGY_STORAGE: {},
+        REDUCED_MODEL: {
+            REMOVED_ASSETS: {"period": "merged", "pv": "zero capacity"},
+            MERGED_BUSSES: {
+                "Electricity_pdp": {
+                    KEPT_BUS: "Electricity",
+                    PASS_THROUGH_TRANSFORMER: "period",
+                }
+            },
+        },
+    }
+    results_main = {
+        ("DSO_consumption", "Electricity"): flow_results([1, 3, 2]),
+        ("Electricity", "demand"): flow_results([1, 3, 2]),
+    }
+    return dict_values, E1.restore_results_of_reduced_model(dict_values, results_main)
+
+
+def test_restore_results_of_reduced_model_removed_asset():
+    dict_values, results = reduced_model_results()
+    assert (
+        "pv",
+        "Electricity",
+    ) in results, "A removed asset should get a flow in the results."
+    assert (
+        results[("pv", "Electricity")][E1.OEMOF_SEQUENCES][E1.OEMOF_FLOW].sum() == 0
+    ), "The flow of a removed asset should be 0."
+
+
+def test_restore_results_of_reduced_model_merged_bus():
+    dict_values, results = reduced_model_results()
+    assert (
+        "DSO_consumption",
+        "Electricity",
+    ) not in results, (
+        "The flow into the kept bus should be assigned to the merged bus again."
+    )
+    assert list(
+        results[("DSO_consumption", "Electricity_pdp")][E1.OEMOF_SEQUENCES][
+            E1.OEMOF_FLOW
+        ]
+    ) == [1, 3, 2]
+    for flow_tuple in [("Electricity_pdp", "period"), ("period", "Electricity")]:
+        assert list(results[flow_tuple][E1.OEMOF_SEQUENCES][E1.OEMOF_FLOW]) == [
+            1,
+            3,
+            2,
+        ], f"The pass-through transformer should transport the flow into the merged bus."
+    assert (
+        results[("period", "Electricity")][E1.OEMOF_SCALARS][E1.OEMOF_INVEST] == 2
+    ), "The optimized capacity of the pass-through transformer should cover its peak flow exceeding the installed capacity."
+
+
+def test_split_aggregated_capacity_maximum_add_cap():
+    dict_assets = [
+        {MAXIMUM_ADD_CAP: {VALUE: 30}, INSTALLED_CAP: {VALUE: 0}},
+        {MAXIMUM_ADD_CAP: {VALUE: 10}, INSTALLED_CAP: {VALUE: 5}},
+    ]
+    assert E1.split_aggregated_capacity(dict_assets, 20) == [
+        15,
+        5,
+    ], f"The optimized capacity should be split proportionally to the {MAXIMUM_ADD_CAP} of the aggregated sources."
+
+
+def test_split_aggregated_capacity_installed_cap():
+    dict_assets = [
+        {MAXIMUM_ADD_CAP: {VALUE: None}, INSTALLED_CAP: {VALUE: 3}},
+        {MAXIMUM_ADD_CAP: {VALUE: 10}, INSTALLED_CAP: {VALUE: 1}},
+    ]
+    assert E1.split_aggregated_capacity(dict_assets, 20) == [
+        15,
+        5,
+    ], f"The optimized capacity should be split proportionally to the {INSTALLED_CAP} of the aggregated sources if their additional capacity is not limited."
+    for dict_asset in dict_assets:
+        dict_asset[INSTALLED_CAP][VALUE] = 0
+    assert E1.split_aggregated_capacity(dict_assets, 20) == [10, 10]
+
+
+def aggregated_model_results():
+    time_index = pd.date_range("2018-01-01", periods=3, freq="H")
+    dict_values = {
+        SIMULATION_SETTINGS: {TIME_INDEX: time_index},
+        ENERGY_CONVERSION: {},
+        ENERGY_PRODUCTION: {
+            "pv_01": {
+                LABEL: "pv_01",
+                OUTFLOW_DIRECTION: "Electricity",
+                INSTALLED_CAP: {VALUE: 1},
+                MAXIMUM_ADD_CAP: {VALUE: None},
+            },
+            "pv_02": {
+                LABEL: "pv_02",
+                OUTFLOW_DIRECTION: "Electricity",
+                INSTALLED_CAP: {VALUE: 3},
+                MAXIMUM_ADD_CAP: {VALUE: None},
+            },
+        },
+        ENERGY_CONSUMPTION: {
+            "demand_01": {
+                LABEL: "demand_01",
+                INFLOW_DIRECTION: "Electricity",
+                TIMESERIES: pd.Series([1, 0, 2], index=time_index),
+            },
+            "demand_02": {
+                LABEL: "demand_02",
+                INFLOW_DIRECTION: "Electricity",
+                TIMESERIES: pd.Series([1, 3, 0], index=time_index),
+            },
+        },
+        ENERGY_STORAGE: {},
+        REDUCED_MODEL: {
+            REMOVED_ASSETS: {},
+            MERGED_BUSSES: {},
+            AGGREGATED_ASSETS: {
+                "pv_01": ["pv_01", "pv_02"],
+                "demand_01": ["demand_01", "demand_02"],
+            },
+        },
+    }
+    results_main = {
+        ("pv_01", "Electricity"): {
+            E1.OEMOF_SCALARS: pd.Series({E1.OEMOF_INVEST: 4.0}),
+            E1.OEMOF_SEQUENCES: pd.DataFrame(
+                {E1.OEMOF_FLOW: pd.Series([8, 4, 0], index=time_index, dtype=float)}
+            ),
+        },
+        ("Electricity", "demand_01"): {
+            E1.OEMOF_SCALARS: pd.Series(dtype=float),
+            E1.OEMOF_SEQUENCES: pd.DataFrame(
+                {E1.OEMOF_FLOW: pd.Series([2, 3, 2], index=time_index, dtype=float)}
+            ),
+        },
+    }
+    return E1.restore_results_of_reduced_model(dict_values, results_main)
+
+
+def test_restore_results_of_reduced_model_aggregated_sources():
+    results = aggregated_model_results()
+    for pv, flow, invest in (("pv_01", [2, 1, 0], 1), ("pv_02", [6, 3, 0], 3)):
+        assert (
+            list(results[(pv, "Electricity")][E1.OEMOF_SEQUENCES][E1.OEMOF_FLOW])
+            == flow
+        ), f"The flow of {pv} should be proportional to its total capacity."
+        assert results[(pv, "Electricity")][E1.OEMOF_SCALARS][E1.OEMOF_INVEST] == invest
+
+
+def test_restore_results_of_reduced_model_aggregated_sinks():
+    results = aggregated_model_results()
+    for demand, flow in (("demand_01", [1, 0, 2]), ("demand_02", [1, 3, 0])):
+        assert (
+            list(results[("Electricity", demand)][E1.OEMOF_SEQUENCES][E1.OEMOF_FLOW])
+            == flow
+        ), f"The flow of {demand} should be its timeseries."
+
+
+def test_get_result_granularity_default():
+    assert E1.get_result_granularity({}) == (GRANULARITY_FULL, [])
+
+
+def test_get_result_granularity_from_csv_values():
+    settings = {RESULT_GRANULARITY: GRANULARITY_DAILY, FULL_RESOLUTION_ASSETS: "pv"}
+    assert E1.get_result_granularity(settings) == (GRANULARITY_DAILY, ["pv"])
+    settings = {
+        RESULT_GRANULARITY: {VALUE: GRANULARITY_MONTHLY, UNIT: "str"},
+        FULL_RESOLUTION_ASSETS: {VALUE: ["pv", "demand"], UNIT: "str"},
+    }
+    assert E1.get_result_granularity(settings) == (
+        GRANULARITY_MONTHLY,
+        ["pv", "demand"],
+    )
+
+
+def test_get_result_granularity_unknown_value():
+    with pytest.raises(ValueError):
+        E1.get_result_granularity({RESULT_GRANULARITY: "weekly"})
+
+
+GRANULARITY_TIME_INDEX = pd.date_range("2020-01-01", periods=72, freq="H")
+
+
+def test_aggregate_timeseries_daily():
+    timeseries = pd.Series(range(72), index=GRANULARITY_TIME_INDEX)
+    periods = E1.aggregate_timeseries(timeseries, GRANULARITY_DAILY)
+    assert periods.sum().to_list() == [276, 852, 1428]
+    assert periods.max().to_list() == [23, 47, 71]
+    assert periods.sum().index[1] == pd.Timestamp("2020-01-02")
+
+
+def test_aggregate_timeseries_totals():
+    timeseries = pd.DataFrame(
+        {"pv": range(72), "demand": [-1] * 72}, index=GRANULARITY_TIME_INDEX
+    )
+    totals = E1.aggregate_timeseries(timeseries, GRANULARITY_TOTALS).sum()
+    assert totals.index.to_list() == [GRANULARITY_TIME_INDEX[0]]
+    assert totals["pv"].to_list() == [2556]
+    assert totals["demand"].to_list() == [-72]
+
+
+def test_get_period_index():
+    period_index = E1.get_period_index(GRANULARITY_TIME_INDEX, GRANULARITY_HOURLY)
+    assert period_index.equals(GRANULARITY_TIME_INDEX)
+    period_index = E1.get_period_index(GRANULARITY_TIME_INDEX, GRANULARITY_MONTHLY)
+    assert period_index.to_list() == [pd.Timestamp("2020-01-01")]
+
+
+def dict_values_with_result_timeseries(granularity, full_resolution_assets=None):
+    flow = pd.Series([1.0, 2.0, 3.0] * 24, index=GRANULARITY_TIME_INDEX)
+    settings = {RESULT_GRANULARITY: {VALUE: granularity, UNIT: "str"}}
+    if full_resolution_assets is not None:
+        settings[FULL_RESOLUTION_ASSETS] = {VALUE: full_resolution_assets, UNIT: "str"}
+    return {
+        SIMULATION_SETTINGS: settings,
+        ENERGY_PRODUCTION: {"pv": {LABEL: "pv", FLOW: flow.copy()}},
+        ENERGY_CONSUMPTION: {"demand": {LABEL: "demand", FLOW: flow.copy()}},
+        ENERGY_STORAGE: {
+            "battery": {
+                LABEL: "battery",
+                INPUT_POWER: {FLOW: flow.copy()},
+                OUTPUT_POWER: {FLOW: flow.copy()},
+                STORAGE_CAPACITY: {FLOW: 10 * flow},
+                TIMESERIES_SOC: flow / 3,
+            }
+        },
+        OPTIMIZED_FLOWS: {
+            "Electricity": pd.DataFrame(
+                {"pv": flow, "demand": -flow, f"battery (10kWh) {SOC}": flow / 3}
+            ),
+        },
+    }
+
+
+def test_aggregate_result_timeseries_full():
+    dict_values = dict_values_with_result_timeseries(GRANULARITY_FULL)
+    E1.aggregate_result_timeseries(dict_values)
+    assert len(dict_values[ENERGY_PRODUCTION]["pv"][FLOW]) == 72
+    assert PERIOD_PEAK_FLOW not in dict_values[ENERGY_PRODUCTION]["pv"]
+    assert len(dict_values[OPTIMIZED_FLOWS]["Electricity"]) == 72
+
+
+def test_aggregate_result_timeseries_daily():
+    dict_values = dict_values_with_result_timeseries(GRANULARITY_DAILY)
+    E1.aggregate_result_timeseries(dict_values)
+    pv = dict_values[ENERGY_PRODUCTION]["pv"]
+    assert pv[FLOW].to_list() == [48, 48, 48]
+    assert pv[PERIOD_PEAK_FLOW].to_list() == [3, 3, 3]
+    assert pv[PERIOD_AVERAGE_FLOW].to_list() == [2, 2, 2]
+    battery = dict_values[ENERGY_STORAGE]["battery"]
+    assert battery[INPUT_POWER][FLOW].to_list() == [48, 48, 48]
+    assert battery[STORAGE_CAPACITY][FLOW].to_list() == [20, 20, 20]
+    assert PERIOD_PEAK_FLOW not in battery[STORAGE_CAPACITY]
+    assert battery[TIMESERIES_SOC].round(6).to_list() == [0.666667] * 3
+    assert dict_values[OPTIMIZED_FLOWS]["Electricity"]["demand"].to_list() == [
+        -48,
+        -48,
+        -48,
+    ]
+    assert (
+        dict_values[OPTIMIZED_FLOWS]["Electricity"][f"battery (10kWh) {SOC}"]
+        .round(6)
+        .to_list()
+        == [0.666667] * 3
+    )
+
+
+def test_aggregate_result_timeseries_totals():
+    dict_values = dict_values_with_result_timeseries(GRANULARITY_TOTALS)
+    E1.aggregate_result_timeseries(dict_values)
+    assert dict_values[ENERGY_CONSUMPTION]["demand"][FLOW].to_list() == [144]
+    assert dict_values[ENERGY_STORAGE]["battery"][TIMESERIES_SOC].index.to_list() == [
+        GRANULARITY_TIME_INDEX[0]
+    ]
+    assert dict_values[OPTIMIZED_FLOWS]["Electricity"].shape == (1, 3)
+
+
+def test_aggregate_result_timeseries_full_resolution_assets(caplog):
+    dict_values = dict_values_with_result_timeseries(
+        GRANULARITY_MONTHLY, full_resolution_assets=["pv", "battery", "wind"]
+    )
+    with caplog.at_level(logging.WARNING):
+        E1.aggregate_result_timeseries(dict_values)
+    assert "wind" in caplog.text
+    assert len(dict_values[ENERGY_PRODUCTION]["pv"][FLOW]) == 72
+    assert len(dict_values[ENERGY_STORAGE]["battery"][TIMESERIES_SOC]) == 72
+    assert dict_values[ENERGY_CONSUMPTION]["demand"][FLOW].to_list() == [144]
+    assert len(dict_values[OPTIMIZED_FLOWS]["Electricity"]) == 1
@@ -10,6 +10,7 @@
 """
 
 import copy
+import json
 import os
 import shutil
 
@@ -39,7 +40,10 @@ from multi_vector_simulator.utils.constants_json_strings import (
     OBJECTIVE_VALUE,
     SIMULTATION_TIME,
     MODELLING_TIME,
+    TIMESERIES_STORE,
+    VALUE,
 )
+from multi_vector_simulator.utils.timeseries_store import share_timeseries
 from _constants import (
     EXECUTE_TESTS_ON,
     TESTS_ON_MASTER,
@@ -353,6 +357,19 @@ class TestDictionaryToJsonConversion:
             "data": [[0, 0], [1, 1], [2, 2]],
         }
 
+    def test_processing_dict_for_json_export_reference_timeseries_store(self):
+        """ """
+        dict_values = {"a": pandas_Series.copy(), "b": {"c": pandas_Series.copy()}}
+        share_timeseries(dict_values)
+        json_values = json.loads(F0.store_as_json(dict_values))
+        key = json_values["a"][TIMESERIES_STORE]
+        assert json_values["a"] == {
+            DATA_TYPE_JSON_KEY: TYPE_SERIES,
+            TIMESERIES_STORE: key,
+        }
+        assert json_values["b"]["c"] == json_values["a"]
+        assert json_values[TIMESERIES_STORE][VALUE] == {key: VALUES}
+
     def test_processing_dict_for_json_export_parse_unknown(self):
         """ """
         with pytest.raises(TypeError):
@@ -0,0 +1,329 @@
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from multi_vector_simulator.utils.analysis import (
+    sample_parameters,
+    multi_param_variation_analysis,
+    sample_timeseries_variants,
+    stochastic_timeseries_analysis,
+    pareto_front_analysis,
+    scenario_variants_analysis,
+    scenario_delta_analysis,
+    FULL_FACTORIAL,
+    LATIN_HYPERCUBE,
+    SOBOL,
+    RUN_ID,
+    RUN_ERROR,
+    SCENARIO_FILE,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    EMISSION_BOUND,
+    PARETO_POINT,
+)
+from multi_vector_simulator.utils.scenario_delta import (
+    store_base,
+    write_scenario_delta,
+)
+
+ENERGY_PRICE = "energyProviders.Electricity_grid_DSO.energy_price.value"
+DISCOUNT_FACTOR = ("economic_data", "discount_factor", "value")
+OBJECTIVE = "simulation_results.objective_value"
+DEMAND = "energyConsumption.demand_01.timeseries"
+PV = "energyProduction.pv_plant_01.timeseries"
+EMISSIONS = "kpi.scalars.total_emissions"
+COSTS = "kpi.scalars.costs_total"
+
+
+class TestSampleParameters:
+    def test_full_factorial_all_combinations(self):
+        samples = sample_parameters({ENERGY_PRICE: [1, 2, 3], DISCOUNT_FACTOR: [4, 5]})
+        assert len(samples) == 6
+        assert samples[0] == {tuple(ENERGY_PRICE.split(".")): 1, DISCOUNT_FACTOR: 4}
+
+    def test_latin_hypercube_one_sample_per_stratum(self):
+        n_samples = 10
+        samples = sample_parameters(
+            {ENERGY_PRICE: (0, 1), DISCOUNT_FACTOR: (10, 20)},
+            design=LATIN_HYPERCUBE,
+            n_samples=n_samples,
+            seed=2,
+        )
+        values = np.array([list(s.values()) for s in samples])
+        strata = np.floor((values - [0, 10]) / [1, 10] * n_samples)
+        for column in strata.T:
+            assert sorted(column) == list(range(n_samples))
+
+    def test_latin_hypercube_reproducible_with_seed(self):
+        kwargs = dict(design=LATIN_HYPERCUBE, n_samples=5, seed=3)
+        space = {ENERGY_PRICE: (0, 1)}
+        assert sample_parameters(space, **kwargs) == sample_parameters(space, **kwargs)
+
+    def test_sobol_within_bounds(self):
+        pytest.importorskip("scipy.stats.qmc")
+        samples = sample_parameters(
+            {ENERGY_PRICE: (0, 1), DISCOUNT_FACTOR: (10, 20)},
+            design=SOBOL,
+            n_samples=8,
+            seed=1,
+        )
+        values = np.array([list(s.values()) for s in samples])
+        assert values.shape == (8, 2)
+        assert values[:, 0].min() >= 0 and values[:, 0].max() <= 1
+        assert values[:, 1].min() >= 10 and values[:, 1].max() <= 20
+
+    def test_sampled_design_requires_n_samples(self):
+        with pytest.raises(ValueError):
+            sample_parameters({ENERGY_PRICE: (0, 1)}, design=LATIN_HYPERCUBE)
+
+    def test_unknown_design(self):
+        with pytest.raises(ValueError):
+            sample_parameters({ENERGY_PRICE: [1]}, design="unknown")
+
+
+class TestMultiParamVariationAnalysis:
+    def test_results_streamed_to_file(self, json_input, tmp_path):
+        results_file = str(tmp_path / "results.csv")
+        results = multi_param_variation_analysis(
+            json_input,
+            {ENERGY_PRICE: [0.5, 0.8], DISCOUNT_FACTOR: [0.05, 0.1]},
+            (OBJECTIVE,),
+            results_file,
+            max_workers=2,
+        )
+        assert list(results[RUN_ID]) == [0, 1, 2, 3]
+        assert results[RUN_ERROR].isna().all()
+        # a higher energy price leads to higher costs
+        assert results.loc[2, OBJECTIVE] > results.loc[0, OBJECTIVE]
+        assert pd.read_csv(results_file).shape == results.shape
+
+    def test_resume_runs_only_missing_simulations(self, json_input, tmp_path):
+        results_file = str(tmp_path / "results.csv")
+        space = {ENERGY_PRICE: [0.5, 0.8, 1.1]}
+        multi_param_variation_analysis(
+            json_input, space, (OBJECTIVE,), results_file, max_workers=1
+        )
+        complete = pd.read_csv(results_file).sort_values(RUN_ID)
+        # drop the last run and mark the others, as if the analysis was interrupted
+        partial = complete[complete[RUN_ID] != 2].copy()
+        partial[OBJECTIVE] = -1
+        partial.to_csv(results_file, index=False)
+
+        results = multi_param_variation_analysis(
+            json_input, space, (OBJECTIVE,), results_file, max_workers=1
+        )
+        assert list(results[RUN_ID]) == [0, 1, 2]
+        assert list(results[OBJECTIVE][:2]) == [-1, -1]
+        assert results[OBJECTIVE][2] == pytest.approx(complete[OBJECTIVE].iloc[2])
+
+    def test_resume_random_design_without_seed_raises(self, json_input, tmp_path):
+        results_file = str(tmp_path / "results.csv")
+        open(results_file, "w").close()
+        with pytest.raises(ValueError):
+            multi_param_variation_analysis(
+                json_input,
+                {ENERGY_PRICE: (0, 1)},
+                (OBJECTIVE,),
+                results_file,
+                design=LATIN_HYPERCUBE,
+                n_samples=2,
+            )
+
+    def test_failed_run_stores_error(self, json_input, tmp_path):
+        results_file = str(tmp_path / "results.csv")
+        results = multi_param_variation_analysis(
+            json_input,
+            {ENERGY_PRICE: [0.5]},
+            ("not.an.output",),
+            results_file,
+            max_workers=1,
+        )
+        assert "KeyError" in results[RUN_ERROR][0]
+
+
+class TestSampleTimeseriesVariants:
+    timeseries = np.vstack([np.arange(48.0), 100 + np.arange(48.0)])
+
+    def test_bootstrapped_days_are_common_to_all_timeseries(self):
+        variants = sample_timeseries_variants(self.timeseries, 5, seed=1)
+        assert variants.shape == (5, 2, 48)
+        # each day of a variant is one of the original days, the same for both timeseries
+        assert set(variants[:, 0, ::24].flatten()).issubset({0, 24})
+        assert np.array_equal(variants[:, 1] - variants[:, 0], np.full((5, 48), 100))
+
+    def test_reproducible_with_seed(self):
+        kwargs = dict(noise_std=0.1, ar_coefficient=0.5, seed=3)
+        assert np.array_equal(
+            sample_timeseries_variants(self.timeseries, 3, **kwargs),
+            sample_timeseries_variants(self.timeseries, 3, **kwargs),
+        )
+
+    def test_fully_correlated_noise(self):
+        variants = sample_timeseries_variants(
+            np.ones((2, 48)),
+            4,
+            bootstrap_days=False,
+            noise_std=0.1,
+            noise_correlation=1,
+            seed=2,
+        )
+        assert np.allclose(variants[:, 0], variants[:, 1])
+        assert variants.std() > 0
+
+    def test_scaling_within_bounds(self):
+        variants = sample_timeseries_variants(
+            np.ones((2, 48)), 10, scaling=[(2, 3), None], seed=4
+        )
+        assert variants[:, 0].min() >= 2 and variants[:, 0].max() <= 3
+        assert np.array_equal(variants[:, 1], np.ones((10, 48)))
+
+    def test_written_in_provided_array(self):
+        out = np.zeros((2, 2, 48))
+        answer = sample_timeseries_variants(self.timeseries, 2, seed=5, out=out)
+        assert answer is out and out.any()
+
+    def test_less_than_a_day_raises(self):
+        with pytest.raises(ValueError):
+            sample_timeseries_variants(np.ones((1, 10)), 2)
+
+
+class TestStochasticTimeseriesAnalysis:
+    def test_output_distributions(self, json_input):
+        results, summary = stochastic_timeseries_analysis(
+            json_input,
+            (DEMAND, PV),
+            (OBJECTIVE,),
+            n_variants=3,
+            noise_std=0.05,
+            ar_coefficient=0.5,
+            scaling={DEMAND: (0.9, 1.1)},
+            seed=2,
+            max_workers=2,
+        )
+        assert list(results[RUN_ID]) == [0, 1, 2]
+        assert (results[RUN_ERROR] == "").all()
+        # the variants lead to different costs
+        assert results[OBJECTIVE].nunique() == 3
+        assert summary.loc["count", OBJECTIVE] == 3
+        assert summary.loc["50%", OBJECTIVE] == pytest.approx(
+            results[OBJECTIVE].median()
+        )
+
+    def test_timeseries_of_different_length_raises(self, json_input):
+        json_input["energyConsumption"]["demand_01"]["timeseries"]["value"].pop()
+        with pytest.raises(ValueError):
+            stochastic_timeseries_analysis(json_input, (DEMAND, PV), (OBJECTIVE,), 2)
+
+
+class TestParetoFrontAnalysis:
+    @pytest.fixture
+    def json_input_with_emissions(self, json_input):
+        dso = json_input["energyProviders"]["Electricity_grid_DSO"]
+        dso["emission_factor"]["value"] = 0.5
+        dso["feedin_tariff"]["value"] = 0
+        pv_plant = json_input["energyProduction"]["pv_plant_01"]
+        pv_plant["optimizeCap"]["value"] = True
+        pv_plant["specific_costs"]["value"] = 15000
+        return json_input
+
+    def test_costs_increase_with_decreasing_emissions(
+        self, json_input_with_emissions, tmpdir
+    ):
+        results_file = os.path.join(tmpdir, "pareto_front.csv")
+        results = pareto_front_analysis(
+            json_input_with_emissions,
+            number_of_points=3,
+            json_path_to_output_value=(EMISSIONS, COSTS),
+            results_file=results_file,
+        )
+        assert list(results[PARETO_POINT]) == [1, 2, 3]
+        assert np.isnan(results[EMISSION_BOUND][0])
+        assert results[EMISSIONS].is_monotonic_decreasing
+        assert results[COSTS].is_monotonic_increasing
+        assert results[EMISSIONS][1:].values == pytest.approx(
+            results[EMISSION_BOUND][1:].values, rel=1e-4
+        )
+        # the pv plant is not worth it at the cost optimum
+        assert results["optimizedAddCap.pv_plant_01"][0] == pytest.approx(0)
+        assert results["optimizedAddCap.pv_plant_01"].is_monotonic_increasing
+        pd.testing.assert_frame_equal(pd.read_csv(results_file), results)
+
+
+class TestScenarioVariantsAnalysis:
+    PV_DISPATCH_PRICE = "energyProduction.pv_plant_01.dispatch_price.value"
+
+    def test_variants_equal_complete_simulations(self, json_input, tmpdir):
+        results_file = os.path.join(tmpdir, "variants.csv")
+        variations = [
+            {self.PV_DISPATCH_PRICE: 0.1},
+            {ENERGY_PRICE: 0.5},
+            {"simulation_settings.lp_scaling": {"value": True}},
+        ]
+        results = scenario_variants_analysis(
+            json_input,
+            variations,
+            (OBJECTIVE,),
+            results_file=results_file,
+            max_workers=2,
+        )
+        assert list(results[RUN_ID]) == [0, 1, 2]
+        assert (results[RUN_ERROR] == "").all()
+        # the parameter changes of the first and last variants are applied to the processed
+        # base case, the energy price of the second one requires it to be processed again
+        full = multi_param_variation_analysis(
+            json_input,
+            {self.PV_DISPATCH_PRICE: [0.1]},
+            (OBJECTIVE,),
+            os.path.join(tmpdir, "full.csv"),
+            max_workers=1,
+        )
+        assert results[OBJECTIVE][0] == pytest.approx(full[OBJECTIVE][0])
+        assert results[OBJECTIVE][1] < results[OBJECTIVE][2]
+        assert pd.read_csv(results_file).shape == results.shape
+
+    def test_failed_variant_stores_error(self, json_input):
+        base_input = copy.deepcopy(json_input)
+        results = scenario_variants_analysis(
+            json_input,
+            [{"energyProduction.not_an_asset.dispatch_price.value": 0.1}],
+            (OBJECTIVE,),
+            max_workers=1,
+        )
+        assert "InvalidScenarioDeltaError" in results[RUN_ERROR][0]
+        assert json_input == base_input
+
+
+class TestScenarioDeltaAnalysis:
+    def test_scenario_deltas_of_one_base_input(self, json_input, tmpdir):
+        path_base = store_base(json_input, os.path.join(tmpdir, "library"))
+        delta_files = []
+        for i, (provider, parameter, value) in enumerate(
+            (
+                ("energyProviders", "energy_price", 0.5),
+                ("energyProduction", "dispatch_price", 0.1),
+            )
+        ):
+            scenario = copy.deepcopy(json_input)
+            asset = "Electricity_grid_DSO" if i == 0 else "pv_plant_01"
+            scenario[provider][asset][parameter]["value"] = value
+            delta_files.append(os.path.join(tmpdir, f"scenario_{i}.json"))
+            write_scenario_delta(scenario, path_base, delta_files[-1])
+
+        results = scenario_delta_analysis(delta_files, (OBJECTIVE,), max_workers=2)
+        assert list(results[RUN_ID]) == [0, 1]
+        assert list(results[SCENARIO_FILE]) == delta_files
+        assert (results[RUN_ERROR] == "").all()
+        assert list(results.columns)[-2:] == [OBJECTIVE, RUN_ERROR]
+        variants = scenario_variants_analysis(
+            json_input,
+            [
+                {ENERGY_PRICE: 0.5},
+                {"energyProduction.pv_plant_01.dispatch_price.value": 0.1},
+            ],
+            (OBJECTIVE,),
+            max_workers=2,
+        )
+        assert results[OBJECTIVE].values == pytest.approx(variants[OBJECTIVE].values)
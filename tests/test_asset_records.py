@@ -0,0 +1,164 @@
+import json
+
+import pandas as pd
+import pytest
+
+from multi_vector_simulator.F0_output import store_as_json
+from multi_vector_simulator.utils.asset_records import (
+    ProductionRecord,
+    StorageComponentRecord,
+    StorageRecord,
+    UnitSchema,
+    asset_records_to_dict_values,
+    dict_values_to_asset_records,
+    get_unit,
+    get_value,
+    set_parameter,
+    set_value,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    ENERGY_PRODUCTION,
+    ENERGY_STORAGE,
+    EFFICIENCY,
+    FLOW,
+    COST_OPERATIONAL_TOTAL,
+    INPUT_POWER,
+    INSTALLED_CAP,
+    LABEL,
+    LCOE_ASSET,
+    OPTIMIZE_CAP,
+    OUTPUT_POWER,
+    RENEWABLE_ASSET_BOOL,
+    SIMULATION_SETTINGS,
+    STORAGE_CAPACITY,
+    UNIT,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import UnknownParameterError
+
+
+def production_asset(label):
+    return {
+        LABEL: label,
+        INSTALLED_CAP: {VALUE: 10, UNIT: "kWp"},
+        OPTIMIZE_CAP: {VALUE: True, UNIT: "bool"},
+        RENEWABLE_ASSET_BOOL: {VALUE: True},
+        FLOW: pd.Series([1.0, 2.0]),
+    }
+
+
+def storage_component(label):
+    return {
+        LABEL: label,
+        INSTALLED_CAP: {VALUE: 5, UNIT: "kWh"},
+        EFFICIENCY: {VALUE: 0.9, UNIT: "factor"},
+    }
+
+
+def dict_values_with_assets():
+    return {
+        SIMULATION_SETTINGS: {"setting": {VALUE: 1}},
+        ENERGY_PRODUCTION: {
+            "pv": production_asset("pv"),
+            "pv_2": production_asset("pv_2"),
+        },
+        ENERGY_STORAGE: {
+            "battery": {
+                LABEL: "battery",
+                OPTIMIZE_CAP: {VALUE: False, UNIT: "bool"},
+                INPUT_POWER: storage_component("battery input power"),
+                OUTPUT_POWER: storage_component("battery output power"),
+                STORAGE_CAPACITY: storage_component("battery storage capacity"),
+            }
+        },
+    }
+
+
+def test_asset_record_from_dict_and_to_dict():
+    record = ProductionRecord.from_dict(production_asset("pv"))
+    assert record.installedCap == 10
+    assert record.unit_of(INSTALLED_CAP) == "kWp"
+    assert record.get(RENEWABLE_ASSET_BOOL) is True
+    assert record.unit_of(RENEWABLE_ASSET_BOOL) is None
+    assert record.label == "pv"
+    dict_asset = record.to_dict()
+    assert dict_asset[RENEWABLE_ASSET_BOOL] == {VALUE: True}
+    assert dict_asset[FLOW].equals(production_asset("pv")[FLOW])
+    dict_asset.pop(FLOW)
+    expected = production_asset("pv")
+    expected.pop(FLOW)
+    assert dict_asset == expected
+
+
+def test_asset_record_records_with_same_units_share_the_schema():
+    record = ProductionRecord.from_dict(production_asset("pv"))
+    record_2 = ProductionRecord.from_dict(production_asset("pv_2"))
+    assert record._schema is record_2._schema
+    record_2.set(INSTALLED_CAP, 20, unit="kW")
+    assert record._schema is not record_2._schema
+    assert record.unit_of(INSTALLED_CAP) == "kWp"
+    assert record_2.to_dict()[INSTALLED_CAP] == {VALUE: 20, UNIT: "kW"}
+
+
+def test_asset_record_unknown_parameter_raises_error():
+    dict_asset = production_asset("pv")
+    dict_asset["instaledCap"] = dict_asset.pop(INSTALLED_CAP)
+    with pytest.raises(UnknownParameterError, match=INSTALLED_CAP):
+        ProductionRecord.from_dict(dict_asset)
+    record = ProductionRecord.from_dict(production_asset("pv"))
+    with pytest.raises(AttributeError):
+        record.instaledCap = 10
+    with pytest.raises(AttributeError):
+        record.maximumCap
+
+
+def test_asset_record_storage_components():
+    dict_values = dict_values_with_assets()
+    record = StorageRecord.from_dict(dict_values[ENERGY_STORAGE]["battery"])
+    assert isinstance(record.input_power, StorageComponentRecord)
+    assert record.storage_capacity.unit_of(INSTALLED_CAP) == "kWh"
+    assert record.to_dict() == dict_values[ENERGY_STORAGE]["battery"]
+
+
+def test_dict_values_to_asset_records_and_back():
+    dict_values = dict_values_with_assets()
+    records = dict_values_to_asset_records(dict_values)
+    assert records[SIMULATION_SETTINGS] is dict_values[SIMULATION_SETTINGS]
+    assert isinstance(records[ENERGY_PRODUCTION]["pv"], ProductionRecord)
+    assert isinstance(dict_values[ENERGY_PRODUCTION]["pv"], dict)
+    rebuilt = asset_records_to_dict_values(records)
+    assert rebuilt[ENERGY_STORAGE] == dict_values[ENERGY_STORAGE]
+    assert rebuilt[ENERGY_PRODUCTION]["pv"][INSTALLED_CAP] == {VALUE: 10, UNIT: "kWp"}
+
+
+def test_store_as_json_of_asset_records():
+    dict_values = dict_values_with_assets()
+    records = dict_values_to_asset_records(dict_values)
+    assert json.loads(store_as_json(records)) == json.loads(store_as_json(dict_values))
+
+
+def test_unit_schema_of_unhashable_units():
+    schema = UnitSchema.of({EFFICIENCY: ["factor", "factor"]})
+    assert schema[EFFICIENCY] == ["factor", "factor"]
+
+
+@pytest.mark.parametrize("as_record", [False, True])
+def test_access_parameters_of_dict_or_record(as_record):
+    asset = production_asset("pv")
+    if as_record is True:
+        asset = ProductionRecord.from_dict(asset)
+    assert get_value(asset, INSTALLED_CAP) == 10
+    assert get_unit(asset, INSTALLED_CAP) == "kWp"
+    assert get_value(asset, LABEL) == "pv"
+    assert get_value(asset, FLOW).to_list() == [1.0, 2.0]
+    assert LCOE_ASSET not in asset
+    set_value(asset, LCOE_ASSET, 0.1, "EUR/kWh")
+    set_value(asset, COST_OPERATIONAL_TOTAL, 5)
+    set_parameter(asset, FLOW, pd.Series([3.0]))
+    assert LCOE_ASSET in asset
+    assert get_value(asset, FLOW).to_list() == [3.0]
+    dict_asset = asset.to_dict() if as_record is True else asset
+    assert dict_asset[LCOE_ASSET] == {VALUE: 0.1, UNIT: "EUR/kWh"}
+    assert dict_asset[COST_OPERATIONAL_TOTAL] == {VALUE: 5}
+    asset.pop(LCOE_ASSET)
+    assert LCOE_ASSET not in asset
@@ -58,6 +58,13 @@ from multi_vector_simulator.utils.constants_json_strings import (
     OUTPUT_POWER,
     STORAGE_CAPACITY,
     TIMESERIES_SOC,
+    SIMULATION_RESULTS,
+    OBJECTIVE_VALUE,
+    PEAK_DEMAND_PRICING_CONSTRAINT,
+    MODEL_REDUCTION,
+    REDUCED_MODEL,
+    REMOVED_ASSETS,
+    MERGED_BUSSES,
 )
 
 from multi_vector_simulator.utils.data_parser import convert_epa_params_to_mvs
@@ -422,6 +429,134 @@ class TestACElectricityBus:
                 ):
                     assert abs(battery_charge[i - 1]) > 0
 
+    @pytest.mark.skipif(
+        EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
+        reason="Benchmark test deactivated, set env variable "
+        "EXECUTE_TESTS_ON to 'master' to run this test",
+    )
+    @mock.patch("argparse.ArgumentParser.parse_args", return_value=argparse.Namespace())
+    def test_benchmark_AE_grid_battery_peak_pricing_constraint(self, margs):
+        r"""
+        Benchmark test for the peak demand pricing modelled with one peak demand variable per period (simulation setting `peak_demand_pricing_constraint`). The optimal solution, the optimized peak demand of each period and the flows of the periods have to be the same as with one transformer per period.
+        """
+        use_case = "AE_grid_battery_peak_pricing"
+        use_case_constraint = use_case + "_constraint"
+        path_input_constraint = os.path.join(
+            TEST_OUTPUT_PATH, use_case_constraint + "_input"
+        )
+        shutil.copytree(os.path.join(TEST_INPUT_PATH, use_case), path_input_constraint)
+        with open(
+            os.path.join(
+                path_input_constraint, CSV_ELEMENTS, f"{SIMULATION_SETTINGS}.{CSV_EXT}"
+            ),
+            "a",
+        ) as settings:
+            settings.write(f"{PEAK_DEMAND_PRICING_CONSTRAINT},bool,True\n")
+
+        data = {}
+        busses_flow = {}
+        for case, path_input_folder in (
+            (use_case, os.path.join(TEST_INPUT_PATH, use_case)),
+            (use_case_constraint, path_input_constraint),
+        ):
+            path_output_folder = os.path.join(TEST_OUTPUT_PATH, case)
+            main(
+                overwrite=True,
+                display_output="warning",
+                path_input_folder=path_input_folder,
+                input_type=CSV_EXT,
+                path_output_folder=path_output_folder,
+            )
+            data[case] = load_json(
+                os.path.join(
+                    path_output_folder, JSON_WITH_RESULTS + JSON_FILE_EXTENSION
+                ),
+                flag_missing_values=False,
+            )
+            busses_flow[case] = pd.read_excel(
+                os.path.join(path_output_folder, "timeseries_all_busses.xlsx"),
+                sheet_name="Electricity",
+                index_col=0,
+            )
+
+        assert data[use_case_constraint][SIMULATION_RESULTS][OBJECTIVE_VALUE] == approx(
+            data[use_case][SIMULATION_RESULTS][OBJECTIVE_VALUE], rel=1e-6
+        ), f"The objective value with the peak demand pricing constraint differs from the one with peak demand pricing transformers."
+        for period in range(1, 4):
+            transformer = f"Electricity grid DSO_consumption_period_{period}"
+            assert data[use_case_constraint][ENERGY_CONVERSION][transformer][
+                OPTIMIZED_ADD_CAP
+            ][VALUE] == approx(
+                data[use_case][ENERGY_CONVERSION][transformer][OPTIMIZED_ADD_CAP][
+                    VALUE
+                ],
+                rel=1e-6,
+            ), f"The optimized peak demand of {transformer} differs between both models of the peak demand pricing."
+            assert busses_flow[use_case_constraint][transformer].values == approx(
+                busses_flow[use_case][transformer].values, abs=1e-6
+            ), f"The flow of {transformer} differs between both models of the peak demand pricing."
+
+    @pytest.mark.skipif(
+        EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
+        reason="Benchmark test deactivated, set env variable "
+        "EXECUTE_TESTS_ON to 'master' to run this test",
+    )
+    @mock.patch("argparse.ArgumentParser.parse_args", return_value=argparse.Namespace())
+    def test_benchmark_model_reduction(self, margs):
+        r"""
+        Benchmark test for the model reduction (simulation setting `model_reduction`) of a sector coupled energy system. The busses of the energy providers are merged and excess sinks are removed, but the optimal solution, the optimized capacities and the total flows of all assets have to be the same as without model reduction.
+        """
+        use_case = "AFG_grid_heatpump_heat"
+        use_case_reduced = use_case + "_reduced"
+        path_input_reduced = os.path.join(TEST_OUTPUT_PATH, use_case_reduced + "_input")
+        shutil.copytree(os.path.join(TEST_INPUT_PATH, use_case), path_input_reduced)
+        path_settings = os.path.join(
+            path_input_reduced, CSV_ELEMENTS, f"{SIMULATION_SETTINGS}.{CSV_EXT}"
+        )
+        with open(path_settings, "r") as settings:
+            simulation_settings = settings.read().rstrip("\n")
+        with open(path_settings, "w") as settings:
+            settings.write(simulation_settings + f"\n{MODEL_REDUCTION},bool,True\n")
+
+        data = {}
+        for case, path_input_folder in (
+            (use_case, os.path.join(TEST_INPUT_PATH, use_case)),
+            (use_case_reduced, path_input_reduced),
+        ):
+            path_output_folder = os.path.join(TEST_OUTPUT_PATH, case)
+            main(
+                overwrite=True,
+                display_output="warning",
+                path_input_folder=path_input_folder,
+                input_type=CSV_EXT,
+                path_output_folder=path_output_folder,
+            )
+            data[case] = load_json(
+                os.path.join(
+                    path_output_folder, JSON_WITH_RESULTS + JSON_FILE_EXTENSION
+                ),
+                flag_missing_values=False,
+            )
+
+        reduced_model = data[use_case_reduced][REDUCED_MODEL]
+        assert (
+            len(reduced_model[MERGED_BUSSES]) > 0
+            and len(reduced_model[REMOVED_ASSETS]) > 0
+        ), f"The model of {use_case} should be reduced."
+        assert data[use_case_reduced][SIMULATION_RESULTS][OBJECTIVE_VALUE] == approx(
+            data[use_case][SIMULATION_RESULTS][OBJECTIVE_VALUE], rel=1e-6
+        ), f"The objective value of the reduced model differs from the one of the full model."
+        for asset_group in (ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_CONSUMPTION):
+            for asset, dict_asset in data[use_case][asset_group].items():
+                for parameter in (OPTIMIZED_ADD_CAP, TOTAL_FLOW):
+                    if parameter not in dict_asset:
+                        continue
+                    assert data[use_case_reduced][asset_group][asset][parameter][
+                        VALUE
+                    ] == approx(
+                        dict_asset[parameter][VALUE], rel=1e-5, abs=1e-6
+                    ), f"The {parameter} of {asset} differs between the reduced and the full model."
+
     @pytest.mark.skipif(
         EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
         reason="Benchmark test deactivated, set env variable "
@@ -0,0 +1,144 @@
+import io
+import os
+import queue
+import shutil
+import signal
+import threading
+import time
+
+import pytest
+
+from multi_vector_simulator.daemon import SimulationDaemon, submit, _run_job
+from multi_vector_simulator.utils.constants import (
+    DAEMON_EVENT,
+    DAEMON_PING,
+    DAEMON_STARTED,
+    DAEMON_STOP,
+    INPUT_FOLDER,
+    JSON_WITH_RESULTS,
+    JSON_FILE_EXTENSION,
+)
+from multi_vector_simulator.utils.exceptions import MVSDaemonError
+
+from _constants import TEST_REPO_PATH
+
+TEST_INPUT_PATH = os.path.join(TEST_REPO_PATH, INPUT_FOLDER)
+TEST_OUTPUT_PATH = os.path.join(TEST_REPO_PATH, "MVS_outputs_daemon")
+
+
+class TestSimulationDaemon:
+    def setup_method(self):
+        shutil.rmtree(TEST_OUTPUT_PATH, ignore_errors=True)
+
+    @pytest.fixture
+    def daemon(self, tmp_path):
+        key_file = str(tmp_path / "key")
+        daemon = SimulationDaemon(n_workers=1, port=0, key_file=key_file)
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        yield daemon, key_file
+        if daemon.stopped.is_set() is False:
+            submit([], port=daemon.address[1], key_file=key_file, command=DAEMON_STOP)
+        thread.join(timeout=60)
+
+    def test_ping(self, daemon):
+        daemon, key_file = daemon
+        answer = submit(
+            [], port=daemon.address[1], key_file=key_file, command=DAEMON_PING
+        )
+        assert answer == "pong"
+
+    def test_run_simulation_streams_logs_and_returns_output_folder(self, daemon):
+        daemon, key_file = daemon
+        stream = io.StringIO()
+        answer = submit(
+            ["-i", TEST_INPUT_PATH, "-o", TEST_OUTPUT_PATH, "-f"],
+            port=daemon.address[1],
+            key_file=key_file,
+            stream=stream,
+        )
+        assert answer == os.path.abspath(TEST_OUTPUT_PATH)
+        assert os.path.exists(
+            os.path.join(TEST_OUTPUT_PATH, JSON_WITH_RESULTS + JSON_FILE_EXTENSION)
+        )
+        assert "Starting simulation." in stream.getvalue()
+
+    def test_failing_simulation_raises_daemon_error(self, daemon):
+        daemon, key_file = daemon
+        with pytest.raises(MVSDaemonError, match="FileNotFoundError"):
+            submit(
+                [
+                    "-i",
+                    os.path.join(TEST_REPO_PATH, "not_a_folder"),
+                    "-o",
+                    TEST_OUTPUT_PATH,
+                ],
+                port=daemon.address[1],
+                key_file=key_file,
+                stream=io.StringIO(),
+            )
+
+    def test_dead_worker_sends_error_to_client(self, daemon):
+        daemon, key_file = daemon
+        stream = io.StringIO()
+        errors = []
+
+        def run():
+            try:
+                submit(
+                    ["-i", TEST_INPUT_PATH, "-o", TEST_OUTPUT_PATH, "-f"],
+                    port=daemon.address[1],
+                    key_file=key_file,
+                    stream=stream,
+                )
+            except MVSDaemonError as e:
+                errors.append(str(e))
+
+        client = threading.Thread(target=run, daemon=True)
+        client.start()
+        while stream.getvalue() == "":
+            time.sleep(0.05)
+        # e.g. the worker is killed because the machine ran out of memory
+        for worker in daemon.pool._pool:
+            os.kill(worker.pid, signal.SIGKILL)
+        client.join(timeout=60)
+        assert client.is_alive() is False
+        assert len(errors) == 1
+        assert "died" in errors[0]
+        # the dead worker is replaced, the next simulations run as usual
+        with pytest.raises(MVSDaemonError, match="FileNotFoundError"):
+            submit(
+                ["-i", os.path.join(TEST_REPO_PATH, "not_a_folder")],
+                port=daemon.address[1],
+                key_file=key_file,
+                stream=io.StringIO(),
+            )
+
+    def test_wrong_key_is_refused(self, daemon, tmp_path):
+        daemon, key_file = daemon
+        wrong_key_file = str(tmp_path / "wrong_key")
+        with open(wrong_key_file, "w") as fp:
+            fp.write("wrong")
+        with pytest.raises(Exception):
+            submit(
+                [], port=daemon.address[1], key_file=wrong_key_file, command=DAEMON_PING
+            )
+
+    def teardown_method(self):
+        shutil.rmtree(TEST_OUTPUT_PATH, ignore_errors=True)
+
+
+def test_submit_without_daemon_raises_daemon_error(tmp_path):
+    key_file = str(tmp_path / "key")
+    with open(key_file, "w") as fp:
+        fp.write("key")
+    with pytest.raises(MVSDaemonError):
+        submit([], port=1, key_file=key_file, command=DAEMON_PING)
+
+
+def test_run_job_restores_working_directory(tmp_path):
+    events = queue.Queue()
+    cwd = os.getcwd()
+    _run_job(["-i", "not_a_folder", "-o", "output"], str(tmp_path), events)
+    assert os.getcwd() == cwd
+    assert events.get()[DAEMON_EVENT] == DAEMON_STARTED
@@ -0,0 +1,83 @@
+"""
+The reporting stack (F1_plotting, F2_autoreport and their dependencies) should only be imported
+when a pdf report or png figures are requested, as it dominates the import time of the MVS.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from _constants import TEST_REPO_PATH, INPUT_FOLDER
+
+REPORT_STACK = (
+    "multi_vector_simulator.F1_plotting",
+    "multi_vector_simulator.F2_autoreport",
+    "plotly",
+    "graphviz",
+    "dash",
+    "folium",
+    "reverse_geocoder",
+    "staticmap",
+    "pyppeteer",
+)
+
+TEST_OUTPUT_PATH = os.path.join(TEST_REPO_PATH, "MVS_outputs_import_budget")
+
+
+# prefix of the line of the output listing the loaded modules, other lines (e.g. deprecation
+# warnings of pyomo and oemof) may be printed before or after it
+LOADED_MODULES_PREFIX = "__loaded_report_modules__:"
+
+
+def loaded_report_modules(code):
+    """Runs code in a fresh interpreter and returns the modules of the report stack it loaded"""
+    script = (
+        code
+        + "\nimport json, sys"
+        + f"\nprint({LOADED_MODULES_PREFIX!r} + json.dumps("
+        + f"[m for m in {REPORT_STACK} if m in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=TEST_REPO_PATH,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+        universal_newlines=True,
+    ).stdout
+    lines = [
+        line[len(LOADED_MODULES_PREFIX) :]
+        for line in output.splitlines()
+        if line.startswith(LOADED_MODULES_PREFIX)
+    ]
+    assert len(lines) == 1, f"The loaded modules are missing in the output:\n{output}"
+    return json.loads(lines[0])
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "multi_vector_simulator.cli",
+        "multi_vector_simulator.server",
+        "multi_vector_simulator.F0_output",
+        "multi_vector_simulator.D0_modelling_and_optimization",
+    ],
+)
+def test_import_does_not_load_report_stack(module):
+    assert loaded_report_modules(f"import {module}") == []
+
+
+def test_mvs_tool_without_pdf_and_png_does_not_load_report_stack():
+    code = (
+        "from multi_vector_simulator.cli import main\n"
+        f"main(path_input_folder={os.path.join(TEST_REPO_PATH, INPUT_FOLDER)!r}, "
+        f"path_output_folder={TEST_OUTPUT_PATH!r}, overwrite=True, "
+        "display_output='error', pdf_report=False, save_png=False)"
+    )
+    try:
+        assert loaded_report_modules(code) == []
+    finally:
+        shutil.rmtree(TEST_OUTPUT_PATH, ignore_errors=True)
@@ -0,0 +1,215 @@
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+
+import pytest
+
+from multi_vector_simulator.job_queue import JobQueue, main, run_worker
+from multi_vector_simulator.utils.constants import (
+    INPUT_FOLDER,
+    JOB_DEAD_LETTER,
+    JOB_DONE,
+    JOB_PENDING,
+    JOB_RUNNING,
+    JSON_WITH_RESULTS,
+    JSON_FILE_EXTENSION,
+)
+from multi_vector_simulator.utils.exceptions import MVSQueueError
+
+from _constants import TEST_REPO_PATH
+
+TEST_INPUT_PATH = os.path.join(TEST_REPO_PATH, INPUT_FOLDER)
+
+
+@pytest.fixture
+def path_database(tmp_path):
+    return str(tmp_path / "queue.sqlite")
+
+
+def claim_all(path_database, worker_id, claimed):
+    with JobQueue(path_database) as queue:
+        while True:
+            job = queue.claim(worker_id)
+            if job is None:
+                break
+            claimed.put(job["id"])
+
+
+def test_claim_is_atomic_across_processes(path_database):
+    with JobQueue(path_database) as queue:
+        job_ids = [queue.submit_mvs_tool(["-i", str(i)]) for i in range(40)]
+    claimed = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(
+            target=claim_all, args=(path_database, f"worker_{i}", claimed)
+        )
+        for i in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    claimed_ids = [claimed.get(timeout=60) for _ in job_ids]
+    for worker in workers:
+        worker.join(timeout=60)
+    assert sorted(claimed_ids) == job_ids
+    with JobQueue(path_database) as queue:
+        assert queue.counts()[JOB_RUNNING] == len(job_ids)
+
+
+def test_expired_lease_is_claimed_by_another_worker(path_database):
+    with JobQueue(path_database, lease_timeout=0.05, retry_delay=0) as queue:
+        job_id = queue.submit_mvs_tool([])
+        assert queue.claim("a")["attempts"] == 1
+        assert queue.claim("b") is None
+        time.sleep(0.1)
+        job = queue.claim("b")
+        assert job["id"] == job_id
+        assert job["attempts"] == 2
+        assert "a sent no heartbeat" in job["error"]
+        assert queue.heartbeat(job_id, "a") is False
+        assert queue.complete(job_id, "a", "lost") is False
+        assert queue.complete(job_id, "b", {"result": 1}) is True
+        assert queue.result(job_id) == {"result": 1}
+
+
+def test_failed_job_is_retried_and_moved_to_dead_letter(path_database, tmp_path):
+    with JobQueue(path_database) as queue:
+        job_id = queue.submit_mvs_tool(
+            ["-i", str(tmp_path / "missing"), "-o", str(tmp_path / "out")],
+            max_attempts=2,
+        )
+    n_jobs = run_worker(
+        path_database, exit_when_idle=True, poll_interval=0.05, retry_delay=0
+    )
+    assert n_jobs == 2
+    with JobQueue(path_database) as queue:
+        job = queue.get(job_id)
+        assert job["status"] == JOB_DEAD_LETTER
+        assert job["attempts"] == 2
+        assert "Traceback" in job["error"]
+        with pytest.raises(MVSQueueError, match="has no result"):
+            queue.result(job_id)
+        queue.requeue(job_id)
+        assert queue.get(job_id)["status"] == JOB_PENDING
+        assert queue.get(job_id)["attempts"] == 0
+        with pytest.raises(MVSQueueError, match="can not be requeued"):
+            queue.requeue(job_id)
+
+
+def test_retry_overwrites_the_output_folder_of_the_failed_attempt(
+    path_database, tmp_path
+):
+    path_input_folder = str(tmp_path / "in")
+    shutil.copytree(TEST_INPUT_PATH, path_input_folder)
+    path_input_file = os.path.join(path_input_folder, "mvs_config.json")
+    os.rename(path_input_file, path_input_file + ".bak")
+    with open(path_input_file, "w") as input_file:
+        input_file.write("not a json")
+    path_output_folder = str(tmp_path / "out")
+    with JobQueue(path_database, retry_delay=0) as queue:
+        job_id = queue.submit_mvs_tool(
+            ["-i", path_input_folder, "-o", path_output_folder]
+        )
+    run_worker(path_database, max_jobs=1, retry_delay=0)
+    with JobQueue(path_database) as queue:
+        job = queue.get(job_id)
+    assert job["status"] == JOB_PENDING
+    assert os.path.exists(path_output_folder)
+
+    os.replace(path_input_file + ".bak", path_input_file)
+    run_worker(path_database, exit_when_idle=True, poll_interval=0.05)
+    with JobQueue(path_database) as queue:
+        job = queue.get(job_id)
+    assert job["status"] == JOB_DONE
+    assert job["attempts"] == 2
+    assert os.path.exists(
+        os.path.join(path_output_folder, JSON_WITH_RESULTS + JSON_FILE_EXTENSION)
+    )
+
+
+def test_existing_output_folder_is_not_overwritten_by_retries(path_database, tmp_path):
+    path_output_folder = tmp_path / "out"
+    path_output_folder.mkdir()
+    (path_output_folder / "results.txt").write_text("former results")
+    with JobQueue(path_database) as queue:
+        job_id = queue.submit_mvs_tool(
+            ["-i", TEST_INPUT_PATH, "-o", str(path_output_folder)], max_attempts=2
+        )
+    run_worker(path_database, exit_when_idle=True, poll_interval=0.05, retry_delay=0)
+    with JobQueue(path_database) as queue:
+        job = queue.get(job_id)
+    assert job["status"] == JOB_DEAD_LETTER
+    assert "FileExistsError" in job["error"]
+    assert (path_output_folder / "results.txt").read_text() == "former results"
+
+
+def test_job_exceeding_its_timeout_is_stopped(path_database, tmp_path):
+    with JobQueue(path_database) as queue:
+        job_id = queue.submit_mvs_tool(
+            ["-i", TEST_INPUT_PATH, "-o", str(tmp_path / "out"), "-f"],
+            max_attempts=1,
+            timeout=0.5,
+        )
+    run_worker(path_database, exit_when_idle=True, poll_interval=0.05)
+    with JobQueue(path_database) as queue:
+        job = queue.get(job_id)
+    assert job["status"] == JOB_DEAD_LETTER
+    assert "exceeded its timeout" in job["error"]
+
+
+def test_several_workers_run_the_queued_simulations(
+    path_database, tmp_path, json_input
+):
+    path_output_folder = str(tmp_path / "out")
+    with JobQueue(path_database) as queue:
+        job_ids = [
+            queue.submit_mvs_tool(["-i", TEST_INPUT_PATH, "-o", path_output_folder]),
+            queue.submit_simulation(json_input),
+            queue.submit_simulation(json_input),
+        ]
+    workers = [
+        multiprocessing.Process(
+            target=run_worker,
+            kwargs=dict(
+                path_database=path_database,
+                exit_when_idle=True,
+                poll_interval=0.05,
+                heartbeat_interval=0.5,
+            ),
+        )
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=600)
+    with JobQueue(path_database) as queue:
+        assert queue.counts()[JOB_DONE] == 3
+        assert queue.result(job_ids[0]) == os.path.abspath(path_output_folder)
+        assert os.path.exists(
+            os.path.join(path_output_folder, JSON_WITH_RESULTS + JSON_FILE_EXTENSION)
+        )
+        assert queue.result(job_ids[1]) == queue.result(job_ids[2])
+        assert all(job["attempts"] == 1 for job in queue.jobs())
+
+
+def test_command_line_submit_and_status(path_database, monkeypatch, capsys):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["mvs_queue", "-db", path_database, "submit", "-attempts", "2", "-i", "in"],
+    )
+    assert main() == 0
+    monkeypatch.setattr(sys, "argv", ["mvs_queue", "-db", path_database, "status"])
+    assert main() == 0
+    output = capsys.readouterr().out
+    assert "pending: 1, running: 0, done: 0, dead_letter: 0" in output
+    with JobQueue(path_database) as queue:
+        job = queue.get(1)
+    assert job["payload"] == {"argv": ["-i", "in"], "cwd": os.getcwd()}
+    assert job["max_attempts"] == 2
+    monkeypatch.setattr(
+        sys, "argv", ["mvs_queue", "-db", path_database, "requeue", "1"]
+    )
+    assert main() == 1
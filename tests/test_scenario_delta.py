@@ -0,0 +1,166 @@
+import json
+import os
+
+import pytest
+
+from multi_vector_simulator.B0_data_input_json import load_json
+from multi_vector_simulator.utils.scenario_delta import (
+    apply_changes,
+    compute_changes,
+    content_hash,
+    load_scenario,
+    store_base,
+    write_scenario_delta,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    CONSTRAINTS,
+    ENERGY_PRODUCTION,
+    MAXIMUM_EMISSIONS,
+    PATCH_ADD,
+    PATCH_OPERATION,
+    PATCH_PATH,
+    PATCH_REMOVE,
+    PATCH_REPLACE,
+    SCENARIO_BASE,
+    SCENARIO_BASE_HASH,
+    SCENARIO_CHANGES,
+    SPECIFIC_COSTS,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidScenarioDeltaError
+
+from _constants import JSON_PATH
+
+PV_SPECIFIC_COSTS = "energyProduction.PV_plant_(mono).specific_costs.value"
+
+
+def base_input():
+    with open(JSON_PATH) as json_file:
+        return json.load(json_file)
+
+
+def write_json(json_dict, path):
+    with open(path, "w") as json_file:
+        json.dump(json_dict, json_file)
+    return str(path)
+
+
+def test_apply_changes():
+    json_dict = {"a": {"b": 1, "c": [1, 2]}}
+    apply_changes(
+        json_dict,
+        [
+            {PATCH_OPERATION: PATCH_REPLACE, PATCH_PATH: "a.b", VALUE: 2},
+            {PATCH_OPERATION: PATCH_ADD, PATCH_PATH: ["a", "d"], VALUE: {"e": 3}},
+            {PATCH_OPERATION: PATCH_ADD, PATCH_PATH: "a.c.2", VALUE: 3},
+            {PATCH_OPERATION: PATCH_REMOVE, PATCH_PATH: "a.c.0"},
+            {PATCH_OPERATION: PATCH_ADD, PATCH_PATH: "f", VALUE: None},
+        ],
+    )
+    assert json_dict == {"a": {"b": 2, "c": [2, 3], "d": {"e": 3}}, "f": None}
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {PATCH_OPERATION: "move", PATCH_PATH: "a.b", VALUE: 2},
+        {PATCH_OPERATION: PATCH_REPLACE, PATCH_PATH: "a.b"},
+        {PATCH_OPERATION: PATCH_REPLACE, PATCH_PATH: "a.x", VALUE: 2},
+        {PATCH_OPERATION: PATCH_REMOVE, PATCH_PATH: "x.b"},
+        {PATCH_OPERATION: PATCH_ADD, PATCH_PATH: "", VALUE: 2},
+    ],
+)
+def test_apply_changes_invalid_change(change):
+    with pytest.raises(InvalidScenarioDeltaError):
+        apply_changes({"a": {"b": 1}}, [change])
+
+
+def test_compute_changes_turn_base_into_scenario():
+    base = base_input()
+    scenario = base_input()
+    scenario[ENERGY_PRODUCTION]["PV_plant_(mono)"][SPECIFIC_COSTS][VALUE] = 3000
+    scenario[CONSTRAINTS].pop(MAXIMUM_EMISSIONS)
+    scenario["project_data"]["scenario.label"] = "a"
+    changes = compute_changes(base, scenario)
+    assert len(changes) == 3
+    assert {
+        PATCH_OPERATION: PATCH_REPLACE,
+        PATCH_PATH: PV_SPECIFIC_COSTS,
+        VALUE: 3000,
+    } in changes
+    assert apply_changes(json.loads(json.dumps(base)), changes) == scenario
+
+
+def test_store_base_deduplicates_identical_inputs(tmpdir):
+    library = os.path.join(tmpdir, "library")
+    path_base = store_base(base_input(), library)
+    assert os.path.basename(path_base) == content_hash(base_input()) + ".json"
+    # the order of the keys does not change the content hash
+    reordered = dict(reversed(list(base_input().items())))
+    assert store_base(reordered, library) == path_base
+    assert os.listdir(library) == [os.path.basename(path_base)]
+
+
+def test_write_scenario_delta(tmpdir):
+    path_base = store_base(base_input(), os.path.join(tmpdir, "library"))
+    scenario = base_input()
+    scenario[ENERGY_PRODUCTION]["PV_plant_(mono)"][SPECIFIC_COSTS][VALUE] = 3000
+    path_delta = os.path.join(tmpdir, "scenario.json")
+    delta = write_scenario_delta(scenario, path_base, path_delta)
+    assert delta[SCENARIO_BASE] == os.path.join("library", os.path.basename(path_base))
+    assert delta[SCENARIO_CHANGES] == [
+        {PATCH_OPERATION: PATCH_REPLACE, PATCH_PATH: PV_SPECIFIC_COSTS, VALUE: 3000}
+    ]
+    assert load_scenario(path_delta) == scenario
+
+
+def test_load_scenario_delta(tmpdir):
+    path_base = write_json(base_input(), os.path.join(tmpdir, "base.json"))
+    delta = {
+        SCENARIO_BASE: "base.json",
+        SCENARIO_CHANGES: [
+            {PATCH_OPERATION: PATCH_REPLACE, PATCH_PATH: PV_SPECIFIC_COSTS, VALUE: 3000}
+        ],
+    }
+    path_delta = write_json(delta, os.path.join(tmpdir, "delta.json"))
+    # a scenario delta can be based on another scenario delta
+    delta = {
+        SCENARIO_BASE: "delta.json",
+        SCENARIO_CHANGES: [
+            {PATCH_OPERATION: PATCH_REMOVE, PATCH_PATH: "constraints.maximum_emissions"}
+        ],
+    }
+    path_delta_of_delta = write_json(delta, os.path.join(tmpdir, "delta_2.json"))
+    dict_values = load_json(path_delta_of_delta, flag_missing_values=False)
+    assert (
+        dict_values[ENERGY_PRODUCTION]["PV_plant_(mono)"][SPECIFIC_COSTS][VALUE] == 3000
+    )
+    assert MAXIMUM_EMISSIONS not in dict_values[CONSTRAINTS]
+    pv_plant = base_input()[ENERGY_PRODUCTION]["PV_plant_(mono)"]
+    assert (
+        load_json(path_base)[ENERGY_PRODUCTION]["PV_plant_(mono)"][SPECIFIC_COSTS]
+        == pv_plant[SPECIFIC_COSTS]
+    )
+
+
+def test_load_scenario_delta_of_modified_base(tmpdir):
+    path_base = write_json(base_input(), os.path.join(tmpdir, "base.json"))
+    delta = {
+        SCENARIO_BASE: path_base,
+        SCENARIO_BASE_HASH: content_hash(base_input()),
+        SCENARIO_CHANGES: [],
+    }
+    path_delta = write_json(delta, os.path.join(tmpdir, "delta.json"))
+    assert load_scenario(path_delta) == base_input()
+    modified = base_input()
+    modified[CONSTRAINTS].pop(MAXIMUM_EMISSIONS)
+    write_json(modified, path_base)
+    with pytest.raises(InvalidScenarioDeltaError, match="modified"):
+        load_scenario(path_delta)
+
+
+def test_load_scenario_delta_referencing_itself(tmpdir):
+    delta = {SCENARIO_BASE: "delta.json", SCENARIO_CHANGES: []}
+    path_delta = write_json(delta, os.path.join(tmpdir, "delta.json"))
+    with pytest.raises(InvalidScenarioDeltaError, match="references itself"):
+        load_scenario(path_delta)
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from multi_vector_simulator.server import (
+    PIPELINE_STAGES,
+    SimulationJobManager,
+    run_pipeline,
+)
+from multi_vector_simulator.utils.constants import (
+    JOB_PENDING,
+    JOB_DONE,
+    JOB_CANCELLED,
+    JOB_STATUS,
+    JOB_STAGE,
+    JOB_EVENTS,
+    JOB_LOGS,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_RESULTS,
+    OBJECTIVE_VALUE,
+)
+from multi_vector_simulator.utils.exceptions import JobCancelledError
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def test_run_pipeline_reports_all_stages_in_order(json_input):
+    stages = []
+    run_pipeline(json_input, epa_format=False, progress_callback=stages.append)
+    assert tuple(stages) == PIPELINE_STAGES
+
+
+def test_run_pipeline_aborted_by_progress_callback(json_input):
+    def abort(stage):
+        if stage == PIPELINE_STAGES[1]:
+            raise JobCancelledError(stage)
+
+    with pytest.raises(JobCancelledError):
+        run_pipeline(json_input, progress_callback=abort)
+
+
+class TestSimulationJobManager:
+    def test_job_result_status_and_logs(self, json_input):
+        async def simulate():
+            async with SimulationJobManager(max_workers=1) as manager:
+                job_id = await manager.submit(json_input, epa_format=False)
+                result = await manager.result(job_id)
+                # let the event listener process the last messages of the job
+                await asyncio.sleep(0.5)
+                status = await manager.status(job_id)
+            return result, status
+
+        result, status = run(simulate())
+        assert OBJECTIVE_VALUE in result[SIMULATION_RESULTS]
+        assert status[JOB_STATUS] == JOB_DONE
+        assert status[JOB_STAGE] == PIPELINE_STAGES[-1]
+        assert [e[JOB_STAGE] for e in status[JOB_EVENTS]] == list(PIPELINE_STAGES)
+        assert len(status[JOB_LOGS]) > 0
+
+    def test_cancel_pending_job(self, json_input):
+        async def simulate():
+            async with SimulationJobManager(max_workers=1) as manager:
+                first_job = await manager.submit(json_input)
+                second_job = await manager.submit(json_input)
+                cancelled = await manager.cancel(second_job)
+                with pytest.raises(JobCancelledError):
+                    await manager.result(second_job)
+                status = await manager.status(second_job)
+                await manager.result(first_job)
+            return cancelled, status
+
+        cancelled, status = run(simulate())
+        assert cancelled is True
+        assert status[JOB_STATUS] == JOB_CANCELLED
+
+    def test_cancel_running_job(self, json_input):
+        async def simulate():
+            async with SimulationJobManager(max_workers=1) as manager:
+                job_id = await manager.submit(json_input)
+                while (await manager.status(job_id))[JOB_STATUS] == JOB_PENDING:
+                    await asyncio.sleep(0.01)
+                cancelled = await manager.cancel(job_id)
+                with pytest.raises(JobCancelledError) as error:
+                    await manager.result(job_id)
+                # let the event listener process the last messages of the job
+                await asyncio.sleep(0.5)
+                status = await manager.status(job_id)
+                # the worker process is free for the next job
+                next_job = await manager.submit(json_input, epa_format=False)
+                await manager.result(next_job)
+            return cancelled, str(error.value), status
+
+        cancelled, message, status = run(simulate())
+        assert cancelled is True
+        assert status[JOB_STATUS] == JOB_CANCELLED
+        # the job stopped before the stage following the cancellation
+        stopped_stage = message.split()[-1]
+        assert message.endswith(f"before stage {stopped_stage}")
+        assert [e[JOB_STAGE] for e in status[JOB_EVENTS]] == list(
+            PIPELINE_STAGES[: PIPELINE_STAGES.index(stopped_stage)]
+        )
+
+    def test_status_of_unknown_job_raises_key_error(self):
+        async def simulate():
+            async with SimulationJobManager(max_workers=1) as manager:
+                await manager.status("unknown")
+
+        with pytest.raises(KeyError):
+            run(simulate())
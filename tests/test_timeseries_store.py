@@ -0,0 +1,92 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from multi_vector_simulator.utils.timeseries_store import (
+    TimeseriesStore,
+    share_timeseries,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    ENERGY_CONSUMPTION,
+    ENERGY_PRODUCTION,
+    TIMESERIES,
+    TIMESERIES_NORMALIZED,
+    TIMESERIES_STORE,
+    LABEL,
+    VALUE,
+)
+
+TIME_INDEX = pd.date_range("2020-01-01", periods=4, freq="H")
+
+
+def dict_values_with_timeseries():
+    profile = pd.Series([0, 0.5, 1, 0.5], index=TIME_INDEX)
+    return {
+        ENERGY_PRODUCTION: {
+            "pv": {LABEL: "pv", TIMESERIES: profile.copy()},
+            "pv_2": {
+                LABEL: "pv_2",
+                TIMESERIES: profile.copy(),
+                TIMESERIES_NORMALIZED: profile.copy(),
+            },
+        },
+        ENERGY_CONSUMPTION: {
+            "demand": {LABEL: "demand", TIMESERIES: 2 * profile},
+            "labels": {LABEL: "labels", TIMESERIES: pd.Series(["a", "b", "c", "d"])},
+        },
+    }
+
+
+def test_share_timeseries_identical_timeseries_share_one_array():
+    dict_values = dict_values_with_timeseries()
+    timeseries_store = share_timeseries(dict_values)
+    assert dict_values[TIMESERIES_STORE] is timeseries_store
+    assert len(timeseries_store) == 2
+    pv = dict_values[ENERGY_PRODUCTION]["pv"][TIMESERIES]
+    pv_2 = dict_values[ENERGY_PRODUCTION]["pv_2"]
+    assert pv.values is pv_2[TIMESERIES].values
+    assert pv.values is pv_2[TIMESERIES_NORMALIZED].values
+    assert pv.index.equals(TIME_INDEX)
+    assert (
+        timeseries_store.key_of(dict_values[ENERGY_CONSUMPTION]["labels"][TIMESERIES])
+        is None
+    )
+
+
+def test_share_timeseries_views_are_read_only():
+    dict_values = dict_values_with_timeseries()
+    share_timeseries(dict_values)
+    with pytest.raises(ValueError):
+        dict_values[ENERGY_PRODUCTION]["pv"][TIMESERIES].iloc[0] = 1
+    assert dict_values[ENERGY_PRODUCTION]["pv_2"][TIMESERIES].iloc[0] == 0
+
+
+def test_share_timeseries_releases_unused_arrays():
+    dict_values = dict_values_with_timeseries()
+    timeseries_store = share_timeseries(dict_values)
+    dict_values[ENERGY_CONSUMPTION].pop("demand")
+    share_timeseries(dict_values)
+    assert dict_values[TIMESERIES_STORE] is timeseries_store
+    assert len(timeseries_store) == 1
+
+
+def test_timeseries_store_to_json_and_from_json():
+    timeseries_store = TimeseriesStore()
+    view = timeseries_store.add(pd.Series([1.0, 2.0, 3.0]))
+    key = timeseries_store.key_of(view)
+    rebuilt_store = TimeseriesStore.from_json(timeseries_store.to_json())
+    assert list(rebuilt_store) == [key]
+    assert np.array_equal(rebuilt_store[key], timeseries_store[key])
+    assert rebuilt_store[key].flags.writeable is False
+
+
+def test_share_timeseries_deepcopy_of_dict_values():
+    dict_values = dict_values_with_timeseries()
+    share_timeseries(dict_values)
+    dict_copy = copy.deepcopy(dict_values)
+    dict_copy[ENERGY_CONSUMPTION].pop("demand")
+    timeseries_store = share_timeseries(dict_copy)
+    assert len(timeseries_store) == 1
+    assert timeseries_store.key_of(dict_copy[ENERGY_PRODUCTION]["pv"][TIMESERIES])